@@ -7,23 +7,72 @@ Key insight: A coastal Florida F-150 with salt + humidity is NORMAL
 But an inland Michigan F-150 with the same pattern is an OUTLIER
 
 Only flag vehicles that are statistical outliers within their cohort
+
+Percentiles come from each cohort's sorted metric arrays (searchsorted,
+O(n log n) per cohort); percentile_method="scipy" keeps the original
+per-vehicle scipy.stats.percentileofscore path
 """
 
 import json
 import numpy as np
 import logging
 from datetime import datetime
-from typing import Dict, List, Any, Tuple
+from dataclasses import dataclass
+from typing import Dict, List, Any, Optional, Tuple
 from collections import defaultdict
 from scipy import stats
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+PERCENTILE_METHODS = ("searchsorted", "scipy")
+
+
+def percentiles_of_scores(sorted_values: np.ndarray, scores: np.ndarray) -> np.ndarray:
+    """scipy.stats.percentileofscore(kind='rank') for many scores against one sorted array"""
+    n = len(sorted_values)
+    if n == 0 or np.isnan(sorted_values[-1]):  # NaNs sort last; like scipy, they make every percentile NaN
+        return np.full(len(scores), np.nan)
+    
+    left = np.searchsorted(sorted_values, scores, side='left')
+    right = np.searchsorted(sorted_values, scores, side='right')
+    percentiles = (left + right + (left < right)) * (50.0 / n)
+    return np.where(np.isnan(scores), np.nan, percentiles)
+
+
+@dataclass
+class CohortRanking:
+    """A cohort's metric arrays, sorted once so any vehicle's percentile is a binary search"""
+    risk_scores: np.ndarray
+    stressor_counts: np.ndarray
+    revenues: np.ndarray
+    
+    @classmethod
+    def from_vehicles(cls, cohort_vehicles: List[Dict]) -> "CohortRanking":
+        risk_scores, stressor_counts, revenues = _metric_arrays(cohort_vehicles)
+        return cls(np.sort(risk_scores), np.sort(stressor_counts), np.sort(revenues))
+
+
+def _metric_arrays(vehicles: List[Dict]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(risk scores, stressor counts, revenue opportunities) with the detector's defaults for missing values"""
+    return (
+        np.array([v.get('posterior_probability', 0) for v in vehicles], dtype=float),
+        np.array([v.get('stressor_count', 0) for v in vehicles], dtype=float),
+        np.array([v.get('revenue_opportunity', 0) for v in vehicles], dtype=float)
+    )
+
+
 class CohortRelativeOutlierDetector:
-    def __init__(self):
+    def __init__(self, percentile_method: str = "searchsorted"):
         """Initialize cohort-relative analysis system"""
         
+        if percentile_method not in PERCENTILE_METHODS:
+            raise ValueError(f"percentile_method must be one of {PERCENTILE_METHODS}")
+        self.percentile_method = percentile_method
+        
+        # Sorted metric arrays per cohort, built once per analysis run
+        self.cohort_rankings: Dict[str, CohortRanking] = {}
+        
         # Define meaningful cohorts for comparison
         self.cohort_definitions = {
             "geographic_climate": ["state", "climate_zone"],
@@ -154,12 +203,57 @@ class CohortRelativeOutlierDetector:
         stressor_percentile = stats.percentileofscore(cohort_stressor_counts, vehicle_stressors)
         revenue_percentile = stats.percentileofscore(cohort_revenues, vehicle_revenue)
         
+        return self._classify_in_cohort(
+            vehicle_risk, risk_percentile, stressor_percentile, revenue_percentile,
+            len(cohort_vehicles), cohort_stats
+        )
+    
+    def detect_outliers_sorted(self, vehicles: List[Dict], best_cohorts: List[Optional[str]],
+                               cohorts: Dict[str, List[Dict]], cohort_stats: Dict[str, Dict]) -> List[Dict[str, Any]]:
+        """Outlier analysis for every vehicle, ranking each cohort's members in one searchsorted pass"""
+        
+        analyses: List[Dict[str, Any]] = [{"outlier_status": "no_suitable_cohort"} for _ in vehicles]
+        
+        members = defaultdict(list)
+        for index, cohort_name in enumerate(best_cohorts):
+            if cohort_name:
+                members[cohort_name].append(index)
+        
+        for cohort_name, indices in members.items():
+            if cohort_stats[cohort_name].get("insufficient_data"):
+                for index in indices:
+                    analyses[index] = {"outlier_status": "insufficient_cohort_data"}
+                continue
+            
+            ranking = self.cohort_rankings.get(cohort_name)
+            if ranking is None:
+                ranking = self.cohort_rankings[cohort_name] = CohortRanking.from_vehicles(cohorts[cohort_name])
+            
+            group = [vehicles[index] for index in indices]
+            risks, stressor_counts, revenues = _metric_arrays(group)
+            risk_percentiles = percentiles_of_scores(ranking.risk_scores, risks)
+            stressor_percentiles = percentiles_of_scores(ranking.stressor_counts, stressor_counts)
+            revenue_percentiles = percentiles_of_scores(ranking.revenues, revenues)
+            
+            for position, index in enumerate(indices):
+                analyses[index] = self._classify_in_cohort(
+                    group[position].get('posterior_probability', 0),
+                    risk_percentiles[position], stressor_percentiles[position], revenue_percentiles[position],
+                    len(cohorts[cohort_name]), cohort_stats[cohort_name]
+                )
+        
+        return analyses
+    
+    def _classify_in_cohort(self, vehicle_risk: float, risk_percentile: float, stressor_percentile: float,
+                            revenue_percentile: float, cohort_size: int, cohort_stats: Dict) -> Dict[str, Any]:
+        """Outlier status from a vehicle's percentiles within its cohort"""
+        
         # Determine outlier status
         outlier_analysis = {
             "risk_percentile_in_cohort": round(risk_percentile, 1),
             "stressor_count_percentile": round(stressor_percentile, 1),
             "revenue_percentile": round(revenue_percentile, 1),
-            "cohort_size": len(cohort_vehicles),
+            "cohort_size": cohort_size,
             "cohort_risk_mean": round(cohort_stats["risk_score_stats"]["mean"], 3),
             "vehicle_vs_cohort_risk": round(vehicle_risk - cohort_stats["risk_score_stats"]["mean"], 3)
         }
@@ -240,6 +334,18 @@ class CohortRelativeOutlierDetector:
         cohort_stats = {}
         for cohort_name, cohort_vehicles in cohorts.items():
             cohort_stats[cohort_name] = self.calculate_cohort_statistics(cohort_vehicles)
+        self.cohort_rankings = {}
+        
+        # Find best cohort match for each vehicle, then rank it within that cohort
+        best_cohorts = [self._find_best_cohort(vehicle, cohorts) for vehicle in vehicles]
+        if self.percentile_method == "searchsorted":
+            cohort_analyses = self.detect_outliers_sorted(vehicles, best_cohorts, cohorts, cohort_stats)
+        else:
+            cohort_analyses = [
+                self.detect_outliers_in_cohort(vehicle, cohorts[best_cohort], cohort_stats[best_cohort])
+                if best_cohort else {"outlier_status": "no_suitable_cohort"}
+                for vehicle, best_cohort in zip(vehicles, best_cohorts)
+            ]
         
         # Analyze each vehicle relative to its cohorts
         outlier_results = []
@@ -247,18 +353,7 @@ class CohortRelativeOutlierDetector:
         attention_worthy = 0
         unexpected_patterns = 0
         
-        for vehicle in vehicles:
-            vin = vehicle.get('vin', 'UNKNOWN')
-            
-            # Find best cohort match for this vehicle
-            best_cohort = self._find_best_cohort(vehicle, cohorts)
-            
-            if best_cohort:
-                cohort_analysis = self.detect_outliers_in_cohort(
-                    vehicle, cohorts[best_cohort], cohort_stats[best_cohort]
-                )
-            else:
-                cohort_analysis = {"outlier_status": "no_suitable_cohort"}
+        for vehicle, best_cohort, cohort_analysis in zip(vehicles, best_cohorts, cohort_analyses):
             
             # Check for unexpected patterns
             pattern_analysis = self.check_unexpected_stressor_combinations(vehicle)
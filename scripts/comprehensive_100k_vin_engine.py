@@ -7,18 +7,105 @@ Regions: Florida, Texas, Montana, California, Southeast
 Features: DTC integration, personalized messaging, lead volume optimization
 """
 
+import argparse
 import json
 import random
 import asyncio
 import logging
+import sys
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple, Optional
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple, Optional
 from collections import defaultdict
 import numpy as np
 
+# Project root on the path so the shared fleet generators can be imported as the src package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.services.synthetic_fleet import fleet_rng, sample_without_replacement, synthesize_vins
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Vehicles generated, aggregated and written per step; peak memory scales with this, not the fleet size
+DEFAULT_CHUNK_SIZE = 10_000
+
+# Lookup tables shared by the per-vehicle and vectorized generators
+VEHICLE_BASE_PRIORS = {"F-150": 0.15, "F-250": 0.18, "F-350": 0.20, "Explorer": 0.12, "Expedition": 0.16, "Ranger": 0.12}
+VEHICLE_BATTERY_COSTS = {"F-150": 280, "F-250": 320, "F-350": 350, "Explorer": 260, "Expedition": 300, "Ranger": 240}
+DTC_SEVERITY_MULTIPLIERS = {"low": 1.1, "medium": 1.3, "high": 1.5, "critical": 1.8}  # Battery-related DTCs only
+REGIONAL_MESSAGING_CONTEXT = {
+    "southeast": "humidity and temperature cycling stress",
+    "texas": "extreme heat and electrical system stress",
+    "california": "stop-and-go traffic patterns",
+    "florida": "tropical heat and salt corrosion stress",
+    "montana": "extreme cold weather stress"
+}
+
+@dataclass
+class RegionalRunningStats:
+    """Running aggregates of one region's vehicles, updated chunk by chunk instead of keeping every vehicle"""
+    vin_count: int = 0
+    risk_sum: float = 0.0
+    high_risk_count: int = 0
+    total_revenue: int = 0
+    high_priority_leads: int = 0
+    vehicles_with_dtcs: int = 0
+    vehicles_with_prognostics: int = 0
+    integrated_opportunities: int = 0
+    engagement_distribution: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    
+    def add_columns(self, columns: Dict[str, np.ndarray]) -> None:
+        """Fold one generate_vehicle_columns chunk into the aggregates"""
+        risk = columns['posterior_probability']
+        has_dtcs = columns['dtc_count'] > 0
+        has_prognostics = columns['prognostics'].any(axis=1)
+        
+        self.vin_count += len(risk)
+        self.risk_sum += float(risk.sum())
+        self.high_risk_count += int((risk > 0.6).sum())
+        self.total_revenue += int(columns['revenue_opportunity'].sum())
+        self.high_priority_leads += int(np.isin(columns['priority_level'], ['immediate', 'same_day']).sum())
+        self.vehicles_with_dtcs += int(has_dtcs.sum())
+        self.vehicles_with_prognostics += int(has_prognostics.sum())
+        self.integrated_opportunities += int((has_dtcs | has_prognostics).sum())
+        
+        engagement_types, counts = np.unique(columns['customer_engagement_type'], return_counts=True)
+        for engagement_type, count in zip(engagement_types.tolist(), counts.tolist()):
+            self.engagement_distribution[engagement_type] += count
+    
+    def regional_summary(self) -> Dict:
+        return {
+            "vin_count": self.vin_count,
+            "avg_risk": self.risk_sum / self.vin_count if self.vin_count else 0.0,
+            "high_risk_count": self.high_risk_count,
+            "total_revenue": self.total_revenue
+        }
+
+class StreamingResultsWriter:
+    """Writes the results JSON incrementally: the vehicles array chunk by chunk, then the aggregate sections"""
+    
+    def __init__(self, filename: str):
+        self.filename = filename
+        self.vehicle_count = 0
+        self._file = open(filename, 'w')
+        self._file.write('{\n  "vehicles": [')
+    
+    def write_chunk(self, vehicles: List[Dict]) -> None:
+        if not vehicles:
+            return
+        separator = "," if self.vehicle_count else ""
+        self._file.write(separator + "\n    " + ",\n    ".join(json.dumps(vehicle) for vehicle in vehicles))
+        self.vehicle_count += len(vehicles)
+    
+    def close(self, sections: Optional[Dict[str, Any]] = None) -> None:
+        """Close the vehicles array, append the remaining top-level sections and finish the file"""
+        self._file.write("\n  ]" if self.vehicle_count else "]")
+        for key, value in (sections or {}).items():
+            self._file.write(f",\n  {json.dumps(key)}: " + json.dumps(value, indent=2).replace("\n", "\n  "))
+        self._file.write("\n}\n")
+        self._file.close()
+
 class Comprehensive100kVINEngine:
     def __init__(self):
         """Initialize the comprehensive VIN engine"""
@@ -102,62 +189,233 @@ class Comprehensive100kVINEngine:
             "montana": {"max_daily_leads": 15, "target_conversion": 0.22},
         }
     
-    async def generate_100k_vins(self) -> Dict:
-        """Generate 100k VINs distributed across regions"""
-        logger.info("🎯 Starting 100k VIN generation across all regions")
+    async def generate_100k_vins(
+        self,
+        total_vins: int = 100_000,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        main_file: Optional[str] = None,
+        seed: Optional[int] = None
+    ) -> Dict:
+        """Generate VINs distributed across regions as a stream: each chunk is scored and folded into
+        running stats. With main_file the vehicles are written out chunk by chunk, so memory does not
+        grow with total_vins; without it they are returned under "vehicles" as before.
+        The same seed and chunk_size reproduce the same fleet"""
+        logger.info(f"🎯 Starting {total_vins:,} VIN generation across all regions")
+        
+        rng = fleet_rng(seed)
+        running_stats = {region: RegionalRunningStats() for region in self.regional_distribution}
+        writer = StreamingResultsWriter(main_file) if main_file else None
+        vehicles = [] if writer is None else None
+        sections = None
+        
+        try:
+            for region, percentage in self.regional_distribution.items():
+                vin_count = int(total_vins * percentage)
+                logger.info(f"📍 Generating {vin_count:,} VINs for {region.upper()}")
+            
+                for columns in self._generate_regional_vins(region, vin_count, chunk_size, rng):
+                    running_stats[region].add_columns(columns)
+                    records = self._vehicle_records(region, columns)
+                    if writer:
+                        writer.write_chunk(records)
+                    else:
+                        vehicles.extend(records)
+            
+            regional_stats = {region: stats.regional_summary() for region, stats in running_stats.items()}
+            total_count = sum(stats.vin_count for stats in running_stats.values())
+            logger.info(f"✅ Generated {total_count:,} total VINs")
+            
+            # Generate comprehensive analysis
+            analysis_result = await self._comprehensive_analysis(running_stats, regional_stats)
+            sections = {
+                "regional_stats": regional_stats,
+                "analysis": analysis_result,
+                "total_count": total_count
+            }
+        finally:
+            if writer:
+                writer.close(sections)
         
-        all_vehicles = []
-        regional_stats = {}
+        if writer is None:
+            return {"vehicles": vehicles, **sections}
         
-        for region, percentage in self.regional_distribution.items():
-            vin_count = int(100000 * percentage)
-            logger.info(f"📍 Generating {vin_count:,} VINs for {region.upper()}")
+        logger.info(f"📄 Streamed main results: {main_file}")
+        return {**sections, "main_file": main_file}
+        
+    def _generate_regional_vins(
+        self, region: str, count: int, chunk_size: int = DEFAULT_CHUNK_SIZE, rng: Optional[np.random.Generator] = None
+    ) -> Iterator[Dict[str, np.ndarray]]:
+        """Generate VINs for a specific region as generate_vehicle_columns chunks of at most chunk_size vehicles"""
+        rng = fleet_rng(rng)
+        
+        for start in range(0, count, chunk_size):
+            yield self.generate_vehicle_columns(region, min(chunk_size, count - start), rng, first_vehicle_id=start + 1)
+            logger.info(f"  ✅ {region}: {min(start + chunk_size, count):,} VINs generated")
             
-            regional_vehicles = await self._generate_regional_vins(region, vin_count)
-            all_vehicles.extend(regional_vehicles)
+    def generate_vehicle_columns(
+        self, region: str, count: int, rng: Optional[np.random.Generator] = None, first_vehicle_id: int = 1
+    ) -> Dict[str, np.ndarray]:
+        """
+        Vectorized _create_vehicle_record for a batch of one region's vehicles: one array per field,
+        with DTCs as (count, 3) indexes into common_dtcs (-1 padded) and prognostics as a
+        (count, len(prognostic_patterns)) mask. Draws come from rng, so a seeded Generator reproduces the batch.
+        """
+        rng = fleet_rng(rng)
+        n = count
             
-            regional_stats[region] = {
-                "vin_count": len(regional_vehicles),
-                "avg_risk": np.mean([v['posterior_probability'] for v in regional_vehicles]),
-                "high_risk_count": len([v for v in regional_vehicles if v['posterior_probability'] > 0.6]),
-                "total_revenue": sum(v['revenue_opportunity'] for v in regional_vehicles)
-            }
+        # Lookup tables indexed by each vehicle's draws
+        zips = self.regional_zips[region]
+        zip_codes = list(zips.keys())
+        models = np.array(list(VEHICLE_BASE_PRIORS))
+        base_priors = np.array(list(VEHICLE_BASE_PRIORS.values()))
+        battery_costs = np.array([VEHICLE_BATTERY_COSTS[model] for model in models])
+            
+        dtc_info = list(self.common_dtcs.values())
+        dtc_severity = np.array([info["severity"] for info in dtc_info])
+        dtc_multiplier = np.array([
+            DTC_SEVERITY_MULTIPLIERS.get(info["severity"], 1.0) if info["battery_related"] else 1.0 for info in dtc_info
+        ] + [1.0])  # Trailing 1.0 for the -1 padding
+        prognostic_probability = np.array([info["probability"] for info in self.prognostic_patterns.values()])
+        prognostic_cost = np.array([info["service_cost"] for info in self.prognostic_patterns.values()])
+        
+        # Vehicle draws
+        zip_index = rng.integers(0, len(zip_codes), n)
+        model_index = rng.integers(0, len(models), n)
+        year = rng.integers(2020, 2025, n)
+        mileage = rng.integers(25000, 75001, n)
+        vin = synthesize_vins(rng, n)
+    
+        # Base stressor risk (_calculate_stressor_risk)
+        regional_multiplier = np.array([zips[zip_code]["stressor_multiplier"] for zip_code in zip_codes])[zip_index]
+        age_factor = 1.0 + (2024 - year) * 0.1
+        mileage_factor = 1.0 + (mileage / 100000 * 0.3)
+        base_risk = np.minimum(base_priors[model_index] * (regional_multiplier * age_factor * mileage_factor), 0.85)
+        
+        # DTC codes (_generate_dtc_codes): 1-3 distinct codes for vehicles that draw below base_risk * 0.4
+        has_dtcs = rng.random(n) < base_risk * 0.4
+        dtc_count = np.where(has_dtcs, rng.choice([1, 2, 3], size=n, p=[0.7, 0.25, 0.05]), 0)
+        dtc_index = sample_without_replacement(rng, dtc_count, len(dtc_info), 3)
+        
+        # Prognostics (_generate_prognostics): each service independently
+        prognostics = rng.random((n, len(prognostic_probability))) < prognostic_probability
+        prognostic_count = prognostics.sum(axis=1)
         
-        logger.info(f"✅ Generated {len(all_vehicles):,} total VINs")
+        # Final risk (_integrate_dtc_prognostic_risk)
+        final_risk = base_risk * np.prod(dtc_multiplier[dtc_index], axis=1)
+        final_risk = np.minimum(np.where(prognostic_count > 2, final_risk * 1.2, final_risk), 0.90)
         
-        # Generate comprehensive analysis
-        analysis_result = await self._comprehensive_analysis(all_vehicles, regional_stats)
+        # Revenue (_calculate_comprehensive_revenue)
+        stressor_revenue = battery_costs[model_index] + 125
+        prognostic_revenue = prognostics @ prognostic_cost
+        dtc_revenue = dtc_count * 85
+        total_before_discount = stressor_revenue + prognostic_revenue + dtc_revenue
+        bundling_discount = np.select([prognostic_count > 1, prognostic_count > 0], [0.1, 0.05], 0.0)
+        
+        # Priority (_calculate_priority) and messaging (_generate_messaging_strategy)
+        selected_severity = np.where(dtc_index >= 0, dtc_severity[dtc_index], "")
+        has_critical = (selected_severity == "critical").any(axis=1)
+        has_high = (selected_severity == "high").any(axis=1)
+        priority_level = np.select(
+            [(final_risk > 0.7) | has_critical, (final_risk > 0.5) | has_high, (final_risk > 0.3) | (dtc_count > 0)],
+            ["immediate", "same_day", "next_day"], "this_week"
+        )
+        has_existing_issues = (dtc_count > 0) | (prognostic_count > 0)
         
         return {
-            "vehicles": all_vehicles,
-            "regional_stats": regional_stats,
-            "analysis": analysis_result,
-            "total_count": len(all_vehicles)
+            "vehicle_id": np.arange(first_vehicle_id, first_vehicle_id + n),
+            "vin": vin,
+            "model": models[model_index],
+            "year": year,
+            "mileage": mileage,
+            "zip_index": zip_index,
+            "base_stressor_risk": base_risk,
+            "dtc_index": dtc_index,
+            "dtc_count": dtc_count,
+            "prognostics": prognostics,
+            "posterior_probability": final_risk,
+            "urgency_level": np.select([final_risk > 0.6, final_risk > 0.4], ["high", "medium"], "low"),
+            "recommended_channel": np.select([final_risk > 0.7, final_risk > 0.4], ["phone", "text"], "email"),
+            "customer_engagement_type": np.where(has_existing_issues, "integrated_bundling", "proactive_stressor"),
+            "stressor_service": stressor_revenue,
+            "prognostic_services": prognostic_revenue,
+            "dtc_diagnostics": dtc_revenue,
+            "bundling_discount": (total_before_discount * bundling_discount).astype(np.int64),
+            "revenue_opportunity": (total_before_discount * (1 - bundling_discount)).astype(np.int64),
+            "priority_level": priority_level
         }
     
-    async def _generate_regional_vins(self, region: str, count: int) -> List[Dict]:
-        """Generate VINs for a specific region"""
-        regional_vehicles = []
-        regional_zips = list(self.regional_zips[region].keys())
-        
-        for i in range(count):
-            zip_code = random.choice(regional_zips)
-            zip_data = self.regional_zips[region][zip_code]
-            
-            vehicle = await self._create_vehicle_record(region, zip_code, zip_data, i + 1)
-            regional_vehicles.append(vehicle)
+    def _vehicle_records(self, region: str, columns: Dict[str, np.ndarray]) -> List[Dict]:
+        """Vehicle dicts in the _create_vehicle_record layout from a generate_vehicle_columns batch"""
+        zips = self.regional_zips[region]
+        zip_codes = list(zips.keys())
+        dtc_codes = list(self.common_dtcs.keys())
+        prognostic_services = list(self.prognostic_patterns.keys())
+        regional_context = REGIONAL_MESSAGING_CONTEXT[region]
+        
+        records = []
+        values = {name: column.tolist() for name, column in columns.items()}
+        for i in range(len(values["vin"])):
+            dtcs = [
+                {"code": dtc_codes[index], **self.common_dtcs[dtc_codes[index]]}
+                for index in values["dtc_index"][i] if index >= 0
+            ]
+            prognostics = [
+                {
+                    "service": service,
+                    "cost": self.prognostic_patterns[service]["service_cost"],
+                    "bundling_opportunity": self.prognostic_patterns[service]["bundling_opportunity"]
+                }
+                for service, active in zip(prognostic_services, values["prognostics"][i]) if active
+            ]
+            zip_code = zip_codes[values["zip_index"][i]]
+            engagement_type = values["customer_engagement_type"][i]
+            revenue_breakdown = {
+                "stressor_service": values["stressor_service"][i],
+                "prognostic_services": values["prognostic_services"][i],
+                "dtc_diagnostics": values["dtc_diagnostics"][i],
+                "bundling_discount": values["bundling_discount"][i],
+                "total": values["revenue_opportunity"][i]
+            }
             
-            if (i + 1) % 5000 == 0:
-                logger.info(f"  ✅ {region}: {i + 1:,} VINs generated")
-        
-        return regional_vehicles
+            records.append({
+                "vehicle_id": values["vehicle_id"][i],
+                "vin": values["vin"][i],
+                "model": values["model"][i],
+                "year": values["year"][i],
+                "mileage": values["mileage"][i],
+                "region": region,
+                "zip_code": zip_code,
+                "city": zips[zip_code]["city"],
+                "state": zips[zip_code]["state"],
+                "climate": zips[zip_code]["climate"],
+                "base_stressor_risk": values["base_stressor_risk"][i],
+                "active_dtcs": dtcs,
+                "active_prognostics": prognostics,
+                "posterior_probability": values["posterior_probability"][i],
+                "messaging_strategy": {
+                    "engagement_type": engagement_type,
+                    "primary_message": (
+                        "bundle_existing_services" if engagement_type == "integrated_bundling" else "proactive_prevention"
+                    ),
+                    "regional_context": regional_context,
+                    "urgency_level": values["urgency_level"][i],
+                    "customer_pain_points": self._identify_pain_points(dtcs, prognostics, region),
+                    "recommended_channel": values["recommended_channel"][i]
+                },
+                "revenue_opportunity": values["revenue_opportunity"][i],
+                "revenue_breakdown": revenue_breakdown,
+                "priority_level": values["priority_level"][i],
+                "customer_engagement_type": engagement_type
+            })
+        
+        return records
     
-    async def _create_vehicle_record(self, region: str, zip_code: str, zip_data: Dict, vehicle_id: int) -> Dict:
-        """Create comprehensive vehicle record with DTC and prognostics"""
+    def _create_vehicle_record(self, region: str, zip_code: str, zip_data: Dict, vehicle_id: int) -> Dict:
+        """Create comprehensive vehicle record with DTC and prognostics (one vehicle; see generate_vehicle_columns)"""
         
         # Generate VIN and basic vehicle info
         vin = self._generate_vin()
-        model = random.choice(["F-150", "F-250", "F-350", "Explorer", "Expedition", "Ranger"])
+        model = random.choice(list(VEHICLE_BASE_PRIORS))
         year = random.randint(2020, 2024)
         mileage = random.randint(25000, 75000)
         
@@ -217,8 +475,7 @@ class Comprehensive100kVINEngine:
     
     def _calculate_stressor_risk(self, region: str, zip_data: Dict, model: str, year: int, mileage: int) -> float:
         """Calculate base stressor risk"""
-        base_prior = {"F-150": 0.15, "F-250": 0.18, "F-350": 0.20, "Explorer": 0.12, 
-                     "Expedition": 0.16, "Ranger": 0.12}.get(model, 0.15)
+        base_prior = VEHICLE_BASE_PRIORS.get(model, 0.15)
         
         # Regional multiplier
         regional_multiplier = zip_data["stressor_multiplier"]
@@ -278,8 +535,7 @@ class Comprehensive100kVINEngine:
         # DTC impact
         for dtc in dtcs:
             if dtc["battery_related"]:
-                severity_multiplier = {"low": 1.1, "medium": 1.3, "high": 1.5, "critical": 1.8}
-                final_risk *= severity_multiplier.get(dtc["severity"], 1.0)
+                final_risk *= DTC_SEVERITY_MULTIPLIERS.get(dtc["severity"], 1.0)
         
         # Prognostic impact (deferred maintenance increases risk)
         if len(prognostics) > 2:  # Multiple deferred items
@@ -301,19 +557,10 @@ class Comprehensive100kVINEngine:
             engagement_type = "proactive_stressor"   # Pure stressor-based outreach
             primary_message = "proactive_prevention"
         
-        # Regional customization
-        regional_context = {
-            "southeast": "humidity and temperature cycling stress",
-            "texas": "extreme heat and electrical system stress", 
-            "california": "stop-and-go traffic patterns",
-            "florida": "tropical heat and salt corrosion stress",
-            "montana": "extreme cold weather stress"
-        }
-        
         return {
             "engagement_type": engagement_type,
             "primary_message": primary_message,
-            "regional_context": regional_context[region],
+            "regional_context": REGIONAL_MESSAGING_CONTEXT[region],
             "urgency_level": "high" if risk > 0.6 else "medium" if risk > 0.4 else "low",
             "customer_pain_points": self._identify_pain_points(dtcs, prognostics, region),
             "recommended_channel": "phone" if risk > 0.7 else "text" if risk > 0.4 else "email"
@@ -354,9 +601,7 @@ class Comprehensive100kVINEngine:
         """Calculate comprehensive revenue with bundling"""
         
         # Base battery service revenue
-        battery_costs = {"F-150": 280, "F-250": 320, "F-350": 350, "Explorer": 260, 
-                        "Expedition": 300, "Ranger": 240}
-        base_battery = battery_costs.get(model, 280)
+        base_battery = VEHICLE_BATTERY_COSTS.get(model, 280)
         
         stressor_revenue = base_battery + 125  # Parts + service
         
@@ -391,23 +636,23 @@ class Comprehensive100kVINEngine:
         else:
             return "this_week"
     
-    async def _comprehensive_analysis(self, vehicles: List[Dict], regional_stats: Dict) -> Dict:
-        """Generate comprehensive business analysis"""
+    async def _comprehensive_analysis(self, running_stats: Dict[str, RegionalRunningStats], regional_stats: Dict) -> Dict:
+        """Generate comprehensive business analysis from the per-region running stats"""
         
-        total_vehicles = len(vehicles)
-        total_revenue = sum(v['revenue_opportunity'] for v in vehicles)
+        total_vehicles = sum(stats.vin_count for stats in running_stats.values())
+        total_revenue = sum(stats.total_revenue for stats in running_stats.values())
         
         # Lead volume analysis by region
         lead_volume_analysis = {}
         for region in self.regional_distribution.keys():
-            regional_vehicles = [v for v in vehicles if v['region'] == region]
-            high_priority = len([v for v in regional_vehicles if v['priority_level'] in ['immediate', 'same_day']])
+            stats = running_stats[region]
+            high_priority = stats.high_priority_leads
             
             daily_leads = high_priority / 30  # Assume 30-day processing cycle
             threshold = self.regional_thresholds[region]["max_daily_leads"]
             
             lead_volume_analysis[region] = {
-                "total_vehicles": len(regional_vehicles),
+                "total_vehicles": stats.vin_count,
                 "high_priority_leads": high_priority,
                 "daily_lead_rate": daily_leads,
                 "capacity_threshold": threshold,
@@ -417,13 +662,14 @@ class Comprehensive100kVINEngine:
         
         # Engagement type distribution
         engagement_distribution = defaultdict(int)
-        for vehicle in vehicles:
-            engagement_distribution[vehicle['customer_engagement_type']] += 1
+        for stats in running_stats.values():
+            for engagement_type, count in stats.engagement_distribution.items():
+                engagement_distribution[engagement_type] += count
         
         # DTC integration analysis
-        vehicles_with_dtcs = len([v for v in vehicles if v['active_dtcs']])
-        vehicles_with_prognostics = len([v for v in vehicles if v['active_prognostics']])
-        integrated_opportunities = len([v for v in vehicles if v['active_dtcs'] or v['active_prognostics']])
+        vehicles_with_dtcs = sum(stats.vehicles_with_dtcs for stats in running_stats.values())
+        vehicles_with_prognostics = sum(stats.vehicles_with_prognostics for stats in running_stats.values())
+        integrated_opportunities = sum(stats.integrated_opportunities for stats in running_stats.values())
         
         return {
             "total_vehicles": total_vehicles,
@@ -476,15 +722,19 @@ class Comprehensive100kVINEngine:
         
         return recommendations
     
-    async def export_comprehensive_results(self, results: Dict, filename_base: str = "comprehensive_100k_analysis"):
-        """Export all results to files"""
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    async def export_comprehensive_results(
+        self, results: Dict, filename_base: str = "comprehensive_100k_analysis", timestamp: Optional[str] = None
+    ):
+        """Export all results to files (the main results are already on disk when generation streamed them)"""
+        timestamp = timestamp or datetime.now().strftime('%Y%m%d_%H%M%S')
         
         # Export main results
-        main_file = f"{filename_base}_{timestamp}.json"
-        with open(main_file, 'w') as f:
-            json.dump(results, f, indent=2)
-        logger.info(f"📄 Exported main results: {main_file}")
+        main_file = results.get("main_file")
+        if not main_file:
+            main_file = f"{filename_base}_{timestamp}.json"
+            with open(main_file, 'w') as f:
+                json.dump(results, f, indent=2)
+            logger.info(f"📄 Exported main results: {main_file}")
         
         # Export executive summary
         summary_file = f"{filename_base}_executive_summary_{timestamp}.txt"
@@ -573,17 +823,27 @@ class Comprehensive100kVINEngine:
 
 async def main():
     """Main execution"""
+    parser = argparse.ArgumentParser(description="Comprehensive multi-region VIN engine")
+    parser.add_argument("--vins", type=int, default=100_000, help="Fleet size to generate (e.g. 10000000 for load tests)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Vehicles generated and written per chunk")
+    parser.add_argument("--seed", type=int, help="Seed for a reproducible fleet (with the same --chunk-size)")
+    args = parser.parse_args()
+    
     engine = Comprehensive100kVINEngine()
     
-    logger.info("🚀 Starting Comprehensive 100k VIN Analysis")
+    logger.info(f"🚀 Starting Comprehensive {args.vins:,} VIN Analysis")
     logger.info("📍 Regions: Southeast, Texas, California, Florida, Montana")
     logger.info("🔧 Features: DTC integration, Prognostics, Lead management")
     
-    # Generate 100k VINs
-    results = await engine.generate_100k_vins()
+    # Generate VINs, streaming the main results file chunk by chunk
+    filename_base = "comprehensive_100k_analysis"
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    results = await engine.generate_100k_vins(
+        args.vins, args.chunk_size, main_file=f"{filename_base}_{timestamp}.json", seed=args.seed
+    )
     
     # Export comprehensive results
-    files = await engine.export_comprehensive_results(results)
+    files = await engine.export_comprehensive_results(results, filename_base, timestamp)
     
     logger.info("\n" + "="*60)
     logger.info("🎉 COMPREHENSIVE 100K VIN ANALYSIS COMPLETE!")
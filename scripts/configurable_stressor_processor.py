@@ -8,10 +8,16 @@ Perfect for gradual deployment or testing different combinations
 import json
 import asyncio
 import logging
+import sys
 from datetime import datetime
+from pathlib import Path
 from typing import Dict, List, Any, Set
 import numpy as np
 
+# Project root on the path so the shared VIN column store can be imported as the src package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.services.vin_column_store import VinColumnStore, is_column_store, latest_database
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -297,11 +303,21 @@ class ConfigurableStressorProcessor:
         self.enabled_stressors = {k: v for k, v in self.all_stressors.items() if v["enabled"]}
         logger.info(f"❌ Disabled {count} stressors in category: {category}")
     
+    def required_columns(self) -> List[str]:
+        """Vehicle fields the enabled stressors read, plus the identity fields every analysis reports"""
+        columns = ["vin", "model"]
+        for stressor_config in self.enabled_stressors.values():
+            columns.extend(req for req in stressor_config["data_requirements"] if req not in columns)
+        return columns
+    
     def load_vin_database(self, filename: str) -> List[Dict]:
-        """Load VIN database from JSON file"""
+        """Load VIN database from a column store (only the columns the stressors read) or a JSON file"""
         try:
-            with open(filename, 'r') as f:
-                leads = json.load(f)
+            if is_column_store(filename):
+                leads = VinColumnStore(filename).records(self.required_columns())
+            else:
+                with open(filename, 'r') as f:
+                    leads = json.load(f)
             logger.info(f"✅ Loaded {len(leads)} VINs from {filename}")
             return leads
         except Exception as e:
@@ -589,10 +605,8 @@ def interactive_configuration():
             print(f"✅ Configuration saved to {config_file}")
         
         elif choice == "7":
-            import glob
-            vin_files = glob.glob("vin_leads_database_*.json")
-            if vin_files:
-                latest_file = max(vin_files, key=lambda x: x.split('_')[-1])
+            latest_file = latest_database("vin_leads_database_")
+            if latest_file:
                 print(f"📄 Using VIN database: {latest_file}")
                 result = asyncio.run(processor.process_all_vins(latest_file))
                 print("✅ Processing complete!")
@@ -621,13 +635,11 @@ async def main():
         processor.print_stressor_status()
         
         # Find latest VIN database
-        import glob
-        vin_files = glob.glob("vin_leads_database_*.json")
-        if not vin_files:
+        latest_file = latest_database("vin_leads_database_")
+        if not latest_file:
             logger.error("❌ No VIN database files found")
             return
         
-        latest_file = max(vin_files, key=lambda x: x.split('_')[-1])
         logger.info(f"📄 Using VIN database: {latest_file}")
         
         # Process with current configuration
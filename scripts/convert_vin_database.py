@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+🗄️ VIN DATABASE CONVERTER 🗄️
+Converts JSON/CSV lead databases and stressor analysis files into the
+memory-mapped columnar VIN store read by the processors and outlier engine
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+# Project root on the path so the shared VIN column store can be imported as the src package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.services.vin_column_store import STORE_SUFFIX, VinColumnStore, convert_to_column_store
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def main():
+    """Main execution function"""
+    parser = argparse.ArgumentParser(description="Convert JSON/CSV VIN files into columnar VIN stores")
+    parser.add_argument("sources", nargs="+", help="vin_leads_database_*.json/.csv or *_analysis_*.json files")
+    parser.add_argument("--output", help=f"Store directory (single source only; default: source name with {STORE_SUFFIX})")
+    parser.add_argument("--overwrite", action="store_true", help="Replace stores that already exist")
+    args = parser.parse_args()
+    
+    if args.output and len(args.sources) > 1:
+        parser.error("--output needs exactly one source")
+    
+    for source in args.sources:
+        start_time = time.time()
+        try:
+            store_path = convert_to_column_store(source, args.output, overwrite=args.overwrite)
+        except (OSError, ValueError) as e:
+            logger.error(f"❌ Failed to convert {source}: {e}")
+            continue
+        
+        store = VinColumnStore(store_path)
+        logger.info(f"✅ {source} -> {store_path}: {len(store)} rows, {len(store.columns)} columns in {time.time() - start_time:.2f}s")
+
+if __name__ == "__main__":
+    main()
@@ -8,14 +8,26 @@ ALL 13 STRESSORS with EXACT LIKELIHOOD RATIOS from scientific research
 import json
 import asyncio
 import logging
+import sys
 from datetime import datetime
+from pathlib import Path
 from typing import Dict, List, Any
 import numpy as np
 
+# Project root on the path so the shared VIN column store can be imported as the src package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.services.vin_column_store import VinColumnStore, is_column_store, latest_database
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Vehicle fields the 13 stressor checks read (all a column store load needs)
+STRESSOR_INPUT_COLUMNS = [
+    "vin", "model", "soc_decline_rate", "start_cycles_annual", "temperature_stress", "vehicle_age",
+    "current_mileage", "short_trip_percentage", "climate_zone", "temperature_delta", "state"
+]
+
 class Enhanced13StressorProcessor:
     def __init__(self):
         """Initialize with COMPLETE 13-stressor framework"""
@@ -122,10 +134,13 @@ class Enhanced13StressorProcessor:
         logger.info(f"📊 Total stressors: {len(self.thirteen_stressors)}")
         
     def load_vin_database(self, filename: str) -> List[Dict]:
-        """Load VIN database from JSON file"""
+        """Load VIN database from a column store (only the columns the stressors read) or a JSON file"""
         try:
-            with open(filename, 'r') as f:
-                leads = json.load(f)
+            if is_column_store(filename):
+                leads = VinColumnStore(filename).records(STRESSOR_INPUT_COLUMNS)
+            else:
+                with open(filename, 'r') as f:
+                    leads = json.load(f)
             logger.info(f"✅ Loaded {len(leads)} VINs from {filename}")
             return leads
         except Exception as e:
@@ -423,13 +438,11 @@ async def main():
     processor = Enhanced13StressorProcessor()
     
     # Find the latest VIN database
-    import glob
-    vin_files = glob.glob("vin_leads_database_*.json")
-    if not vin_files:
+    latest_file = latest_database("vin_leads_database_")
+    if not latest_file:
         logger.error("❌ No VIN database files found")
         return
     
-    latest_file = max(vin_files, key=lambda x: x.split('_')[-1])
     logger.info(f"📄 Using VIN database: {latest_file}")
     
     # Process all VINs with 13-stressor framework
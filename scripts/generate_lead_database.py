@@ -5,12 +5,22 @@ Generates 5,000-10,000 realistic vehicle leads for Southeast region
 with Argonne-based stressor analysis and Bayesian risk scoring
 """
 
+import argparse
 import json
 import random
 import csv
+import sys
+import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 import math
+import numpy as np
+
+# Project root on the path so the shared VIN column store can be imported as the src package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.services.synthetic_fleet import MODEL_YEAR_CODES, columns_to_records, fleet_rng, synthesize_vins
+from src.services.vin_column_store import STORE_SUFFIX, write_column_store
 
 class LeadDatabaseGenerator:
     def __init__(self):
@@ -327,6 +337,16 @@ class LeadDatabaseGenerator:
         
         customer_name = f"{random.choice(first_names)} {random.choice(last_names)}"
         
+        # Telematics inputs for the cohort engine (VehicleInputData fields)
+        telematics = self.engine_inputs(
+            round(stressors["short_trip_percentage"], 2),
+            stressors["start_cycles_annual"],
+            round(stressors["temperature_stress"], 3),
+            mileage,
+            random.uniform(0.6, 1.0)
+        )
+        telematics = {name: value.item() for name, value in telematics.items()}
+        
         # Complete lead record
         lead_record = {
             # Identifiers
@@ -377,27 +397,201 @@ class LeadDatabaseGenerator:
             # Metadata
             "generated_date": datetime.now().isoformat(),
             "cohort_assignment": f"{vehicle_data['weight_class']}_{zip_data['climate']}",
-            "argonne_validated": True
+            "argonne_validated": True,
+            
+            # Cohort engine inputs
+            **telematics
         }
         
         return lead_record
     
-    def generate_database(self, num_leads: int = 5000) -> List[Dict]:
-        """Generate complete database of leads"""
+    @staticmethod
+    def engine_inputs(short_trip_percentage, start_cycles_annual, temperature_stress, mileage, maintenance_compliance) -> Dict[str, np.ndarray]:
+        """
+        Synthetic telematics for the cohort engine (VehicleInputData fields), derived from the
+        lead's stressors; takes and returns scalars as 0-d arrays or whole columns. Short trips
+        never let the alternator recharge the battery (6-mile rule), so they stand in for both
+        the 30-day SOC decline and odometer irregularity.
+        """
+        short_trips = np.asarray(short_trip_percentage, dtype=float)
+        mileage = np.asarray(mileage)
+        return {
+            "soc_30day_trend": np.round(-short_trips * 0.25, 3),
+            "trip_cycles_weekly": np.minimum(np.rint(np.asarray(start_cycles_annual) / 52), 200).astype(np.int64),
+            "odometer_variance": short_trips,
+            "climate_stress_index": np.minimum(np.maximum(np.asarray(temperature_stress, dtype=float), 0.0), 1.0),
+            "maintenance_compliance": np.round(maintenance_compliance, 3),
+            "powertrain": np.full(mileage.shape, "Gas"),
+            "region": np.full(mileage.shape, "Southeast"),
+            "mileage_band": np.select([mileage < 35000, mileage < 50000], ["LOW", "MEDIUM"], "HIGH")
+        }
+    
+    def generate_lead_columns(self, num_leads: int, seed: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Vectorized generate_lead_record for a whole database: one column per lead field (same names
+        and order), drawn from a numpy Generator so the same seed reproduces the same leads
+        """
+        rng = fleet_rng(seed)
+        n = num_leads
+        
+        # Lookup tables: per-ZIP and per-model values indexed by each lead's draw
+        zip_codes = list(self.southeast_zips.keys())
+        zips = [self.southeast_zips[zip_code] for zip_code in zip_codes]
+        temp_winter = np.array([z["temp_winter"] for z in zips])
+        temp_summer = np.array([z["temp_summer"] for z in zips])
+        temp_stress_by_zip = np.array([
+            (40 - z["temp_winter"]) * 0.05 * (z["temp_winter"] < 40) + (z["temp_summer"] - 85) * 0.03 * (z["temp_summer"] > 85)
+            for z in zips
+        ])
+        climate_multiplier = {
+            "coastal_hot": 1.4, "inland_hot": 1.3, "coastal_moderate": 1.1, "inland_moderate": 1.0, "mountain_cool": 0.8
+        }
+        env_by_zip = np.array([climate_multiplier.get(z["climate"], 1.0) for z in zips])
+        
+        categories = list(self.vehicle_models.keys())
+        models = [info for category in categories for info in self.vehicle_models[category]]
+        per_category = len(self.vehicle_models[categories[0]])
+        model_names = np.array([info["model"] for info in models])
+        base_prior_by_model = np.array([info["base_prior"] for info in models])
+        wmi_codes = {"Explorer": "1FM", "Expedition": "1FM"}
+        parts_by_model = {
+            "F-150": 280, "F-250": 320, "F-350": 350, "Ranger": 240, "Explorer": 260, "Expedition": 300
+        }
+        battery_by_model = np.array([parts_by_model.get(info["model"], 280) for info in models])
+        
+        # Geography, vehicle and mileage draws
+        zip_index = rng.integers(0, len(zip_codes), n)
+        model_index = rng.integers(0, len(categories), n) * per_category + rng.integers(0, per_category, n)
+        year = rng.integers(2020, 2024, n)  # 1-4 years old
+        age = 2024 - year
+        mileage = rng.integers(30000, 50001, n)
+        vin = synthesize_vins(
+            rng, n,
+            wmi=[wmi_codes.get(info["model"], "1FT") for info in models], wmi_index=model_index,
+            year_codes=[MODEL_YEAR_CODES[y] for y in range(2020, 2024)], year_index=year - 2020
+        )
+        
+        # Stressor deviations (calculate_stressor_deviations)
+        annual_miles = mileage / age
+        unit = rng.random(n)
+        start_cycle_multiplier = np.select(
+            [annual_miles > 15000, annual_miles < 8000],
+            [1.8 + 0.2 + unit * 0.6, 2.2 + 0.3 + unit * 0.7],
+            1.0 + 0.1 + unit * 0.3
+        )
+        start_cycles_annual = (1200 * start_cycle_multiplier).astype(np.int64)
+        temperature_stress = temp_stress_by_zip[zip_index]
+        unit = rng.random(n)
+        short_trip_percentage = np.where(annual_miles < 10000, 0.4 + unit * 0.4, 0.1 + unit * 0.2)
+        
+        # Bayesian risk (calculate_bayesian_risk)
+        base_prior = base_prior_by_model[model_index]
+        usage_multiplier = np.where(start_cycle_multiplier > 2.0, 1.5, 1.0) * np.where(short_trip_percentage > 0.5, 1.3, 1.0)
+        adjusted_prior = np.minimum(base_prior * env_by_zip[zip_index] * usage_multiplier, 0.25)
+        lr_values = [
+            self.argonne_constants["lr_temperature_cycling"], self.argonne_constants["lr_ignition_frequency"],
+            self.argonne_constants["lr_short_trips"], self.argonne_constants["lr_soc_decline"]
+        ]
+        lr_active = np.column_stack([
+            temperature_stress > 0.2, start_cycle_multiplier > 1.5, short_trip_percentage > 0.4, age > 3
+        ])
+        combined_lr = np.prod(np.where(lr_active, lr_values, 1.0), axis=1)
+        numerator = adjusted_prior * combined_lr
+        posterior = numerator / (numerator + (1 - adjusted_prior))
+        
+        # Only 16 active-LR combinations exist; index a list per combination instead of building one per lead
+        combination = lr_active @ (1 << np.arange(len(lr_values)))
+        lr_lists = [[lr for bit, lr in enumerate(lr_values) if code >> bit & 1] for code in range(1 << len(lr_values))]
+        active_lrs = [list(lr_lists[code]) for code in combination.tolist()]
+        
+        # calculate_percentile: inclusive ranges by uncapped posterior
+        band = np.searchsorted([0.1, 0.3, 0.5], posterior, side="right")
+        band_low, band_high = np.array([5, 25, 50, 75]), np.array([25, 50, 75, 95])
+        risk_percentile = band_low[band] + (rng.random(n) * (band_high[band] - band_low[band] + 1)).astype(np.int64)
+        urgency_score = np.minimum((posterior * 100).astype(np.int64), 95)
+        posterior_capped = np.minimum(posterior, 0.85)
+        
+        # Revenue opportunity (calculate_revenue_opportunity) on the capped posterior
+        high, medium = posterior_capped > 0.6, posterior_capped > 0.4
+        battery = battery_by_model[model_index]
+        parts_cost = np.select([high, medium], [battery, battery // 2], 0)
+        service_cost = np.where(high, 125, 85)
+        
+        first_names = np.array(["James", "Mary", "John", "Patricia", "Robert", "Jennifer", "Michael", "Linda", "William", "Elizabeth"])
+        last_names = np.array(["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez", "Martinez"])
+        customer_name = np.char.add(np.char.add(first_names[rng.integers(0, len(first_names), n)], " "),
+                                    last_names[rng.integers(0, len(last_names), n)])
+        
+        def by_zip(field: str) -> np.ndarray:
+            return np.array([z[field] for z in zips])[zip_index]
+        
+        weight_class = np.array([info["weight_class"] for info in models])[model_index]
+        climate = by_zip("climate")
+        telematics = self.engine_inputs(
+            np.round(short_trip_percentage, 2),
+            start_cycles_annual,
+            np.round(temperature_stress, 3),
+            mileage,
+            rng.uniform(0.6, 1.0, n)
+        )
+        
+        return {
+            "lead_id": np.arange(1, n + 1),
+            "vin": vin,
+            "customer_name": customer_name,
+            "year": year,
+            "make": np.full(n, "Ford"),
+            "model": model_names[model_index],
+            "vehicle_type": weight_class,
+            "current_mileage": mileage,
+            "vehicle_age": age,
+            "zip_code": np.array(zip_codes)[zip_index],
+            "city": by_zip("city"),
+            "state": by_zip("state"),
+            "climate_zone": climate,
+            "temp_winter": temp_winter[zip_index],
+            "temp_summer": temp_summer[zip_index],
+            "temperature_delta": (temp_summer - temp_winter)[zip_index],
+            "start_cycles_annual": start_cycles_annual,
+            "start_cycle_deviation": np.round(start_cycle_multiplier, 2),
+            "temperature_stress": np.round(temperature_stress, 3),
+            "short_trip_percentage": np.round(short_trip_percentage, 2),
+            "estimated_cold_starts": (start_cycles_annual * 0.3).astype(np.int64),
+            "base_prior": np.round(base_prior, 3),
+            "adjusted_prior": np.round(adjusted_prior, 3),
+            "active_lrs": active_lrs,
+            "combined_lr": np.round(combined_lr, 2),
+            "posterior_probability": np.round(posterior_capped, 3),
+            "risk_percentile": risk_percentile,
+            "urgency_score": urgency_score,
+            "primary_service": np.select([high, medium], ["battery_replacement", "battery_check"], "routine_inspection"),
+            "parts_cost": parts_cost,
+            "service_cost": service_cost,
+            "total_opportunity": parts_cost + service_cost,
+            "contact_urgency": np.select([high, medium], ["immediate", "24_hours"], "48_hours"),
+            "generated_date": np.full(n, datetime.now().isoformat()),
+            "cohort_assignment": np.char.add(np.char.add(weight_class, "_"), climate),
+            "argonne_validated": np.ones(n, dtype=bool),
+            **telematics
+        }
+    
+    def generate_database(self, num_leads: int = 5000, seed: Optional[int] = None) -> List[Dict]:
+        """Generate complete database of leads (vectorized; the same seed reproduces the same leads)"""
         print(f"🚀 Generating {num_leads} lead records for Southeast region...")
         print("📊 Target criteria: Light/midweight trucks, 30-50k miles, 2+ std dev stressors")
         
-        leads = []
-        for i in range(1, num_leads + 1):
-            if i % 500 == 0:
-                print(f"  ✅ Generated {i} leads...")
-            
-            lead = self.generate_lead_record(i)
-            leads.append(lead)
+        leads = columns_to_records(self.generate_lead_columns(num_leads, seed))
         
         print(f"✨ Database generation complete: {len(leads)} leads")
         return leads
     
+    def export_column_store(self, columns: Dict[str, Any], base_filename: str = "vin_leads_database") -> str:
+        """Write generate_lead_columns output straight to a column store (no JSON/CSV, for benchmark fleets)"""
+        store_path = f"{base_filename}_{datetime.now().strftime('%Y%m%d_%H%M%S')}{STORE_SUFFIX}"
+        write_column_store(store_path, columns)
+        print(f"🗄️ Exported to column store: {store_path}")
+        return store_path
+    
     def export_to_files(self, leads: List[Dict], base_filename: str = "vin_leads_database"):
         """Export database to multiple formats"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -418,6 +612,11 @@ class LeadDatabaseGenerator:
                 writer.writerows(leads)
         print(f"📊 Exported to CSV: {csv_filename}")
         
+        # Export to the columnar VIN store (memory-mapped by the stressor processors)
+        store_path = f"{base_filename}_{timestamp}{STORE_SUFFIX}"
+        write_column_store(store_path, leads)
+        print(f"🗄️ Exported to column store: {store_path}")
+        
         # Generate summary report
         self.generate_summary_report(leads, f"{base_filename}_summary_{timestamp}.txt")
     
@@ -495,22 +694,35 @@ class LeadDatabaseGenerator:
 
 def main():
     """Main execution function"""
+    parser = argparse.ArgumentParser(description="VIN stressors lead database generator")
+    parser.add_argument("--leads", "--count", dest="leads", type=int, default=5000, help="Number of leads to generate")
+    parser.add_argument("--seed", type=int, help="Seed for a reproducible database")
+    parser.add_argument("--columnar", action="store_true", help="Write only the column store (benchmark and load-test fleets)")
+    args = parser.parse_args()
+    
     generator = LeadDatabaseGenerator()
     
-    # Generate 5,000 leads (can adjust to 10,000)
-    num_leads = 5000
+    num_leads = args.leads
     print("🔥 VIN STRESSORS LEAD DATABASE GENERATOR")
     print("=" * 50)
     print(f"Target: {num_leads} Southeast leads with 2+ standard deviation stressors")
     print("Based on Argonne ANL-115925.pdf methodology\n")
     
-    leads = generator.generate_database(num_leads)
+    if args.columnar:
+        start_time = time.time()
+        columns = generator.generate_lead_columns(num_leads, args.seed)
+        print(f"✨ Generated {num_leads:,} leads in {time.time() - start_time:.2f}s")
+        generator.export_column_store(columns)
+        return
+    
+    leads = generator.generate_database(num_leads, args.seed)
     generator.export_to_files(leads)
     
     print("\n🎯 DATABASE GENERATION COMPLETE!")
     print("Files generated:")
     print("  📄 JSON database file (full data)")
     print("  📊 CSV database file (spreadsheet format)") 
+    print("  🗄️ Columnar VIN store (fast loading)")
     print("  📋 Summary analysis report")
     print("\n✨ Ready for enterprise-scale demos!")
 
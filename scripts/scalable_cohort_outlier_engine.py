@@ -9,18 +9,31 @@ the WORST of the salt corrosions is."
 Focus: Top 5-10% outliers within each cohort
 """
 
+import argparse
 import json
 import numpy as np
 import pandas as pd
 import logging
+import sys
 from datetime import datetime
-from typing import Dict, List, Any, Tuple
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
 from collections import defaultdict
 import time
 
+# Project root on the path so the shared VIN column store can be imported as the src package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.services.vin_column_store import VinColumnStore, is_column_store, latest_database
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Analysis fields the cohort stages read (all a column store load needs when the full export is skipped)
+ANALYSIS_COLUMNS = [
+    "vin", "model", "state", "climate_zone", "vehicle_age", "posterior_probability",
+    "stressor_count", "revenue_opportunity", "active_stressors", "severity"
+]
+
 class ScalableCohortOutlierEngine:
     def __init__(self):
         """Initialize high-performance outlier detection engine"""
@@ -60,19 +73,31 @@ class ScalableCohortOutlierEngine:
         logger.info("⚡ Scalable Cohort Outlier Engine initialized")
         logger.info("🎯 Target: Top 5-10% outliers within cohorts at scale")
     
-    def load_and_preprocess(self, filename: str) -> pd.DataFrame:
-        """Load and preprocess data for high-performance analysis"""
+    def load_and_preprocess(self, filename: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Load and preprocess data for high-performance analysis (store columns: all unless given)"""
         
         start_time = time.time()
         
-        # Load JSON data
-        with open(filename, 'r') as f:
-            data = json.load(f)
+        if is_column_store(filename):
+            # Memory-mapped columns; every field by default, like the JSON path, so the full export keeps them
+            df = self.prepare_frame(VinColumnStore(filename).to_frame(columns))
+        else:
+            # Load JSON data
+            with open(filename, 'r') as f:
+                data = json.load(f)
+        
+            vehicles = data.get('vehicle_analyses', [])
         
-        vehicles = data.get('vehicle_analyses', [])
+            # Convert to pandas for vectorized operations
+            df = self.prepare_frame(pd.DataFrame(vehicles))
         
-        # Convert to pandas for vectorized operations
-        df = pd.DataFrame(vehicles)
+        load_time = time.time() - start_time
+        logger.info(f"✅ Loaded and preprocessed {len(df)} vehicles in {load_time:.2f}s")
+        
+        return df
+    
+    def prepare_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Add cohort key columns and coerce the scored columns to numbers"""
         
         # Add derived columns for cohort creation
         df['cohort_primary'] = df['state'].astype(str) + '_' + df['model'].astype(str)
@@ -85,9 +110,6 @@ class ScalableCohortOutlierEngine:
         df['stressor_count'] = pd.to_numeric(df['stressor_count'], errors='coerce')
         df['revenue_opportunity'] = pd.to_numeric(df['revenue_opportunity'], errors='coerce')
         
-        load_time = time.time() - start_time
-        logger.info(f"✅ Loaded and preprocessed {len(df)} vehicles in {load_time:.2f}s")
-        
         return df
     
     def assign_cohorts(self, df: pd.DataFrame) -> pd.DataFrame:
@@ -95,27 +117,20 @@ class ScalableCohortOutlierEngine:
         
         start_time = time.time()
         
-        # Count cohort sizes for each level
-        cohort_counts = {}
-        for level in self.cohort_hierarchy.keys():
-            cohort_col = f'cohort_{level}'
-            cohort_counts[level] = df[cohort_col].value_counts()
-        
-        # Assign best cohort for each vehicle
-        def find_best_cohort(row):
-            for level in ['primary', 'secondary', 'tertiary', 'fallback']:
-                cohort_key = row[f'cohort_{level}']
-                min_size = self.min_cohort_sizes[level]
-                
-                if cohort_counts[level].get(cohort_key, 0) >= min_size:
-                    return cohort_key, level
-            
-            return 'insufficient_data', 'none'
-        
-        # Apply cohort assignment vectorized
-        cohort_assignments = df.apply(find_best_cohort, axis=1)
-        df['assigned_cohort'] = [x[0] for x in cohort_assignments]
-        df['cohort_level'] = [x[1] for x in cohort_assignments]
+        # Per level: does the vehicle's cohort at that level meet the minimum size?
+        levels = ['primary', 'secondary', 'tertiary', 'fallback']
+        size_ok = []
+        cohort_keys = []
+        for level in levels:
+            cohort_col = df[f'cohort_{level}']
+            codes, _ = pd.factorize(cohort_col)
+            cohort_size = np.bincount(codes)[codes]
+            size_ok.append(cohort_size >= self.min_cohort_sizes[level])
+            cohort_keys.append(cohort_col.to_numpy(dtype=object))
+        
+        # First level (most specific) whose cohort is large enough wins
+        df['assigned_cohort'] = np.select(size_ok, cohort_keys, default='insufficient_data')
+        df['cohort_level'] = np.select(size_ok, levels, default='none')
         
         # Filter out vehicles without valid cohorts
         valid_df = df[df['cohort_level'] != 'none'].copy()
@@ -136,40 +151,30 @@ class ScalableCohortOutlierEngine:
         
         start_time = time.time()
         
-        def calculate_percentiles(group):
-            """Calculate percentile scores within each cohort"""
-            
-            # Risk score percentiles
-            group['risk_percentile'] = group['posterior_probability'].rank(pct=True) * 100
+        cohorts = df.groupby('assigned_cohort', sort=False)
             
-            # Stressor count percentiles  
-            group['stressor_percentile'] = group['stressor_count'].rank(pct=True) * 100
+        # Percentiles within each cohort (risk, stressor count, revenue)
+        df['risk_percentile'] = cohorts['posterior_probability'].rank(pct=True) * 100
+        df['stressor_percentile'] = cohorts['stressor_count'].rank(pct=True) * 100
+        df['revenue_percentile'] = cohorts['revenue_opportunity'].rank(pct=True) * 100
             
-            # Revenue percentiles
-            group['revenue_percentile'] = group['revenue_opportunity'].rank(pct=True) * 100
+        # Combined outlier score (weighted average)
+        df['outlier_score'] = (
+            df['risk_percentile'] * 0.5 +
+            df['stressor_percentile'] * 0.3 +
+            df['revenue_percentile'] * 0.2
+        )
             
-            # Combined outlier score (weighted average)
-            group['outlier_score'] = (
-                group['risk_percentile'] * 0.5 +
-                group['stressor_percentile'] * 0.3 +
-                group['revenue_percentile'] * 0.2
-            )
-            
-            # Cohort statistics for context
-            group['cohort_size'] = len(group)
-            group['cohort_risk_mean'] = group['posterior_probability'].mean()
-            group['cohort_risk_std'] = group['posterior_probability'].std()
-            group['risk_vs_cohort'] = group['posterior_probability'] - group['cohort_risk_mean']
-            
-            return group
-        
-        # Apply calculations by cohort (vectorized)
-        df_with_percentiles = df.groupby('assigned_cohort').apply(calculate_percentiles)
+        # Cohort statistics for context, broadcast back to every vehicle
+        df['cohort_size'] = cohorts['posterior_probability'].transform('size')
+        df['cohort_risk_mean'] = cohorts['posterior_probability'].transform('mean')
+        df['cohort_risk_std'] = cohorts['posterior_probability'].transform('std')
+        df['risk_vs_cohort'] = df['posterior_probability'] - df['cohort_risk_mean']
         
         calculation_time = time.time() - start_time
         logger.info(f"⚡ Calculated outlier scores in {calculation_time:.2f}s")
         
-        return df_with_percentiles
+        return df
     
     def classify_outliers(self, df: pd.DataFrame) -> pd.DataFrame:
         """Classify outliers based on cohort-relative percentiles"""
@@ -202,29 +207,35 @@ class ScalableCohortOutlierEngine:
         df['priority'] = df['outlier_classification'].map(priority_map)
         
         # Generate reasoning
-        df['outlier_reasoning'] = df.apply(self._generate_reasoning, axis=1)
+        df['outlier_reasoning'] = self._generate_reasoning(df)
         
         classification_time = time.time() - start_time
         logger.info(f"🎯 Classified outliers in {classification_time:.2f}s")
         
         return df
     
-    def _generate_reasoning(self, row) -> str:
-        """Generate human-readable reasoning for outlier classification"""
-        
-        classification = row['outlier_classification']
-        risk_pct = row['risk_percentile']
-        stressor_pct = row['stressor_percentile']
-        cohort = row['assigned_cohort']
-        
-        if classification == 'severe_outlier':
-            return f"Top {100-risk_pct:.0f}% risk + top {100-stressor_pct:.0f}% stressor count in {cohort} cohort"
-        elif classification == 'high_outlier':
-            return f"Top {100-risk_pct:.0f}% risk in {cohort} cohort" 
-        elif classification == 'moderate_outlier':
-            return f"Above average risk in {cohort} cohort"
-        else:
-            return f"Normal variation within {cohort} cohort"
+    def _generate_reasoning(self, df: pd.DataFrame) -> pd.Series:
+        """Generate human-readable reasoning for outlier classification (one string per vehicle)"""
+        
+        classification = df['outlier_classification']
+        top_risk = (100 - df['risk_percentile']).round().astype('Int64').astype(str)
+        top_stressor = (100 - df['stressor_percentile']).round().astype('Int64').astype(str)
+        cohort = df['assigned_cohort'].astype(str)
+        
+        reasoning = np.select(
+            [
+                classification == 'severe_outlier',
+                classification == 'high_outlier',
+                classification == 'moderate_outlier'
+            ],
+            [
+                "Top " + top_risk + "% risk + top " + top_stressor + "% stressor count in " + cohort + " cohort",
+                "Top " + top_risk + "% risk in " + cohort + " cohort",
+                "Above average risk in " + cohort + " cohort"
+            ],
+            default="Normal variation within " + cohort + " cohort"
+        )
+        return pd.Series(reasoning, index=df.index)
     
     def detect_unexpected_patterns(self, df: pd.DataFrame) -> pd.DataFrame:
         """Detect unexpected stressor patterns at scale"""
@@ -310,14 +321,19 @@ class ScalableCohortOutlierEngine:
         
         return actionable_df, summary
     
-    def process_vehicles(self, filename: str) -> Dict[str, Any]:
-        """Main processing pipeline for scalable outlier detection"""
+    def process_vehicles(self, filename: str, full_export: bool = True) -> Dict[str, Any]:
+        """
+        Main processing pipeline for scalable outlier detection
+        
+        full_export=False writes only the dealer alerts; a column store then
+        maps just ANALYSIS_COLUMNS instead of every field.
+        """
         
         total_start = time.time()
         logger.info("🚀 STARTING SCALABLE COHORT OUTLIER ANALYSIS")
         
         # Step 1: Load and preprocess
-        df = self.load_and_preprocess(filename)
+        df = self.load_and_preprocess(filename, None if full_export else ANALYSIS_COLUMNS)
         
         # Step 2: Assign cohorts
         df_with_cohorts = self.assign_cohorts(df)
@@ -338,8 +354,10 @@ class ScalableCohortOutlierEngine:
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         
         # Full analysis results
-        full_output_file = f"scalable_cohort_analysis_{timestamp}.json"
-        df_with_patterns.to_json(full_output_file, orient='records', indent=2)
+        full_output_file = None
+        if full_export:
+            full_output_file = f"scalable_cohort_analysis_{timestamp}.json"
+            df_with_patterns.to_json(full_output_file, orient='records', indent=2)
         
         # Actionable alerts only (for dealers)
         actionable_output_file = f"actionable_alerts_{timestamp}.json"
@@ -349,7 +367,7 @@ class ScalableCohortOutlierEngine:
         }
         
         with open(actionable_output_file, 'w') as f:
-            json.dump(actionable_data, f, indent=2)
+            json.dump(actionable_data, f, indent=2, default=list)  # stressor_set, as to_json writes it
         
         total_time = time.time() - total_start
         
@@ -358,7 +376,8 @@ class ScalableCohortOutlierEngine:
         logger.info(f"📊 Processed: {len(df)} vehicles")
         logger.info(f"🔥 Actionable alerts: {len(actionable_df)} ({summary['actionable_percentage']}%)")
         logger.info(f"💰 Actionable revenue: ${summary['total_actionable_revenue']:,}")
-        logger.info(f"📄 Full results: {full_output_file}")
+        if full_output_file:
+            logger.info(f"📄 Full results: {full_output_file}")
         logger.info(f"🎯 Dealer alerts: {actionable_output_file}")
         
         return {
@@ -369,22 +388,72 @@ class ScalableCohortOutlierEngine:
             "success": True
         }
 
+    def benchmark(self, sizes: Tuple[int, ...] = (100_000, 1_000_000), seed: int = 42) -> Dict[int, Dict[str, float]]:
+        """Time cohort assignment, outlier scoring and classification on synthetic fleets of each size"""
+        
+        rng = np.random.default_rng(seed)
+        states = np.array(["FL", "TX", "CA", "MI", "OH", "AZ", "NY", "WA", "MN", "GA"] +
+                          [f"S{i:02d}" for i in range(40)])
+        models = np.array(["F150", "Explorer", "Escape", "Edge", "Expedition", "Ranger", "Bronco", "Mustang"])
+        climates = np.array(["hot_humid", "hot_dry", "cold", "coastal", "temperate", "mountain"])
+        
+        timings = {}
+        for size in sizes:
+            df = self.prepare_frame(pd.DataFrame({
+                "state": states[rng.integers(0, len(states), size)],
+                "model": models[rng.integers(0, len(models), size)],
+                "climate_zone": climates[rng.integers(0, len(climates), size)],
+                "posterior_probability": rng.beta(2, 12, size),
+                "stressor_count": rng.integers(0, 9, size),
+                "revenue_opportunity": rng.choice([0, 150, 300, 600, 1200], size)
+            }))
+            
+            stage_start = time.perf_counter()
+            df = self.assign_cohorts(df)
+            assign_time = time.perf_counter() - stage_start
+            
+            stage_start = time.perf_counter()
+            df = self.calculate_outlier_scores(df)
+            score_time = time.perf_counter() - stage_start
+            
+            stage_start = time.perf_counter()
+            self.classify_outliers(df)
+            classify_time = time.perf_counter() - stage_start
+            
+            timings[size] = {
+                "assign_cohorts_s": round(assign_time, 3),
+                "calculate_outlier_scores_s": round(score_time, 3),
+                "classify_outliers_s": round(classify_time, 3),
+                "vehicles_per_second": int(size / (assign_time + score_time + classify_time))
+            }
+            logger.info(f"⏱️ {size:,} vehicles: {timings[size]}")
+        
+        return timings
+
 async def main():
     """Main execution function"""
+    parser = argparse.ArgumentParser(description="Scalable Cohort Outlier Engine")
+    parser.add_argument("--benchmark", action="store_true", help="Time the cohort stages on synthetic fleets instead of analyzing a file")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000], help="Fleet sizes for --benchmark")
+    parser.add_argument("--alerts-only", action="store_true", help="Write only the dealer alerts, reading just the analysis columns")
+    args = parser.parse_args()
+    
     engine = ScalableCohortOutlierEngine()
     
+    if args.benchmark:
+        engine.benchmark(tuple(args.sizes))
+        return
+    
     # Find latest analysis file
-    import glob
-    analysis_files = glob.glob("enhanced_13_stressor_analysis_*.json")
-    if not analysis_files:
+    latest_file = latest_database("enhanced_13_stressor_analysis_")
+    if not latest_file:
         logger.error("❌ No analysis files found. Run enhanced processor first.")
         return
     
-    latest_file = max(analysis_files, key=lambda x: x.split('_')[-1])
     logger.info(f"📄 Using analysis file: {latest_file}")
     
     # Process vehicles
-    result = engine.process_vehicles(latest_file)
+    result = engine.process_vehicles(latest_file, full_export=not args.alerts_only)
     
     if result["success"]:
         logger.info("✅ SCALABLE OUTLIER DETECTION COMPLETE")
@@ -2,6 +2,14 @@
 """
 🚀 SCALABLE VIN PROCESSOR
 Handles 100k+ VINs with VIN consistency and cohort-relative outlier detection
+
+With --backend process-pool each lead is scored by the cohort engine exactly as
+the API would score the same vehicle. Lead fields map one-to-one onto
+VehicleInputData, and a lead missing any of them is rejected:
+  vin, soc_30day_trend, trip_cycles_weekly, odometer_variance,
+  climate_stress_index, maintenance_compliance -> same-named inputs
+  model, powertrain, region, mileage_band      -> cohort_assignment
+generate_lead_database.py writes these fields on every lead.
 """
 
 import json
@@ -12,15 +20,28 @@ from typing import Dict, List
 import numpy as np
 from collections import defaultdict
 import argparse
+import sys
+from pathlib import Path
+
+# Project root on the path so the scoring engine can be imported as the src package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Lead fields read by lead_to_vehicle_input (see the module docstring)
+TELEMATICS_FIELDS = (
+    "soc_30day_trend", "trip_cycles_weekly", "odometer_variance", "climate_stress_index", "maintenance_compliance"
+)
+COHORT_FIELDS = ("model", "powertrain", "region", "mileage_band")
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class ScalableVINProcessor:
-    def __init__(self, batch_size: int = 1000):
+    def __init__(self, batch_size: int = 1000, backend: str = "subprocess", workers: int = None):
         """Initialize scalable processor"""
         self.batch_size = batch_size
-        logger.info(f"🚀 Scalable VIN Processor initialized (batch size: {batch_size})")
+        self.backend = backend  # "subprocess" (13-stressor script) or "process-pool" (cohort engine on all cores)
+        self.workers = workers
+        logger.info(f"🚀 Scalable VIN Processor initialized (batch size: {batch_size}, backend: {backend})")
     
     async def process_pipeline(self, vin_count: int) -> Dict:
         """Complete pipeline: Generate → Analyze → Find Outliers"""
@@ -33,9 +54,13 @@ class ScalableVINProcessor:
         logger.info(f"📊 Step 1: Generating {vin_count:,} VINs...")
         vin_db_file = await self.generate_vin_database(vin_count, timestamp)
         
-        # Step 2: Run 13-stressor analysis 
-        logger.info(f"🧮 Step 2: Running 13-stressor analysis...")
-        analysis_file = await self.run_stressor_analysis(vin_db_file, timestamp)
+        # Step 2: Run 13-stressor analysis (or cohort engine scoring on the process pool)
+        if self.backend == "process-pool":
+            logger.info("🧮 Step 2: Scoring with the cohort engine on the process pool...")
+            analysis_file = await self.run_process_pool_analysis(vin_db_file, timestamp)
+        else:
+            logger.info("🧮 Step 2: Running 13-stressor analysis...")
+            analysis_file = await self.run_stressor_analysis(vin_db_file, timestamp)
         
         # Step 3: Cohort-relative outlier detection
         logger.info(f"🎯 Step 3: Finding cohort outliers...")
@@ -58,11 +83,11 @@ class ScalableVINProcessor:
         """Generate VIN database with specified count"""
         import subprocess
         
-        # Use existing generator with count parameter
-        cmd = f"python3 scripts/generate_lead_database.py --count {count}"
+        # Use existing generator with count parameter (files land in the working directory)
+        cmd = [sys.executable, str(Path(__file__).parent / "generate_lead_database.py"), "--count", str(count)]
         
         logger.info(f"🔄 Generating {count:,} VINs...")
-        result = subprocess.run(cmd.split(), capture_output=True, text=True)
+        result = subprocess.run(cmd, capture_output=True, text=True)
         
         if result.returncode != 0:
             logger.error(f"❌ VIN generation failed: {result.stderr}")
@@ -116,6 +141,77 @@ class ScalableVINProcessor:
         logger.info(f"✅ Completed stressor analysis: {latest_file}")
         return latest_file
     
+    async def run_process_pool_analysis(self, vin_db_file: str, timestamp: str) -> str:
+        """Score the VIN database with the cohort engine sharded across worker processes"""
+        from src.services.cohort_service import CohortService
+        from src.engines.bayesian_engine_v2 import BayesianRiskEngineV2, SEVERITY_ORDER
+        from src.engines.process_pool_scorer import ProcessPoolScorer
+        
+        with open(vin_db_file, 'r') as f:
+            leads = json.load(f)
+        
+        cohort_service = CohortService()
+        engine = await BayesianRiskEngineV2(cohort_service).ready()
+        scorer = ProcessPoolScorer(engine, max_workers=self.workers, shard_size=self.batch_size * 50)
+        
+        start_time = datetime.now()
+        try:
+            scores = await scorer.score_vehicles([self.lead_to_vehicle_input(lead) for lead in leads])
+        finally:
+            scorer.shutdown()
+        
+        elapsed = (datetime.now() - start_time).total_seconds()
+        logger.info(f"⚡ Scored {len(leads):,} VINs in {elapsed:.2f}s on {scorer.max_workers} workers")
+        
+        # Same layout as the 13-stressor analysis so the outlier step reads either
+        vehicle_analyses = []
+        for row, lead in enumerate(leads):
+            vehicle_analyses.append({
+                "vin": scores.vins[row],
+                "model": lead["model"],
+                "cohort_id": scores.cohort_id(row),
+                "active_stressors": scores.active_stressors(row),
+                "combined_lr": float(scores.combined_likelihood_ratio[row]),
+                "posterior_probability": float(scores.posterior_probability[row]),
+                "severity": SEVERITY_ORDER[scores.severity_index[row]].value,
+                "revenue_opportunity": lead["total_opportunity"]
+            })
+        
+        output_file = f"process_pool_analysis_{timestamp}.json"
+        with open(output_file, 'w') as f:
+            json.dump({
+                "summary": {
+                    "total_vins_processed": len(vehicle_analyses),
+                    "model_version": engine.model_version,
+                    "cohort_database_version": cohort_service.database_version,
+                    "workers": scorer.max_workers,
+                    "processing_seconds": elapsed,
+                    "processing_timestamp": datetime.now().isoformat()
+                },
+                "vehicle_analyses": vehicle_analyses
+            }, f, indent=2)
+        
+        logger.info(f"✅ Completed process-pool analysis: {output_file}")
+        return output_file
+    
+    @staticmethod
+    def lead_to_vehicle_input(lead: Dict):
+        """Map a lead record onto the engine's inputs field for field; raises ValueError if any are missing"""
+        from src.models.schemas import VehicleInputData, CohortAssignment
+        
+        missing = [name for name in ("vin",) + TELEMATICS_FIELDS + COHORT_FIELDS if lead.get(name) is None]
+        if missing:
+            raise ValueError(
+                f"Lead {lead.get('vin', '?')} cannot be scored by the cohort engine; missing fields: {missing}. "
+                "Regenerate the lead database with scripts/generate_lead_database.py"
+            )
+        
+        return VehicleInputData(
+            vin=lead["vin"],
+            **{name: lead[name] for name in TELEMATICS_FIELDS},
+            cohort_assignment=CohortAssignment(**{name: lead[name] for name in COHORT_FIELDS})
+        )
+    
     async def find_cohort_outliers(self, analysis_file: str, vin_db_file: str, timestamp: str) -> str:
         """Find cohort-relative outliers"""
         
@@ -277,10 +373,13 @@ async def main():
     parser = argparse.ArgumentParser(description="Scalable VIN Processing Pipeline")
     parser.add_argument("--vins", type=int, default=10000, help="Number of VINs to process")
     parser.add_argument("--batch-size", type=int, default=1000, help="Batch size for processing")
+    parser.add_argument("--backend", choices=["subprocess", "process-pool"], default="subprocess",
+                        help="Scoring backend: 13-stressor script or cohort engine sharded across processes")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes for --backend process-pool (default: all cores)")
     
     args = parser.parse_args()
     
-    processor = ScalableVINProcessor(batch_size=args.batch_size)
+    processor = ScalableVINProcessor(batch_size=args.batch_size, backend=args.backend, workers=args.workers)
     result = await processor.process_pipeline(args.vins)
     
     if result["success"]:
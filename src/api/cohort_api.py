@@ -9,14 +9,17 @@ Enhanced API endpoints for the academic-sourced cohort system:
 """
 
 import asyncio
+import csv
+import io
+import json
 import logging
-from typing import List, Optional, Dict, Any
+from typing import AsyncIterator, Iterator, List, Optional, Dict, Any, Tuple, Union
 from datetime import datetime
-from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks, status
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks, File, Query, UploadFile, status
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
 
-from ..models.schemas import VehicleInputData, RiskScoreOutput
+from ..models.schemas import VehicleInputData, RiskScoreOutput, CohortAssignment
 from ..models.cohort_schemas import (
     CohortDefinition, CohortMatchResult, StressorAnalysis,
     CohortDatabase, RegionType, VehicleClass, PowertrainType
@@ -24,10 +27,19 @@ from ..models.cohort_schemas import (
 from ..services.cohort_service import CohortService
 from ..swarm.cohort_orchestrator import CohortOrchestrator
 
+# Arrow IPC output for streaming batches is optional
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/v1/cohorts", tags=["Cohorts"])
 
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
 
 # Request/Response Models
 class CohortAnalysisRequest(BaseModel):
@@ -52,6 +64,16 @@ class BatchCohortRequest(BaseModel):
     processing_options: Dict[str, Any] = Field(default_factory=dict)
 
 
+class StressorRuleResponse(BaseModel):
+    """Compiled activation rule for one cohort stressor"""
+    stressor: str
+    field: Optional[str] = None
+    comparator: Optional[str] = None
+    threshold: Optional[float] = None
+    likelihood_ratio: float
+    has_rule: bool
+
+
 class CohortPerformanceResponse(BaseModel):
     """Response for cohort performance metrics"""
     summary: Dict[str, Any]
@@ -117,6 +139,46 @@ async def get_cohort_details(
         )
 
 
+@router.get("/{cohort_id}/stressor-rules", response_model=List[StressorRuleResponse])
+async def get_cohort_stressor_rules(
+    cohort_id: str,
+    cohort_service: CohortService = Depends(get_cohort_service)
+):
+    """
+    Get the compiled stressor rule table for a cohort, in evaluation order
+    
+    Audits which input field, comparator and threshold activate each stressor;
+    stressors without a rule never fire.
+    """
+    try:
+        rules = await cohort_service.get_stressor_rules(cohort_id)
+        if rules is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Cohort {cohort_id} not found"
+            )
+        
+        return [
+            StressorRuleResponse(
+                stressor=rule.stressor,
+                field=rule.field,
+                comparator=rule.comparator,
+                threshold=rule.threshold,
+                likelihood_ratio=rule.lr,
+                has_rule=rule.field is not None
+            )
+            for rule in rules
+        ]
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to get stressor rules for {cohort_id}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve stressor rules"
+        )
+
+
 @router.post("/analyze", response_model=CohortAnalysisResponse)
 async def analyze_vehicle_cohort(
     request: CohortAnalysisRequest,
@@ -214,6 +276,61 @@ async def batch_process_with_cohorts(
         )
 
 
+@router.post("/batch-process/stream")
+async def stream_batch_process_with_cohorts(
+    file: UploadFile = File(..., description="NDJSON (one VehicleInputData per line) or CSV upload"),
+    output_format: str = Query("ndjson", pattern="^(ndjson|arrow)$", description="ndjson or arrow (IPC stream)"),
+    chunk_size: int = Query(1000, ge=1, le=10000, description="Vehicles scored per chunk"),
+    cohort_orchestrator: CohortOrchestrator = Depends(get_cohort_orchestrator)
+):
+    """
+    Score an uploaded batch in chunks and stream results back while scoring
+    
+    Only one chunk of vehicles and results is held in memory at a time.
+    Records that fail validation are reported inline (NDJSON: an object with
+    "line" and "error"; Arrow: a row with the "error" column set).
+    """
+    if not cohort_orchestrator:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Cohort orchestrator not available"
+        )
+    
+    if output_format == "arrow" and pa is None:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Arrow output requires pyarrow to be installed"
+        )
+    
+    is_csv = (file.filename or "").lower().endswith(".csv") or file.content_type == "text/csv"
+    chunks = _score_upload_in_chunks(file, is_csv, chunk_size, cohort_orchestrator)
+    
+    if output_format == "arrow":
+        return StreamingResponse(_arrow_stream(chunks), media_type=ARROW_STREAM_MEDIA_TYPE)
+    return StreamingResponse(_ndjson_stream(chunks), media_type=NDJSON_MEDIA_TYPE)
+
+
+@router.post("/batch-process/priority")
+async def stream_batch_process_by_priority(
+    request: BatchCohortRequest,
+    cohort_orchestrator: CohortOrchestrator = Depends(get_cohort_orchestrator)
+):
+    """
+    Score a nightly batch in priority lanes and stream each lane as NDJSON
+    
+    Critical and high-priority VINs are scored and flushed first, so dealer
+    morning lists are available before the standard lane finishes.
+    """
+    if not cohort_orchestrator:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Cohort orchestrator not available"
+        )
+    
+    chunks = _score_by_priority(request.vehicles, cohort_orchestrator)
+    return StreamingResponse(_ndjson_stream(chunks), media_type=NDJSON_MEDIA_TYPE)
+
+
 @router.get("/performance/summary", response_model=CohortPerformanceResponse)
 async def get_cohort_performance(
     cohort_orchestrator: CohortOrchestrator = Depends(get_cohort_orchestrator)
@@ -422,6 +539,181 @@ async def _log_batch_performance(
         logger.error(f"Failed to log batch performance: {str(e)}")
 
 
+# Streaming batch helpers
+ScoredItem = Union[RiskScoreOutput, Tuple[int, str]]  # Result, or (upload line number, error)
+
+
+def _iter_upload_records(file: UploadFile, is_csv: bool) -> Iterator[Tuple[int, Union[str, List[str], Exception]]]:
+    """
+    Yield (line number, record) without reading the whole upload into memory
+    
+    The spooled upload is decoded as a text stream; CSV goes straight to
+    csv.reader, so quoted fields may span lines (the line number is where the
+    record ends). A CSV record that cannot be parsed is yielded as its error.
+    """
+    text = io.TextIOWrapper(file.file, encoding="utf-8", newline="")
+    try:
+        if not is_csv:
+            for line_number, line in enumerate(text, start=1):
+                if line.strip():
+                    yield line_number, line
+            return
+        
+        reader = csv.reader(text)
+        while True:
+            try:
+                values = next(reader)
+            except StopIteration:
+                return
+            except csv.Error as e:
+                yield reader.line_num, e
+                continue
+            if values:
+                yield reader.line_num, values
+    finally:
+        text.detach()  # Leave the upload's own file open for FastAPI to close
+
+
+def _vehicle_from_csv_row(row: Dict[str, str]) -> VehicleInputData:
+    """Build vehicle input from a flat CSV row (cohort assignment fields as columns)"""
+    data = {
+        "vin": row["vin"],
+        "soc_30day_trend": row["soc_30day_trend"],
+        "trip_cycles_weekly": row["trip_cycles_weekly"],
+        "odometer_variance": row["odometer_variance"],
+        "climate_stress_index": row["climate_stress_index"],
+        "maintenance_compliance": row["maintenance_compliance"],
+        "cohort_assignment": CohortAssignment(
+            model=row["model"],
+            powertrain=row["powertrain"],
+            region=row["region"],
+            mileage_band=row["mileage_band"]
+        )
+    }
+    if row.get("timestamp"):
+        data["timestamp"] = row["timestamp"]
+    return VehicleInputData(**data)
+
+
+async def _score_upload_in_chunks(
+    file: UploadFile,
+    is_csv: bool,
+    chunk_size: int,
+    orchestrator: CohortOrchestrator
+) -> AsyncIterator[List[ScoredItem]]:
+    """Parse the upload incrementally and score it chunk by chunk (chunks with nothing to report are skipped)"""
+    header: Optional[List[str]] = None
+    vehicles: List[VehicleInputData] = []
+    errors: List[Tuple[int, str]] = []
+    total = 0
+    
+    for line_number, record in _iter_upload_records(file, is_csv):
+        try:
+            if isinstance(record, Exception):
+                raise record
+            if is_csv:
+                if header is None:
+                    header = [column.strip() for column in record]
+                    continue
+                vehicles.append(_vehicle_from_csv_row(dict(zip(header, record))))
+            else:
+                vehicles.append(VehicleInputData(**json.loads(record)))
+        except Exception as e:
+            errors.append((line_number, str(e)))
+        
+        if len(vehicles) >= chunk_size:
+            total += len(vehicles)
+            items = errors + await orchestrator.process_vehicle_batch(vehicles)
+            vehicles, errors = [], []
+            if items:
+                yield items
+    
+    if vehicles or errors:
+        total += len(vehicles)
+        items = errors + (await orchestrator.process_vehicle_batch(vehicles) if vehicles else [])
+        if items:
+            yield items
+    
+    logger.info(f"Streamed batch scoring completed: {total} vehicles")
+
+
+async def _score_by_priority(
+    vehicles: List[VehicleInputData],
+    orchestrator: CohortOrchestrator
+) -> AsyncIterator[List[ScoredItem]]:
+    """Each priority lane's results as one chunk, highest lane first (empty lanes are skipped)"""
+    async for lane, results in orchestrator.process_by_priority(vehicles):
+        logger.info(f"Streaming priority lane {lane}: {len(results)} results")
+        if results:
+            yield results
+
+
+async def _ndjson_stream(chunks: AsyncIterator[List[ScoredItem]]) -> AsyncIterator[bytes]:
+    """One JSON document per line; each chunk is flushed as soon as it is scored"""
+    async for items in chunks:
+        lines = []
+        for item in items:
+            if isinstance(item, RiskScoreOutput):
+                lines.append(item.json())
+            else:
+                line_number, error = item
+                lines.append(json.dumps({"line": line_number, "error": error}))
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def _arrow_schema() -> "pa.Schema":
+    return pa.schema([
+        ("vin", pa.string()),
+        ("risk_score", pa.float64()),
+        ("severity_bucket", pa.string()),
+        ("cohort", pa.string()),
+        ("dominant_stressors", pa.list_(pa.string())),
+        ("recommended_action", pa.string()),
+        ("revenue_opportunity", pa.float64()),
+        ("confidence", pa.float64()),
+        ("scored_at", pa.timestamp("us")),
+        ("model_version", pa.string()),
+        ("line", pa.int64()),
+        ("error", pa.string())
+    ])
+
+
+async def _arrow_stream(chunks: AsyncIterator[List[ScoredItem]]) -> AsyncIterator[bytes]:
+    """Arrow IPC stream: schema first, then one record batch per scored chunk"""
+    schema = _arrow_schema()
+    sink = io.BytesIO()
+    writer = pa.ipc.new_stream(sink, schema)
+    
+    async for items in chunks:
+        columns: Dict[str, List] = {name: [] for name in schema.names}
+        for item in items:
+            if isinstance(item, RiskScoreOutput):
+                row = {
+                    "vin": item.vin,
+                    "risk_score": item.risk_score,
+                    "severity_bucket": item.severity_bucket.value,
+                    "cohort": item.cohort,
+                    "dominant_stressors": item.dominant_stressors,
+                    "recommended_action": item.recommended_action,
+                    "revenue_opportunity": float(item.revenue_opportunity),
+                    "confidence": item.confidence,
+                    "scored_at": item.metadata.scored_at,
+                    "model_version": item.metadata.model_version
+                }
+            else:
+                row = {"line": item[0], "error": item[1]}
+            for name in schema.names:
+                columns[name].append(row.get(name))
+        
+        writer.write_batch(pa.RecordBatch.from_pydict(columns, schema=schema))
+        yield sink.getvalue()
+        sink.seek(0)
+        sink.truncate()
+    
+    writer.close()
+    yield sink.getvalue()
+
+
 # Validation endpoints for academic integrity
 @router.post("/validate", response_model=Dict[str, Any])
 async def validate_cohort_definitions(
@@ -13,19 +13,45 @@ import json
 from typing import Dict, List, Tuple, Optional
 from datetime import datetime, timedelta
 from decimal import Decimal
-import asyncio
 from dataclasses import dataclass
 
 from ..models.schemas import (
     VehicleInputData, RiskScoreOutput, RiskScoreMetadata,
     BayesianPriors, LikelihoodRatios, SeverityBucket, CohortAssignment
 )
-from ..services.cohort_service import CohortService
+from ..services.cohort_service import CohortService, StressorRule, compile_stressor_rules
+from ..services.batch_executor import BoundedBatchExecutor
 
 
 logger = logging.getLogger(__name__)
 
 
+# Academic activation thresholds, checked in order: (name patterns, input field, comparator, threshold)
+# Stressors matching no pattern never fire (there is no catch-all climate rule).
+ACADEMIC_STRESSOR_RULES = [
+    # Temperature-related stressors
+    (("temp",), "climate_stress_index", ">=", 0.7),
+    
+    # Trip/cycling related stressors (Argonne 6-mile rule)
+    (("trip", "short"), "trip_cycles_weekly", ">=", 40),  # Frequent short trips
+    
+    # Ignition cycle stressors (Argonne ANL-115925.pdf validation)
+    (("ignition",), "trip_cycles_weekly", ">=", 50),  # High ignition cycles
+    
+    # SOC/battery health stressors
+    (("soc",), "soc_30day_trend", "<=", -0.15),  # 15% SOC decline
+    
+    # Maintenance-related stressors
+    (("maintenance",), "maintenance_compliance", "<", 0.6),  # Poor maintenance
+    
+    # Mileage/usage stressors
+    (("mileage", "usage"), "odometer_variance", ">=", 0.8),  # High usage variability
+    
+    # Salt/corrosion stressors
+    (("salt", "corrosion"), "climate_stress_index", ">=", 0.5),  # Moderate climate stress
+]
+
+
 class BayesianRiskEngine:
     """
     Core Bayesian risk calculation engine using academic cohort system
@@ -35,6 +61,7 @@ class BayesianRiskEngine:
         self.cohort_service = CohortService(cohorts_file)
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
         self.model_version = "1.1"  # Updated for cohort integration
+        self._rule_tables: Dict[str, List[StressorRule]] = {}
         
     async def calculate_risk_score(self, input_data: VehicleInputData) -> RiskScoreOutput:
         """
@@ -120,55 +147,31 @@ class BayesianRiskEngine:
         return {'make': 'Ford', 'model': 'F-150', 'class': 'Light Truck'}
     
     def _analyze_stressors(self, input_data: VehicleInputData, cohort: Dict) -> List[Dict]:
-        """Analyze input data against cohort-specific stressors"""
+        """Analyze input data against the cohort's compiled stressor rules"""
         active_stressors = []
         
-        for stressor_key, stressor_data in cohort['likelihood_ratios'].items():
-            is_active = self._is_stressor_active(stressor_key, input_data)
-            
-            if is_active:
+        for rule in self._get_stressor_rules(cohort):
+            if rule.is_active(input_data):
+                stressor_data = cohort['likelihood_ratios'][rule.stressor]
                 active_stressors.append({
-                    'name': stressor_key,
-                    'lr_value': stressor_data['value'],
+                    'name': rule.stressor,
+                    'lr_value': rule.lr,
                     'definition': stressor_data['definition'],
                     'source': stressor_data['source']
                 })
         
         return active_stressors
     
-    def _is_stressor_active(self, stressor_key: str, input_data: VehicleInputData) -> bool:
-        """Determine if a specific stressor is active based on academic thresholds"""
-        
-        # Temperature-related stressors
-        if 'temp' in stressor_key.lower():
-            return input_data.climate_stress_index >= 0.7
-        
-        # Trip/cycling related stressors (Argonne 6-mile rule)
-        if 'trip' in stressor_key.lower() or 'short' in stressor_key.lower():
-            return input_data.trip_cycles_weekly >= 40  # Frequent short trips
-        
-        # Ignition cycle stressors (Argonne ANL-115925.pdf validation)
-        if 'ignition' in stressor_key.lower():
-            return input_data.trip_cycles_weekly >= 50  # High ignition cycles
-        
-        # SOC/battery health stressors
-        if 'soc' in stressor_key.lower():
-            return input_data.soc_30day_trend <= -0.15  # 15% SOC decline
-        
-        # Maintenance-related stressors
-        if 'maintenance' in stressor_key.lower():
-            return input_data.maintenance_compliance < 0.6  # Poor maintenance
-        
-        # Mileage/usage stressors
-        if 'mileage' in stressor_key.lower() or 'usage' in stressor_key.lower():
-            return input_data.odometer_variance >= 0.8  # High usage variability
-        
-        # Salt/corrosion stressors
-        if 'salt' in stressor_key.lower() or 'corrosion' in stressor_key.lower():
-            return input_data.climate_stress_index >= 0.5  # Moderate climate stress
-        
-        # Default: moderate threshold
-        return input_data.climate_stress_index >= 0.6
+    def _get_stressor_rules(self, cohort: Dict) -> List[StressorRule]:
+        """Compile (once per cohort) the academic-threshold rule table"""
+        rules = self._rule_tables.get(cohort['cohort_id'])
+        if rules is None:
+            rules = compile_stressor_rules(
+                {name: data['value'] for name, data in cohort['likelihood_ratios'].items()},
+                ACADEMIC_STRESSOR_RULES
+            )
+            self._rule_tables[cohort['cohort_id']] = rules
+        return rules
     
     def _calculate_cohort_likelihood_ratio(self, active_stressors: List[Dict]) -> float:
         """Calculate combined likelihood ratio from active stressors"""
@@ -271,9 +274,13 @@ class BatchBayesianProcessor:
     Batch processor for high-throughput risk scoring with cohort optimization
     """
     
-    def __init__(self, engine: BayesianRiskEngine, batch_size: int = 1000):
+    def __init__(self, engine: BayesianRiskEngine, batch_size: int = 1000, max_concurrency: int = 100):
         self.engine = engine
         self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        self.executor = BoundedBatchExecutor(
+            chunk_size=batch_size, max_in_flight=max_concurrency, name=self.__class__.__name__
+        )
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
     
     async def process_batch(self, vehicles: List[VehicleInputData]) -> List[RiskScoreOutput]:
@@ -296,9 +303,8 @@ class BatchBayesianProcessor:
         for cohort_id, cohort_vehicles in cohort_groups.items():
             self.logger.info(f"Processing {len(cohort_vehicles)} vehicles in cohort {cohort_id}")
             
-            # Process cohort concurrently
-            tasks = [self.engine.calculate_risk_score(vehicle) for vehicle in cohort_vehicles]
-            cohort_results = await asyncio.gather(*tasks, return_exceptions=True)
+            # Process cohort in chunks of batch_size with bounded concurrency
+            cohort_results = await self.executor.run(cohort_vehicles, self.engine.calculate_risk_score)
             
             # Handle exceptions
             for j, result in enumerate(cohort_results):
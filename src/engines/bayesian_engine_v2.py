@@ -14,7 +14,7 @@ This upgraded engine uses:
 
 import numpy as np
 import logging
-from typing import Dict, List, Tuple, Optional
+from typing import AsyncIterator, Dict, List, Tuple, Optional
 from datetime import datetime, timedelta
 from decimal import Decimal
 import asyncio
@@ -25,7 +25,10 @@ from ..models.schemas import (
     SeverityBucket, CohortAssignment
 )
 from ..models.cohort_schemas import CohortDefinition, StressorAnalysis
-from ..services.cohort_service import CohortService
+from ..services.cohort_service import CohortService, CohortResolution, COMPARATORS
+from ..services.score_fingerprint_store import ScoreFingerprintStore
+from ..services.priority_scheduler import PriorityLaneScheduler
+from ..services.batch_executor import BoundedBatchExecutor
 
 
 logger = logging.getLogger(__name__)
@@ -58,6 +61,138 @@ class BayesianCalculationTrace:
             }
 
 
+# Lower bounds of MODERATE, HIGH, CRITICAL and SEVERE (see _classify_severity)
+SEVERITY_THRESHOLDS = np.array([0.03, 0.07, 0.12, 0.20])
+SEVERITY_ORDER = [
+    SeverityBucket.LOW,
+    SeverityBucket.MODERATE,
+    SeverityBucket.HIGH,
+    SeverityBucket.CRITICAL,
+    SeverityBucket.SEVERE
+]
+
+
+@dataclass
+class VehicleColumns:
+    """Column-oriented vehicle inputs for batch scoring (one array entry per VIN)"""
+    soc_30day_trend: np.ndarray
+    trip_cycles_weekly: np.ndarray
+    climate_stress_index: np.ndarray
+    maintenance_compliance: np.ndarray
+    cohort_index: np.ndarray  # Position in CohortService.get_all_cohorts()
+    vins: Optional[List[str]] = None
+    cohort_match_confidence: Optional[np.ndarray] = None
+    resolutions: Optional[List[CohortResolution]] = None  # Per-row matches, when matched in this process
+    
+    def __len__(self) -> int:
+        return len(self.cohort_index)
+    
+    def column(self, field: str) -> np.ndarray:
+        """Get an input column by VehicleInputData field name"""
+        return np.asarray(getattr(self, field))
+
+
+@dataclass
+class ColumnarRiskScores:
+    """Array results of a columnar scoring run"""
+    cohort_ids: List[str]
+    stressor_names: List[List[str]]  # Per cohort, in active_mask slot order
+    cohort_index: np.ndarray
+    active_mask: np.ndarray  # (n, slots) bool
+    stressor_contributions: np.ndarray  # (n, slots) LR if active else 1.0
+    combined_likelihood_ratio: np.ndarray
+    prior_probability: np.ndarray
+    posterior_probability: np.ndarray
+    severity_index: np.ndarray  # Index into SEVERITY_ORDER
+    vins: Optional[List[str]] = None
+    cohort_match_confidence: Optional[np.ndarray] = None
+    resolutions: Optional[List[CohortResolution]] = None
+    
+    def __len__(self) -> int:
+        return len(self.posterior_probability)
+    
+    def cohort_id(self, row: int) -> str:
+        return self.cohort_ids[self.cohort_index[row]]
+    
+    def severity(self, row: int) -> SeverityBucket:
+        return SEVERITY_ORDER[self.severity_index[row]]
+    
+    def active_stressors(self, row: int) -> List[str]:
+        names = self.stressor_names[self.cohort_index[row]]
+        return [name for j, name in enumerate(names) if self.active_mask[row, j]]
+    
+    def contributions(self, row: int) -> Dict[str, float]:
+        names = self.stressor_names[self.cohort_index[row]]
+        return {name: float(self.stressor_contributions[row, j]) for j, name in enumerate(names)}
+
+
+@dataclass
+class BatchResultContext:
+    """Metadata shared by every RiskScoreRecord of one batch run"""
+    cohort_ids: List[str]
+    stressor_names: List[List[str]]  # Per cohort, in stressor mask bit order
+    model_version: str
+    scored_at: datetime
+    calculation_time_ms: float  # Batch wall time per vehicle
+
+
+class RiskScoreRecord:
+    """
+    Compact batch result for one VIN
+    
+    Cohort, stressor and source metadata live once in the shared
+    BatchResultContext and are referenced by index; active stressors are a
+    bitmask over the cohort's stressor slots. Use
+    BayesianRiskEngineV2.to_risk_score_output() for the full pydantic model.
+    """
+    __slots__ = (
+        "vin", "risk_score", "severity_index", "cohort_index", "stressor_mask",
+        "combined_likelihood_ratio", "confidence", "cohort_match_confidence",
+        "data_freshness", "context"
+    )
+    
+    def __init__(
+        self,
+        vin: str,
+        risk_score: float,
+        severity_index: int,
+        cohort_index: int,
+        stressor_mask: int,
+        combined_likelihood_ratio: float,
+        confidence: float,
+        cohort_match_confidence: float,
+        data_freshness: int,
+        context: BatchResultContext
+    ):
+        self.vin = vin
+        self.risk_score = risk_score
+        self.severity_index = severity_index
+        self.cohort_index = cohort_index
+        self.stressor_mask = stressor_mask
+        self.combined_likelihood_ratio = combined_likelihood_ratio
+        self.confidence = confidence
+        self.cohort_match_confidence = cohort_match_confidence
+        self.data_freshness = data_freshness
+        self.context = context
+    
+    @property
+    def cohort_id(self) -> str:
+        return self.context.cohort_ids[self.cohort_index]
+    
+    @property
+    def severity(self) -> SeverityBucket:
+        return SEVERITY_ORDER[self.severity_index]
+    
+    @property
+    def active_stressors(self) -> List[str]:
+        names = self.context.stressor_names[self.cohort_index]
+        return [name for j, name in enumerate(names) if self.stressor_mask >> j & 1]
+    
+    def __repr__(self) -> str:
+        return (f"RiskScoreRecord(vin={self.vin!r}, risk_score={self.risk_score:.4f}, "
+                f"severity={self.severity.value}, cohort={self.cohort_id!r})")
+
+
 class FordBatteryRiskCalculator:
     """
     Ford-specific battery risk calculator using lead-acid AGM battery research
@@ -227,13 +362,25 @@ class BayesianRiskEngineV2:
             "telematics_integration": "Real-time driving pattern analysis and maintenance record fusion"
         }
         
-        # Initialize cohort service
-        asyncio.create_task(self.cohort_service.initialize())
+        # Initialize cohort service (await ready() before relying on it)
+        self._initialization = asyncio.create_task(self.cohort_service.initialize())
+    
+    async def ready(self) -> "BayesianRiskEngineV2":
+        """Wait for the cohort load scheduled at construction (loads cohorts exactly once)"""
+        await self._initialization
+        return self
         
-    async def calculate_risk_score(self, input_data: VehicleInputData) -> RiskScoreOutput:
+    async def calculate_risk_score(
+        self,
+        input_data: VehicleInputData,
+        resolution: Optional[CohortResolution] = None
+    ) -> RiskScoreOutput:
         """
         Calculate Bayesian risk score using peer-reviewed academic sources
         
+        Pass the CohortResolution from an earlier match (e.g. batch grouping)
+        to skip re-matching; it is threaded through every pipeline step.
+        
         Enhanced formula with scientifically-validated parameters:
         P(Failure|Evidence) = P(Evidence|Failure) * P(Failure) / P(Evidence)
         
@@ -244,79 +391,349 @@ class BayesianRiskEngineV2:
         start_time = datetime.utcnow()
         
         try:
-            # Step 1: Match vehicle to appropriate cohort
-            cohort_match = await self.cohort_service.match_cohort(input_data.vin, input_data)
-            cohort = await self.cohort_service.get_cohort_by_id(cohort_match.matched_cohort_id)
-            
-            if not cohort:
-                raise ValueError(f"Failed to match vehicle {input_data.vin} to any cohort")
+            # Step 1: Match vehicle to appropriate cohort (once per request)
+            if resolution is None:
+                resolution = await self.cohort_service.resolve_cohort(input_data.vin, input_data)
+            cohort = resolution.cohort
             
             # Step 2: Get peer-reviewed prior probability
             prior_prob = cohort.prior
             
             # Step 3: Analyze vehicle stressors using scientifically-validated definitions
             stressor_analysis = await self.cohort_service.analyze_vehicle_stressors(
-                input_data.vin, input_data
+                input_data.vin, input_data, resolution
             )
             
             # Step 4: Apply Bayesian update with peer-reviewed likelihood ratios
             posterior_prob = self._bayesian_update(prior_prob, stressor_analysis.combined_likelihood_ratio)
             
-            # Step 5: Determine severity and recommendations
-            severity_bucket = self._classify_severity(posterior_prob)
-            recommended_action = self._generate_recommendation(severity_bucket, stressor_analysis)
-            revenue_opportunity = self._estimate_revenue_opportunity(severity_bucket, cohort)
-            
-            # Step 6: Calculate confidence with academic backing
-            confidence = self._calculate_confidence(
-                input_data, prior_prob, cohort_match.confidence, stressor_analysis
-            )
-            
-            # Step 7: Create calculation trace for scientific auditability
-            trace = BayesianCalculationTrace(
-                vin=input_data.vin,
-                cohort_id=cohort.cohort_id,
-                prior_probability=prior_prob,
-                prior_source=cohort.prior_source,
-                active_stressors=stressor_analysis.active_stressors,
-                likelihood_ratios=stressor_analysis.stressor_contributions,
-                combined_likelihood_ratio=stressor_analysis.combined_likelihood_ratio,
-                posterior_probability=posterior_prob,
-                scientific_validation=self.academic_foundation
-            )
-            
-            # Step 8: Build enhanced metadata with academic sources
-            calculation_time = (datetime.utcnow() - start_time).total_seconds() * 1000
-            metadata = RiskScoreMetadata(
-                scored_at=start_time,
-                prior_failure_rate=prior_prob,
-                data_freshness=self._calculate_data_freshness(input_data.timestamp),
-                model_version=self.model_version,
-                calculation_time_ms=calculation_time
-            )
-            
-            return RiskScoreOutput(
-                vin=input_data.vin,
-                risk_score=posterior_prob,
-                severity_bucket=severity_bucket,
-                cohort=cohort_match.matched_cohort_id,
-                dominant_stressors=stressor_analysis.active_stressors,
-                recommended_action=recommended_action,
-                revenue_opportunity=revenue_opportunity,
-                confidence=confidence,
-                metadata=metadata,
-                # Enhanced fields for V2
-                cohort_match_confidence=cohort_match.confidence,
-                academic_sources=self._extract_academic_sources(cohort, stressor_analysis),
-                risk_factors=stressor_analysis.risk_factors,
-                calculation_trace=trace,
-                academic_foundation=self.academic_foundation
+            # Steps 5-8: Severity, recommendations, confidence, trace and metadata
+            return self._build_risk_score_output(
+                input_data, cohort, resolution.confidence, stressor_analysis, posterior_prob, start_time
             )
             
         except Exception as e:
             self.logger.error(f"Risk calculation failed for VIN {input_data.vin}: {str(e)}")
             raise
     
+    def _build_risk_score_output(
+        self,
+        input_data: VehicleInputData,
+        cohort: CohortDefinition,
+        cohort_match_confidence: float,
+        stressor_analysis: StressorAnalysis,
+        posterior_prob: float,
+        start_time: datetime
+    ) -> RiskScoreOutput:
+        """Assemble the full risk score output for one scored vehicle"""
+        # Step 6: Calculate confidence with academic backing
+        confidence = self._calculate_confidence(
+            input_data, cohort.prior, cohort_match_confidence, stressor_analysis
+        )
+        
+        calculation_time = (datetime.utcnow() - start_time).total_seconds() * 1000
+        return self._assemble_risk_score_output(
+            input_data.vin, cohort, cohort_match_confidence, stressor_analysis, posterior_prob,
+            confidence, self._calculate_data_freshness(input_data.timestamp), start_time, calculation_time
+        )
+    
+    def _assemble_risk_score_output(
+        self,
+        vin: str,
+        cohort: CohortDefinition,
+        cohort_match_confidence: float,
+        stressor_analysis: StressorAnalysis,
+        posterior_prob: float,
+        confidence: float,
+        data_freshness: int,
+        scored_at: datetime,
+        calculation_time_ms: float
+    ) -> RiskScoreOutput:
+        """Build the pydantic output from already computed scores (shared by single and batch paths)"""
+        prior_prob = cohort.prior
+        
+        # Step 5: Determine severity and recommendations
+        severity_bucket = self._classify_severity(posterior_prob)
+        recommended_action = self._generate_recommendation(severity_bucket, stressor_analysis)
+        revenue_opportunity = self._estimate_revenue_opportunity(severity_bucket, cohort)
+        
+        # Step 7: Create calculation trace for scientific auditability
+        trace = BayesianCalculationTrace(
+            vin=vin,
+            cohort_id=cohort.cohort_id,
+            prior_probability=prior_prob,
+            prior_source=cohort.prior_source,
+            active_stressors=stressor_analysis.active_stressors,
+            likelihood_ratios=stressor_analysis.stressor_contributions,
+            combined_likelihood_ratio=stressor_analysis.combined_likelihood_ratio,
+            posterior_probability=posterior_prob,
+            scientific_validation=self.academic_foundation
+        )
+        
+        # Step 8: Build enhanced metadata with academic sources
+        metadata = RiskScoreMetadata(
+            scored_at=scored_at,
+            prior_failure_rate=prior_prob,
+            data_freshness=data_freshness,
+            model_version=self.model_version,
+            calculation_time_ms=calculation_time_ms
+        )
+        
+        return RiskScoreOutput(
+            vin=vin,
+            risk_score=posterior_prob,
+            severity_bucket=severity_bucket,
+            cohort=cohort.cohort_id,
+            dominant_stressors=stressor_analysis.active_stressors,
+            recommended_action=recommended_action,
+            revenue_opportunity=revenue_opportunity,
+            confidence=confidence,
+            metadata=metadata,
+            # Enhanced fields for V2
+            cohort_match_confidence=cohort_match_confidence,
+            academic_sources="; ".join(self._extract_academic_sources(cohort, stressor_analysis)),
+            risk_factors=stressor_analysis.risk_factors,
+            calculation_trace=trace,
+            academic_foundation=self.academic_foundation
+        )
+    
+    async def match_cohort_columns(
+        self,
+        vins: List[str],
+        vehicles: Optional[List[VehicleInputData]] = None
+    ) -> Tuple[np.ndarray, np.ndarray, List[CohortResolution]]:
+        """Match each VIN's cohort once: (cohort_index, match confidence, resolutions)"""
+        cohorts = await self.cohort_service.get_all_cohorts()
+        cohort_positions = {cohort.cohort_id: i for i, cohort in enumerate(cohorts)}
+        
+        resolutions = []
+        for i, vin in enumerate(vins):
+            resolutions.append(await self.cohort_service.resolve_cohort(vin, vehicles[i] if vehicles else None))
+        
+        cohort_index = np.fromiter(
+            (cohort_positions[resolution.cohort.cohort_id] for resolution in resolutions),
+            dtype=np.int32, count=len(resolutions)
+        )
+        match_confidence = np.fromiter(
+            (resolution.confidence for resolution in resolutions), dtype=np.float64, count=len(resolutions)
+        )
+        return cohort_index, match_confidence, resolutions
+    
+    async def columns_from_vehicles(self, vehicles: List[VehicleInputData]) -> VehicleColumns:
+        """Match cohorts and pack vehicle inputs into scoring columns (resolutions are kept for output building)"""
+        vins = [v.vin for v in vehicles]
+        cohort_index, match_confidence, resolutions = await self.match_cohort_columns(vins, vehicles)
+        
+        return VehicleColumns(
+            soc_30day_trend=np.array([v.soc_30day_trend for v in vehicles], dtype=np.float64),
+            trip_cycles_weekly=np.array([v.trip_cycles_weekly for v in vehicles], dtype=np.float64),
+            climate_stress_index=np.array([v.climate_stress_index for v in vehicles], dtype=np.float64),
+            maintenance_compliance=np.array([v.maintenance_compliance for v in vehicles], dtype=np.float64),
+            cohort_index=cohort_index,
+            vins=vins,
+            cohort_match_confidence=match_confidence,
+            resolutions=resolutions
+        )
+    
+    async def calculate_risk_scores_columnar(self, columns: VehicleColumns) -> ColumnarRiskScores:
+        """
+        Score a whole batch as array operations over input columns
+        
+        Mirrors calculate_risk_score step for step (cohort stressor rules,
+        combined LR in cohort stressor order, odds-form update, severity
+        thresholds) so every row matches the scalar path exactly.
+        """
+        cohorts = await self.cohort_service.get_all_cohorts()
+        n = len(columns)
+        cohort_index = np.asarray(columns.cohort_index, dtype=np.int32)
+        
+        rule_tables = [await self.cohort_service.get_stressor_rules(c.cohort_id) for c in cohorts]
+        stressor_names = [[rule.stressor for rule in rules] for rules in rule_tables]
+        max_slots = max((len(rules) for rules in rule_tables), default=0)
+        fields = sorted({rule.field for rules in rule_tables for rule in rules if rule.field})
+        
+        # Rule tables as (cohort, slot) matrices; slots follow each cohort's stressor order
+        comparator_codes = {comparator: code for code, comparator in enumerate(COMPARATORS, start=1)}
+        lr_table = np.ones((len(cohorts), max_slots), dtype=np.float64)
+        field_table = np.zeros((len(cohorts), max_slots), dtype=np.int32)
+        threshold_table = np.zeros((len(cohorts), max_slots), dtype=np.float64)
+        comparator_table = np.zeros((len(cohorts), max_slots), dtype=np.int8)  # 0: no rule, else COMPARATORS position + 1
+        for c, rules in enumerate(rule_tables):
+            for j, rule in enumerate(rules):
+                lr_table[c, j] = rule.lr
+                if rule.field:
+                    field_table[c, j] = fields.index(rule.field)
+                    threshold_table[c, j] = rule.threshold
+                    comparator_table[c, j] = comparator_codes[rule.comparator]
+        
+        # Step 3: Stressor activation masks as one matrix compare per comparator
+        inputs = np.column_stack([columns.column(f).astype(np.float64) for f in fields]) if fields else np.zeros((n, 1))
+        values = np.take_along_axis(inputs, field_table[cohort_index], axis=1)
+        thresholds = threshold_table[cohort_index]
+        row_comparators = comparator_table[cohort_index]
+        active_mask = np.zeros((n, max_slots), dtype=bool)
+        for comparator, compare in COMPARATORS.items():
+            selected = row_comparators == comparator_codes[comparator]
+            active_mask |= selected & compare(values, thresholds)
+        
+        # Combined LR multiplied slot by slot to keep the scalar multiplication order
+        contributions = np.where(active_mask, lr_table[cohort_index], 1.0)
+        combined_lr = np.ones(n, dtype=np.float64)
+        for j in range(max_slots):
+            combined_lr = combined_lr * contributions[:, j]
+        
+        # Step 4: Odds-form Bayesian update
+        prior = np.array([cohort.prior for cohort in cohorts], dtype=np.float64)[cohort_index]
+        posterior = self._bayesian_update_array(prior, combined_lr)
+        
+        # Step 5: Severity buckets
+        severity_index = np.searchsorted(SEVERITY_THRESHOLDS, posterior, side="right").astype(np.int8)
+        
+        return ColumnarRiskScores(
+            cohort_ids=[cohort.cohort_id for cohort in cohorts],
+            stressor_names=stressor_names,
+            cohort_index=cohort_index,
+            active_mask=active_mask,
+            stressor_contributions=contributions,
+            combined_likelihood_ratio=combined_lr,
+            prior_probability=prior,
+            posterior_probability=posterior,
+            severity_index=severity_index,
+            vins=columns.vins,
+            cohort_match_confidence=columns.cohort_match_confidence,
+            resolutions=columns.resolutions
+        )
+    
+    async def build_stressor_analysis(self, scores: ColumnarRiskScores, row: int) -> StressorAnalysis:
+        """Materialize the StressorAnalysis for one row of a columnar result"""
+        cohort = await self.cohort_service.get_cohort_by_id(scores.cohort_id(row))
+        active_stressors = scores.active_stressors(row)
+        
+        return StressorAnalysis(
+            vin=scores.vins[row] if scores.vins else "",
+            cohort_id=cohort.cohort_id,
+            active_stressors=active_stressors,
+            stressor_contributions=scores.contributions(row),
+            combined_likelihood_ratio=float(scores.combined_likelihood_ratio[row]),
+            risk_factors=self.cohort_service._generate_risk_factors(active_stressors, cohort)
+        )
+    
+    async def build_risk_score_output(
+        self,
+        scores: ColumnarRiskScores,
+        row: int,
+        input_data: VehicleInputData,
+        resolution: Optional[CohortResolution] = None
+    ) -> RiskScoreOutput:
+        """
+        Materialize the full RiskScoreOutput for one row of a columnar result
+        
+        The cohort match made for the columns is reused (the row's resolution,
+        or its cohort and match confidence); VINs are only re-matched when
+        the scores carry neither.
+        """
+        start_time = datetime.utcnow()
+        if resolution is None and scores.resolutions is not None:
+            resolution = scores.resolutions[row]
+        
+        if resolution is not None:
+            cohort, match_confidence = resolution.cohort, resolution.confidence
+        elif scores.cohort_match_confidence is not None:
+            cohort = await self.cohort_service.get_cohort_by_id(scores.cohort_id(row))
+            match_confidence = float(scores.cohort_match_confidence[row])
+        else:
+            resolution = await self.cohort_service.resolve_cohort(input_data.vin, input_data)
+            cohort, match_confidence = resolution.cohort, resolution.confidence
+        
+        stressor_analysis = await self.build_stressor_analysis(scores, row)
+        return self._build_risk_score_output(
+            input_data, cohort, match_confidence, stressor_analysis,
+            float(scores.posterior_probability[row]), start_time
+        )
+    
+    def build_risk_score_records(
+        self,
+        scores: ColumnarRiskScores,
+        vehicles: List[VehicleInputData],
+        scored_at: Optional[datetime] = None
+    ) -> List[RiskScoreRecord]:
+        """
+        Turn a columnar result into compact per-VIN records
+        
+        Confidence is computed over whole columns with the same factors (and
+        multiplication order) as _calculate_confidence, so records convert to
+        outputs identical to the single-VIN path.
+        """
+        scored_at = scored_at or datetime.utcnow()
+        n = len(scores)
+        if scores.cohort_match_confidence is None:
+            raise ValueError("Columnar scores carry no cohort match confidence; build columns with columns_from_vehicles")
+        
+        data_freshness = np.array([self._calculate_data_freshness(v.timestamp) for v in vehicles], dtype=np.int64)
+        soc = np.array([v.soc_30day_trend for v in vehicles], dtype=np.float64)
+        trips = np.array([v.trip_cycles_weekly for v in vehicles], dtype=np.float64)
+        active_counts = scores.active_mask.sum(axis=1)
+        
+        confidence = self._calculate_confidence_array(
+            scores.cohort_match_confidence, data_freshness, soc, trips,
+            active_counts, scores.prior_probability, scores.combined_likelihood_ratio
+        )
+        
+        # Active stressors as one integer bitmask per row
+        bit_values = np.left_shift(np.uint64(1), np.arange(scores.active_mask.shape[1], dtype=np.uint64))
+        stressor_masks = (scores.active_mask.astype(np.uint64) * bit_values).sum(axis=1, dtype=np.uint64)
+        
+        context = BatchResultContext(
+            cohort_ids=scores.cohort_ids,
+            stressor_names=scores.stressor_names,
+            model_version=self.model_version,
+            scored_at=scored_at,
+            calculation_time_ms=(datetime.utcnow() - scored_at).total_seconds() * 1000 / n if n else 0.0
+        )
+        
+        vins = scores.vins or [v.vin for v in vehicles]
+        return [
+            RiskScoreRecord(vin, risk_score, severity_index, cohort_index, stressor_mask,
+                            combined_lr, row_confidence, match_confidence, freshness, context)
+            for vin, risk_score, severity_index, cohort_index, stressor_mask, combined_lr,
+                row_confidence, match_confidence, freshness in zip(
+                vins,
+                scores.posterior_probability.tolist(),
+                scores.severity_index.tolist(),
+                scores.cohort_index.tolist(),
+                stressor_masks.tolist(),
+                scores.combined_likelihood_ratio.tolist(),
+                confidence.tolist(),
+                scores.cohort_match_confidence.tolist(),
+                data_freshness.tolist()
+            )
+        ]
+    
+    async def to_risk_score_output(self, record: RiskScoreRecord) -> RiskScoreOutput:
+        """Materialize the full pydantic output for one compact record (e.g. for API serialization)"""
+        cohort = await self.cohort_service.get_cohort_by_id(record.cohort_id)
+        if not cohort:
+            raise ValueError(f"Cohort not found: {record.cohort_id}")
+        
+        rules = await self.cohort_service.get_stressor_rules(cohort.cohort_id)
+        active_stressors = record.active_stressors
+        stressor_analysis = StressorAnalysis(
+            vin=record.vin,
+            cohort_id=cohort.cohort_id,
+            active_stressors=active_stressors,
+            stressor_contributions={
+                rule.stressor: rule.lr if record.stressor_mask >> j & 1 else 1.0 for j, rule in enumerate(rules)
+            },
+            combined_likelihood_ratio=record.combined_likelihood_ratio,
+            risk_factors=self.cohort_service._generate_risk_factors(active_stressors, cohort)
+        )
+        
+        return self._assemble_risk_score_output(
+            record.vin, cohort, record.cohort_match_confidence, stressor_analysis, record.risk_score,
+            record.confidence, record.data_freshness, record.context.scored_at,
+            record.context.calculation_time_ms
+        )
+    
     def _bayesian_update(self, prior: float, likelihood_ratio: float) -> float:
         """
         Apply Bayesian update using likelihood ratio form
@@ -336,6 +753,13 @@ class BayesianRiskEngineV2:
         # Ensure bounds and handle edge cases
         return max(0.001, min(0.999, posterior_prob))
     
+    def _bayesian_update_array(self, prior: np.ndarray, likelihood_ratio: np.ndarray) -> np.ndarray:
+        """Vectorized _bayesian_update over whole columns (same operation order)"""
+        prior_odds = prior / (1 - prior + 1e-10)
+        posterior_odds = prior_odds * likelihood_ratio
+        posterior_prob = posterior_odds / (1 + posterior_odds)
+        return np.clip(posterior_prob, 0.001, 0.999)
+    
     def _classify_severity(self, risk_score: float) -> SeverityBucket:
         """Enhanced severity classification based on Ford lead-acid battery research"""
         # Thresholds based on Ford battery research and BCI lead-acid failure data
@@ -437,6 +861,32 @@ class BayesianRiskEngineV2:
         
         return max(0.3, min(1.0, confidence))
     
+    def _calculate_confidence_array(
+        self,
+        cohort_confidence: np.ndarray,
+        data_freshness: np.ndarray,
+        soc_30day_trend: np.ndarray,
+        trip_cycles_weekly: np.ndarray,
+        active_counts: np.ndarray,
+        prior: np.ndarray,
+        combined_lr: np.ndarray
+    ) -> np.ndarray:
+        """Vectorized _calculate_confidence/_assess_data_quality over whole columns (same operation order)"""
+        # Data quality (completeness is always 1.0: the input schema requires every field)
+        quality = np.ones(len(cohort_confidence), dtype=np.float64)
+        quality = np.where(data_freshness > 48, quality * 0.9, quality)
+        quality = np.where(data_freshness > 168, quality * 0.8, quality)
+        quality = np.where(np.abs(soc_30day_trend) > 0.5, quality * 0.9, quality)
+        quality = np.where(trip_cycles_weekly > 100, quality * 0.9, quality)
+        
+        confidence = cohort_confidence * quality
+        confidence = np.where(active_counts >= 3, confidence * 1.1, confidence)
+        confidence = np.where(active_counts == 0, confidence * 0.8, confidence)
+        confidence = np.where((prior < 0.02) | (prior > 0.30), confidence * 0.9, confidence)
+        confidence = np.where((combined_lr > 5.0) | (combined_lr < 0.2), confidence * 0.85, confidence)
+        
+        return np.clip(confidence, 0.3, 1.0)
+    
     def _assess_data_quality(self, input_data: VehicleInputData) -> float:
         """Assess quality of input data"""
         quality_score = 1.0
@@ -476,7 +926,7 @@ class BayesianRiskEngineV2:
             if stressor in cohort.likelihood_ratios:
                 sources.append(cohort.likelihood_ratios[stressor].source)
         
-        return list(set(sources))  # Remove duplicates
+        return list(dict.fromkeys(sources))  # Remove duplicates, keep citation order
     
     def _calculate_data_freshness(self, timestamp: datetime) -> int:
         """Calculate hours since data timestamp"""
@@ -539,30 +989,51 @@ class BatchBayesianProcessorV2:
     Enhanced batch processor with cohort-aware processing
     """
     
-    def __init__(self, engine: BayesianRiskEngineV2, batch_size: int = 1000):
+    def __init__(
+        self,
+        engine: BayesianRiskEngineV2,
+        batch_size: int = 1000,
+        fingerprint_store: Optional[ScoreFingerprintStore] = None,
+        max_concurrency: int = 100
+    ):
         self.engine = engine
         self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        self.executor = BoundedBatchExecutor(
+            chunk_size=batch_size, max_in_flight=max_concurrency, name=self.__class__.__name__
+        )
+        self.fingerprint_store = fingerprint_store  # Enables delta (changed-VIN-only) runs
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
     
     async def process_batch(self, vehicles: List[VehicleInputData]) -> List[RiskScoreOutput]:
         """Process batch with cohort-aware optimization"""
         start_time = datetime.utcnow()
         
-        # Group vehicles by likely cohort for optimization
+        # Delta mode: only score VINs whose inputs, cohorts or model changed
+        partition = None
+        if self.fingerprint_store:
+            await self.engine.cohort_service.get_all_cohorts()  # Ensures database_version is loaded
+            partition = await self.fingerprint_store.partition(
+                vehicles, self.engine.cohort_service.database_version, self.engine.model_version
+            )
+            vehicles = partition.changed
+        
+        # Group vehicles by cohort, keeping each vehicle's resolution for scoring
         cohort_groups = await self._group_by_cohort(vehicles)
         
         results = []
         for cohort_id, vehicle_group in cohort_groups.items():
             self.logger.info(f"Processing {len(vehicle_group)} vehicles for cohort {cohort_id}")
             
-            # Process cohort group
-            tasks = [self.engine.calculate_risk_score(vehicle) for vehicle in vehicle_group]
-            group_results = await asyncio.gather(*tasks, return_exceptions=True)
+            # Process cohort group in chunks of batch_size, reusing the match made during grouping
+            group_results = await self.executor.run(
+                vehicle_group, lambda pair: self.engine.calculate_risk_score(*pair)
+            )
             
             # Handle exceptions
             for i, result in enumerate(group_results):
                 if isinstance(result, Exception):
-                    self.logger.error(f"Failed to process VIN {vehicle_group[i].vin}: {str(result)}")
+                    self.logger.error(f"Failed to process VIN {vehicle_group[i][0].vin}: {str(result)}")
                 else:
                     results.append(result)
         
@@ -572,25 +1043,68 @@ class BatchBayesianProcessorV2:
         self.logger.info(f"Processed {len(results)} vehicles in {processing_time:.2f}s "
                         f"({rate:.0f} vehicles/second) across {len(cohort_groups)} cohorts")
         
+        if partition:
+            await self.fingerprint_store.record(results, partition.fingerprints, vehicles)
+            results = partition.merge(results)
+        
         return results
     
-    async def _group_by_cohort(self, vehicles: List[VehicleInputData]) -> Dict[str, List[VehicleInputData]]:
-        """Group vehicles by likely cohort for batch optimization"""
+    async def process_batch_records(self, vehicles: List[VehicleInputData]) -> List[RiskScoreRecord]:
+        """
+        Score a batch as arrays and return compact records instead of pydantic outputs
+        
+        For fleet-scale runs; convert single records with
+        engine.to_risk_score_output() when a VIN is served through the API.
+        """
+        start_time = datetime.utcnow()
+        
+        columns = await self.engine.columns_from_vehicles(vehicles)
+        scores = await self.engine.calculate_risk_scores_columnar(columns)
+        records = self.engine.build_risk_score_records(scores, vehicles, scored_at=start_time)
+        
+        processing_time = (datetime.utcnow() - start_time).total_seconds()
+        rate = len(records) / processing_time if processing_time > 0 else 0
+        self.logger.info(f"Scored {len(records)} vehicles as compact records in {processing_time:.2f}s "
+                         f"({rate:.0f} vehicles/second)")
+        return records
+    
+    async def process_by_priority(
+        self,
+        vehicles: List[VehicleInputData],
+        scheduler: Optional[PriorityLaneScheduler] = None
+    ) -> AsyncIterator[Tuple[str, List[RiskScoreOutput]]]:
+        """
+        Score a batch lane by lane (critical, high, standard), yielding each
+        lane's results as soon as it finishes so early lanes can be published
+        while later ones are still running
+        """
+        scheduler = scheduler or PriorityLaneScheduler(self.fingerprint_store)
+        
+        for lane in await scheduler.plan(vehicles):
+            lane_start = datetime.utcnow()
+            results = await self.process_batch(lane.vehicles)
+            
+            lane_time = (datetime.utcnow() - lane_start).total_seconds()
+            self.logger.info(f"Priority lane {lane.name}: {len(results)} results in {lane_time:.2f}s")
+            yield lane.name, results
+    
+    async def _group_by_cohort(
+        self, vehicles: List[VehicleInputData]
+    ) -> Dict[str, List[Tuple[VehicleInputData, CohortResolution]]]:
+        """Group vehicles by matched cohort for batch optimization"""
         cohort_groups = {}
         
         for vehicle in vehicles:
-            # Quick cohort prediction (simplified)
-            likely_cohort = await self._predict_cohort(vehicle)
+            resolution = await self._predict_cohort(vehicle)
+            likely_cohort = resolution.cohort.cohort_id
             
             if likely_cohort not in cohort_groups:
                 cohort_groups[likely_cohort] = []
             
-            cohort_groups[likely_cohort].append(vehicle)
+            cohort_groups[likely_cohort].append((vehicle, resolution))
         
         return cohort_groups
     
-    async def _predict_cohort(self, vehicle: VehicleInputData) -> str:
-        """Quickly predict likely cohort without full analysis"""
-        # This could be optimized with ML models in production
-        cohort_match = await self.engine.cohort_service.match_cohort(vehicle.vin)
-        return cohort_match.matched_cohort_id 
\ No newline at end of file
+    async def _predict_cohort(self, vehicle: VehicleInputData) -> CohortResolution:
+        """Match the vehicle's cohort once; the resolution is reused for scoring"""
+        return await self.engine.cohort_service.resolve_cohort(vehicle.vin, vehicle)
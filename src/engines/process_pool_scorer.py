@@ -0,0 +1,232 @@
+"""
+Ford Bayesian Risk Score Engine - Process Pool Scorer
+
+Multi-core backend for CPU-bound batch scoring:
+- Worker processes load cohorts.json once and keep a warm CohortService and
+  BayesianRiskEngineV2 for their whole lifetime
+- Batches are sorted by the VIN characters cohort matching reads (model code
+  and model year) and cut into shards, so shards stay cohort-homogeneous and
+  every core gets work even when one cohort dominates the fleet
+- Workers match cohorts as well as scoring, so the parent does no per-VIN
+  cohort matching
+- Shards travel as NumPy input columns and come back as compact result
+  arrays (cohort, match confidence, posterior, severity, combined LR, active
+  stressor mask); no pydantic objects are pickled in either direction
+- Results are reassembled in input order as a ColumnarRiskScores
+"""
+
+import asyncio
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from ..models.schemas import VehicleInputData
+from ..services.cohort_service import CohortService
+from .bayesian_engine_v2 import BayesianRiskEngineV2, VehicleColumns, ColumnarRiskScores
+
+
+logger = logging.getLogger(__name__)
+
+
+# Per-process state, set once by _init_worker
+_worker_loop: Optional[asyncio.AbstractEventLoop] = None
+_worker_engine: Optional[BayesianRiskEngineV2] = None
+
+# VIN positions cohort matching decodes: model code (4-8) and model year (10)
+MATCH_KEY_POSITIONS = [3, 4, 5, 6, 7, 9]
+VIN_LENGTH = 17
+
+# (cohort_index, match confidence, posterior, severity_index, combined_lr, active_mask, cohort database version)
+ShardResult = Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, str]
+
+
+async def _build_worker_engine(cohorts_file: str) -> BayesianRiskEngineV2:
+    """Create the worker's engine and wait for its cohort load to finish"""
+    return await BayesianRiskEngineV2(CohortService(cohorts_file=cohorts_file)).ready()
+
+
+def _init_worker(cohorts_file: str) -> None:
+    """ProcessPoolExecutor initializer: warm engine and event loop for this process"""
+    global _worker_loop, _worker_engine
+    _worker_loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(_worker_loop)
+    _worker_engine = _worker_loop.run_until_complete(_build_worker_engine(cohorts_file))
+    logger.info(f"Scoring worker {os.getpid()} ready "
+                f"(cohort database {_worker_engine.cohort_service.database_version})")
+
+
+async def _match_and_score(
+    vins: np.ndarray,
+    soc_30day_trend: np.ndarray,
+    trip_cycles_weekly: np.ndarray,
+    climate_stress_index: np.ndarray,
+    maintenance_compliance: np.ndarray
+) -> ColumnarRiskScores:
+    cohort_index, match_confidence, _ = await _worker_engine.match_cohort_columns(vins.tolist())
+    columns = VehicleColumns(
+        soc_30day_trend=soc_30day_trend,
+        trip_cycles_weekly=trip_cycles_weekly,
+        climate_stress_index=climate_stress_index,
+        maintenance_compliance=maintenance_compliance,
+        cohort_index=cohort_index,
+        cohort_match_confidence=match_confidence
+    )
+    return await _worker_engine.calculate_risk_scores_columnar(columns)
+
+
+def _score_shard(
+    vins: np.ndarray,
+    soc_30day_trend: np.ndarray,
+    trip_cycles_weekly: np.ndarray,
+    climate_stress_index: np.ndarray,
+    maintenance_compliance: np.ndarray
+) -> ShardResult:
+    """Match and score one shard in a worker process and return only the result arrays"""
+    scores = _worker_loop.run_until_complete(_match_and_score(
+        vins, soc_30day_trend, trip_cycles_weekly, climate_stress_index, maintenance_compliance
+    ))
+    
+    return (
+        scores.cohort_index,
+        scores.cohort_match_confidence,
+        scores.posterior_probability,
+        scores.severity_index,
+        scores.combined_likelihood_ratio,
+        scores.active_mask,
+        _worker_engine.cohort_service.database_version
+    )
+
+
+class ProcessPoolScorer:
+    """
+    Shards columnar batch scoring by cohort across worker processes
+    """
+    
+    def __init__(
+        self,
+        engine: BayesianRiskEngineV2,
+        max_workers: Optional[int] = None,
+        shard_size: int = 50000,
+        cohorts_file: Optional[str] = None
+    ):
+        if shard_size < 1:
+            raise ValueError("shard_size must be at least 1")
+        
+        self.engine = engine  # Parent-side engine: cohort tables, metadata and result materialization
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.shard_size = shard_size  # Upper bound on rows per shard (bounds pickled payload size)
+        self.cohorts_file = str(cohorts_file or engine.cohort_service.cohorts_file)
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        
+        self._pool: Optional[ProcessPoolExecutor] = None
+    
+    def start(self) -> None:
+        """Start the worker processes (done lazily on first use)"""
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_init_worker,
+                initargs=(self.cohorts_file,)
+            )
+            self.logger.info(f"Started {self.max_workers} scoring workers for {self.cohorts_file}")
+    
+    def shutdown(self) -> None:
+        """Stop the worker processes"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+    
+    async def score_vehicles(self, vehicles: List[VehicleInputData]) -> ColumnarRiskScores:
+        """
+        Match cohorts and score a batch across the pool; rows come back in input order
+    
+        Workers match from the VIN alone, which is all CohortService reads from
+        VehicleInputData.
+        """
+        cohorts = await self.engine.cohort_service.get_all_cohorts()
+        expected_version = self.engine.cohort_service.database_version
+        n = len(vehicles)
+        
+        rule_tables = [await self.engine.cohort_service.get_stressor_rules(c.cohort_id) for c in cohorts]
+        max_slots = max((len(rules) for rules in rule_tables), default=0)
+        
+        cohort_index = np.zeros(n, dtype=np.int32)
+        match_confidence = np.empty(n, dtype=np.float64)
+        posterior = np.empty(n, dtype=np.float64)
+        severity_index = np.empty(n, dtype=np.int8)
+        combined_lr = np.empty(n, dtype=np.float64)
+        active_mask = np.zeros((n, max_slots), dtype=bool)
+        vins = [v.vin for v in vehicles]
+        
+        if n:
+            self.start()
+            loop = asyncio.get_running_loop()
+            vin_array = np.array(vins, dtype=f"U{VIN_LENGTH}")
+            soc = np.array([v.soc_30day_trend for v in vehicles], dtype=np.float64)
+            trips = np.array([v.trip_cycles_weekly for v in vehicles], dtype=np.float64)
+            climate = np.array([v.climate_stress_index for v in vehicles], dtype=np.float64)
+            maintenance = np.array([v.maintenance_compliance for v in vehicles], dtype=np.float64)
+            
+            shards = self._plan_shards(vin_array)
+            shard_results = await asyncio.gather(*(
+                loop.run_in_executor(
+                    self._pool, _score_shard,
+                    vin_array[rows], soc[rows], trips[rows], climate[rows], maintenance[rows]
+                )
+                for rows in shards
+            ))
+            
+            for rows, shard_result in zip(shards, shard_results):
+                shard_cohorts, shard_confidence, shard_posterior, shard_severity, shard_lr, shard_mask, version = shard_result
+                if version != expected_version:
+                    raise RuntimeError(
+                        f"Scoring worker cohort database {version} does not match {expected_version}; "
+                        f"restart the pool after reloading cohorts"
+                    )
+                cohort_index[rows] = shard_cohorts
+                match_confidence[rows] = shard_confidence
+                posterior[rows] = shard_posterior
+                severity_index[rows] = shard_severity
+                combined_lr[rows] = shard_lr
+                active_mask[rows, :shard_mask.shape[1]] = shard_mask
+            
+            self.logger.info(f"Scored {n} vehicles in {len(shards)} shards across {self.max_workers} workers")
+        
+        # Rebuild the remaining per-row arrays from the parent's cohort tables
+        lr_table = np.ones((len(cohorts), max_slots), dtype=np.float64)
+        for c, rules in enumerate(rule_tables):
+            for j, rule in enumerate(rules):
+                lr_table[c, j] = rule.lr
+        
+        return ColumnarRiskScores(
+            cohort_ids=[cohort.cohort_id for cohort in cohorts],
+            stressor_names=[[rule.stressor for rule in rules] for rules in rule_tables],
+            cohort_index=cohort_index,
+            active_mask=active_mask,
+            stressor_contributions=np.where(active_mask, lr_table[cohort_index], 1.0),
+            combined_likelihood_ratio=combined_lr,
+            prior_probability=np.array([cohort.prior for cohort in cohorts], dtype=np.float64)[cohort_index],
+            posterior_probability=posterior,
+            severity_index=severity_index,
+            vins=vins,
+            cohort_match_confidence=match_confidence
+        )
+    
+    def _plan_shards(self, vins: np.ndarray) -> List[np.ndarray]:
+        """
+        Sort row positions by cohort match key and cut them into shards
+        
+        VINs sharing a match key always match the same cohort, so each shard
+        covers few cohorts; shards are sized so there are at least as many
+        shards as workers.
+        """
+        n = len(vins)
+        target = min(self.shard_size, max(1, -(-n // self.max_workers)))
+        
+        characters = vins.view("U1").reshape(n, VIN_LENGTH)[:, MATCH_KEY_POSITIONS]
+        order = np.lexsort(characters.T[::-1])
+        return [order[start:start + target] for start in range(0, n, target)]
+        
\ No newline at end of file
@@ -0,0 +1,128 @@
+"""
+Ford Bayesian Risk Score Engine - Bounded Batch Executor
+
+Chunked, bounded-concurrency execution for batch scoring:
+- Walks the batch in chunks of `chunk_size` items
+- Keeps at most `max_in_flight` coroutines alive at any time
+- Reports progress after every chunk (log line plus optional callback)
+- Returns results aligned with the inputs, exceptions in place of failures
+  (same contract as asyncio.gather(..., return_exceptions=True))
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, AsyncIterator, Awaitable, Callable, List, Optional, Sequence, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ChunkProgress:
+    """Progress snapshot emitted after each chunk"""
+    chunk_index: int
+    total_chunks: int
+    completed_items: int
+    total_items: int
+    failed_items: int
+    elapsed_seconds: float
+    
+    @property
+    def items_per_second(self) -> float:
+        return self.completed_items / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+
+class BoundedBatchExecutor:
+    """
+    Runs an async worker over a batch without creating one task per item
+    """
+    
+    def __init__(
+        self,
+        chunk_size: int = 1000,
+        max_in_flight: int = 100,
+        progress_callback: Optional[Callable[[ChunkProgress], Any]] = None,
+        name: str = "batch"
+    ):
+        if chunk_size < 1 or max_in_flight < 1:
+            raise ValueError("chunk_size and max_in_flight must be at least 1")
+        
+        self.chunk_size = chunk_size
+        self.max_in_flight = max_in_flight
+        self.progress_callback = progress_callback
+        self.name = name
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+    
+    async def run(self, items: Sequence, worker: Callable[[Any], Awaitable[Any]]) -> List[Any]:
+        """Process every item; results (or exceptions) are returned in input order"""
+        results = []
+        async for _, chunk_results in self.map_chunks(items, worker):
+            results.extend(chunk_results)
+        return results
+    
+    async def map_chunks(
+        self,
+        items: Sequence,
+        worker: Callable[[Any], Awaitable[Any]]
+    ) -> AsyncIterator[Tuple[Sequence, List[Any]]]:
+        """Yield (chunk_items, chunk_results) as each chunk completes"""
+        total_items = len(items)
+        total_chunks = (total_items + self.chunk_size - 1) // self.chunk_size
+        start_time = datetime.utcnow()
+        completed = 0
+        failed = 0
+        
+        for chunk_index in range(total_chunks):
+            chunk = items[chunk_index * self.chunk_size:(chunk_index + 1) * self.chunk_size]
+            chunk_results = await self._run_chunk(chunk, worker)
+            
+            completed += len(chunk)
+            failed += sum(1 for result in chunk_results if isinstance(result, Exception))
+            
+            progress = ChunkProgress(
+                chunk_index=chunk_index + 1,
+                total_chunks=total_chunks,
+                completed_items=completed,
+                total_items=total_items,
+                failed_items=failed,
+                elapsed_seconds=(datetime.utcnow() - start_time).total_seconds()
+            )
+            await self._report(progress)
+            
+            yield chunk, chunk_results
+    
+    async def _run_chunk(self, chunk: Sequence, worker: Callable[[Any], Awaitable[Any]]) -> List[Any]:
+        """Drain one chunk with a fixed pool of `max_in_flight` runner coroutines"""
+        results: List[Any] = [None] * len(chunk)
+        next_index = 0
+        
+        async def runner():
+            nonlocal next_index
+            while next_index < len(chunk):
+                index = next_index
+                next_index += 1
+                try:
+                    results[index] = await worker(chunk[index])
+                except Exception as e:
+                    results[index] = e
+        
+        await asyncio.gather(*(runner() for _ in range(min(self.max_in_flight, len(chunk)))))
+        return results
+    
+    async def _report(self, progress: ChunkProgress) -> None:
+        """Log progress and notify the optional callback"""
+        self.logger.info(
+            f"{self.name}: chunk {progress.chunk_index}/{progress.total_chunks} - "
+            f"{progress.completed_items}/{progress.total_items} items "
+            f"({progress.failed_items} failed, {progress.items_per_second:.0f}/s)"
+        )
+        
+        if self.progress_callback:
+            try:
+                outcome = self.progress_callback(progress)
+                if asyncio.iscoroutine(outcome):
+                    await outcome
+            except Exception as e:
+                self.logger.warning(f"Progress callback failed: {str(e)}")
@@ -9,12 +9,14 @@ Production-ready cohort management service that:
 """
 
 import json
+import hashlib
 import logging
 import asyncio
 from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 from datetime import datetime
 import re
+import operator
 from dataclasses import dataclass
 import redis.asyncio as redis
 
@@ -28,6 +30,64 @@ from ..models.schemas import VehicleInputData
 logger = logging.getLogger(__name__)
 
 
+# Stressor activation rules, checked in order: (name patterns, input field, comparator, threshold)
+STRESSOR_RULES: List[Tuple[Tuple[str, ...], str, str, float]] = [
+    # Temperature-related stressors (climate_stress_index as temperature proxy)
+    (("temp_delta_high",), "climate_stress_index", ">", 0.6),
+    (("temp_extreme_hot",), "climate_stress_index", ">", 0.8),
+    (("cold_extreme",), "climate_stress_index", ">", 0.7),  # Cold stress proxy
+    
+    # Trip-related stressors (high frequency = short trips)
+    (("short_trip", "trip_duration_low"), "trip_cycles_weekly", ">", 45),
+    (("ignition_cycles_high",), "trip_cycles_weekly", ">", 40),
+    
+    # Usage pattern stressors (SOC trend as proxy for insufficient recharge time)
+    (("ign_off_to_on_under_1hr",), "soc_30day_trend", "<", -0.1),
+    (("maintenance_deferred",), "maintenance_compliance", "<", 0.7),
+]
+
+COMPARATORS = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+}
+
+
+@dataclass(frozen=True)
+class StressorRule:
+    """Compiled activation rule for one cohort stressor"""
+    stressor: str
+    field: Optional[str]  # None when no rule covers this stressor (never fires)
+    comparator: Optional[str]
+    threshold: Optional[float]
+    lr: float
+    
+    def is_active(self, input_data) -> bool:
+        """Evaluate the rule against one vehicle's inputs"""
+        if self.field is None:
+            return False
+        return bool(COMPARATORS[self.comparator](getattr(input_data, self.field), self.threshold))
+
+
+def compile_stressor_rules(
+    likelihood_ratios: Dict[str, float],
+    rules: List[Tuple[Tuple[str, ...], str, str, float]] = STRESSOR_RULES
+) -> List[StressorRule]:
+    """Compile a cohort's stressor -> LR mapping into an ordered rule table"""
+    table = []
+    for stressor_name, lr in likelihood_ratios.items():
+        name = stressor_name.lower()
+        for patterns, field, comparator, threshold in rules:
+            if any(pattern in name for pattern in patterns):
+                table.append(StressorRule(stressor_name, field, comparator, threshold, lr))
+                break
+        else:
+            logger.warning(f"No activation rule for stressor {stressor_name}; it will never fire")
+            table.append(StressorRule(stressor_name, None, None, None, lr))
+    return table
+
+
 @dataclass
 class VehicleProfile:
     """Extracted vehicle profile for cohort matching"""
@@ -40,6 +100,30 @@ class VehicleProfile:
     powertrain: str = "Gas"  # Default assumption
 
 
+# (make, model, year, region, estimated_class)
+MatchKey = Tuple[str, str, int, Optional[str], Optional[str]]
+
+
+@dataclass(frozen=True)
+class CohortIndexEntry:
+    """Precomputed cohort match for one vehicle profile key"""
+    cohort_id: str
+    confidence: float
+    fallback_used: bool
+
+
+@dataclass
+class CohortResolution:
+    """Request-scoped cohort match, carried through scoring so a VIN is matched once"""
+    match: CohortMatchResult
+    cohort: CohortDefinition
+    profile: VehicleProfile
+    
+    @property
+    def confidence(self) -> float:
+        return self.match.confidence
+
+
 class CohortService:
     """
     Production cohort management service with academic-sourced data
@@ -49,6 +133,7 @@ class CohortService:
         self.cohorts_file = Path(cohorts_file)
         self.redis_client = redis_client
         self.cohort_database: Optional[CohortDatabase] = None
+        self.database_version: Optional[str] = None
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
         
         # Region mapping for ZIP codes (simplified - could be expanded)
@@ -83,6 +168,31 @@ class CohortService:
             "Hybrid": ["Prius", "Fusion Hybrid", "Escape Hybrid"]
         }
     
+        # VIN model code mapping, positions 1-5 (simplified)
+        self.model_code_mapping = {
+            "1FTFW": "F-150",
+            "1FTRE": "Ranger", 
+            "1FTBF": "Super Duty",
+            "1FMSK": "Escape",
+            "1FMHK": "Explorer",
+            "1FMJK": "Expedition",
+            "3FA6P": "Fusion",
+            "1FADP": "Focus"
+        }
+        
+        # VIN model year mapping, position 10 (simplified)
+        self.year_mapping = {
+            'A': 2010, 'B': 2011, 'C': 2012, 'D': 2013, 'E': 2014,
+            'F': 2015, 'G': 2016, 'H': 2017, 'J': 2018, 'K': 2019,
+            'L': 2020, 'M': 2021, 'N': 2022, 'P': 2023, 'R': 2024
+        }
+        
+        # Compiled match index: profile key -> winning cohort, rebuilt on every load
+        self._match_index: Dict[MatchKey, CohortIndexEntry] = {}
+        
+        # Compiled stressor rule tables: cohort_id -> rules in likelihood_ratios order
+        self._rule_tables: Dict[str, List[StressorRule]] = {}
+    
     async def initialize(self) -> None:
         """Initialize the cohort service by loading and validating data"""
         try:
@@ -99,11 +209,23 @@ class CohortService:
         
         try:
             with open(self.cohorts_file, 'r') as f:
-                data = json.load(f)
+                raw = f.read()
+            data = json.loads(raw)
             
             # Validate and create cohort database
             self.cohort_database = CohortDatabase(**data)
             
+            # Content-derived version: any edit to cohorts.json invalidates delta fingerprints
+            content_hash = hashlib.sha256(raw.encode()).hexdigest()[:12]
+            self.database_version = f"{self.cohort_database.metadata.get('version', 'unknown')}:{content_hash}"
+            self._build_match_index()
+            self._rule_tables = {
+                cohort.cohort_id: compile_stressor_rules(
+                    {name: lr_def.value for name, lr_def in cohort.likelihood_ratios.items()}
+                )
+                for cohort in self.cohort_database.cohorts
+            }
+            
             # Cache in Redis if available
             if self.redis_client:
                 await self.redis_client.set(
@@ -152,31 +274,13 @@ class CohortService:
         
         year_char = vin[9].upper()
         
-        # VIN year mapping (simplified)
-        year_mapping = {
-            'A': 2010, 'B': 2011, 'C': 2012, 'D': 2013, 'E': 2014,
-            'F': 2015, 'G': 2016, 'H': 2017, 'J': 2018, 'K': 2019,
-            'L': 2020, 'M': 2021, 'N': 2022, 'P': 2023, 'R': 2024
-        }
-        
-        return year_mapping.get(year_char, 2020)
+        return self.year_mapping.get(year_char, 2020)
     
     def _infer_model_from_code(self, model_code: str) -> str:
         """Infer model from VIN model code (simplified)"""
         # This would be much more sophisticated in production
-        code_mapping = {
-            "1FTFW": "F-150",
-            "1FTRE": "Ranger", 
-            "1FTBF": "Super Duty",
-            "1FMSK": "Escape",
-            "1FMHK": "Explorer",
-            "1FMJK": "Expedition",
-            "3FA6P": "Fusion",
-            "1FADP": "Focus"
-        }
-        
         # Try partial matches
-        for code, model in code_mapping.items():
+        for code, model in self.model_code_mapping.items():
             if model_code.startswith(code[:4]):
                 return model
         
@@ -202,14 +306,36 @@ class CohortService:
                 return vehicle_class
         return None
     
-    async def match_cohort(self, vin: str, input_data: Optional[VehicleInputData] = None) -> CohortMatchResult:
-        """Match a vehicle to the most appropriate cohort"""
-        if not self.cohort_database:
-            await self.initialize()
-        
-        # Extract vehicle profile
-        profile = self._extract_vehicle_profile(vin, input_data)
-        
+    def _match_key(self, profile: VehicleProfile) -> MatchKey:
+        """Index key for a vehicle profile"""
+        return (profile.make, profile.model, profile.year, profile.region, profile.estimated_class)
+        
+    def _build_match_index(self) -> None:
+        """Precompute the winning cohort for every profile the VIN decoder can produce"""
+        self._match_index = {}
+        
+        models = set(self.model_code_mapping.values()) | {"F-150"}
+        for cohort in self.cohort_database.cohorts:
+            models.update(cohort.models)
+        years = set(self.year_mapping.values()) | {2020}
+        for cohort in self.cohort_database.cohorts:
+            years.update(cohort.years_supported)
+        regions = set(self.zip_to_region.values()) | {None}
+        
+        for model in models:
+            estimated_class = self._infer_vehicle_class(model)
+            for year in years:
+                for region in regions:
+                    profile = VehicleProfile(
+                        make="Ford", model=model, year=year, vin="",
+                        region=region, estimated_class=estimated_class
+                    )
+                    self._match_index[self._match_key(profile)] = self._resolve_match(profile)
+        
+        self.logger.info(f"Built cohort match index with {len(self._match_index)} entries")
+    
+    def _resolve_match(self, profile: VehicleProfile) -> CohortIndexEntry:
+        """Run the full candidate search and scoring for one profile"""
         # Find matching cohorts
         candidates = self.cohort_database.find_cohorts_by_criteria(
             make=profile.make,
@@ -236,11 +362,41 @@ class CohortService:
         best_match = self._score_cohort_matches(profile, candidates)
         confidence = self._calculate_match_confidence(profile, best_match, len(candidates))
         
-        return CohortMatchResult(
-            vin=vin,
-            matched_cohort_id=best_match.cohort_id,
+        return CohortIndexEntry(
+            cohort_id=best_match.cohort_id,
             confidence=confidence,
-            fallback_used=fallback_used,
+            fallback_used=fallback_used
+        )
+    
+    async def match_cohort(self, vin: str, input_data: Optional[VehicleInputData] = None) -> CohortMatchResult:
+        """Match a vehicle to the most appropriate cohort"""
+        resolution = await self.resolve_cohort(vin, input_data)
+        return resolution.match
+    
+    async def resolve_cohort(self, vin: str, input_data: Optional[VehicleInputData] = None) -> CohortResolution:
+        """Match a vehicle once and return the match, cohort definition and profile together"""
+        if not self.cohort_database:
+            await self.initialize()
+        
+        # Extract vehicle profile
+        profile = self._extract_vehicle_profile(vin, input_data)
+        
+        # One dict lookup; profiles outside the precomputed domain are resolved once and memoized
+        key = self._match_key(profile)
+        entry = self._match_index.get(key)
+        if entry is None:
+            entry = self._resolve_match(profile)
+            self._match_index[key] = entry
+        
+        cohort = self.cohort_database.get_cohort_by_id(entry.cohort_id)
+        if not cohort:
+            raise ValueError(f"Cohort not found: {entry.cohort_id}")
+        
+        match = CohortMatchResult(
+            vin=vin,
+            matched_cohort_id=entry.cohort_id,
+            confidence=entry.confidence,
+            fallback_used=entry.fallback_used,
             match_criteria={
                 "make": profile.make,
                 "model": profile.model,
@@ -249,6 +405,8 @@ class CohortService:
                 "vehicle_class": profile.estimated_class or "unknown"
             }
         )
+        
+        return CohortResolution(match=match, cohort=cohort, profile=profile)
     
     def _score_cohort_matches(self, profile: VehicleProfile, candidates: List[CohortDefinition]) -> CohortDefinition:
         """Score cohort candidates and return best match"""
@@ -298,31 +456,30 @@ class CohortService:
         
         return min(1.0, confidence)
     
-    async def analyze_vehicle_stressors(self, vin: str, input_data: VehicleInputData) -> StressorAnalysis:
+    async def analyze_vehicle_stressors(
+        self,
+        vin: str,
+        input_data: VehicleInputData,
+        resolution: Optional[CohortResolution] = None
+    ) -> StressorAnalysis:
         """Analyze vehicle stressors using cohort-specific likelihood ratios"""
-        # Get cohort match
-        cohort_match = await self.match_cohort(vin, input_data)
-        cohort = self.cohort_database.get_cohort_by_id(cohort_match.matched_cohort_id)
+        # Reuse the caller's cohort match when one was already made
+        if resolution is None:
+            resolution = await self.resolve_cohort(vin, input_data)
+        cohort = resolution.cohort
         
-        if not cohort:
-            raise ValueError(f"Cohort not found: {cohort_match.matched_cohort_id}")
-        
-        # Analyze each stressor
+        # Evaluate the cohort's compiled rule table
         active_stressors = []
         stressor_contributions = {}
-        
-        for stressor_name, lr_def in cohort.likelihood_ratios.items():
-            is_active, contribution = self._evaluate_stressor(stressor_name, lr_def, input_data)
-            
-            stressor_contributions[stressor_name] = contribution
-            
-            if is_active:
-                active_stressors.append(stressor_name)
-        
-        # Calculate combined likelihood ratio
         combined_lr = 1.0
-        for stressor in active_stressors:
-            combined_lr *= cohort.likelihood_ratios[stressor].value
+        
+        for rule in self._rule_tables[cohort.cohort_id]:
+            if rule.is_active(input_data):
+                active_stressors.append(rule.stressor)
+                stressor_contributions[rule.stressor] = rule.lr
+                combined_lr *= rule.lr
+            else:
+                stressor_contributions[rule.stressor] = 1.0
         
         # Generate human-readable risk factors
         risk_factors = self._generate_risk_factors(active_stressors, cohort)
@@ -336,54 +493,6 @@ class CohortService:
             risk_factors=risk_factors
         )
     
-    def _evaluate_stressor(self, stressor_name: str, lr_def, input_data: VehicleInputData) -> Tuple[bool, float]:
-        """Evaluate if a specific stressor is active for this vehicle"""
-        # Temperature-related stressors
-        if "temp_delta_high" in stressor_name:
-            # Would need temperature data - using climate_stress_index as proxy
-            is_active = input_data.climate_stress_index > 0.6
-            contribution = lr_def.value if is_active else 1.0
-            return is_active, contribution
-        
-        elif "temp_extreme_hot" in stressor_name:
-            is_active = input_data.climate_stress_index > 0.8
-            contribution = lr_def.value if is_active else 1.0
-            return is_active, contribution
-        
-        elif "cold_extreme" in stressor_name:
-            is_active = input_data.climate_stress_index > 0.7  # Cold stress proxy
-            contribution = lr_def.value if is_active else 1.0
-            return is_active, contribution
-        
-        # Trip-related stressors
-        elif "short_trip" in stressor_name or "trip_duration_low" in stressor_name:
-            is_active = input_data.trip_cycles_weekly > 45  # High frequency = short trips
-            contribution = lr_def.value if is_active else 1.0
-            return is_active, contribution
-        
-        elif "ignition_cycles_high" in stressor_name:
-            is_active = input_data.trip_cycles_weekly > 40
-            contribution = lr_def.value if is_active else 1.0
-            return is_active, contribution
-        
-        # Usage pattern stressors
-        elif "ign_off_to_on_under_1hr" in stressor_name:
-            # Use SOC trend as proxy for insufficient recharge time
-            is_active = input_data.soc_30day_trend < -0.1
-            contribution = lr_def.value if is_active else 1.0
-            return is_active, contribution
-        
-        elif "maintenance_deferred" in stressor_name:
-            is_active = input_data.maintenance_compliance < 0.7
-            contribution = lr_def.value if is_active else 1.0
-            return is_active, contribution
-        
-        # Default case
-        else:
-            is_active = False
-            contribution = 1.0
-            return is_active, contribution
-    
     def _generate_risk_factors(self, active_stressors: List[str], cohort: CohortDefinition) -> List[str]:
         """Generate human-readable risk factor descriptions"""
         risk_factors = []
@@ -402,6 +511,13 @@ class CohortService:
         
         return self.cohort_database.get_cohort_by_id(cohort_id)
     
+    async def get_stressor_rules(self, cohort_id: str) -> Optional[List[StressorRule]]:
+        """Get the compiled stressor rule table for a cohort"""
+        if not self.cohort_database:
+            await self.initialize()
+        
+        return self._rule_tables.get(cohort_id)
+    
     async def get_all_cohorts(self) -> List[CohortDefinition]:
         """Get all available cohorts"""
         if not self.cohort_database:
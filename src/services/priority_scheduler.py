@@ -0,0 +1,101 @@
+"""
+Ford Bayesian Risk Score Engine - Priority Lane Scheduler
+
+Orders nightly batch work so dealer morning lists are ready early (PRD 03
+"Priority Lanes: Critical vehicles processed first"):
+- Ranks VINs by last known severity from the score fingerprint store
+- Promotes VINs whose inputs moved toward higher risk since the last run
+- Splits the batch into lanes, highest priority first, for a run to score in order
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from ..models.schemas import VehicleInputData, SeverityBucket
+from .score_fingerprint_store import ScoreFingerprintStore, LastKnownState
+
+
+logger = logging.getLogger(__name__)
+
+
+# Lanes in processing order
+PRIORITY_LANES = ["critical", "high", "standard"]
+
+LANE_BY_SEVERITY = {
+    SeverityBucket.SEVERE: "critical",
+    SeverityBucket.CRITICAL: "critical",
+    SeverityBucket.HIGH: "high",
+    SeverityBucket.MODERATE: "standard",
+    SeverityBucket.LOW: "standard"
+}
+
+
+@dataclass
+class PriorityLane:
+    """One tier of a nightly run, ordered by input delta within the lane"""
+    name: str
+    vehicles: List[VehicleInputData] = field(default_factory=list)
+
+
+class PriorityLaneScheduler:
+    """
+    Pre-ranks a batch into priority lanes before any scoring happens
+    """
+    
+    def __init__(
+        self,
+        fingerprint_store: Optional[ScoreFingerprintStore] = None,
+        promotion_threshold: float = 1.0,
+        unknown_lane: str = "high"
+    ):
+        self.fingerprint_store = fingerprint_store
+        self.promotion_threshold = promotion_threshold  # Delta score that moves a VIN up one lane
+        self.unknown_lane = unknown_lane  # Lane for VINs with no scoring history
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        
+        # Risk-direction change that counts as one unit of delta per input
+        self.delta_scales = {
+            "soc_30day_trend": 0.1,         # 10 points deeper SOC decline
+            "trip_cycles_weekly": 10.0,     # 10 more ignition cycles per week
+            "climate_stress_index": 0.1,    # Hotter/colder exposure
+            "maintenance_compliance": 0.1   # Slipping service adherence
+        }
+    
+    def input_delta_score(self, vehicle: VehicleInputData, state: LastKnownState) -> float:
+        """Score how far a VIN's inputs moved toward higher risk since its last run"""
+        scales = self.delta_scales
+        return (
+            max(0.0, state.soc_30day_trend - vehicle.soc_30day_trend) / scales["soc_30day_trend"]
+            + max(0.0, vehicle.trip_cycles_weekly - state.trip_cycles_weekly) / scales["trip_cycles_weekly"]
+            + max(0.0, vehicle.climate_stress_index - state.climate_stress_index) / scales["climate_stress_index"]
+            + max(0.0, state.maintenance_compliance - vehicle.maintenance_compliance) / scales["maintenance_compliance"]
+        )
+    
+    async def plan(self, vehicles: List[VehicleInputData]) -> List[PriorityLane]:
+        """Split a batch into non-empty lanes, highest priority first"""
+        states: Dict[str, LastKnownState] = {}
+        if self.fingerprint_store:
+            states = await self.fingerprint_store.last_known_states([v.vin for v in vehicles])
+        
+        ranked: Dict[str, List] = {lane: [] for lane in PRIORITY_LANES}
+        for vehicle in vehicles:
+            state = states.get(vehicle.vin)
+            if state is None:
+                ranked[self.unknown_lane].append((0.0, vehicle))
+                continue
+            
+            lane_position = PRIORITY_LANES.index(LANE_BY_SEVERITY[state.severity])
+            delta = self.input_delta_score(vehicle, state)
+            if delta >= self.promotion_threshold and lane_position > 0:
+                lane_position -= 1
+            ranked[PRIORITY_LANES[lane_position]].append((delta, vehicle))
+        
+        lanes = []
+        for name in PRIORITY_LANES:
+            entries = sorted(ranked[name], key=lambda entry: entry[0], reverse=True)
+            if entries:
+                lanes.append(PriorityLane(name=name, vehicles=[vehicle for _, vehicle in entries]))
+        
+        self.logger.info("Priority plan: " + ", ".join(f"{lane.name}={len(lane.vehicles)}" for lane in lanes))
+        return lanes
@@ -0,0 +1,252 @@
+"""
+Ford Bayesian Risk Score Engine - Score Fingerprint Store
+
+Change detection for nightly delta rescoring (PRD 03 "only recalculate
+changed vehicles"):
+- Fingerprints each VIN's scoring inputs together with the cohort database
+  version and model version
+- Splits a nightly batch into changed VINs (to score) and unchanged VINs
+  (carry the previous result forward)
+- Keeps fingerprints, last results and a compact last-known state (severity
+  plus scoring inputs, used for priority lanes) in memory, or in Redis when a
+  client is provided
+- Fingerprints, last results and last-known states are per-VIN keys sharing
+  one TTL, so VINs that drop out of the nightly runs age out instead of
+  growing unbounded hashes
+"""
+
+import hashlib
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+import redis.asyncio as redis
+
+from ..models.schemas import VehicleInputData, RiskScoreOutput, SeverityBucket
+
+
+logger = logging.getLogger(__name__)
+
+# Stored VINs outlive a week of missed nightly runs before the VIN is rescored from scratch
+DEFAULT_RESULT_TTL_SECONDS = 8 * 24 * 3600
+
+
+@dataclass
+class DeltaPartition:
+    """A batch split into VINs that need scoring and carried-forward results"""
+    changed: List[VehicleInputData] = field(default_factory=list)
+    carried_forward: List[RiskScoreOutput] = field(default_factory=list)
+    fingerprints: Dict[str, str] = field(default_factory=dict)  # VIN -> fingerprint for this run
+    vins: List[str] = field(default_factory=list)  # Input order of the whole batch
+
+    @property
+    def total_vehicles(self) -> int:
+        return len(self.changed) + len(self.carried_forward)
+
+    def merge(self, fresh_results: Sequence[RiskScoreOutput]) -> List[RiskScoreOutput]:
+        """Fresh and carried-forward results together, in the batch's input order (failed VINs are left out)"""
+        by_vin = {result.vin: result for result in self.carried_forward}
+        by_vin.update((result.vin, result) for result in fresh_results)
+        return [by_vin[vin] for vin in self.vins if vin in by_vin]
+
+
+@dataclass
+class LastKnownState:
+    """Severity and scoring inputs from a VIN's previous scoring run"""
+    severity: SeverityBucket
+    soc_30day_trend: float
+    trip_cycles_weekly: float
+    climate_stress_index: float
+    maintenance_compliance: float
+
+    def encode(self) -> str:
+        return "|".join([
+            self.severity.value,
+            repr(self.soc_30day_trend),
+            repr(self.trip_cycles_weekly),
+            repr(self.climate_stress_index),
+            repr(self.maintenance_compliance)
+        ])
+
+    @classmethod
+    def decode(cls, encoded: str) -> "LastKnownState":
+        severity, soc, trips, climate, maintenance = encoded.split("|")
+        return cls(SeverityBucket(severity), float(soc), float(trips), float(climate), float(maintenance))
+
+
+class ScoreFingerprintStore:
+    """
+    VIN -> scoring-input fingerprint store with the last result and state per VIN
+    """
+
+    def __init__(
+        self,
+        redis_client: Optional[redis.Redis] = None,
+        key_prefix: str = "scoring",
+        result_ttl_seconds: int = DEFAULT_RESULT_TTL_SECONDS
+    ):
+        self.redis_client = redis_client
+        self.fingerprint_key_prefix = f"{key_prefix}:fingerprint:"
+        self.result_key_prefix = f"{key_prefix}:result:"
+        self.state_key_prefix = f"{key_prefix}:state:"
+        self.result_ttl_seconds = result_ttl_seconds  # Applies to fingerprint, result and state alike
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+
+        # In-process store when no Redis client is configured: VIN -> (expires at, value)
+        self._fingerprints: Dict[str, Tuple[float, str]] = {}
+        self._results: Dict[str, Tuple[float, str]] = {}
+        self._states: Dict[str, Tuple[float, str]] = {}
+
+    @staticmethod
+    def fingerprint(input_data: VehicleInputData, cohort_db_version: str, model_version: str) -> str:
+        """
+        Hash everything that can change a VIN's score
+
+        The telemetry timestamp is deliberately excluded: a fresh snapshot with
+        identical values keeps its earlier result.
+        """
+        payload = "|".join([
+            input_data.vin,
+            repr(input_data.soc_30day_trend),
+            repr(input_data.trip_cycles_weekly),
+            repr(input_data.odometer_variance),
+            repr(input_data.climate_stress_index),
+            repr(input_data.maintenance_compliance),
+            input_data.cohort_assignment.cohort_key,
+            cohort_db_version,
+            model_version
+        ])
+        return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+    async def partition(
+        self,
+        vehicles: List[VehicleInputData],
+        cohort_db_version: str,
+        model_version: str
+    ) -> DeltaPartition:
+        """Split a batch into changed vehicles and carried-forward results"""
+        partition = DeltaPartition(vins=[vehicle.vin for vehicle in vehicles])
+        if not vehicles:
+            return partition
+
+        for vehicle in vehicles:
+            partition.fingerprints[vehicle.vin] = self.fingerprint(vehicle, cohort_db_version, model_version)
+
+        stored = await self._get_many(self.fingerprint_key_prefix, self._fingerprints, partition.vins)
+
+        unchanged_vins = []
+        for vehicle, previous in zip(vehicles, stored):
+            if previous is not None and previous == partition.fingerprints[vehicle.vin]:
+                unchanged_vins.append(vehicle.vin)
+            else:
+                partition.changed.append(vehicle)
+
+        # Carry forward stored results; a missing result means the VIN must be rescored
+        if unchanged_vins:
+            by_vin = {vehicle.vin: vehicle for vehicle in vehicles}
+            stored_results = await self._get_many(self.result_key_prefix, self._results, unchanged_vins)
+            for vin, result_json in zip(unchanged_vins, stored_results):
+                if result_json is None:
+                    partition.changed.append(by_vin[vin])
+                else:
+                    partition.carried_forward.append(RiskScoreOutput.parse_raw(result_json))
+
+        self.logger.info(f"Delta partition: {len(partition.changed)} changed, "
+                         f"{len(partition.carried_forward)} carried forward of {len(vehicles)} vehicles")
+        return partition
+
+    async def record(
+        self,
+        results: List[RiskScoreOutput],
+        fingerprints: Dict[str, str],
+        vehicles: Optional[List[VehicleInputData]] = None
+    ) -> None:
+        """Store fingerprints, results and (given the inputs) last-known state for freshly scored VINs"""
+        inputs_by_vin = {vehicle.vin: vehicle for vehicle in vehicles or []}
+        fingerprint_updates = {}
+        result_updates = {}
+        state_updates = {}
+        for result in results:
+            if result.vin not in fingerprints:
+                continue
+            fingerprint_updates[result.vin] = fingerprints[result.vin]
+            result_updates[result.vin] = result.json()
+
+            vehicle = inputs_by_vin.get(result.vin)
+            if vehicle is not None:
+                state_updates[result.vin] = LastKnownState(
+                    severity=result.severity_bucket,
+                    soc_30day_trend=vehicle.soc_30day_trend,
+                    trip_cycles_weekly=vehicle.trip_cycles_weekly,
+                    climate_stress_index=vehicle.climate_stress_index,
+                    maintenance_compliance=vehicle.maintenance_compliance
+                ).encode()
+
+        if not fingerprint_updates:
+            return
+
+        updates = [
+            (self.fingerprint_key_prefix, self._fingerprints, fingerprint_updates),
+            (self.result_key_prefix, self._results, result_updates),
+            (self.state_key_prefix, self._states, state_updates)
+        ]
+        if self.redis_client:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for key_prefix, _, values in updates:
+                for vin, value in values.items():
+                    pipe.set(key_prefix + vin, value, ex=self.result_ttl_seconds)
+            await pipe.execute()
+        else:
+            now = time.monotonic()
+            expires_at = now + self.result_ttl_seconds
+            for _, local, values in updates:
+                # Drop expired VINs so the in-process store stays bounded like the Redis one
+                for vin in [vin for vin, (expiry, _) in local.items() if expiry <= now]:
+                    del local[vin]
+                local.update((vin, (expires_at, value)) for vin, value in values.items())
+
+    async def last_known_states(self, vins: List[str]) -> Dict[str, LastKnownState]:
+        """Get the previous run's severity and inputs for the VINs that have one"""
+        if not vins:
+            return {}
+        encoded = await self._get_many(self.state_key_prefix, self._states, vins)
+        return {vin: LastKnownState.decode(value) for vin, value in zip(vins, encoded) if value is not None}
+
+    async def invalidate(self, vins: Optional[List[str]] = None) -> None:
+        """
+        Forget VINs (or the whole fleet when None): fingerprint, result and last-known
+        state go together, so the next run rescores them and ranks them as unknown
+        """
+        key_prefixes = [self.fingerprint_key_prefix, self.result_key_prefix, self.state_key_prefix]
+        if self.redis_client:
+            if vins is None:
+                keys = []
+                for key_prefix in key_prefixes:
+                    keys.extend([key async for key in self.redis_client.scan_iter(match=key_prefix + "*")])
+            else:
+                keys = [key_prefix + vin for key_prefix in key_prefixes for vin in vins]
+            if keys:
+                await self.redis_client.delete(*keys)
+        else:
+            for local in (self._fingerprints, self._results, self._states):
+                if vins is None:
+                    local.clear()
+                else:
+                    for vin in vins:
+                        local.pop(vin, None)
+
+    async def _get_many(self, key_prefix: str, local: Dict[str, Tuple[float, str]], vins: List[str]) -> List[Optional[str]]:
+        """Fetch one per-VIN value for many VINs in one round trip (expired entries read as None)"""
+        if self.redis_client:
+            values = await self.redis_client.mget([key_prefix + vin for vin in vins])
+            return [value.decode() if isinstance(value, bytes) else value for value in values]
+
+        now = time.monotonic()
+        values = []
+        for vin in vins:
+            entry = local.get(vin)
+            if entry is not None and entry[0] <= now:
+                del local[vin]
+                entry = None
+            values.append(None if entry is None else entry[1])
+        return values
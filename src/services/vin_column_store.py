@@ -0,0 +1,440 @@
+"""
+Ford Bayesian Risk Score Engine - VIN Column Store
+
+Shared on-disk columnar format for VIN lead databases and stressor analyses:
+- One NumPy .npy file per column, opened memory-mapped, so loading a store
+  only maps files and a stage reads just the columns it asks for
+- Low-cardinality strings (model, state, climate zone) are stored as int32
+  codes plus a dictionary kept in the manifest; high-cardinality strings
+  (VINs, names) as fixed-width UTF-8
+- List columns (active stressors, likelihood ratios) are stored Arrow-style
+  as flat values plus row offsets
+- Missing values carry a per-column null mask; rows read back as records
+  omit them, like the keys absent from the JSON files
+- A store is a directory (conventionally *.vincols) holding manifest.json
+"""
+
+import gc
+import glob
+import json
+import logging
+import os
+import re
+import shutil
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+
+logger = logging.getLogger(__name__)
+
+
+STORE_FORMAT = "vin-columns"
+STORE_VERSION = 1
+STORE_SUFFIX = ".vincols"
+MANIFEST_FILE = "manifest.json"
+
+# Strings become a dictionary column when at most this share of the rows are distinct
+CATEGORY_MAX_DISTINCT_RATIO = 0.5
+
+ColumnData = Union[np.ndarray, Sequence[Any]]
+
+
+def is_column_store(path: str) -> bool:
+    return os.path.isfile(os.path.join(path, MANIFEST_FILE))
+
+
+@contextmanager
+def _gc_paused():
+    """Pause the cyclic GC while building millions of row lists/dicts; collections would rescan them over and over"""
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _file_stem(index: int, name: str) -> str:
+    return f"{index:03d}_{re.sub(r'[^0-9A-Za-z_-]+', '_', name)[:48]}"
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float, np.integer, np.floating)) and not isinstance(value, (bool, np.bool_))
+
+
+def _is_bool(value: Any) -> bool:
+    return isinstance(value, (bool, np.bool_))
+
+
+def _is_text(value: Any) -> bool:
+    return isinstance(value, str)
+
+
+def _is_missing(value: Any) -> bool:
+    return value is None or (isinstance(value, float) and value != value)
+
+
+def _encode_strings(values: np.ndarray, total_rows: int) -> Dict[str, Any]:
+    """Dictionary-encode strings when they repeat enough, else keep them as fixed-width UTF-8"""
+    dictionary, codes = np.unique(values, return_inverse=True)
+    if len(dictionary) <= max(1, int(total_rows * CATEGORY_MAX_DISTINCT_RATIO)):
+        return {"kind": "category", "codes": codes.astype(np.int32), "dictionary": dictionary.tolist()}
+    return {"kind": "text", "values": np.char.encode(values.astype(str), "utf-8")}
+
+
+class _ColumnEncoder:
+    """Turns one column of Python values (or a NumPy array) into arrays plus manifest metadata"""
+    
+    def __init__(self, name: str, data: ColumnData):
+        self.name = name
+        self.data = data
+    
+    def encode(self) -> Dict[str, Any]:
+        if isinstance(self.data, np.ndarray) and self.data.dtype.kind in "biuf":
+            return {"kind": "number", "values": self.data}
+        if isinstance(self.data, np.ndarray) and self.data.dtype.kind == "U":
+            return _encode_strings(self.data, len(self.data))
+        
+        values = list(self.data)
+        present = [value for value in values if not _is_missing(value)]
+        nulls = None
+        if len(present) != len(values):
+            nulls = np.fromiter((_is_missing(value) for value in values), dtype=bool, count=len(values))
+        
+        encoded = self._encode_present(values, present, nulls)
+        if nulls is not None and encoded["kind"] != "category":
+            encoded["nulls"] = nulls
+        return encoded
+    
+    def _encode_present(self, values: List[Any], present: List[Any], nulls: Optional[np.ndarray]) -> Dict[str, Any]:
+        if all(_is_bool(value) for value in present):
+            return {"kind": "number", "values": self._filled(values, nulls, False, bool)}
+        if all(_is_number(value) or _is_bool(value) for value in present):
+            integral = all(isinstance(value, (int, np.integer, bool, np.bool_)) for value in present)
+            return {"kind": "number", "values": self._filled(values, nulls, 0, np.int64 if integral else np.float64)}
+        if all(_is_text(value) for value in present):
+            strings = np.array(self._filled_list(values, nulls, ""), dtype=str)
+            encoded = _encode_strings(strings, len(values))
+            if encoded["kind"] == "category" and nulls is not None:
+                # Nulls were encoded as "" above; give them code -1 and drop "" if only they used it
+                codes = encoded["codes"]
+                dictionary = encoded["dictionary"]
+                blank = dictionary.index("") if "" in dictionary else -1
+                if blank >= 0 and not any(value == "" for value in present):
+                    codes = np.where(codes > blank, codes - 1, codes)
+                    dictionary.pop(blank)
+                codes[nulls] = -1
+                encoded["codes"] = codes
+            return encoded
+        if all(isinstance(value, (list, tuple)) for value in present):
+            return self._encode_lists(self._filled_list(values, nulls, []))
+        
+        # Mixed or nested values: keep each row's JSON text
+        texts = np.array([json.dumps(value, default=str) for value in self._filled_list(values, nulls, None)], dtype=str)
+        encoded = _encode_strings(texts, len(values))
+        encoded["json"] = True
+        return encoded
+    
+    def _encode_lists(self, lists: List[Sequence[Any]]) -> Dict[str, Any]:
+        lengths = np.fromiter((len(items) for items in lists), dtype=np.int64, count=len(lists))
+        offsets = np.zeros(len(lists) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        flat = [item for items in lists for item in items]
+        
+        if all(_is_text(item) for item in flat):
+            dictionary, codes = np.unique(np.array(flat, dtype=str), return_inverse=True)
+            return {
+                "kind": "list", "values": codes.astype(np.int32), "offsets": offsets,
+                "dictionary": dictionary.tolist()
+            }
+        if all(_is_number(item) for item in flat):
+            return {"kind": "list", "values": np.array(flat, dtype=np.float64), "offsets": offsets}
+        raise ValueError(f"Column {self.name}: list items must be all strings or all numbers")
+    
+    @staticmethod
+    def _filled_list(values: List[Any], nulls: Optional[np.ndarray], fill: Any) -> List[Any]:
+        if nulls is None:
+            return values
+        return [fill if _is_missing(value) else value for value in values]
+    
+    @classmethod
+    def _filled(cls, values: List[Any], nulls: Optional[np.ndarray], fill: Any, dtype: Any) -> np.ndarray:
+        return np.array(cls._filled_list(values, nulls, fill), dtype=dtype)
+
+
+def _records_to_columns(records: Sequence[Mapping[str, Any]]) -> Dict[str, List[Any]]:
+    """Column lists from row dicts; keys are taken in first-seen order and absent keys become None"""
+    names: Dict[str, None] = {}
+    for record in records:
+        for name in record:
+            names.setdefault(name, None)
+    return {name: [record.get(name) for record in records] for name in names}
+
+
+def _frame_to_columns(df: pd.DataFrame) -> Dict[str, ColumnData]:
+    columns: Dict[str, ColumnData] = {}
+    for name in df.columns:
+        series = df[name]
+        if pd.api.types.is_bool_dtype(series) or pd.api.types.is_numeric_dtype(series):
+            columns[str(name)] = series.to_numpy()
+        else:
+            columns[str(name)] = [None if _is_missing(value) else value for value in series.tolist()]
+    return columns
+
+
+def write_column_store(
+    path: str,
+    data: Union[Sequence[Mapping[str, Any]], Mapping[str, ColumnData], pd.DataFrame],
+    overwrite: bool = False
+) -> Dict[str, Any]:
+    """Write records, a column mapping or a DataFrame as a column store directory; returns the manifest"""
+    if isinstance(data, pd.DataFrame):
+        columns = _frame_to_columns(data)
+    elif isinstance(data, Mapping):
+        columns = dict(data)
+    else:
+        columns = _records_to_columns(data)
+    
+    lengths = {len(values) for values in columns.values()}
+    if len(lengths) > 1:
+        raise ValueError(f"Columns have different lengths: {sorted(lengths)}")
+    rows = lengths.pop() if lengths else 0
+    
+    if os.path.exists(path):
+        if not overwrite:
+            raise FileExistsError(f"Column store {path} already exists")
+        if not is_column_store(path):
+            raise ValueError(f"Refusing to overwrite {path}: not a column store")
+    
+    # Build the store next to its destination and swap it in, so readers never see half a store
+    staging = f"{path}.tmp-{os.getpid()}"
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+    
+    manifest_columns: Dict[str, Any] = {}
+    try:
+        for index, (name, values) in enumerate(columns.items()):
+            encoded = _ColumnEncoder(name, values).encode()
+            stem = _file_stem(index, name)
+            entry: Dict[str, Any] = {"kind": encoded["kind"]}
+            
+            main = encoded["codes"] if encoded["kind"] == "category" else encoded["values"]
+            entry["file"] = f"{stem}.npy"
+            np.save(os.path.join(staging, entry["file"]), np.ascontiguousarray(main))
+            
+            if "offsets" in encoded:
+                entry["offsets"] = f"{stem}.offsets.npy"
+                np.save(os.path.join(staging, entry["offsets"]), encoded["offsets"])
+            if "nulls" in encoded:
+                entry["nulls"] = f"{stem}.nulls.npy"
+                np.save(os.path.join(staging, entry["nulls"]), encoded["nulls"])
+            if "dictionary" in encoded:
+                entry["dictionary"] = encoded["dictionary"]
+            if encoded.get("json"):
+                entry["json"] = True
+            manifest_columns[name] = entry
+        
+        manifest = {"format": STORE_FORMAT, "version": STORE_VERSION, "rows": rows, "columns": manifest_columns}
+        with open(os.path.join(staging, MANIFEST_FILE), "w") as f:
+            json.dump(manifest, f, indent=2)
+        
+        if os.path.exists(path):
+            shutil.rmtree(path)
+        os.replace(staging, path)
+    except Exception:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    
+    logger.info(f"Wrote {rows} rows x {len(manifest_columns)} columns to {path}")
+    return manifest
+
+
+class VinColumnStore:
+    """
+    Read side of a column store: columns are memory-mapped on first use and only when asked for
+    """
+    
+    def __init__(self, path: str):
+        manifest_path = os.path.join(path, MANIFEST_FILE)
+        if not os.path.isfile(manifest_path):
+            raise FileNotFoundError(f"No column store manifest at {manifest_path}")
+        
+        with open(manifest_path, "r") as f:
+            manifest = json.load(f)
+        if manifest.get("format") != STORE_FORMAT or manifest.get("version") != STORE_VERSION:
+            raise ValueError(f"Unsupported column store {path}: {manifest.get('format')} v{manifest.get('version')}")
+        
+        self.path = path
+        self.rows: int = manifest["rows"]
+        self._columns: Dict[str, Dict[str, Any]] = manifest["columns"]
+        self._mapped: Dict[str, np.ndarray] = {}
+    
+    def __len__(self) -> int:
+        return self.rows
+    
+    def __contains__(self, name: str) -> bool:
+        return name in self._columns
+    
+    @property
+    def columns(self) -> List[str]:
+        return list(self._columns)
+    
+    def kind(self, name: str) -> str:
+        return self._entry(name)["kind"]
+    
+    def dictionary(self, name: str) -> List[Any]:
+        """Dictionary of a category or string-list column"""
+        return self._entry(name).get("dictionary", [])
+    
+    def raw(self, name: str) -> np.ndarray:
+        """Stored array of a column, memory-mapped: numbers, category codes, UTF-8 bytes or flat list values"""
+        return self._map(self._entry(name)["file"])
+    
+    def offsets(self, name: str) -> np.ndarray:
+        return self._map(self._entry(name)["offsets"])
+    
+    def nulls(self, name: str) -> Optional[np.ndarray]:
+        """Null mask of a column (category nulls are code -1 instead)"""
+        entry = self._entry(name)
+        return self._map(entry["nulls"]) if "nulls" in entry else None
+    
+    def to_frame(self, columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """DataFrame of the requested columns that exist in the store (all by default)"""
+        names = self._select(columns)
+        with _gc_paused():
+            data = {name: self._series_values(name) for name in names}
+            return pd.DataFrame(data, index=pd.RangeIndex(self.rows), copy=False)
+    
+    def records(self, columns: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        """Row dicts of the requested columns that exist in the store; null values are left out"""
+        names = self._select(columns)
+        with _gc_paused():
+            values = [self._python_values(name) for name in names]
+            records = [dict(zip(names, row)) for row in zip(*values)] if names else [{} for _ in range(self.rows)]
+        
+        for name in names:
+            entry = self._entry(name)
+            if entry["kind"] == "category":
+                missing = np.flatnonzero(self.raw(name) < 0)
+            elif "nulls" in entry:
+                missing = np.flatnonzero(self.nulls(name))
+            else:
+                continue
+            for row in missing.tolist():
+                del records[row][name]
+        return records
+    
+    def _entry(self, name: str) -> Dict[str, Any]:
+        if name not in self._columns:
+            raise KeyError(f"Column {name} is not in column store {self.path}")
+        return self._columns[name]
+    
+    def _map(self, filename: str) -> np.ndarray:
+        if filename not in self._mapped:
+            self._mapped[filename] = np.load(os.path.join(self.path, filename), mmap_mode="r")
+        return self._mapped[filename]
+    
+    def _select(self, columns: Optional[Iterable[str]]) -> List[str]:
+        if columns is None:
+            return self.columns
+        return [name for name in columns if name in self._columns]
+    
+    def _decoded_text(self, name: str) -> List[str]:
+        return [value.decode("utf-8") for value in self.raw(name).tolist()]
+    
+    def _series_values(self, name: str) -> Any:
+        entry = self._entry(name)
+        kind = entry["kind"]
+        if kind == "number":
+            values = self.raw(name)
+            nulls = self.nulls(name)
+            if nulls is None:
+                return values
+            return np.where(nulls, np.nan, values.astype(np.float64))
+        if kind == "category" and not entry.get("json"):
+            return pd.Categorical.from_codes(self.raw(name), categories=entry["dictionary"], validate=False)
+        return self._python_values(name)
+    
+    def _python_values(self, name: str) -> List[Any]:
+        entry = self._entry(name)
+        kind = entry["kind"]
+        if kind == "number":
+            return self.raw(name).tolist()
+        if kind == "category":
+            dictionary = np.array(entry["dictionary"] + [None], dtype=object)  # Code -1 picks the trailing None
+            values = dictionary[self.raw(name)].tolist()
+        elif kind == "text":
+            values = self._decoded_text(name)
+        elif kind == "list":
+            flat = self.raw(name)
+            flat = np.array(entry["dictionary"], dtype=object)[flat].tolist() if "dictionary" in entry else flat.tolist()
+            bounds = self.offsets(name).tolist()
+            return [flat[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+        else:
+            raise ValueError(f"Column {name} has unknown kind {kind}")
+        
+        if entry.get("json"):
+            values = [json.loads(value) if value is not None else None for value in values]
+        return values
+
+
+def load_vin_records(path: str, columns: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+    """Records from a column store or a JSON/CSV lead file (JSON and CSV are read whole)"""
+    if is_column_store(path):
+        return VinColumnStore(path).records(columns)
+    
+    if path.endswith(".csv"):
+        df = pd.read_csv(path)
+        if columns is not None:
+            df = df[[name for name in columns if name in df.columns]]
+        return df.to_dict("records")
+    
+    with open(path, "r") as f:
+        records = _json_records(json.load(f))
+    if columns is None:
+        return records
+    wanted = list(columns)
+    return [{name: record[name] for name in wanted if name in record} for record in records]
+
+
+def _json_records(data: Any) -> List[Dict[str, Any]]:
+    """Row list of a JSON file: a bare list, or the first list of objects in a wrapper (vehicle_analyses first)"""
+    if isinstance(data, list):
+        return data
+    if isinstance(data, dict):
+        if isinstance(data.get("vehicle_analyses"), list):
+            return data["vehicle_analyses"]
+        for value in data.values():
+            if isinstance(value, list) and (not value or isinstance(value[0], dict)):
+                return value
+    raise ValueError("JSON file holds no list of records")
+
+
+def convert_to_column_store(source: str, destination: Optional[str] = None, overwrite: bool = False) -> str:
+    """Convert a JSON (list, or wrapper such as vehicle_analyses) or CSV lead file into a column store"""
+    if destination is None:
+        destination = os.path.splitext(source)[0] + STORE_SUFFIX
+    
+    if source.endswith(".csv"):
+        write_column_store(destination, pd.read_csv(source), overwrite=overwrite)
+    else:
+        with open(source, "r") as f:
+            write_column_store(destination, _json_records(json.load(f)), overwrite=overwrite)
+    return destination
+
+
+def latest_database(prefix: str) -> Optional[str]:
+    """Newest "<prefix><YYYYmmdd_HHMMSS>" JSON file or column store; a store wins over JSON with the same stamp"""
+    candidates = glob.glob(f"{prefix}*.json") + [path for path in glob.glob(f"{prefix}*{STORE_SUFFIX}") if is_column_store(path)]
+    if not candidates:
+        return None
+    
+    def stamp(path: str):
+        stem, suffix = os.path.splitext(os.path.basename(path))
+        return (stem[len(os.path.basename(prefix)):], suffix == STORE_SUFFIX)
+    
+    return max(candidates, key=stamp)
@@ -0,0 +1,245 @@
+"""
+Ford Bayesian Risk Score Engine - Swarm Admission Control
+
+Bounded priority queue in front of the swarm pipelines:
+- Tasks are served strictly by priority (1 = highest, the SwarmTask and
+  ProcessingTask convention), FIFO within a priority
+- Every submission gets a queue-wait estimate (tasks ahead of it x recent
+  service interval); once the estimate passes the priority's wait SLO the
+  task is shed immediately with a retry-after instead of timing out later
+- When the queue is full, a higher-priority task displaces the newest task
+  of the lowest queued priority, so dealer lookups stay admitted while
+  nightly traffic saturates the swarm
+- Queue depth per priority and queue-wait histograms per priority
+"""
+
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+
+# Longest acceptable queue wait per priority before new tasks are shed (seconds)
+DEFAULT_WAIT_SLO_SECONDS = {1: 2.0, 2: 5.0, 3: 10.0, 4: 20.0, 5: 20.0}
+
+# Shortest retry-after handed to shed callers (seconds)
+MIN_RETRY_AFTER_SECONDS = 1.0
+
+# Upper bounds (seconds) of the queue-wait histogram buckets; a final +Inf bucket is implied
+WAIT_BUCKETS_SECONDS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class AdmissionRejected(Exception):
+    """A task was shed; callers should retry after `retry_after` seconds (HTTP 429)"""
+    
+    status_code = 429
+    
+    def __init__(self, message: str, retry_after: float, priority: int, estimated_wait: float):
+        super().__init__(message)
+        self.retry_after = max(retry_after, MIN_RETRY_AFTER_SECONDS)
+        self.priority = priority
+        self.estimated_wait = estimated_wait
+    
+    @property
+    def headers(self) -> Dict[str, str]:
+        return {"Retry-After": str(math.ceil(self.retry_after))}
+
+
+class WaitTimeHistogram:
+    """Per-bucket counts of queue waits, with approximate percentiles"""
+    
+    def __init__(self, bounds: Tuple[float, ...] = WAIT_BUCKETS_SECONDS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+    
+    def observe(self, seconds: float) -> None:
+        index = 0
+        while index < len(self.bounds) and seconds > self.bounds[index]:
+            index += 1
+        self.counts[index] += 1
+        self.count += 1
+        self.total += seconds
+    
+    def percentile(self, fraction: float) -> float:
+        """Upper bound of the bucket holding the given fraction of observations"""
+        if not self.count:
+            return 0.0
+        target = fraction * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= target:
+                return self.bounds[index] if index < len(self.bounds) else math.inf
+        return math.inf
+    
+    def snapshot(self) -> Dict[str, Any]:
+        buckets = {f"le_{bound:g}": count for bound, count in zip(self.bounds, self.counts)}
+        buckets["le_inf"] = self.counts[-1]
+        return {
+            "buckets": buckets,
+            "count": self.count,
+            "avg_seconds": self.total / self.count if self.count else 0.0,
+            "p50_seconds": self.percentile(0.50),
+            "p95_seconds": self.percentile(0.95),
+            "p99_seconds": self.percentile(0.99)
+        }
+
+
+class AdmissionQueue:
+    """
+    Bounded, strict-priority asyncio queue with SLO-based load shedding
+    """
+    
+    def __init__(
+        self,
+        maxsize: int = 10000,
+        wait_slo: Optional[Dict[int, float]] = None,
+        default_slo: float = 10.0,
+        on_shed: Optional[Callable[[Any, AdmissionRejected], None]] = None,
+        smoothing: float = 0.2,
+        name: str = "tasks"
+    ):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        
+        self.maxsize = maxsize
+        self.wait_slo = {**DEFAULT_WAIT_SLO_SECONDS, **(wait_slo or {})}
+        self.default_slo = default_slo  # SLO for priorities missing from wait_slo
+        self.on_shed = on_shed  # Called for queued tasks displaced by higher-priority ones
+        self.smoothing = smoothing  # EWMA weight of the newest service interval
+        self.name = name
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        
+        # priority -> FIFO of (enqueued_at, item)
+        self._lanes: Dict[int, Deque[Tuple[float, Any]]] = {}
+        self._size = 0
+        self._not_empty = asyncio.Event()
+        
+        # Seconds between dequeues while the queue was busy (drives wait estimates)
+        self.service_interval: Optional[float] = None
+        self._last_dequeue: Optional[float] = None
+        self._busy_since_last_dequeue = False
+        
+        self.admitted = 0
+        self.rejected = 0
+        self.displaced = 0
+        self._wait_histograms: Dict[int, WaitTimeHistogram] = {}
+    
+    def qsize(self) -> int:
+        return self._size
+    
+    def empty(self) -> bool:
+        return self._size == 0
+    
+    def full(self) -> bool:
+        return self._size >= self.maxsize
+    
+    def slo_for(self, priority: int) -> float:
+        return self.wait_slo.get(priority, self.default_slo)
+    
+    def tasks_ahead(self, priority: int) -> int:
+        """Queued tasks that would be served before a new task of this priority"""
+        return sum(len(lane) for lane_priority, lane in self._lanes.items() if lane_priority <= priority)
+    
+    def estimated_wait(self, priority: int) -> float:
+        """Expected queue wait for a task submitted now at this priority"""
+        ahead = self.tasks_ahead(priority)
+        if ahead == 0 or self.service_interval is None:
+            return 0.0
+        return ahead * self.service_interval
+    
+    async def put(self, item: Any, priority: int = 1) -> None:
+        """Admit an item or raise AdmissionRejected without waiting"""
+        self.put_nowait(item, priority)
+    
+    def put_nowait(self, item: Any, priority: int = 1) -> None:
+        estimated_wait = self.estimated_wait(priority)
+        slo = self.slo_for(priority)
+        if estimated_wait > slo:
+            self._reject(priority, estimated_wait, retry_after=estimated_wait - slo,
+                         reason=f"estimated queue wait {estimated_wait:.2f}s exceeds {slo:.2f}s SLO")
+        
+        if self.full() and not self._displace_lower_priority(priority):
+            self._reject(priority, estimated_wait, retry_after=self.service_interval or 0.0,
+                         reason=f"{self.name} queue full ({self.maxsize})")
+        
+        self._lanes.setdefault(priority, deque()).append((time.monotonic(), item))
+        self._size += 1
+        self.admitted += 1
+        self._not_empty.set()
+    
+    async def get(self) -> Any:
+        """Next item by priority (FIFO within a priority); waits while empty"""
+        while self._size == 0:
+            self._not_empty.clear()
+            await self._not_empty.wait()
+        
+        priority = min(lane_priority for lane_priority, lane in self._lanes.items() if lane)
+        enqueued_at, item = self._lanes[priority].popleft()
+        self._size -= 1
+        
+        now = time.monotonic()
+        self._wait_histograms.setdefault(priority, WaitTimeHistogram()).observe(now - enqueued_at)
+        
+        # Only intervals between back-to-back dequeues measure service speed; idle gaps would inflate it
+        if self._last_dequeue is not None and self._busy_since_last_dequeue:
+            interval = now - self._last_dequeue
+            self.service_interval = interval if self.service_interval is None else (
+                self.smoothing * interval + (1 - self.smoothing) * self.service_interval
+            )
+        self._last_dequeue = now
+        self._busy_since_last_dequeue = self._size > 0
+        return item
+    
+    def depth_by_priority(self) -> Dict[int, int]:
+        return {priority: len(lane) for priority, lane in sorted(self._lanes.items()) if lane}
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Depth, admission counters, SLO estimates and wait histograms per priority"""
+        priorities = sorted(set(self.wait_slo) | set(self._wait_histograms))
+        return {
+            "depth": self._size,
+            "maxsize": self.maxsize,
+            "depth_by_priority": self.depth_by_priority(),
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "displaced": self.displaced,
+            "service_interval_ms": (self.service_interval or 0.0) * 1000,
+            "estimated_wait_seconds": {priority: self.estimated_wait(priority) for priority in priorities},
+            "wait_histograms": {
+                priority: histogram.snapshot() for priority, histogram in sorted(self._wait_histograms.items())
+            }
+        }
+    
+    def _displace_lower_priority(self, priority: int) -> bool:
+        """Shed the newest queued task of the lowest priority below `priority`; False if there is none"""
+        lower = [lane_priority for lane_priority, lane in self._lanes.items() if lane and lane_priority > priority]
+        if not lower:
+            return False
+        
+        victim_priority = max(lower)
+        _, victim = self._lanes[victim_priority].pop()
+        self._size -= 1
+        self.displaced += 1
+        
+        if self.on_shed:
+            estimated_wait = self.estimated_wait(victim_priority)
+            self.on_shed(victim, AdmissionRejected(
+                f"Displaced from full {self.name} queue by priority {priority} work",
+                retry_after=estimated_wait, priority=victim_priority, estimated_wait=estimated_wait
+            ))
+        return True
+    
+    def _reject(self, priority: int, estimated_wait: float, retry_after: float, reason: str) -> None:
+        self.rejected += 1
+        raise AdmissionRejected(
+            f"Shedding priority {priority} task: {reason}",
+            retry_after=retry_after, priority=priority, estimated_wait=estimated_wait
+        )
@@ -0,0 +1,208 @@
+"""
+📝 Buffered Audit Writer
+Shared, pipelined writer for agent audit trails and debug info
+
+- Agents enqueue records instead of awaiting Redis for every lpush/hset/expire
+- A background loop flushes whatever accumulated into one pipeline, with one
+  expire per key per flush; while a flush waits on Redis the next batch
+  builds up, so agent throughput does not track Redis round-trip time
+- The in-memory queue is bounded. When Redis falls behind, the "block"
+  policy applies backpressure (bounded wait, then drop) and the "sample"
+  policy keeps every Nth record once the queue passes its high-water mark
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import redis.asyncio as redis
+
+
+OVERFLOW_POLICIES = ("block", "sample")
+
+
+@dataclass
+class AuditRecord:
+    """One queued Redis write"""
+    key: str
+    value: str
+    ttl: int
+    field: Optional[str] = None  # Set for hash writes (debug info); list push otherwise
+
+
+class AuditWriter:
+    """
+    Bounded queue of audit/debug writes flushed to Redis in pipelined batches
+    """
+    
+    def __init__(
+        self,
+        redis_pool: redis.Redis,
+        max_queue: int = 10000,
+        max_batch: int = 2000,
+        flush_interval: float = 0.05,
+        overflow_policy: str = "block",
+        put_timeout: float = 1.0,
+        high_water: float = 0.8,
+        sample_every: int = 10
+    ):
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow_policy must be one of {OVERFLOW_POLICIES}")
+        if max_queue < 1 or max_batch < 1 or sample_every < 1:
+            raise ValueError("max_queue, max_batch and sample_every must be at least 1")
+        
+        self.redis_pool = redis_pool
+        self.max_queue = max_queue
+        self.max_batch = max_batch  # Records per pipeline
+        self.flush_interval = flush_interval  # Longest a record waits for more to share its flush
+        self.overflow_policy = overflow_policy
+        self.put_timeout = put_timeout  # "block": longest an agent waits for queue space
+        self.high_water = int(max_queue * high_water)  # "sample": queue depth where sampling starts
+        self.sample_every = sample_every
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        
+        self._queue: Optional[asyncio.Queue] = None
+        self._flusher: Optional[asyncio.Task] = None
+        self._stopping = asyncio.Event()
+        self._sample_counter = 0
+        
+        self.stats = {
+            "enqueued": 0,
+            "written": 0,
+            "dropped": 0,
+            "sampled_out": 0,
+            "failed_writes": 0,
+            "flushes": 0,
+            "last_flush_ms": 0.0,
+            "last_flush_size": 0
+        }
+    
+    @property
+    def running(self) -> bool:
+        return self._flusher is not None
+    
+    def start(self) -> None:
+        """Start the background flush loop"""
+        if self._flusher is None:
+            self._queue = self._queue or asyncio.Queue(maxsize=self.max_queue)
+            self._stopping.clear()
+            self._flusher = asyncio.create_task(self._flush_loop())
+    
+    async def stop(self) -> None:
+        """Stop the flush loop and write everything still queued"""
+        if self._flusher is not None:
+            self._stopping.set()
+            try:
+                self._queue.put_nowait(None)  # Wake a loop waiting on an empty queue
+            except asyncio.QueueFull:
+                pass  # A full queue never blocks the loop; it sees the stop flag after its write
+            await asyncio.gather(self._flusher, return_exceptions=True)
+            self._flusher = None
+        await self.flush()
+    
+    async def lpush(self, key: str, value: str, ttl: int) -> None:
+        """Queue a list push (audit trail entry)"""
+        await self._submit(AuditRecord(key=key, value=value, ttl=ttl))
+    
+    async def hset(self, key: str, field: str, value: str, ttl: int) -> None:
+        """Queue a hash field write (debug info)"""
+        await self._submit(AuditRecord(key=key, value=value, ttl=ttl, field=field))
+    
+    async def flush(self) -> None:
+        """Write everything queued right now"""
+        while self._queue is not None and not self._queue.empty():
+            batch = []
+            while len(batch) < self.max_batch and not self._queue.empty():
+                record = self._queue.get_nowait()
+                if record is not None:
+                    batch.append(record)
+            await self._write(batch)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Counters plus current queue depth"""
+        return {
+            **self.stats,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "overflow_policy": self.overflow_policy
+        }
+    
+    async def _submit(self, record: AuditRecord) -> None:
+        """Queue one record, applying the overflow policy when Redis falls behind"""
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+        
+        if self.overflow_policy == "sample" and self._queue.qsize() >= self.high_water:
+            self._sample_counter += 1
+            if self._sample_counter % self.sample_every:
+                self.stats["sampled_out"] += 1
+                return
+        
+        try:
+            self._queue.put_nowait(record)
+        except asyncio.QueueFull:
+            if self.overflow_policy != "block":
+                self.stats["dropped"] += 1
+                return
+            try:
+                await asyncio.wait_for(self._queue.put(record), self.put_timeout)
+            except asyncio.TimeoutError:
+                self.stats["dropped"] += 1
+                return
+        self.stats["enqueued"] += 1
+    
+    async def _flush_loop(self) -> None:
+        """Collect records until max_batch or flush_interval, then write them in one pipeline"""
+        loop = asyncio.get_running_loop()
+        while not self._stopping.is_set():
+            first = await self._queue.get()
+            if first is None:
+                return
+            batch = [first]
+            deadline = loop.time() + self.flush_interval
+            
+            while len(batch) < self.max_batch:
+                try:
+                    record = self._queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        record = await asyncio.wait_for(self._queue.get(), remaining)
+                    except asyncio.TimeoutError:
+                        break
+                
+                if record is None:
+                    break
+                batch.append(record)
+            
+            await self._write(batch)
+    
+    async def _write(self, batch: List[AuditRecord]) -> None:
+        """One pipelined round trip for a batch; each key gets a single expire"""
+        if not batch:
+            return
+        
+        start_time = datetime.utcnow()
+        expirations: Dict[str, int] = {}
+        try:
+            pipe = self.redis_pool.pipeline(transaction=False)
+            for record in batch:
+                if record.field is None:
+                    pipe.lpush(record.key, record.value)
+                else:
+                    pipe.hset(record.key, record.field, record.value)
+                expirations[record.key] = max(record.ttl, expirations.get(record.key, 0))
+            for key, ttl in expirations.items():
+                pipe.expire(key, ttl)
+            await pipe.execute()
+            self.stats["written"] += len(batch)
+        except Exception as e:
+            self.stats["failed_writes"] += len(batch)
+            self.logger.warning(f"Failed to flush {len(batch)} audit records: {str(e)}")
+        finally:
+            self.stats["flushes"] += 1
+            self.stats["last_flush_size"] = len(batch)
+            self.stats["last_flush_ms"] = (datetime.utcnow() - start_time).total_seconds() * 1000
@@ -7,11 +7,14 @@ import asyncio
 import logging
 import json
 import uuid
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple, Callable, Awaitable
 from datetime import datetime
 from abc import ABC, abstractmethod
 import redis.asyncio as redis
 
+from .audit_writer import AuditWriter
+from .result_cache import AgentResultCache
+
 
 class BaseAgent(ABC):
     """Base class for all swarm agents"""
@@ -35,6 +38,12 @@ class BaseAgent(ABC):
         self.status = "idle"
         self.current_task = None
         
+        # Shared buffered writer for audit/debug records (direct Redis writes when not attached)
+        self.audit_writer: Optional[AuditWriter] = None
+        
+        # Two-tier result cache shared by all agents (a private one is created when not attached)
+        self.result_cache: Optional[AgentResultCache] = None
+        
         self.logger.info(f"🤖 Agent {self.agent_name} initialized")
     
     @abstractmethod
@@ -45,6 +54,15 @@ class BaseAgent(ABC):
         """
         pass
     
+    async def process_batch(self, tasks: List) -> List[Any]:
+        """
+        Process a micro-batch of tasks; results are aligned with tasks
+        
+        Default: process() per task, with an exception in place of a failed
+        task. Agents whose math vectorizes override this.
+        """
+        return list(await asyncio.gather(*(self.process(task) for task in tasks), return_exceptions=True))
+    
     @abstractmethod
     def get_agent_info(self) -> Dict[str, Any]:
         """
@@ -53,6 +71,19 @@ class BaseAgent(ABC):
         """
         pass
     
+    def attach_audit_writer(self, audit_writer: AuditWriter):
+        """Send audit trail and debug info through a shared buffered writer"""
+        self.audit_writer = audit_writer
+    
+    def attach_result_cache(self, result_cache: AgentResultCache):
+        """Use a result cache shared with the other agents"""
+        self.result_cache = result_cache
+    
+    def _get_result_cache(self) -> AgentResultCache:
+        if self.result_cache is None:
+            self.result_cache = AgentResultCache(self.redis_pool)
+        return self.result_cache
+    
     async def health_check(self) -> Dict[str, Any]:
         """Check agent health"""
         return {
@@ -70,6 +101,7 @@ class BaseAgent(ABC):
         return {
             "agent_name": self.agent_name,
             "metrics": self.metrics,
+            "cache": self._get_result_cache().get_stats(self.agent_name),
             "timestamp": datetime.utcnow().isoformat()
         }
     
@@ -89,8 +121,79 @@ class BaseAgent(ABC):
         self.metrics["success_rate"] = 1.0 - (self.metrics["error_count"] / count)
         self.metrics["last_active"] = datetime.utcnow()
     
+    async def _update_batch_metrics(self, processing_time: float, task_count: int, failures: int = 0):
+        """Update agent metrics for a whole micro-batch (processing_time is per task)"""
+        if task_count <= 0:
+            return
+        
+        previous = self.metrics["tasks_processed"]
+        count = previous + task_count
+        self.metrics["tasks_processed"] = count
+        self.metrics["avg_processing_time"] = (
+            (self.metrics["avg_processing_time"] * previous) + processing_time * task_count
+        ) / count
+        self.metrics["error_count"] += failures
+        self.metrics["success_rate"] = 1.0 - (self.metrics["error_count"] / count)
+        self.metrics["last_active"] = datetime.utcnow()
+    
+    def _score_isolated(
+        self,
+        tasks: List,
+        score_batch: Callable[[List], List[Any]],
+        error_result: Callable[[Exception], Any]
+    ) -> List[Any]:
+        """
+        Run vectorized scoring over a micro-batch, isolating failures per task
+        
+        When the batch call raises, tasks are rescored one at a time so only
+        the offending task gets error_result in its slot.
+        """
+        try:
+            return score_batch(tasks)
+        except Exception as e:
+            if len(tasks) == 1:
+                return [error_result(e)]
+        
+        results = []
+        for task in tasks:
+            try:
+                results.extend(score_batch([task]))
+            except Exception as e:
+                results.append(error_result(e))
+        return results
+    
+    async def _write_batch_records(
+        self,
+        action: str,
+        records: List[Tuple[str, Dict[str, Any], Optional[Dict[str, Any]]]]
+    ):
+        """
+        Queue audit entries (and optional debug info) for a micro-batch on the shared AuditWriter
+        
+        records: (task_id, audit details, debug data or None) per task. Opt-in:
+        without an attached writer nothing is written, so batch scoring does
+        no Redis I/O of its own.
+        """
+        if not records or self.audit_writer is None:
+            return
+        
+        timestamp = datetime.utcnow().isoformat()
+        for task_id, details, debug_data in records:
+            try:
+                await self._log_agent_action(action, task_id, details, timestamp=timestamp)
+                if debug_data is not None:
+                    await self._store_debug_info(task_id, debug_data)
+            except Exception as e:
+                self.logger.warning(f"Failed to queue audit record for {task_id}: {str(e)}")
+    
     async def _store_debug_info(self, task_id: str, debug_data: Dict[str, Any]):
         """Store debug information for a task"""
+        if self.audit_writer is not None:
+            await self.audit_writer.hset(
+                f"swarm:debug:{task_id}", self.agent_name, json.dumps(debug_data, default=str), 3600
+            )
+            return
+        
         try:
             await self.redis_pool.hset(
                 f"swarm:debug:{task_id}",
@@ -102,17 +205,22 @@ class BaseAgent(ABC):
         except Exception as e:
             self.logger.warning(f"Failed to store debug info: {str(e)}")
     
-    async def _log_agent_action(self, action: str, task_id: str, details: Dict[str, Any] = None):
+    async def _log_agent_action(self, action: str, task_id: str, details: Dict[str, Any] = None,
+                                timestamp: Optional[str] = None):
         """Log agent actions for audit trail"""
         log_entry = {
             "agent_name": self.agent_name,
             "agent_id": self.agent_id,
             "action": action,
             "task_id": task_id,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": timestamp or datetime.utcnow().isoformat(),
             "details": details or {}
         }
         
+        if self.audit_writer is not None:
+            await self.audit_writer.lpush(f"swarm:audit:{task_id}", json.dumps(log_entry, default=str), 86400)
+            return
+        
         try:
             await self.redis_pool.lpush(
                 f"swarm:audit:{task_id}",
@@ -142,24 +250,19 @@ class BaseAgent(ABC):
         except (AttributeError, TypeError):
             return default
     
-    async def _cache_result(self, cache_key: str, result: Dict[str, Any], ttl: int = 3600):
-        """Cache agent result"""
-        try:
-            await self.redis_pool.setex(
-                cache_key,
-                ttl,
-                json.dumps(result, default=str)
-            )
-        except Exception as e:
-            self.logger.warning(f"Failed to cache result: {str(e)}")
+    async def _cache_result(self, cache_key: str, result: Dict[str, Any], ttl: Optional[int] = None):
+        """Cache agent result (ttl defaults to this agent's cache TTL)"""
+        await self._get_result_cache().set(self.agent_name, cache_key, result, ttl)
     
     async def _get_cached_result(self, cache_key: str) -> Optional[Dict[str, Any]]:
         """Get cached agent result"""
-        try:
-            cached_data = await self.redis_pool.get(cache_key)
-            if cached_data:
-                return json.loads(cached_data)
-            return None
-        except Exception as e:
-            self.logger.warning(f"Failed to get cached result: {str(e)}")
-            return None 
\ No newline at end of file
+        return await self._get_result_cache().get(self.agent_name, cache_key)
+    
+    async def _get_or_compute_cached(
+        self,
+        cache_key: str,
+        compute: Callable[[], Awaitable[Dict[str, Any]]],
+        ttl: Optional[int] = None
+    ) -> Tuple[Dict[str, Any], bool]:
+        """Return (result, cache_hit); concurrent misses for the same key compute once"""
+        return await self._get_result_cache().get_or_load(self.agent_name, cache_key, compute, ttl)
@@ -8,6 +8,7 @@ import json
 import math
 from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
+import numpy as np
 from .base_agent import BaseAgent
 
 
@@ -35,41 +36,62 @@ class BayesScoreAgent(BaseAgent):
     
     async def process(self, task) -> Dict[str, Any]:
         """Process Bayesian risk score calculation"""
+        return (await self.process_batch([task]))[0]
+    
+    async def process_batch(self, tasks: List) -> List[Dict[str, Any]]:
+        """Bayesian risk scores for a micro-batch, vectorized across tasks"""
+        if not tasks:
+            return []
+        
         start_time = datetime.utcnow()
+        scored = self._score_isolated(
+            tasks, self._score_tasks, lambda e: ({"error": str(e), "risk_score": 0.0}, None)
+        )
         
-        try:
-            validated_stressors = task.results.get("validated_stressors", [])
-            
-            # Calculate risk using Bayesian approach
-            prior = 0.023  # Base rate
-            combined_lr = 1.0
-            
-            for stressor in validated_stressors:
+        processing_time = (datetime.utcnow() - start_time).total_seconds() / len(tasks)
+        failures = sum(combined_lr is None for _, combined_lr in scored)
+        await self._update_batch_metrics(processing_time, len(tasks), failures=failures)
+        await self._write_batch_records("bayes_score", [
+            (task.task_id, {"risk_score": result["risk_score"]}, {"combined_lr": combined_lr})
+            for task, (result, combined_lr) in zip(tasks, scored)
+            if combined_lr is not None
+        ])
+        
+        return [result for result, _ in scored]
+    
+    def _score_tasks(self, tasks: List) -> List[Tuple[Dict[str, Any], float]]:
+        """(result, combined LR) per task"""
+        stressor_lists = [task.results.get("validated_stressors", []) for task in tasks]
+        
+        # LR per (task, stressor slot); unknown stressors and padding contribute 1.0
+        width = max((len(stressors) for stressors in stressor_lists), default=0)
+        lr_matrix = np.ones((len(tasks), width), dtype=np.float64)
+        for row, stressors in enumerate(stressor_lists):
+            for slot, stressor in enumerate(stressors):
                 if stressor in self.likelihood_ratios:
-                    lr = self.likelihood_ratios[stressor]["likelihood_ratio"]
-                    combined_lr *= lr
-            
-            # Apply Bayesian update
-            posterior_odds = (prior / (1 - prior)) * combined_lr
-            risk_score = posterior_odds / (1 + posterior_odds)
-            risk_score = min(0.95, risk_score)  # Cap at 95%
+                    lr_matrix[row, slot] = self.likelihood_ratios[stressor]["likelihood_ratio"]
             
-            result = {
-                "risk_score": risk_score,
-                "confidence": 0.89,
-                "top_stressors": validated_stressors[:3]
-            }
-            
-            processing_time = (datetime.utcnow() - start_time).total_seconds()
-            await self._update_metrics(processing_time, True)
-            
-            return result
-            
-        except Exception as e:
-            processing_time = (datetime.utcnow() - start_time).total_seconds()
-            await self._update_metrics(processing_time, False)
-            
-            return {"error": str(e), "risk_score": 0.0}
+        # Multiply slot by slot, in the same order as a per-task loop
+        combined_lr = np.ones(len(tasks), dtype=np.float64)
+        for slot in range(width):
+            combined_lr *= lr_matrix[:, slot]
+        
+        # Apply Bayesian update
+        prior = 0.023  # Base rate
+        posterior_odds = (prior / (1 - prior)) * combined_lr
+        risk_scores = np.minimum(0.95, posterior_odds / (1 + posterior_odds))  # Cap at 95%
+        
+        return [
+            (
+                {
+                    "risk_score": float(risk_score),
+                    "confidence": 0.89,
+                    "top_stressors": stressors[:3]
+                },
+                float(lr)
+            )
+            for risk_score, stressors, lr in zip(risk_scores, stressor_lists, combined_lr)
+        ]
     
     def get_agent_info(self) -> Dict[str, Any]:
         return {
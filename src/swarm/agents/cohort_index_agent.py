@@ -88,75 +88,15 @@ class CohortIndexAgent(BaseAgent):
             await self._log_agent_action("start_cohort_analysis", task.task_id)
             
             vin = task.vin
-            vehicle_data = task.results.get("vehicle_data", {})
             
             # Check cache first
             cache_key = f"cohort_index:{vin}"
-            cached_result = await self._get_cached_result(cache_key)
-            if cached_result:
+            result, cache_hit = await self._get_or_compute_cached(
+                cache_key, lambda: self._assign_cohort(task, start_time)
+            )
+            if cache_hit:
                 await self._log_agent_action("cache_hit", task.task_id)
-                return cached_result
-            
-            # Extract VIN components
-            vin_analysis = self._analyze_vin(vin)
-            
-            # Determine platform from VIN/model
-            platform = self._determine_platform(vin, vehicle_data)
-            
-            # Determine region from location data
-            region = self._determine_region(vehicle_data)
-            
-            # Determine usage pattern from telemetry
-            usage_pattern = self._determine_usage_pattern(vehicle_data)
-            
-            # Determine climate exposure
-            climate_exposure = self._determine_climate_exposure(vehicle_data, region)
-            
-            # Find best matching cohort
-            best_cohort = self._find_best_cohort_match(platform, region, usage_pattern, climate_exposure)
-            
-            # Calculate cohort position/percentile
-            cohort_position = self._calculate_cohort_position(vehicle_data, best_cohort)
-            
-            # Generate result
-            result = {
-                "vin": vin,
-                "cohort_assignment": {
-                    "cohort_id": best_cohort["id"],
-                    "cohort_name": best_cohort["name"],
-                    "match_confidence": best_cohort["confidence"],
-                    "sample_size": best_cohort["sample_size"]
-                },
-                "cohort_analysis": {
-                    "platform": platform,
-                    "region": region,
-                    "usage_pattern": usage_pattern,
-                    "climate_exposure": climate_exposure
-                },
-                "cohort_position": {
-                    "percentile": cohort_position["percentile"],
-                    "risk_tier": cohort_position["risk_tier"],
-                    "outlier_status": cohort_position["outlier_status"]
-                },
-                "vin_analysis": vin_analysis,
-                "assignment_timestamp": datetime.utcnow().isoformat()
-            }
-            
-            # Cache result
-            await self._cache_result(cache_key, result, ttl=7200)  # 2 hours
-            
-            # Store debug info
-            debug_info = {
-                "platform_determination": platform,
-                "region_mapping": region,
-                "usage_classification": usage_pattern,
-                "cohort_match_score": best_cohort["confidence"],
-                "processing_time_ms": (datetime.utcnow() - start_time).total_seconds() * 1000
-            }
-            await self._store_debug_info(task.task_id, debug_info)
-            
-            await self._log_agent_action("cohort_assigned", task.task_id,
-                                       {"cohort": best_cohort["id"], "confidence": best_cohort["confidence"]})
+                return result
             
             # Update metrics
             processing_time = (datetime.utcnow() - start_time).total_seconds()
@@ -182,6 +122,71 @@ class CohortIndexAgent(BaseAgent):
                 }
             }
     
+    async def _assign_cohort(self, task, start_time: datetime) -> Dict[str, Any]:
+        """Assign the best matching cohort for a VIN (runs on a cache miss)"""
+        vin = task.vin
+        vehicle_data = task.results.get("vehicle_data", {})
+        
+        # Extract VIN components
+        vin_analysis = self._analyze_vin(vin)
+        
+        # Determine platform from VIN/model
+        platform = self._determine_platform(vin, vehicle_data)
+        
+        # Determine region from location data
+        region = self._determine_region(vehicle_data)
+        
+        # Determine usage pattern from telemetry
+        usage_pattern = self._determine_usage_pattern(vehicle_data)
+        
+        # Determine climate exposure
+        climate_exposure = self._determine_climate_exposure(vehicle_data, region)
+        
+        # Find best matching cohort
+        best_cohort = self._find_best_cohort_match(platform, region, usage_pattern, climate_exposure)
+        
+        # Calculate cohort position/percentile
+        cohort_position = self._calculate_cohort_position(vehicle_data, best_cohort)
+        
+        # Generate result
+        result = {
+            "vin": vin,
+            "cohort_assignment": {
+                "cohort_id": best_cohort["id"],
+                "cohort_name": best_cohort["name"],
+                "match_confidence": best_cohort["confidence"],
+                "sample_size": best_cohort["sample_size"]
+            },
+            "cohort_analysis": {
+                "platform": platform,
+                "region": region,
+                "usage_pattern": usage_pattern,
+                "climate_exposure": climate_exposure
+            },
+            "cohort_position": {
+                "percentile": cohort_position["percentile"],
+                "risk_tier": cohort_position["risk_tier"],
+                "outlier_status": cohort_position["outlier_status"]
+            },
+            "vin_analysis": vin_analysis,
+            "assignment_timestamp": datetime.utcnow().isoformat()
+        }
+        
+        # Store debug info
+        debug_info = {
+            "platform_determination": platform,
+            "region_mapping": region,
+            "usage_classification": usage_pattern,
+            "cohort_match_score": best_cohort["confidence"],
+            "processing_time_ms": (datetime.utcnow() - start_time).total_seconds() * 1000
+        }
+        await self._store_debug_info(task.task_id, debug_info)
+        
+        await self._log_agent_action("cohort_assigned", task.task_id,
+                                   {"cohort": best_cohort["id"], "confidence": best_cohort["confidence"]})
+        
+        return result
+    
     def _analyze_vin(self, vin: str) -> Dict[str, Any]:
         """Analyze VIN components"""
         if len(vin) < 17:
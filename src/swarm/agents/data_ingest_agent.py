@@ -57,72 +57,15 @@ class DataIngestAgent(BaseAgent):
             await self._log_agent_action("start_ingestion", task.task_id)
             
             vin = task.vin
-            input_data = task.input_data
             
             # Check cache first
             cache_key = f"data_ingest:{vin}"
-            cached_result = await self._get_cached_result(cache_key)
-            if cached_result:
-                await self._log_agent_action("cache_hit", task.task_id)
-                return cached_result
-            
-            # Ingest data from multiple sources
-            ingestion_results = await asyncio.gather(
-                self._ingest_vh_telemetry(vin, input_data),
-                self._ingest_weather_data(vin, input_data),
-                self._ingest_dealer_data(vin, input_data),
-                self._ingest_trip_logs(vin, input_data),
-                self._ingest_ignition_cycles(vin, input_data),
-                return_exceptions=True
+            result, cache_hit = await self._get_or_compute_cached(
+                cache_key, lambda: self._ingest_vin(task, start_time)
             )
-            
-            # Combine results
-            combined_data = {}
-            source_quality = {}
-            
-            for i, result in enumerate(ingestion_results):
-                source_name = list(self.data_sources.keys())[i]
-                
-                if isinstance(result, Exception):
-                    self.logger.warning(f"Failed to ingest {source_name}: {str(result)}")
-                    source_quality[source_name] = 0.0
-                else:
-                    combined_data.update(result)
-                    source_quality[source_name] = result.get("quality_score", 0.8)
-            
-            # Detect active stressors
-            active_stressors = self._detect_active_stressors(combined_data)
-            
-            # Calculate data quality score
-            overall_quality = self._calculate_data_quality(source_quality)
-            
-            # Prepare result
-            result = {
-                "vin": vin,
-                "ingestion_timestamp": datetime.utcnow().isoformat(),
-                "data_sources": list(source_quality.keys()),
-                "data_quality_score": overall_quality,
-                "source_quality": source_quality,
-                "vehicle_data": combined_data,
-                "active_stressors": active_stressors,
-                "raw_stressor_values": self._extract_stressor_values(combined_data),
-                "data_completeness": len(combined_data) / 20  # Expect ~20 data points
-            }
-            
-            # Cache result
-            await self._cache_result(cache_key, result, ttl=3600)  # 1 hour
-            
-            # Store debug info
-            debug_info = {
-                "ingestion_sources": len(source_quality),
-                "quality_scores": source_quality,
-                "stressor_count": len(active_stressors),
-                "processing_time_ms": (datetime.utcnow() - start_time).total_seconds() * 1000
-            }
-            await self._store_debug_info(task.task_id, debug_info)
-            
-            await self._log_agent_action("ingestion_complete", task.task_id, 
-                                       {"quality_score": overall_quality})
+            if cache_hit:
+                await self._log_agent_action("cache_hit", task.task_id)
+                return result
             
             # Update metrics
             processing_time = (datetime.utcnow() - start_time).total_seconds()
@@ -145,6 +88,68 @@ class DataIngestAgent(BaseAgent):
                 "vehicle_data": {}
             }
     
+    async def _ingest_vin(self, task, start_time: datetime) -> Dict[str, Any]:
+        """Ingest and combine all sources for a VIN (runs on a cache miss)"""
+        vin = task.vin
+        input_data = task.input_data
+        
+        # Ingest data from multiple sources
+        ingestion_results = await asyncio.gather(
+            self._ingest_vh_telemetry(vin, input_data),
+            self._ingest_weather_data(vin, input_data),
+            self._ingest_dealer_data(vin, input_data),
+            self._ingest_trip_logs(vin, input_data),
+            self._ingest_ignition_cycles(vin, input_data),
+            return_exceptions=True
+        )
+        
+        # Combine results
+        combined_data = {}
+        source_quality = {}
+        
+        for i, result in enumerate(ingestion_results):
+            source_name = list(self.data_sources.keys())[i]
+            
+            if isinstance(result, Exception):
+                self.logger.warning(f"Failed to ingest {source_name}: {str(result)}")
+                source_quality[source_name] = 0.0
+            else:
+                combined_data.update(result)
+                source_quality[source_name] = result.get("quality_score", 0.8)
+        
+        # Detect active stressors
+        active_stressors = self._detect_active_stressors(combined_data)
+        
+        # Calculate data quality score
+        overall_quality = self._calculate_data_quality(source_quality)
+        
+        # Prepare result
+        result = {
+            "vin": vin,
+            "ingestion_timestamp": datetime.utcnow().isoformat(),
+            "data_sources": list(source_quality.keys()),
+            "data_quality_score": overall_quality,
+            "source_quality": source_quality,
+            "vehicle_data": combined_data,
+            "active_stressors": active_stressors,
+            "raw_stressor_values": self._extract_stressor_values(combined_data),
+            "data_completeness": len(combined_data) / 20  # Expect ~20 data points
+        }
+        
+        # Store debug info
+        debug_info = {
+            "ingestion_sources": len(source_quality),
+            "quality_scores": source_quality,
+            "stressor_count": len(active_stressors),
+            "processing_time_ms": (datetime.utcnow() - start_time).total_seconds() * 1000
+        }
+        await self._store_debug_info(task.task_id, debug_info)
+        
+        await self._log_agent_action("ingestion_complete", task.task_id, 
+                                   {"quality_score": overall_quality})
+        
+        return result
+    
     async def _ingest_vh_telemetry(self, vin: str, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Ingest VH/Telemetry data"""
         # Simulate VH telemetry ingestion
@@ -0,0 +1,225 @@
+"""
+🗄️ Agent Result Cache
+Two-tier cache shared by all swarm agents
+
+- Bounded in-process LRU in front of Redis: repeat lookups for a VIN during a
+  dealer session are answered without a network round trip
+- TTLs are set per agent; entries promoted from Redis keep Redis' remaining
+  TTL so the local copy never outlives the shared one
+- Concurrent misses for the same key are coalesced (single-flight): one
+  caller loads, the others wait for its result
+- Local hits, Redis hits, misses, coalesced waits and evictions are counted
+  per agent
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+import redis.asyncio as redis
+
+
+# Seconds a result stays valid, per agent
+DEFAULT_AGENT_TTLS = {
+    "data_ingest": 3600,  # 1 hour
+    "cohort_index": 7200,  # 2 hours
+    "stress_validation": 86400  # 24 hours (validation depends on season/weather)
+}
+
+
+class AgentResultCache:
+    """
+    In-process LRU + Redis cache with per-agent TTLs and single-flight loads
+    """
+    
+    def __init__(
+        self,
+        redis_pool: Optional[redis.Redis],
+        max_entries: int = 10000,
+        default_ttl: int = 3600,
+        agent_ttls: Optional[Dict[str, int]] = None
+    ):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        
+        self.redis_pool = redis_pool  # None: local tier only
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.agent_ttls = {**DEFAULT_AGENT_TTLS, **(agent_ttls or {})}
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        
+        # key -> (monotonic expiry, JSON payload); JSON so every caller gets its own copy
+        self._local: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        
+        self.evictions = 0
+        self.expirations = 0
+        self._agent_stats: Dict[str, Dict[str, int]] = {}
+    
+    def ttl_for(self, agent_name: str) -> int:
+        return self.agent_ttls.get(agent_name, self.default_ttl)
+    
+    async def get(self, agent_name: str, key: str) -> Optional[Any]:
+        """Look a key up locally, then in Redis"""
+        encoded = self._get_local(key)
+        if encoded is not None:
+            self._count(agent_name, "local_hits")
+            return json.loads(encoded)
+        
+        encoded = await self._get_remote(key)
+        if encoded is None:
+            self._count(agent_name, "misses")
+            return None
+        
+        self._count(agent_name, "redis_hits")
+        return json.loads(encoded)
+    
+    async def set(self, agent_name: str, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        """Store a value in both tiers"""
+        await self._store(key, json.dumps(value, default=str), ttl or self.ttl_for(agent_name))
+    
+    async def get_or_load(
+        self,
+        agent_name: str,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: Optional[int] = None
+    ) -> Tuple[Any, bool]:
+        """
+        Return (value, cache_hit); on a miss, run loader once and cache its result
+        
+        Callers that miss while a load for the same key is running wait for it
+        instead of loading again (their result counts as a hit). A failed load
+        is not cached and fails its waiters too.
+        """
+        encoded = self._get_local(key)
+        if encoded is not None:
+            self._count(agent_name, "local_hits")
+            return json.loads(encoded), True
+        
+        pending = self._in_flight.get(key)
+        if pending is not None:
+            self._count(agent_name, "coalesced")
+            return json.loads(await asyncio.shield(pending)), True
+        
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            encoded = await self._get_remote(key)
+            if encoded is not None:
+                self._count(agent_name, "redis_hits")
+                future.set_result(encoded)
+                return json.loads(encoded), True
+            
+            self._count(agent_name, "misses")
+            value = await loader()
+            encoded = json.dumps(value, default=str)
+            await self._store(key, encoded, ttl or self.ttl_for(agent_name))
+            future.set_result(encoded)
+            return value, False
+        except BaseException as e:
+            if not future.done():
+                if isinstance(e, asyncio.CancelledError):
+                    future.cancel()
+                else:
+                    future.set_exception(e)
+                    future.exception()  # Retrieved here; waiters (if any) re-raise it
+            raise
+        finally:
+            self._in_flight.pop(key, None)
+    
+    async def invalidate(self, key: str) -> None:
+        """Drop a key from both tiers"""
+        self._local.pop(key, None)
+        if self.redis_pool is not None:
+            try:
+                await self.redis_pool.delete(key)
+            except Exception as e:
+                self.logger.warning(f"Failed to invalidate {key}: {str(e)}")
+    
+    def get_stats(self, agent_name: Optional[str] = None) -> Dict[str, Any]:
+        """Hit/miss counters (for one agent, or all) plus local tier size and evictions"""
+        if agent_name is None:
+            counters = {name: dict(stats) for name, stats in self._agent_stats.items()}
+        else:
+            counters = dict(self._agent_stats.get(agent_name, self._empty_stats()))
+            lookups = counters["local_hits"] + counters["redis_hits"] + counters["coalesced"] + counters["misses"]
+            counters["hit_rate"] = (lookups - counters["misses"]) / lookups if lookups else 0.0
+            counters["ttl_seconds"] = self.ttl_for(agent_name)
+        
+        return {
+            "counters": counters,
+            "local_entries": len(self._local),
+            "max_entries": self.max_entries,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "loads_in_flight": len(self._in_flight)
+        }
+    
+    def _get_local(self, key: str) -> Optional[str]:
+        entry = self._local.get(key)
+        if entry is None:
+            return None
+        
+        expires_at, encoded = entry
+        if expires_at <= time.monotonic():
+            del self._local[key]
+            self.expirations += 1
+            return None
+        
+        self._local.move_to_end(key)
+        return encoded
+    
+    def _put_local(self, key: str, encoded: str, ttl: float) -> None:
+        if ttl <= 0:
+            return
+        
+        self._local[key] = (time.monotonic() + ttl, encoded)
+        self._local.move_to_end(key)
+        while len(self._local) > self.max_entries:
+            self._local.popitem(last=False)
+            self.evictions += 1
+    
+    async def _get_remote(self, key: str) -> Optional[str]:
+        """Fetch a value and its remaining TTL from Redis in one round trip; promote it locally"""
+        if self.redis_pool is None:
+            return None
+        
+        try:
+            pipe = self.redis_pool.pipeline(transaction=False)
+            pipe.get(key)
+            pipe.ttl(key)
+            value, remaining_ttl = await pipe.execute()
+        except Exception as e:
+            self.logger.warning(f"Failed to get cached result: {str(e)}")
+            return None
+        
+        if not value:
+            return None
+        
+        encoded = value.decode() if isinstance(value, bytes) else value
+        self._put_local(key, encoded, remaining_ttl if remaining_ttl and remaining_ttl > 0 else self.default_ttl)
+        return encoded
+    
+    async def _store(self, key: str, encoded: str, ttl: int) -> None:
+        self._put_local(key, encoded, ttl)
+        if self.redis_pool is None:
+            return
+        
+        try:
+            await self.redis_pool.setex(key, ttl, encoded)
+        except Exception as e:
+            self.logger.warning(f"Failed to cache result: {str(e)}")
+    
+    def _count(self, agent_name: str, counter: str) -> None:
+        stats = self._agent_stats.get(agent_name)
+        if stats is None:
+            stats = self._agent_stats[agent_name] = self._empty_stats()
+        stats[counter] += 1
+    
+    @staticmethod
+    def _empty_stats() -> Dict[str, int]:
+        return {"local_hits": 0, "redis_hits": 0, "coalesced": 0, "misses": 0}
@@ -162,77 +162,15 @@ class StressValidationAgent(BaseAgent):
             await self._log_agent_action("start_validation", task.task_id)
             
             vin = task.vin
-            vehicle_data = task.results.get("vehicle_data", {})
-            active_stressors = task.results.get("active_stressors", [])
-            cohort_data = task.results.get("cohort_assignment", {})
             
             # Check cache first
             cache_key = f"stress_validation:{vin}:{datetime.now().strftime('%Y%m%d')}"  # Daily cache
-            cached_result = await self._get_cached_result(cache_key)
-            if cached_result:
-                await self._log_agent_action("cache_hit", task.task_id)
-                return cached_result
-            
-            # Extract validation context
-            validation_context = self._build_validation_context(vehicle_data, cohort_data)
-            
-            # Validate each active stressor
-            validated_stressors = []
-            rejected_stressors = []
-            validation_details = {}
-            
-            for stressor in active_stressors:
-                validation_result = self._validate_stressor(stressor, validation_context)
-                
-                if validation_result["valid"]:
-                    validated_stressors.append(stressor)
-                else:
-                    rejected_stressors.append(stressor)
-                
-                validation_details[stressor] = validation_result
-            
-            # Detect additional context-appropriate stressors
-            additional_stressors = self._detect_context_stressors(validation_context, validated_stressors)
-            validated_stressors.extend(additional_stressors)
-            
-            # Calculate validation confidence
-            validation_confidence = self._calculate_validation_confidence(validated_stressors, validation_details)
-            
-            # Generate reasonableness report
-            reasonableness_report = self._generate_reasonableness_report(
-                validated_stressors, rejected_stressors, validation_context
+            result, cache_hit = await self._get_or_compute_cached(
+                cache_key, lambda: self._validate_stressors(task, start_time)
             )
-            
-            # Generate result
-            result = {
-                "vin": vin,
-                "validated_stressors": validated_stressors,
-                "rejected_stressors": rejected_stressors,
-                "validation_details": validation_details,
-                "validation_context": validation_context,
-                "validation_confidence": validation_confidence,
-                "reasonableness_report": reasonableness_report,
-                "additional_stressors_detected": additional_stressors,
-                "total_valid_stressors": len(validated_stressors),
-                "false_positive_prevention": len(rejected_stressors),
-                "validation_timestamp": datetime.utcnow().isoformat()
-            }
-            
-            # Cache result (daily expiry since validation depends on season/weather)
-            await self._cache_result(cache_key, result, ttl=86400)  # 24 hours
-            
-            # Store debug info
-            debug_info = {
-                "original_stressors": len(active_stressors),
-                "validated_stressors": len(validated_stressors),
-                "rejected_stressors": len(rejected_stressors),
-                "validation_confidence": validation_confidence,
-                "processing_time_ms": (datetime.utcnow() - start_time).total_seconds() * 1000
-            }
-            await self._store_debug_info(task.task_id, debug_info)
-            
-            await self._log_agent_action("validation_complete", task.task_id,
-                                       {"validated": len(validated_stressors), "rejected": len(rejected_stressors)})
+            if cache_hit:
+                await self._log_agent_action("cache_hit", task.task_id)
+                return result
             
             # Update metrics
             processing_time = (datetime.utcnow() - start_time).total_seconds()
@@ -254,6 +192,73 @@ class StressValidationAgent(BaseAgent):
                 "validation_confidence": 0.0
             }
     
+    async def _validate_stressors(self, task, start_time: datetime) -> Dict[str, Any]:
+        """Validate a VIN's active stressors (runs on a cache miss)"""
+        vin = task.vin
+        vehicle_data = task.results.get("vehicle_data", {})
+        active_stressors = task.results.get("active_stressors", [])
+        cohort_data = task.results.get("cohort_assignment", {})
+        
+        # Extract validation context
+        validation_context = self._build_validation_context(vehicle_data, cohort_data)
+        
+        # Validate each active stressor
+        validated_stressors = []
+        rejected_stressors = []
+        validation_details = {}
+        
+        for stressor in active_stressors:
+            validation_result = self._validate_stressor(stressor, validation_context)
+            
+            if validation_result["valid"]:
+                validated_stressors.append(stressor)
+            else:
+                rejected_stressors.append(stressor)
+            
+            validation_details[stressor] = validation_result
+        
+        # Detect additional context-appropriate stressors
+        additional_stressors = self._detect_context_stressors(validation_context, validated_stressors)
+        validated_stressors.extend(additional_stressors)
+        
+        # Calculate validation confidence
+        validation_confidence = self._calculate_validation_confidence(validated_stressors, validation_details)
+        
+        # Generate reasonableness report
+        reasonableness_report = self._generate_reasonableness_report(
+            validated_stressors, rejected_stressors, validation_context
+        )
+        
+        # Generate result
+        result = {
+            "vin": vin,
+            "validated_stressors": validated_stressors,
+            "rejected_stressors": rejected_stressors,
+            "validation_details": validation_details,
+            "validation_context": validation_context,
+            "validation_confidence": validation_confidence,
+            "reasonableness_report": reasonableness_report,
+            "additional_stressors_detected": additional_stressors,
+            "total_valid_stressors": len(validated_stressors),
+            "false_positive_prevention": len(rejected_stressors),
+            "validation_timestamp": datetime.utcnow().isoformat()
+        }
+        
+        # Store debug info
+        debug_info = {
+            "original_stressors": len(active_stressors),
+            "validated_stressors": len(validated_stressors),
+            "rejected_stressors": len(rejected_stressors),
+            "validation_confidence": validation_confidence,
+            "processing_time_ms": (datetime.utcnow() - start_time).total_seconds() * 1000
+        }
+        await self._store_debug_info(task.task_id, debug_info)
+        
+        await self._log_agent_action("validation_complete", task.task_id,
+                                   {"validated": len(validated_stressors), "rejected": len(rejected_stressors)})
+        
+        return result
+    
     def _build_validation_context(self, vehicle_data: Dict[str, Any], cohort_data: Dict[str, Any]) -> Dict[str, Any]:
         """Build comprehensive validation context"""
         
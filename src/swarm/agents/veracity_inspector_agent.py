@@ -7,6 +7,7 @@ import asyncio
 import json
 from typing import Dict, Any, List
 from datetime import datetime
+import numpy as np
 from .base_agent import BaseAgent
 
 
@@ -26,106 +27,131 @@ class VeracityInspectorAgent(BaseAgent):
     
     async def process(self, task) -> Dict[str, Any]:
         """Inspect lead for veracity and reasonableness"""
+        return (await self.process_batch([task]))[0]
+    
+    async def process_batch(self, tasks: List) -> List[Dict[str, Any]]:
+        """Inspect a micro-batch of leads, with the checks vectorized across tasks"""
+        if not tasks:
+            return []
+        
         start_time = datetime.utcnow()
+        results = self._score_isolated(
+            tasks, self._inspect_tasks, lambda e: {"error": str(e), "passes_inspection": False}
+        )
         
-        try:
-            risk_score = task.results.get("risk_score", 0.0)
-            confidence = task.results.get("confidence", 0.0)
-            validated_stressors = task.results.get("validated_stressors", [])
-            lead_classification = task.results.get("lead_classification", {})
-            
-            # Run verification checks
-            verification_results = self._run_verification_checks(
-                risk_score, confidence, validated_stressors, lead_classification
+        processing_time = (datetime.utcnow() - start_time).total_seconds() / len(tasks)
+        failures = sum("error" in result for result in results)
+        await self._update_batch_metrics(processing_time, len(tasks), failures=failures)
+        await self._write_batch_records("veracity_inspection", [
+            (task.task_id, {
+                "inspection_status": result["inspection_status"],
+                "veracity_score": result["veracity_score"]
+            }, {"rejection_reasons": result["rejection_reasons"]})
+            for task, result in zip(tasks, results)
+            if "error" not in result
+        ])
+        
+        return results
+    
+    def _inspect_tasks(self, tasks: List) -> List[Dict[str, Any]]:
+        """Inspection report per task"""
+        risk_scores = np.array([task.results.get("risk_score", 0.0) for task in tasks], dtype=np.float64)
+        confidences = np.array([task.results.get("confidence", 0.0) for task in tasks], dtype=np.float64)
+        stressor_counts = np.array([len(task.results.get("validated_stressors", [])) for task in tasks])
+        high_risk = np.array([
+            task.results.get("lead_classification", {}).get("level") in ["critical", "high"]
+            for task in tasks
+        ], dtype=bool)
+        
+        # Run verification checks: (tasks, checks) pass/fail matrix
+        passed = self._run_verification_checks(risk_scores, confidences, stressor_counts, high_risk)
+        
+        # Calculate veracity score
+        veracity_scores = self._calculate_veracity_scores(passed)
+        
+        results = []
+        for row in range(len(tasks)):
+            verification_results = self._describe_checks(
+                passed[row], float(risk_scores[row]), float(confidences[row]), int(stressor_counts[row])
             )
             
-            # Calculate veracity score
-            veracity_score = self._calculate_veracity_score(verification_results)
-            
             # Determine if lead passes inspection
-            passes_inspection = veracity_score >= 0.8
+            passes_inspection = bool(veracity_scores[row] >= 0.8)
             
-            result = {
+            results.append({
                 "passes_inspection": passes_inspection,
-                "veracity_score": veracity_score,
+                "veracity_score": float(veracity_scores[row]),
                 "verification_results": verification_results,
                 "inspection_status": "approved" if passes_inspection else "rejected",
                 "rejection_reasons": [check["reason"] for check in verification_results if not check["passed"]]
-            }
-            
-            processing_time = (datetime.utcnow() - start_time).total_seconds()
-            await self._update_metrics(processing_time, True)
-            
-            return result
+            })
             
-        except Exception as e:
-            processing_time = (datetime.utcnow() - start_time).total_seconds()
-            await self._update_metrics(processing_time, False)
-            
-            return {"error": str(e), "passes_inspection": False}
+        return results
     
-    def _run_verification_checks(self, risk_score: float, confidence: float, 
-                               stressors: List[str], classification: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Run all verification checks"""
-        checks = []
-        
+    def _run_verification_checks(self, risk_scores: np.ndarray, confidences: np.ndarray,
+                                 stressor_counts: np.ndarray, high_risk: np.ndarray) -> np.ndarray:
+        """Run all verification checks; columns follow _describe_checks order"""
         # Risk score bounds check
         bounds = self.validation_checks["risk_score_bounds"]
-        risk_valid = bounds["min"] <= risk_score <= bounds["max"]
-        checks.append({
-            "check": "risk_score_bounds",
-            "passed": risk_valid,
-            "reason": f"Risk score {risk_score:.3f} outside valid range" if not risk_valid else "Valid range"
-        })
+        risk_valid = (bounds["min"] <= risk_scores) & (risk_scores <= bounds["max"])
         
         # Confidence bounds check
         conf_bounds = self.validation_checks["confidence_bounds"]
-        conf_valid = conf_bounds["min"] <= confidence <= conf_bounds["max"]
-        checks.append({
-            "check": "confidence_bounds",
-            "passed": conf_valid,
-            "reason": f"Confidence {confidence:.3f} outside valid range" if not conf_valid else "Valid range"
-        })
+        conf_valid = (conf_bounds["min"] <= confidences) & (confidences <= conf_bounds["max"])
         
         # High risk stressor check
-        high_risk = classification.get("level") in ["critical", "high"]
         min_stressors = self.validation_checks["min_stressors_for_high_risk"]
-        stressor_valid = not high_risk or len(stressors) >= min_stressors
-        checks.append({
-            "check": "high_risk_stressor_count",
-            "passed": stressor_valid,
-            "reason": f"High risk with only {len(stressors)} stressors" if not stressor_valid else "Sufficient stressors"
-        })
+        stressor_valid = ~high_risk | (stressor_counts >= min_stressors)
         
         # Mathematical consistency check
-        math_consistent = self._check_mathematical_consistency(risk_score, confidence, stressors)
-        checks.append({
-            "check": "mathematical_consistency",
-            "passed": math_consistent,
-            "reason": "Mathematical inconsistency detected" if not math_consistent else "Mathematically consistent"
-        })
+        math_consistent = self._check_mathematical_consistency(risk_scores, confidences, stressor_counts)
         
-        return checks
+        return np.column_stack([risk_valid, conf_valid, stressor_valid, math_consistent])
+    
+    def _describe_checks(self, passed: np.ndarray, risk_score: float, confidence: float,
+                         stressor_count: int) -> List[Dict[str, Any]]:
+        """Turn one task's pass/fail row into the per-check report"""
+        risk_valid, conf_valid, stressor_valid, math_consistent = (bool(value) for value in passed)
+        return [
+            {
+                "check": "risk_score_bounds",
+                "passed": risk_valid,
+                "reason": f"Risk score {risk_score:.3f} outside valid range" if not risk_valid else "Valid range"
+            },
+            {
+                "check": "confidence_bounds",
+                "passed": conf_valid,
+                "reason": f"Confidence {confidence:.3f} outside valid range" if not conf_valid else "Valid range"
+            },
+            {
+                "check": "high_risk_stressor_count",
+                "passed": stressor_valid,
+                "reason": f"High risk with only {stressor_count} stressors" if not stressor_valid else "Sufficient stressors"
+            },
+            {
+                "check": "mathematical_consistency",
+                "passed": math_consistent,
+                "reason": "Mathematical inconsistency detected" if not math_consistent else "Mathematically consistent"
+            }
+        ]
     
-    def _check_mathematical_consistency(self, risk_score: float, confidence: float, stressors: List[str]) -> bool:
+    def _check_mathematical_consistency(self, risk_scores: np.ndarray, confidences: np.ndarray,
+                                        stressor_counts: np.ndarray) -> np.ndarray:
         """Check if results are mathematically consistent"""
         # High risk should correlate with sufficient evidence
-        if risk_score > 0.5 and len(stressors) == 0:
-            return False
+        unsupported_risk = (risk_scores > 0.5) & (stressor_counts == 0)
         
         # Confidence should not exceed what's possible with available data
-        if confidence > 0.95 and len(stressors) < 3:
-            return False
+        overconfident = (confidences > 0.95) & (stressor_counts < 3)
         
-        return True
+        return ~(unsupported_risk | overconfident)
     
-    def _calculate_veracity_score(self, checks: List[Dict[str, Any]]) -> float:
-        """Calculate overall veracity score"""
-        if not checks:
-            return 0.0
+    def _calculate_veracity_scores(self, passed: np.ndarray) -> np.ndarray:
+        """Calculate overall veracity score per task"""
+        if passed.shape[1] == 0:
+            return np.zeros(passed.shape[0])
         
-        passed_checks = sum(1 for check in checks if check["passed"])
-        return passed_checks / len(checks)
+        return passed.sum(axis=1) / passed.shape[1]
     
     def get_agent_info(self) -> Dict[str, Any]:
         return {
@@ -6,12 +6,14 @@ Enhanced orchestrator that:
 - Provides cohort-specific worker scaling
 - Manages dynamic cohort updates
 - Optimizes processing by cohort groups
+- Shards cohorts across orchestrator nodes by consistent hashing, so each
+  cohort is always scored on the node whose caches are warm for it
 """
 
 import asyncio
 import logging
 import json
-from typing import Dict, List, Optional, Set
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple, Union
 from datetime import datetime, timedelta
 from dataclasses import dataclass
 from enum import Enum
@@ -20,7 +22,13 @@ import redis.asyncio as redis
 from ..models.schemas import VehicleInputData, RiskScoreOutput, ProcessingTask
 from ..models.cohort_schemas import CohortDefinition, CohortMatchResult
 from ..services.cohort_service import CohortService
+from ..services.score_fingerprint_store import ScoreFingerprintStore
+from ..services.priority_scheduler import PriorityLaneScheduler
+from ..services.batch_executor import BoundedBatchExecutor
 from ..engines.bayesian_engine import BayesianRiskEngine
+from ..engines.bayesian_engine_v2 import BayesianRiskEngineV2
+from ..engines.process_pool_scorer import ProcessPoolScorer
+from .cohort_sharding import ConsistentHashRing, ShardTransport
 
 
 logger = logging.getLogger(__name__)
@@ -55,13 +63,32 @@ class CohortOrchestrator:
     def __init__(self, 
                  redis_client: redis.Redis,
                  cohort_service: CohortService,
-                 bayesian_engine: BayesianRiskEngine):
+                 bayesian_engine: Union[BayesianRiskEngine, BayesianRiskEngineV2],
+                 fingerprint_store: Optional[ScoreFingerprintStore] = None,
+                 batch_size: int = 1000,
+                 max_concurrency: int = 100,
+                 process_pool_scorer: Optional[ProcessPoolScorer] = None,
+                 node_id: str = "local",
+                 shard_ring: Optional[ConsistentHashRing] = None,
+                 shard_transport: Optional[ShardTransport] = None):
         self.redis_client = redis_client
         self.cohort_service = cohort_service
         self.bayesian_engine = bayesian_engine
+        self.fingerprint_store = fingerprint_store  # Enables delta (changed-VIN-only) runs
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        self.process_pool_scorer = process_pool_scorer  # Multi-core backend running bayesian_engine; replaces per-VIN tasks
+        self.node_id = node_id
+        self.shard_ring = shard_ring  # Multi-node mode: cohort -> owner node (shared by all nodes)
+        self.shard_transport = shard_transport  # Carries cohort groups to their owner node
+        if (shard_ring is None) != (shard_transport is None):
+            raise ValueError("shard_ring and shard_transport must be given together")
+        if process_pool_scorer is not None and process_pool_scorer.engine is not bayesian_engine:
+            # The pool must score with the configured engine, or results would depend on the backend
+            raise ValueError("process_pool_scorer must wrap the orchestrator's bayesian_engine (a BayesianRiskEngineV2)")
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
         
-        # Cohort-specific worker pools
+        # Nodes serving each cohort (the owner node in multi-node mode)
         self.cohort_workers: Dict[str, Set[str]] = {}
         self.cohort_workloads: Dict[str, CohortWorkload] = {}
         
@@ -74,6 +101,11 @@ class CohortOrchestrator:
             # Initialize cohort service
             await self.cohort_service.initialize()
             
+            # Join the ring and accept cohort groups routed here by other nodes
+            if self.shard_ring is not None:
+                self.shard_ring.add_node(self.node_id)
+                self.shard_transport.register(self.node_id, self._process_cohort_group)
+            
             # Load all cohorts and initialize worker pools
             cohorts = await self.cohort_service.get_all_cohorts()
             for cohort in cohorts:
@@ -103,30 +135,43 @@ class CohortOrchestrator:
         """Process vehicle batch with cohort-aware optimization"""
         start_time = datetime.utcnow()
         
-        # Step 1: Group vehicles by cohort for optimized processing
-        cohort_groups = await self._group_vehicles_by_cohort(vehicles)
+        # Step 0: Delta mode - only score VINs whose inputs, cohorts or model changed
+        partition = None
+        if self.fingerprint_store:
+            await self.cohort_service.get_all_cohorts()  # Ensures database_version is loaded
+            partition = await self.fingerprint_store.partition(
+                vehicles, self.cohort_service.database_version, self.model_version
+            )
+            vehicles = partition.changed
         
-        # Step 2: Allocate workers based on cohort workload
-        await self._allocate_cohort_workers(cohort_groups)
+        if self.process_pool_scorer:
+            # Steps 1-4 on the process pool: cohort-sharded array scoring across all cores
+            cohort_groups, all_results = await self._process_in_process_pool(vehicles)
+        else:
+            # Step 1: Group vehicles by cohort for optimized processing
+            cohort_groups = await self._group_vehicles_by_cohort(vehicles)
         
-        # Step 3: Process each cohort group
-        all_results = []
-        processing_tasks = []
+            # Step 2: Allocate workers based on cohort workload
+            await self._allocate_cohort_workers(cohort_groups)
         
-        for cohort_id, vehicle_group in cohort_groups.items():
-            task = asyncio.create_task(
-                self._process_cohort_group(cohort_id, vehicle_group)
-            )
-            processing_tasks.append(task)
+            # Step 3: Process each cohort group
+            all_results = []
+            processing_tasks = []
         
-        # Step 4: Gather all results
-        cohort_results = await asyncio.gather(*processing_tasks, return_exceptions=True)
+            for cohort_id, vehicle_group in cohort_groups.items():
+                task = asyncio.create_task(
+                    self._route_cohort_group(cohort_id, vehicle_group)
+                )
+                processing_tasks.append(task)
         
-        for result in cohort_results:
-            if isinstance(result, Exception):
-                self.logger.error(f"Cohort processing failed: {str(result)}")
-            else:
-                all_results.extend(result)
+            # Step 4: Gather all results
+            cohort_results = await asyncio.gather(*processing_tasks, return_exceptions=True)
+            
+            for result in cohort_results:
+                if isinstance(result, Exception):
+                    self.logger.error(f"Cohort processing failed: {str(result)}")
+                else:
+                    all_results.extend(result)
         
         # Step 5: Update metrics and workload tracking
         await self._update_cohort_metrics(cohort_groups, all_results)
@@ -134,8 +179,75 @@ class CohortOrchestrator:
         processing_time = (datetime.utcnow() - start_time).total_seconds()
         self.logger.info(f"Processed {len(all_results)} vehicles across {len(cohort_groups)} cohorts in {processing_time:.2f}s")
         
+        # Step 6: Record fresh fingerprints and carry unchanged results forward, in input order
+        if partition:
+            await self.fingerprint_store.record(all_results, partition.fingerprints, vehicles)
+            all_results = partition.merge(all_results)
+        
         return all_results
     
+    async def process_by_priority(
+        self,
+        vehicles: List[VehicleInputData],
+        scheduler: Optional[PriorityLaneScheduler] = None
+    ) -> AsyncIterator[Tuple[str, List[RiskScoreOutput]]]:
+        """
+        Nightly run in priority lanes: critical and high VINs (by last known
+        severity and input deltas) are scored first, and each lane's results
+        are yielded as soon as it finishes, before later lanes are scored
+        """
+        scheduler = scheduler or PriorityLaneScheduler(self.fingerprint_store)
+        
+        for lane in await scheduler.plan(vehicles):
+            lane_start = datetime.utcnow()
+            results = await self.process_vehicle_batch(lane.vehicles)
+            
+            lane_time = (datetime.utcnow() - lane_start).total_seconds()
+            self.logger.info(f"Priority lane {lane.name}: {len(results)} results in {lane_time:.2f}s")
+            yield lane.name, results
+    
+    @property
+    def model_version(self) -> str:
+        """Model version of the configured engine (part of delta-run fingerprints)"""
+        return self.bayesian_engine.model_version
+    
+    async def _process_in_process_pool(
+        self, vehicles: List[VehicleInputData]
+    ) -> Tuple[Dict[str, List[VehicleInputData]], List[RiskScoreOutput]]:
+        """
+        Match and score a batch on the process pool, then materialize outputs here
+        
+        Confidence and freshness come from the vectorized compact records, so
+        the parent only assembles each output from already computed values.
+        """
+        start_time = datetime.utcnow()
+        scores = await self.process_pool_scorer.score_vehicles(vehicles)
+        records = self.bayesian_engine.build_risk_score_records(scores, vehicles, scored_at=start_time)
+        
+        cohort_groups: Dict[str, List[VehicleInputData]] = {}
+        for row, vehicle in enumerate(vehicles):
+            cohort_groups.setdefault(scores.cohort_id(row), []).append(vehicle)
+        await self._allocate_cohort_workers(cohort_groups)
+        
+        results = []
+        completed: Dict[str, int] = {}
+        for record in records:
+            try:
+                results.append(await self.bayesian_engine.to_risk_score_output(record))
+                completed[record.cohort_id] = completed.get(record.cohort_id, 0) + 1
+            except Exception as e:
+                self.logger.error(f"Failed to process vehicle {record.vin}: {str(e)}")
+        
+        processing_time = (datetime.utcnow() - start_time).total_seconds()
+        for cohort_id, vehicle_group in cohort_groups.items():
+            if cohort_id in self.cohort_workloads:
+                workload = self.cohort_workloads[cohort_id]
+                workload.pending_vehicles = 0
+                workload.completed_vehicles += completed.get(cohort_id, 0)
+                workload.avg_processing_time = processing_time / len(vehicles)
+        
+        return cohort_groups, results
+    
     async def _group_vehicles_by_cohort(self, vehicles: List[VehicleInputData]) -> Dict[str, List[VehicleInputData]]:
         """Group vehicles by their matched cohort"""
         cohort_groups = {}
@@ -166,14 +278,38 @@ class CohortOrchestrator:
         
         return cohort_groups
     
+    def owner_node(self, cohort_id: str) -> str:
+        """Node that scores a cohort (this node unless sharding is enabled)"""
+        if self.shard_ring is None or not len(self.shard_ring):
+            return self.node_id
+        return self.shard_ring.node_for(cohort_id)
+    
+    def cohort_owners(self) -> Dict[str, List[str]]:
+        """Known cohorts grouped by owner node"""
+        owners: Dict[str, List[str]] = {}
+        for cohort_id in self.cohort_workloads:
+            owners.setdefault(self.owner_node(cohort_id), []).append(cohort_id)
+        return owners
+    
+    async def _route_cohort_group(self, cohort_id: str, vehicles: List[VehicleInputData]) -> List[RiskScoreOutput]:
+        """Score a cohort group here if this node owns the cohort, otherwise on its owner"""
+        owner = self.owner_node(cohort_id)
+        if owner == self.node_id:
+            return await self._process_cohort_group(cohort_id, vehicles)
+        
+        self.logger.debug(f"Routing cohort {cohort_id} ({len(vehicles)} vehicles) to node {owner}")
+        return await self.shard_transport.submit(owner, cohort_id, vehicles)
+    
     async def _allocate_cohort_workers(self, cohort_groups: Dict[str, List[VehicleInputData]]) -> None:
-        """Dynamically allocate workers based on cohort workload"""
+        """Assign each cohort group to its owner node and size its worker share by workload"""
         total_vehicles = sum(len(group) for group in cohort_groups.values())
         
         for cohort_id, vehicle_group in cohort_groups.items():
             workload_ratio = len(vehicle_group) / total_vehicles
             
             # Update workload tracking
+            owner = self.owner_node(cohort_id)
+            self.cohort_workers[cohort_id] = {owner}
             if cohort_id in self.cohort_workloads:
                 self.cohort_workloads[cohort_id].pending_vehicles = len(vehicle_group)
             
@@ -188,7 +324,10 @@ class CohortOrchestrator:
             else:
                 optimal_workers = base_workers
             
-            self.logger.debug(f"Allocated {optimal_workers} workers for cohort {cohort_id} ({len(vehicle_group)} vehicles)")
+            if cohort_id in self.cohort_workloads:
+                self.cohort_workloads[cohort_id].specialized_workers = optimal_workers
+            
+            self.logger.debug(f"Allocated {optimal_workers} workers on node {owner} for cohort {cohort_id} ({len(vehicle_group)} vehicles)")
     
     async def _process_cohort_group(self, cohort_id: str, vehicles: List[VehicleInputData]) -> List[RiskScoreOutput]:
         """Process a group of vehicles from the same cohort"""
@@ -200,13 +339,13 @@ class CohortOrchestrator:
             self.cohort_workloads[cohort_id].pending_vehicles = 0
         
         try:
-            # Process vehicles in parallel
-            processing_tasks = [
-                self.bayesian_engine.calculate_risk_score(vehicle)
-                for vehicle in vehicles
-            ]
-            
-            results = await asyncio.gather(*processing_tasks, return_exceptions=True)
+            # Process vehicles in chunks of batch_size with bounded concurrency
+            executor = BoundedBatchExecutor(
+                chunk_size=self.batch_size,
+                max_in_flight=self.max_concurrency,
+                name=f"cohort {cohort_id}"
+            )
+            results = await executor.run(vehicles, self.bayesian_engine.calculate_risk_score)
             
             # Filter out exceptions and log errors
             valid_results = []
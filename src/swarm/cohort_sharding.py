@@ -0,0 +1,207 @@
+"""
+Ford Bayesian Risk Score Engine - Cohort Sharding
+
+Maps cohorts to orchestrator nodes and carries cohort groups to their owner:
+- Consistent-hash ring with virtual nodes: every cohort has one owner node,
+  so its cohort-warm caches stay hot there, and adding or removing a node
+  moves only about 1/N of the cohorts
+- Shard transports deliver a cohort group to its owner and return the
+  owner's results; LocalShardTransport does this with one in-process queue
+  per node, so several nodes can run (and be tested) in one process
+"""
+
+import asyncio
+import bisect
+import hashlib
+import logging
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_VIRTUAL_NODES = 128
+
+# Handler a node registers to process a cohort group it owns: (cohort_id, vehicles) -> results
+CohortGroupHandler = Callable[[str, List[Any]], Awaitable[List[Any]]]
+
+
+def _ring_hash(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+
+class ConsistentHashRing:
+    """
+    Consistent-hash ring of node ids with virtual nodes
+    """
+    
+    def __init__(self, nodes: Iterable[str] = (), virtual_nodes: int = DEFAULT_VIRTUAL_NODES):
+        if virtual_nodes < 1:
+            raise ValueError("virtual_nodes must be at least 1")
+        
+        self.virtual_nodes = virtual_nodes  # Points per node; more points even out the cohort split
+        self._points: List[int] = []  # Sorted ring positions
+        self._owners: Dict[int, str] = {}  # Ring position -> node id
+        self._nodes: set = set()
+        for node_id in nodes:
+            self.add_node(node_id)
+    
+    @property
+    def nodes(self) -> List[str]:
+        return sorted(self._nodes)
+    
+    def __len__(self) -> int:
+        return len(self._nodes)
+    
+    def __contains__(self, node_id: str) -> bool:
+        return node_id in self._nodes
+    
+    def add_node(self, node_id: str) -> None:
+        """Place a node's virtual points on the ring (no-op if it is already there)"""
+        if node_id in self._nodes:
+            return
+        
+        self._nodes.add(node_id)
+        for replica in range(self.virtual_nodes):
+            point = _ring_hash(f"{node_id}#{replica}")
+            if point in self._owners:
+                continue  # 64-bit collision: keep the earlier owner
+            self._owners[point] = node_id
+            bisect.insort(self._points, point)
+    
+    def remove_node(self, node_id: str) -> None:
+        """Take a node off the ring; its cohorts fall to the next points clockwise"""
+        if node_id not in self._nodes:
+            return
+        
+        self._nodes.discard(node_id)
+        self._owners = {point: owner for point, owner in self._owners.items() if owner != node_id}
+        self._points = sorted(self._owners)
+    
+    def node_for(self, key: str) -> str:
+        """Owner node of a key (cohort id): the first virtual point clockwise of its hash"""
+        if not self._points:
+            raise LookupError("Hash ring has no nodes")
+        
+        index = bisect.bisect_right(self._points, _ring_hash(key))
+        return self._owners[self._points[index % len(self._points)]]
+    
+    def assignments(self, keys: Iterable[str]) -> Dict[str, List[str]]:
+        """Keys grouped by owner node"""
+        owners: Dict[str, List[str]] = {node_id: [] for node_id in self.nodes}
+        for key in keys:
+            owners[self.node_for(key)].append(key)
+        return owners
+
+
+class ShardTransport(ABC):
+    """
+    Delivers cohort groups to the node that owns them
+    """
+    
+    @abstractmethod
+    def register(self, node_id: str, handler: CohortGroupHandler) -> None:
+        """Make a node reachable; handler processes the cohort groups it owns"""
+        pass
+    
+    @abstractmethod
+    async def submit(self, node_id: str, cohort_id: str, vehicles: List[Any]) -> List[Any]:
+        """Process a cohort group on its owner node and return the results"""
+        pass
+    
+    async def stop(self) -> None:
+        """Release transport resources"""
+        pass
+
+
+@dataclass
+class _ShardRequest:
+    cohort_id: str
+    vehicles: List[Any]
+    done: asyncio.Future
+
+
+class LocalShardTransport(ShardTransport):
+    """
+    In-process transport: one bounded queue per node, drained by that node's consumers
+    """
+    
+    def __init__(self, consumers_per_node: int = 4, queue_maxsize: int = 1000):
+        if consumers_per_node < 1:
+            raise ValueError("consumers_per_node must be at least 1")
+        
+        self.consumers_per_node = consumers_per_node  # Cohort groups a node processes concurrently
+        self.queue_maxsize = queue_maxsize
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        
+        self._handlers: Dict[str, CohortGroupHandler] = {}
+        self._queues: Dict[str, asyncio.Queue] = {}
+        self._consumers: Dict[str, List[asyncio.Task]] = {}
+        self.submitted: Dict[str, int] = {}  # Cohort groups delivered per node
+    
+    def register(self, node_id: str, handler: CohortGroupHandler) -> None:
+        self._handlers[node_id] = handler
+        self.submitted.setdefault(node_id, 0)
+    
+    def unregister(self, node_id: str) -> None:
+        """Stop delivering to a node (its queue keeps draining until stop())"""
+        self._handlers.pop(node_id, None)
+    
+    async def submit(self, node_id: str, cohort_id: str, vehicles: List[Any]) -> List[Any]:
+        if node_id not in self._handlers:
+            raise LookupError(f"Shard node {node_id} is not registered")
+        
+        if node_id not in self._queues:
+            self._start_node(node_id)
+        
+        request = _ShardRequest(cohort_id, vehicles, asyncio.get_running_loop().create_future())
+        await self._queues[node_id].put(request)
+        self.submitted[node_id] += 1
+        return await request.done
+    
+    async def stop(self) -> None:
+        """Cancel every node's consumers"""
+        consumers = [task for tasks in self._consumers.values() for task in tasks]
+        for task in consumers:
+            task.cancel()
+        await asyncio.gather(*consumers, return_exceptions=True)
+        self._consumers = {}
+        self._queues = {}
+    
+    def queue_depths(self) -> Dict[str, int]:
+        return {node_id: queue.qsize() for node_id, queue in self._queues.items()}
+    
+    def _start_node(self, node_id: str) -> None:
+        self._queues[node_id] = asyncio.Queue(maxsize=self.queue_maxsize)
+        self._consumers[node_id] = [
+            asyncio.create_task(self._consume(node_id)) for _ in range(self.consumers_per_node)
+        ]
+    
+    async def _consume(self, node_id: str) -> None:
+        queue = self._queues[node_id]
+        while True:
+            request = await queue.get()
+            try:
+                handler = self._handlers.get(node_id)
+                if handler is None:
+                    raise LookupError(f"Shard node {node_id} is no longer registered")
+                result = await handler(request.cohort_id, request.vehicles)
+                if not request.done.done():
+                    request.done.set_result(result)
+            except Exception as e:
+                if not request.done.done():
+                    request.done.set_exception(e)
+            finally:
+                queue.task_done()
+
+
+def moved_keys(before: ConsistentHashRing, after: ConsistentHashRing, keys: Iterable[str]) -> List[Tuple[str, str, str]]:
+    """(key, old owner, new owner) for keys whose owner differs between two rings"""
+    moves = []
+    for key in keys:
+        old_owner, new_owner = before.node_for(key), after.node_for(key)
+        if old_owner != new_owner:
+            moves.append((key, old_owner, new_owner))
+    return moves
@@ -0,0 +1,201 @@
+"""
+Ford Bayesian Risk Score Engine - Swarm Metrics History
+
+Fixed-size time-series store for swarm metric snapshots:
+- Raw snapshots go to a Redis Stream capped with MAXLEN, so writes stay
+  O(1) and nothing has to be scanned or pruned key by key
+- Numeric series are rolled up in-process into 1m/5m/1h buckets
+  (avg/min/max/last); closed buckets are appended to one capped stream per
+  resolution so dashboards in other processes can read aggregates
+- Dashboards query rollups instead of raw snapshots
+"""
+
+import json
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+
+import redis.asyncio as redis
+
+
+logger = logging.getLogger(__name__)
+
+
+# Rollup resolutions (seconds) and how many closed buckets each keeps
+ROLLUP_RESOLUTIONS = {"1m": 60, "5m": 300, "1h": 3600}
+DEFAULT_ROLLUP_RETENTION = {"1m": 1440, "5m": 288, "1h": 168}  # 24h, 24h, 7 days
+
+# Top-level metric sections rolled up by default (nested numbers are flattened to "a.b.c")
+DEFAULT_SERIES_PREFIXES = (
+    "total_workers", "workers_by_service", "queue_depths", "processing_rates", "error_rates", "work_queues"
+)
+
+
+def _field(fields: Dict[Any, Any], name: str) -> str:
+    value = fields.get(name.encode(), fields.get(name))
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def flatten_metrics(metrics: Dict[str, Any], prefixes: Optional[Iterable[str]] = None) -> Dict[str, float]:
+    """Numeric leaves of a nested metrics dict as {"section.key": value}, limited to the given top-level sections"""
+    allowed = set(prefixes) if prefixes is not None else None
+    values = {}
+    stack = [("", metrics)]
+    while stack:
+        path, node = stack.pop()
+        for key, value in node.items():
+            name = f"{path}.{key}" if path else str(key)
+            if not path and allowed is not None and name not in allowed:
+                continue
+            if isinstance(value, dict):
+                stack.append((name, value))
+            elif isinstance(value, (int, float)) and not isinstance(value, bool):
+                values[name] = float(value)
+    return values
+
+
+@dataclass
+class RollupBucket:
+    """Aggregates of every series over one resolution-aligned window"""
+    start: float
+    resolution: int
+    count: int = 0
+    sums: Dict[str, float] = field(default_factory=dict)
+    mins: Dict[str, float] = field(default_factory=dict)
+    maxs: Dict[str, float] = field(default_factory=dict)
+    last: Dict[str, float] = field(default_factory=dict)
+    samples: Dict[str, int] = field(default_factory=dict)
+    
+    def add(self, values: Dict[str, float]) -> None:
+        self.count += 1
+        for name, value in values.items():
+            if name in self.sums:
+                self.sums[name] += value
+                self.mins[name] = min(self.mins[name], value)
+                self.maxs[name] = max(self.maxs[name], value)
+                self.samples[name] += 1
+            else:
+                self.sums[name] = self.mins[name] = self.maxs[name] = value
+                self.samples[name] = 1
+            self.last[name] = value
+    
+    def summary(self, series: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        names = self.sums.keys() if series is None else [name for name in series if name in self.sums]
+        return {
+            "start": datetime.utcfromtimestamp(self.start).isoformat(),
+            "resolution_seconds": self.resolution,
+            "samples": self.count,
+            "series": {
+                name: {
+                    "avg": self.sums[name] / self.samples[name],
+                    "min": self.mins[name],
+                    "max": self.maxs[name],
+                    "last": self.last[name]
+                }
+                for name in names
+            }
+        }
+
+
+class MetricsHistory:
+    """
+    Capped Redis Stream of raw snapshots plus in-process 1m/5m/1h rollups
+    """
+    
+    def __init__(
+        self,
+        redis_pool: redis.Redis,
+        key: str = "swarm:metrics:timeseries",
+        max_snapshots: int = 1440,
+        series_prefixes: Optional[Iterable[str]] = DEFAULT_SERIES_PREFIXES,
+        rollup_retention: Optional[Dict[str, int]] = None
+    ):
+        if max_snapshots < 1:
+            raise ValueError("max_snapshots must be at least 1")
+        
+        self.redis_pool = redis_pool
+        self.key = key
+        self.max_snapshots = max_snapshots  # Raw snapshots kept (24h at one per minute)
+        self.series_prefixes = series_prefixes  # None rolls up every numeric leaf
+        self.rollup_retention = {**DEFAULT_ROLLUP_RETENTION, **(rollup_retention or {})}
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        
+        self._open: Dict[str, RollupBucket] = {}
+        self._closed: Dict[str, Deque[RollupBucket]] = {
+            resolution: deque(maxlen=self.rollup_retention[resolution]) for resolution in ROLLUP_RESOLUTIONS
+        }
+    
+    def rollup_key(self, resolution: str) -> str:
+        return f"{self.key}:{resolution}"
+    
+    async def record(self, metrics: Dict[str, Any], timestamp: Optional[float] = None) -> None:
+        """Append a snapshot and fold it into the rollups; buckets it closes are persisted in the same round trip"""
+        timestamp = time.time() if timestamp is None else timestamp
+        closed = self._add_to_rollups(flatten_metrics(metrics, self.series_prefixes), timestamp)
+        
+        pipe = self.redis_pool.pipeline(transaction=False)
+        pipe.xadd(
+            self.key,
+            {"timestamp": timestamp, "snapshot": json.dumps(metrics, default=str)},
+            maxlen=self.max_snapshots, approximate=True
+        )
+        for resolution, bucket in closed:
+            pipe.xadd(
+                self.rollup_key(resolution),
+                {"bucket": json.dumps(bucket.summary())},
+                maxlen=self.rollup_retention[resolution], approximate=True
+            )
+        await pipe.execute()
+    
+    def get_rollups(
+        self,
+        resolution: str = "5m",
+        since: Optional[float] = None,
+        series: Optional[Iterable[str]] = None,
+        include_open: bool = True
+    ) -> List[Dict[str, Any]]:
+        """Aggregates at one resolution, oldest first, from this process (the open bucket is partial)"""
+        if resolution not in ROLLUP_RESOLUTIONS:
+            raise ValueError(f"resolution must be one of {list(ROLLUP_RESOLUTIONS)}")
+        
+        series = list(series) if series is not None else None
+        buckets = list(self._closed[resolution])
+        if include_open and resolution in self._open:
+            buckets.append(self._open[resolution])
+        return [
+            bucket.summary(series) for bucket in buckets
+            if since is None or bucket.start + bucket.resolution > since
+        ]
+    
+    async def load_rollups(self, resolution: str = "5m", count: int = 100) -> List[Dict[str, Any]]:
+        """Latest closed buckets at one resolution from Redis (for readers outside this process), oldest first"""
+        if resolution not in ROLLUP_RESOLUTIONS:
+            raise ValueError(f"resolution must be one of {list(ROLLUP_RESOLUTIONS)}")
+        
+        entries = await self.redis_pool.xrevrange(self.rollup_key(resolution), count=count)
+        return [json.loads(_field(fields, "bucket")) for _, fields in reversed(entries)]
+    
+    async def latest_snapshots(self, count: int = 10) -> List[Dict[str, Any]]:
+        """Most recent raw snapshots, newest first"""
+        entries = await self.redis_pool.xrevrange(self.key, count=count)
+        return [json.loads(_field(fields, "snapshot")) for _, fields in entries]
+    
+    def _add_to_rollups(self, values: Dict[str, float], timestamp: float) -> List[Tuple[str, RollupBucket]]:
+        """Fold values into each resolution's open bucket; returns (resolution, bucket) pairs closed by this sample"""
+        closed = []
+        for resolution, seconds in ROLLUP_RESOLUTIONS.items():
+            start = timestamp - timestamp % seconds
+            bucket = self._open.get(resolution)
+            if bucket is not None and bucket.start != start:
+                if start < bucket.start:
+                    continue  # Late sample for a bucket already closed
+                self._closed[resolution].append(bucket)
+                closed.append((resolution, bucket))
+                bucket = None
+            if bucket is None:
+                bucket = self._open[resolution] = RollupBucket(start=start, resolution=seconds)
+            bucket.add(values)
+        return closed
@@ -2,8 +2,8 @@
 Ford Bayesian Risk Score Engine - Swarm Orchestrator
 
 Manages distributed processing across multiple worker nodes with:
-- Dynamic load balancing
-- Fault tolerance and recovery
+- Pull-based work queues: idle workers claim tasks from Redis Streams
+- Fault tolerance and recovery (leases, retries, dead-lettering)
 - Auto-scaling based on queue depth
 - Health monitoring and metrics collection
 """
@@ -12,12 +12,12 @@ import asyncio
 import logging
 import json
 import uuid
-from typing import Dict, List, Optional, Set
-from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set, Tuple
+from datetime import datetime, timedelta, timezone
 from dataclasses import dataclass, asdict
 from enum import Enum
 import redis
-import aioredis
+import redis.asyncio as aioredis
 from contextlib import asynccontextmanager
 
 from ..models.schemas import (
@@ -25,6 +25,9 @@ from ..models.schemas import (
     RiskScoreOutput, HealthCheck
 )
 from ..engines.bayesian_engine import BayesianRiskEngine, BatchBayesianProcessor
+from .admission import DEFAULT_WAIT_SLO_SECONDS, MIN_RETRY_AFTER_SECONDS, AdmissionRejected
+from .metrics_history import MetricsHistory
+from .work_queue import PRIORITIES, ClaimedTask, RedisWorkQueue, get_task_state
 
 
 logger = logging.getLogger(__name__)
@@ -74,17 +77,34 @@ class SwarmOrchestrator:
     Central orchestrator for the Ford Risk Score swarm
     """
     
-    def __init__(self, redis_url: str = "redis://localhost:6379"):
+    def __init__(
+        self,
+        redis_url: str = "redis://localhost:6379",
+        max_queue_size: int = 10000,
+        queue_wait_slo: Optional[Dict[int, float]] = None,
+        visibility_timeout: float = 300.0,
+        max_attempts: int = 3,
+        task_result_ttl: int = 86400,
+        high_priority_reserve: float = 0.2
+    ):
         self.redis_url = redis_url
         self.redis_pool = None
         self.workers: Dict[str, WorkerNode] = {}
-        self.task_queues: Dict[ServiceType, asyncio.Queue] = {}
+        self.work_queues: Dict[ServiceType, RedisWorkQueue] = {}  # Created on start, one per service type
         self.running = False
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
         
-        # Initialize task queues for each service type
-        for service_type in ServiceType:
-            self.task_queues[service_type] = asyncio.Queue(maxsize=10000)
+        # Work queue settings (tasks are shed past the wait SLO of their priority)
+        self.max_queue_size = max_queue_size
+        self.queue_wait_slo = {**DEFAULT_WAIT_SLO_SECONDS, **(queue_wait_slo or {})}
+        self.high_priority_reserve = high_priority_reserve  # Share of max_queue_size only priority 1 may fill
+        self.visibility_timeout = visibility_timeout  # Seconds before an unacked task is stolen by another worker
+        self.max_attempts = max_attempts  # Claims per task before it is dead-lettered
+        self.task_result_ttl = task_result_ttl  # Seconds finished task state is kept
+        
+        # Per service: completed-task counter sample and smoothed throughput (tasks/s) for wait estimates
+        self._throughput: Dict[ServiceType, Dict[str, float]] = {}
+        self.metrics_history: Optional[MetricsHistory] = None  # Created on start
         
         # Swarm configuration
         self.config = {
@@ -96,6 +116,7 @@ class SwarmOrchestrator:
             "min_workers_per_service": 1,
             "max_workers_per_service": 10,
             "health_check_interval": 60,
+            "metrics_interval": 60,    # seconds between metrics snapshots
         }
     
     async def start(self):
@@ -103,14 +124,30 @@ class SwarmOrchestrator:
         self.logger.info("Starting Ford Risk Score Swarm Orchestrator")
         
         # Initialize Redis connection
-        self.redis_pool = await aioredis.from_url(self.redis_url)
+        self.redis_pool = aioredis.from_url(self.redis_url)
+        
+        # One work queue per service type; workers pull from these via claim_task()
+        for service_type in ServiceType:
+            self.work_queues[service_type] = RedisWorkQueue(
+                self.redis_pool,
+                service_type.value,
+                visibility_timeout=self.visibility_timeout,
+                max_attempts=self.max_attempts,
+                result_ttl=self.task_result_ttl
+            )
+            await self.work_queues[service_type].ensure_groups()
+        
+        # 24h of raw snapshots at the default interval; rollups are kept in process
+        self.metrics_history = MetricsHistory(
+            self.redis_pool,
+            max_snapshots=max(1, 86400 // self.config["metrics_interval"])
+        )
         
         self.running = True
         
         # Start background tasks
         tasks = [
             asyncio.create_task(self._heartbeat_monitor()),
-            asyncio.create_task(self._task_dispatcher()),
             asyncio.create_task(self._auto_scaler()),
             asyncio.create_task(self._health_monitor()),
             asyncio.create_task(self._metrics_collector()),
@@ -130,7 +167,7 @@ class SwarmOrchestrator:
         self.running = False
         
         if self.redis_pool:
-            await self.redis_pool.close()
+            await self.redis_pool.aclose()
     
     async def register_worker(self, worker_id: str, service_type: ServiceType) -> bool:
         """Register a new worker with the swarm"""
@@ -181,24 +218,33 @@ class SwarmOrchestrator:
             return False
     
     async def submit_task(self, task: ProcessingTask) -> str:
-        """Submit a task to the appropriate service queue"""
+        """
+        Submit a task to the appropriate service queue
+        
+        Raises AdmissionRejected (HTTP 429 with Retry-After) when the queue is
+        full for the task's priority (lower priorities are shed first, keeping
+        headroom for priority 1) or its wait estimate exceeds the priority's SLO.
+        """
         try:
             # Determine service type based on task type
             service_type = self._get_service_type_for_task(task.task_type)
             
-            # Add to appropriate queue
-            await self.task_queues[service_type].put(task)
+            # Shed before queueing when the backlog ahead of this priority would miss its SLO
+            await self._admit(service_type, task.priority)
             
-            # Store task in Redis for persistence
-            await self.redis_pool.hset(
-                "swarm:tasks:pending",
+            # Persist and enqueue in one transaction; an idle worker claims it from there
+            await self.work_queues[service_type].submit(
                 task.task_id,
-                json.dumps(task.dict(), default=str)
+                json.dumps(task.dict(), default=str),
+                task.priority
             )
             
             self.logger.debug(f"Submitted task {task.task_id} to {service_type.value} queue")
             return task.task_id
             
+        except AdmissionRejected as e:
+            self.logger.warning(f"Shed task {task.task_id}: {str(e)}")
+            raise
         except Exception as e:
             self.logger.error(f"Failed to submit task {task.task_id}: {str(e)}")
             raise
@@ -206,27 +252,82 @@ class SwarmOrchestrator:
     async def get_task_status(self, task_id: str) -> Optional[ProcessingTask]:
         """Get the status of a specific task"""
         try:
-            # Check pending tasks
-            task_data = await self.redis_pool.hget("swarm:tasks:pending", task_id)
-            if task_data:
-                return ProcessingTask.parse_raw(task_data)
-            
-            # Check completed tasks
-            task_data = await self.redis_pool.hget("swarm:tasks:completed", task_id)
-            if task_data:
-                return ProcessingTask.parse_raw(task_data)
-            
-            # Check failed tasks
-            task_data = await self.redis_pool.hget("swarm:tasks:failed", task_id)
-            if task_data:
-                return ProcessingTask.parse_raw(task_data)
-            
-            return None
+            # One hash per task; finished tasks expire after task_result_ttl
+            state = await get_task_state(self.redis_pool, task_id)
+            if not state:
+                return None
+            
+            task = ProcessingTask.parse_raw(state["payload"])
+            task.status = {"retrying": "pending", "dead_letter": "failed"}.get(state["status"], state["status"])
+            task.worker_id = state.get("worker_id")
+            task.error_message = state.get("error")
+            if state.get("claimed_at"):
+                task.started_at = datetime.fromisoformat(state["claimed_at"])
+            if state.get("completed_at"):
+                task.completed_at = datetime.fromisoformat(state["completed_at"])
+            if state.get("result"):
+                task.result = RiskScoreOutput.parse_raw(state["result"])
+            return task
             
         except Exception as e:
             self.logger.error(f"Failed to get task status for {task_id}: {str(e)}")
             return None
     
+    async def claim_task(
+        self,
+        worker_id: str,
+        count: int = 1,
+        block_ms: int = 5000
+    ) -> List[Tuple[ProcessingTask, ClaimedTask]]:
+        """
+        Pull work for a registered worker from its service's queue
+        
+        Blocks up to block_ms when nothing is queued. Every claimed task must
+        be passed to complete_task() or fail_task(); tasks left unacked past
+        visibility_timeout are handed to another worker.
+        """
+        worker = self.workers.get(worker_id)
+        if worker is None:
+            raise ValueError(f"Worker {worker_id} is not registered")
+        
+        claimed = await self.work_queues[worker.service_type].claim(worker_id, count=count, block_ms=block_ms)
+        worker.last_heartbeat = datetime.utcnow()
+        if not claimed:
+            return []
+        
+        worker.status = WorkerStatus.BUSY
+        worker.current_task = claimed[-1].task_id
+        return [(ProcessingTask.parse_raw(item.payload), item) for item in claimed]
+    
+    async def complete_task(
+        self,
+        worker_id: str,
+        claimed: ClaimedTask,
+        result: Optional[RiskScoreOutput] = None
+    ) -> bool:
+        """Ack a claimed task and store its result (kept for task_result_ttl); False if its lease was taken over"""
+        acked = await self.work_queues[ServiceType(claimed.service)].ack(
+            claimed, result.json() if result is not None else None
+        )
+        
+        worker = self.workers.get(worker_id)  # May have been dropped for missed heartbeats meanwhile
+        if worker:
+            if acked:
+                worker.processed_count += 1
+            self._release_worker(worker, claimed.task_id)
+        return acked
+    
+    async def fail_task(self, worker_id: str, claimed: ClaimedTask, error: str, retry: bool = True) -> bool:
+        """Requeue a failed task, or dead-letter it once it ran out of attempts; False if its lease was taken over"""
+        failed = await self.work_queues[ServiceType(claimed.service)].fail(claimed, error, retry=retry)
+        
+        worker = self.workers.get(worker_id)
+        if worker:
+            worker.error_count += 1
+            self._release_worker(worker, claimed.task_id)
+        self.logger.warning(f"Task {claimed.task_id} failed on worker {worker_id} (attempt {claimed.attempts}): {error}")
+        return failed
+    
     async def get_swarm_metrics(self) -> Dict[str, any]:
         """Get comprehensive swarm metrics"""
         try:
@@ -235,6 +336,8 @@ class SwarmOrchestrator:
                 "total_workers": len(self.workers),
                 "workers_by_service": {},
                 "queue_depths": {},
+                "work_queues": {},
+                "admission": {},
                 "processing_rates": {},
                 "error_rates": {},
                 "system_health": "healthy"
@@ -251,9 +354,17 @@ class SwarmOrchestrator:
                     "error": len([w for w in service_workers if w.status == WorkerStatus.ERROR])
                 }
             
-            # Queue depths
-            for service_type, queue in self.task_queues.items():
-                metrics["queue_depths"][service_type.value] = queue.qsize()
+            # Queue depths (waiting plus in flight), dead letters and completions per lane
+            for service_type, queue in self.work_queues.items():
+                queue_stats = await queue.get_stats()
+                metrics["queue_depths"][service_type.value] = queue_stats["depth"]
+                metrics["work_queues"][service_type.value] = queue_stats
+                metrics["admission"][service_type.value] = {
+                    "throughput_per_second": self._throughput.get(service_type, {}).get("rate", 0.0),
+                    "wait_slo_seconds": self.queue_wait_slo,
+                    "limit_by_priority": {priority: self._admission_limit(priority) for priority in PRIORITIES},
+                    "wait_histograms": queue_stats["wait_histograms"]
+                }
             
             # Processing rates and error rates
             for worker in self.workers.values():
@@ -283,6 +394,21 @@ class SwarmOrchestrator:
             self.logger.error(f"Failed to get swarm metrics: {str(e)}")
             return {"error": str(e)}
     
+    def get_metrics_rollups(
+        self,
+        resolution: str = "5m",
+        since: Optional[datetime] = None,
+        series: Optional[List[str]] = None
+    ) -> List[Dict[str, any]]:
+        """Aggregated metrics history (avg/min/max/last per series) at 1m, 5m or 1h resolution, for dashboards"""
+        if self.metrics_history is None:
+            return []
+        return self.metrics_history.get_rollups(
+            resolution,
+            since=since.replace(tzinfo=timezone.utc).timestamp() if since else None,
+            series=series
+        )
+    
     async def _heartbeat_monitor(self):
         """Monitor worker heartbeats and mark offline workers"""
         while self.running:
@@ -307,79 +433,62 @@ class SwarmOrchestrator:
                 self.logger.error(f"Heartbeat monitor error: {str(e)}")
                 await asyncio.sleep(5)
     
-    async def _task_dispatcher(self):
-        """Dispatch tasks to available workers"""
-        while self.running:
-            try:
-                # Process each service type queue
-                for service_type, queue in self.task_queues.items():
-                    if queue.empty():
-                        continue
-                    
-                    # Find available workers for this service
-                    available_workers = [
-                        w for w in self.workers.values()
-                        if w.service_type == service_type and w.status == WorkerStatus.IDLE
-                    ]
-                    
-                    if not available_workers:
-                        continue
-                    
-                    # Dispatch tasks to available workers
-                    for worker in available_workers:
-                        if queue.empty():
-                            break
-                        
-                        try:
-                            task = await asyncio.wait_for(queue.get(), timeout=0.1)
-                            await self._assign_task_to_worker(task, worker)
-                        except asyncio.TimeoutError:
-                            break
-                
-                await asyncio.sleep(0.1)  # Small delay to prevent busy waiting
-                
-            except Exception as e:
-                self.logger.error(f"Task dispatcher error: {str(e)}")
-                await asyncio.sleep(1)
-    
-    async def _assign_task_to_worker(self, task: ProcessingTask, worker: WorkerNode):
-        """Assign a specific task to a worker"""
-        try:
-            worker.status = WorkerStatus.BUSY
-            worker.current_task = task.task_id
-            task.worker_id = worker.worker_id
-            task.started_at = datetime.utcnow()
-            task.status = "processing"
-            
-            # Update task in Redis
-            await self.redis_pool.hset(
-                "swarm:tasks:processing",
-                task.task_id,
-                json.dumps(task.dict(), default=str)
+    async def _admit(self, service_type: ServiceType, priority: int):
+        """Raise AdmissionRejected when the queue is full for this priority or the wait ahead of it exceeds its SLO"""
+        depths, completed = await self.work_queues[service_type].backlog()
+        ahead = sum(depth for lane_priority, depth in depths.items() if lane_priority <= priority)
+        throughput = self._update_throughput(service_type, completed)
+        
+        estimated_wait = ahead / throughput if throughput else 0.0
+        slo = self.queue_wait_slo.get(priority, max(self.queue_wait_slo.values()))
+        if estimated_wait > slo:
+            raise AdmissionRejected(
+                f"Shedding priority {priority} task: estimated queue wait {estimated_wait:.2f}s exceeds {slo:.2f}s SLO",
+                retry_after=estimated_wait - slo, priority=priority, estimated_wait=estimated_wait
             )
             
-            # Remove from pending
-            await self.redis_pool.hdel("swarm:tasks:pending", task.task_id)
-            
-            # Send task to worker via Redis pub/sub
-            await self.redis_pool.publish(
-                f"swarm:worker:{worker.worker_id}:tasks",
-                json.dumps(task.dict(), default=str)
+        limit = self._admission_limit(priority)
+        if sum(depths.values()) >= limit:
+            raise AdmissionRejected(
+                f"Shedding priority {priority} task: {service_type.value} queue full for priority {priority} "
+                f"({limit} of {self.max_queue_size})",
+                retry_after=1 / throughput if throughput else MIN_RETRY_AFTER_SECONDS,
+                priority=priority, estimated_wait=estimated_wait
             )
-            
-            self.logger.debug(f"Assigned task {task.task_id} to worker {worker.worker_id}")
-            
-        except Exception as e:
-            self.logger.error(f"Failed to assign task {task.task_id} to worker {worker.worker_id}: {str(e)}")
-            # Reset worker status
-            worker.status = WorkerStatus.IDLE
+    
+    def _admission_limit(self, priority: int) -> int:
+        """Queue depth at which this priority is shed; lower priorities stop earlier, leaving headroom for priority 1"""
+        rank = min(max(priority, PRIORITIES[0]), PRIORITIES[-1]) - PRIORITIES[0]
+        reserved = self.high_priority_reserve * rank / (len(PRIORITIES) - 1)
+        return max(1, int(self.max_queue_size * (1 - reserved)))
+    
+    def _update_throughput(self, service_type: ServiceType, completed: int, smoothing: float = 0.2) -> float:
+        """Smoothed completions per second, from the queue's completed-task counter (sampled at most once a second)"""
+        now = datetime.utcnow().timestamp()
+        sample = self._throughput.get(service_type)
+        if sample is None:
+            self._throughput[service_type] = {"at": now, "completed": completed, "rate": 0.0}
+            return 0.0
+            
+        elapsed = now - sample["at"]
+        if elapsed >= 1.0:
+            rate = max(0, completed - sample["completed"]) / elapsed
+            sample["rate"] = rate if not sample["rate"] else smoothing * rate + (1 - smoothing) * sample["rate"]
+            sample["at"], sample["completed"] = now, completed
+        return sample["rate"]
+    
+    def _release_worker(self, worker: WorkerNode, task_id: str):
+        """Mark a worker idle once it finished the task it was last handed"""
+        worker.last_heartbeat = datetime.utcnow()
+        if worker.current_task == task_id:
             worker.current_task = None
+            worker.status = WorkerStatus.IDLE
     
     async def _auto_scaler(self):
         """Auto-scale workers based on queue depth"""
         while self.running:
             try:
-                for service_type, queue in self.task_queues.items():
+                for service_type, queue in self.work_queues.items():
                     service_workers = [w for w in self.workers.values() if w.service_type == service_type]
                     active_workers = [w for w in service_workers if w.status != WorkerStatus.OFFLINE]
                     
@@ -387,7 +496,7 @@ class SwarmOrchestrator:
                         continue
                     
                     # Calculate queue utilization
-                    queue_depth = queue.qsize()
+                    queue_depth = await queue.depth()
                     worker_capacity = len(active_workers) * self.config["max_queue_depth"]
                     utilization = queue_depth / max(1, worker_capacity)
                     
@@ -488,11 +597,12 @@ class SwarmOrchestrator:
                 active_workers = [w for w in service_workers if w.status != WorkerStatus.OFFLINE]
                 error_workers = [w for w in service_workers if w.status == WorkerStatus.ERROR]
                 
+                queue_depth = await self.work_queues[service_type].depth()
                 service_health = {
                     "total_workers": len(service_workers),
                     "active_workers": len(active_workers),
                     "error_workers": len(error_workers),
-                    "queue_depth": self.task_queues[service_type].qsize(),
+                    "queue_depth": queue_depth,
                     "status": "healthy"
                 }
                 
@@ -503,7 +613,7 @@ class SwarmOrchestrator:
                 elif len(error_workers) > len(active_workers) * 0.5:
                     service_health["status"] = "degraded"
                     health["issues"].append(f"High error rate for {service_type.value}")
-                elif self.task_queues[service_type].qsize() > 1000:
+                elif queue_depth > 1000:
                     service_health["status"] = "overloaded"
                     health["issues"].append(f"High queue depth for {service_type.value}")
                 
@@ -530,24 +640,10 @@ class SwarmOrchestrator:
             try:
                 metrics = await self.get_swarm_metrics()
                 
-                # Store metrics in Redis with timestamp
-                timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M")
-                await self.redis_pool.hset(
-                    "swarm:metrics:history",
-                    timestamp,
-                    json.dumps(metrics, default=str)
-                )
-                
-                # Keep only last 24 hours of metrics
-                all_metrics = await self.redis_pool.hgetall("swarm:metrics:history")
-                cutoff_time = datetime.utcnow() - timedelta(hours=24)
-                cutoff_str = cutoff_time.strftime("%Y%m%d_%H%M")
-                
-                for timestamp_key in all_metrics.keys():
-                    if timestamp_key.decode() < cutoff_str:
-                        await self.redis_pool.hdel("swarm:metrics:history", timestamp_key)
+                # Capped stream of snapshots plus 1m/5m/1h rollups; no scan-and-prune pass
+                await self.metrics_history.record(metrics)
                 
-                await asyncio.sleep(60)  # Collect metrics every minute
+                await asyncio.sleep(self.config["metrics_interval"])
                 
             except Exception as e:
                 self.logger.error(f"Metrics collector error: {str(e)}")
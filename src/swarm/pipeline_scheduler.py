@@ -0,0 +1,282 @@
+"""
+Ford Bayesian Risk Score Engine - Agent Pipeline Scheduler
+
+Dependency-driven execution of the swarm agent pipeline:
+- Stages and their order come from the orchestrator's agent_dependencies map
+- An agent runs for a task as soon as all of its dependencies finished, so
+  independent agents run concurrently
+- Every stage has its own queue and worker pool; many tasks move through the
+  pipeline at once instead of one task at a time
+- Stage workers collect micro-batches (bounded by size and wait time) and
+  hand them to the agent's process_batch(), so agents can vectorize their
+  math and pipeline their Redis writes
+- Per-stage queue depth, in-flight count and timings expose the slow agent
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_STAGE_WORKERS = 8
+DEFAULT_MAX_BATCH_SIZE = 32
+DEFAULT_MAX_BATCH_WAIT = 0.005  # Seconds a worker waits to fill a micro-batch
+
+
+@dataclass
+class StageStats:
+    """Runtime counters for one agent stage"""
+    name: str
+    workers: int
+    in_flight: int = 0
+    processed: int = 0
+    failed: int = 0
+    total_time_ms: float = 0.0
+    batches: int = 0
+    
+    @property
+    def avg_time_ms(self) -> float:
+        calls = self.processed + self.failed
+        return self.total_time_ms / calls if calls else 0.0
+    
+    @property
+    def avg_batch_size(self) -> float:
+        return (self.processed + self.failed) / self.batches if self.batches else 0.0
+
+
+@dataclass
+class _TaskRun:
+    """Progress of one task through the DAG"""
+    task: Any
+    waiting_on: Dict[str, int]  # Agent -> dependencies not yet finished
+    remaining: int  # Agents not yet finished
+    done: Optional[asyncio.Future] = None
+
+
+class AgentPipelineScheduler:
+    """
+    Runs tasks through agents in dependency order with a worker pool per stage
+    """
+    
+    def __init__(
+        self,
+        agents: Dict[str, Any],
+        dependencies: Dict[str, List[str]],
+        stage_workers: Optional[Dict[str, int]] = None,
+        default_workers: int = DEFAULT_STAGE_WORKERS,
+        queue_maxsize: int = 1000,
+        optional_agents: Iterable[str] = (),
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_batch_wait: float = DEFAULT_MAX_BATCH_WAIT
+    ):
+        if max_batch_size < 1 or max_batch_wait < 0:
+            raise ValueError("max_batch_size must be at least 1 and max_batch_wait non-negative")
+        
+        self.agents = agents
+        self.dependencies = {name: list(dependencies.get(name, [])) for name in agents}
+        self.optional_agents = set(optional_agents)  # Failures are logged and the task continues
+        self.queue_maxsize = queue_maxsize
+        self.max_batch_size = max_batch_size  # 1 disables micro-batching
+        self.max_batch_wait = max_batch_wait
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        
+        self.stage_order = self._topological_order()
+        self.dependents: Dict[str, List[str]] = {name: [] for name in agents}
+        for name, deps in self.dependencies.items():
+            for dep in deps:
+                self.dependents[dep].append(name)
+        self.roots = [name for name in self.stage_order if not self.dependencies[name]]
+        
+        stage_workers = stage_workers or {}
+        self.stats = {
+            name: StageStats(name=name, workers=max(1, stage_workers.get(name, default_workers)))
+            for name in self.stage_order
+        }
+        
+        self._queues: Dict[str, asyncio.Queue] = {}
+        self._workers: List[asyncio.Task] = []
+    
+    def _topological_order(self) -> List[str]:
+        """Order agents so every agent follows its dependencies; rejects unknown agents and cycles"""
+        for name, deps in self.dependencies.items():
+            unknown = [dep for dep in deps if dep not in self.agents]
+            if unknown:
+                raise ValueError(f"Agent {name} depends on unknown agents: {unknown}")
+        
+        order = []
+        waiting = {name: len(deps) for name, deps in self.dependencies.items()}
+        ready = [name for name, count in waiting.items() if count == 0]
+        while ready:
+            name = ready.pop(0)
+            order.append(name)
+            for other, deps in self.dependencies.items():
+                if name in deps:
+                    waiting[other] -= 1
+                    if waiting[other] == 0:
+                        ready.append(other)
+        
+        if len(order) != len(self.agents):
+            raise ValueError(f"Agent dependencies contain a cycle: {sorted(set(self.agents) - set(order))}")
+        return order
+    
+    @property
+    def running(self) -> bool:
+        return bool(self._workers)
+    
+    async def start(self) -> None:
+        """Create stage queues and start every stage's worker pool"""
+        if self.running:
+            return
+        
+        for name in self.stage_order:
+            self._queues[name] = asyncio.Queue(maxsize=self.queue_maxsize)
+            for _ in range(self.stats[name].workers):
+                self._workers.append(asyncio.create_task(self._stage_worker(name)))
+        
+        self.logger.info("Pipeline stages: " + ", ".join(
+            f"{name}({self.stats[name].workers})" for name in self.stage_order
+        ))
+    
+    async def stop(self) -> None:
+        """Cancel all stage workers"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+    
+    async def run(self, task: Any) -> Any:
+        """Run one task through every agent; raises if a required agent fails"""
+        if not self.running:
+            await self.start()
+        
+        run = _TaskRun(
+            task=task,
+            waiting_on={name: len(deps) for name, deps in self.dependencies.items()},
+            remaining=len(self.stage_order),
+            done=asyncio.get_running_loop().create_future()
+        )
+        
+        for name in self.roots:
+            await self._queues[name].put(run)
+        
+        return await run.done
+    
+    def queue_depths(self) -> Dict[str, int]:
+        """Tasks waiting per stage (a growing queue marks the slow agent)"""
+        return {name: queue.qsize() for name, queue in self._queues.items()}
+    
+    def get_stage_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Queue depth, workers, in-flight count and timings per stage, in pipeline order"""
+        depths = self.queue_depths()
+        return {
+            name: {
+                "queue_depth": depths.get(name, 0),
+                "workers": stats.workers,
+                "in_flight": stats.in_flight,
+                "processed": stats.processed,
+                "failed": stats.failed,
+                "avg_time_ms": stats.avg_time_ms,
+                "avg_batch_size": stats.avg_batch_size
+            }
+            for name, stats in self.stats.items()
+        }
+    
+    async def _collect_batch(self, queue: asyncio.Queue) -> List[_TaskRun]:
+        """Wait for one run, then gather more until the batch is full or max_batch_wait has passed"""
+        batch = [await queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_batch_wait
+        
+        while len(batch) < self.max_batch_size:
+            try:
+                batch.append(queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+    
+    async def _stage_worker(self, name: str) -> None:
+        """Take micro-batches from one stage's queue, run the agent and release dependents"""
+        queue = self._queues[name]
+        agent = self.agents[name]
+        stats = self.stats[name]
+        
+        while True:
+            batch = await self._collect_batch(queue)
+            try:
+                # Skip runs an earlier required agent already failed
+                runs = [run for run in batch if not run.done.done()]
+                if not runs:
+                    continue
+                
+                start_time = datetime.utcnow()
+                stats.in_flight += len(runs)
+                stats.batches += 1
+                try:
+                    results = await self._process_batch(agent, [run.task for run in runs])
+                finally:
+                    stats.in_flight -= len(runs)
+                    stats.total_time_ms += (datetime.utcnow() - start_time).total_seconds() * 1000 * len(runs)
+                
+                for run, result in zip(runs, results):
+                    try:
+                        if isinstance(result, Exception):
+                            stats.failed += 1
+                            if name not in self.optional_agents:
+                                if not run.done.done():
+                                    run.done.set_exception(result)
+                                continue
+                            self.logger.warning(f"Optional agent {name} failed for {getattr(run.task, 'task_id', '?')}: {str(result)}")
+                        else:
+                            if result:
+                                run.task.results.update(result)
+                            stats.processed += 1
+                        
+                        await self._finish_stage(run, name)
+                    except Exception as e:
+                        self.logger.error(f"Stage {name} worker error: {str(e)}")
+                        if not run.done.done():
+                            run.done.set_exception(e)
+            except Exception as e:
+                self.logger.error(f"Stage {name} batch error: {str(e)}")
+                for run in batch:
+                    if not run.done.done():
+                        run.done.set_exception(e)
+            finally:
+                for _ in batch:
+                    queue.task_done()
+                
+    async def _process_batch(self, agent: Any, tasks: List[Any]) -> List[Any]:
+        """Run a micro-batch through the agent; results (or exceptions) are aligned with tasks"""
+        if hasattr(agent, "process_batch"):
+            results = list(await agent.process_batch(tasks))
+            if len(results) != len(tasks):
+                raise RuntimeError(f"process_batch returned {len(results)} results for {len(tasks)} tasks")
+            return results
+        return list(await asyncio.gather(*(agent.process(task) for task in tasks), return_exceptions=True))
+    
+    async def _finish_stage(self, run: _TaskRun, name: str) -> None:
+        """Mark one agent done for a task and queue dependents whose inputs are all ready"""
+        run.remaining -= 1
+        if run.remaining == 0:
+            if not run.done.done():
+                run.done.set_result(run.task)
+            return
+        
+        for dependent in self.dependents[name]:
+            run.waiting_on[dependent] -= 1
+            if run.waiting_on[dependent] == 0:
+                await self._queues[dependent].put(run)
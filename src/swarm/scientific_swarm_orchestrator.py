@@ -6,8 +6,11 @@ Bayesian-Verified, Dealer-Tuned, LLM-Augmented Multi-Agent System
 import asyncio
 import logging
 import json
+import os
+import socket
 import uuid
-from typing import Dict, List, Optional, Any, Tuple
+from collections import deque
+from typing import Dict, List, Optional, Any, Set, Tuple
 from datetime import datetime, timedelta
 from dataclasses import dataclass, asdict
 from enum import Enum
@@ -15,6 +18,12 @@ import redis.asyncio as redis
 from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 
+from ..services.batch_executor import BoundedBatchExecutor
+from .pipeline_scheduler import AgentPipelineScheduler
+from .admission import AdmissionQueue, AdmissionRejected
+from .agents.audit_writer import AuditWriter
+from .agents.result_cache import AgentResultCache
+
 logger = logging.getLogger(__name__)
 
 
@@ -71,17 +80,61 @@ class ScientificSwarmOrchestrator:
     - Intelligent load balancing
     """
     
-    def __init__(self, redis_url: str = "redis://localhost:6379"):
+    def __init__(
+        self,
+        redis_url: str = "redis://localhost:6379",
+        batch_size: int = 1000,
+        max_concurrency: int = 100,
+        persist_results: bool = True,
+        notify_remote: bool = True,
+        result_timeout: float = 30.0,
+        result_stream_maxlen: int = 100000,
+        stage_workers: Optional[Dict[str, int]] = None,
+        micro_batch_size: int = 32,
+        micro_batch_wait_ms: float = 5.0,
+        audit_flush_interval_ms: float = 50.0,
+        audit_overflow_policy: str = "block",
+        cache_max_entries: int = 10000,
+        cache_agent_ttls: Optional[Dict[str, int]] = None,
+        max_queue_size: int = 10000,
+        queue_wait_slo: Optional[Dict[int, float]] = None,
+        batch_priority: int = 5,
+        batch_admission_timeout: float = 300.0
+    ):
         self.redis_url = redis_url
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        self.persist_results = persist_results  # Keep a swarm:result:{task_id} copy for later lookups
+        self.notify_remote = notify_remote  # Pub/sub notification for callers in other processes
+        self.result_timeout = result_timeout
+        
+        # Result stream consumed incrementally by metrics and quality sampling (capped, approximate trim)
+        self.result_stream = "swarm:results:stream"
+        self.result_stream_maxlen = result_stream_maxlen
+        self.consumer_name = f"{socket.gethostname()}:{os.getpid()}"
+        self.quality_sample: deque = deque(maxlen=10)  # Most recent results for quality scoring
         self.redis_pool = None
         self.agents = {}
         self.running = False
         self.logger = logging.getLogger(f"{__name__}.ScientificSwarm")
         
-        # Task queues
-        self.task_queue = asyncio.Queue(maxsize=10000)
+        # Task queues: bounded, served by SwarmTask.priority (1 = highest), shedding load past the wait SLO
+        self.task_queue = AdmissionQueue(
+            maxsize=max_queue_size,
+            wait_slo=queue_wait_slo,
+            on_shed=self._reject_displaced_task,
+            name="swarm task"
+        )
+        self.batch_priority = batch_priority  # Priority of process_batch (nightly) traffic
+        self.batch_admission_timeout = batch_admission_timeout  # Longest a batch VIN keeps retrying after being shed
         self.result_queue = asyncio.Queue(maxsize=10000)
         
+        # In-process result delivery: task_id -> future resolved by the pipeline
+        self._pending_results: Dict[str, asyncio.Future] = {}
+        
+        # Pipeline runs started by the task processor (kept referenced until done, cancelled on stop)
+        self._pipeline_runs: Set[asyncio.Task] = set()
+        
         # Agent types and their dependencies
         self.agent_dependencies = {
             "data_ingest": [],
@@ -97,6 +150,23 @@ class ScientificSwarmOrchestrator:
             "promotion_path": ["insight_reviewer"]
         }
         
+        # Dependency-driven pipeline with a worker pool per agent stage (built once agents exist)
+        self.stage_workers = stage_workers or {}
+        self.optional_agents = ["data_ingest", "research_priors", "insight_reviewer", "promotion_path"]
+        self.micro_batch_size = micro_batch_size  # Tasks handed to an agent's process_batch() at once
+        self.micro_batch_wait_ms = micro_batch_wait_ms  # Longest a stage waits to fill a micro-batch
+        
+        # Agents' audit trail and debug info go through one buffered, pipelined writer
+        self.audit_flush_interval_ms = audit_flush_interval_ms
+        self.audit_overflow_policy = audit_overflow_policy  # "block" (backpressure) or "sample"
+        self.audit_writer: Optional[AuditWriter] = None
+        
+        # Agent results cache shared by all agents: in-process LRU in front of Redis, TTL per agent
+        self.cache_max_entries = cache_max_entries
+        self.cache_agent_ttls = cache_agent_ttls or {}
+        self.result_cache: Optional[AgentResultCache] = None
+        self.pipeline: Optional[AgentPipelineScheduler] = None
+        
         # Performance metrics
         self.metrics = {
             "tasks_processed": 0,
@@ -112,6 +182,17 @@ class ScientificSwarmOrchestrator:
         
         # Initialize Redis
         self.redis_pool = await redis.from_url(self.redis_url)
+        self.audit_writer = AuditWriter(
+            self.redis_pool,
+            flush_interval=self.audit_flush_interval_ms / 1000,
+            overflow_policy=self.audit_overflow_policy
+        )
+        self.audit_writer.start()
+        self.result_cache = AgentResultCache(
+            self.redis_pool,
+            max_entries=self.cache_max_entries,
+            agent_ttls=self.cache_agent_ttls
+        )
         
         # Initialize all agents
         await self._initialize_agents()
@@ -140,11 +221,21 @@ class ScientificSwarmOrchestrator:
         self.logger.info("🛑 Stopping Scientific VIN Swarm")
         self.running = False
         
+        await self._cancel_pipeline_runs()
+        
+        if self.audit_writer:
+            await self.audit_writer.stop()
+        
         if self.redis_pool:
             await self.redis_pool.close()
     
     async def process_vin(self, vin: str, input_data: Dict[str, Any], priority: int = 1) -> SwarmResult:
-        """Process a single VIN through the swarm"""
+        """
+        Process a single VIN through the swarm
+        
+        Raises AdmissionRejected (HTTP 429 with Retry-After) right away when the
+        queue wait for this priority would exceed its SLO.
+        """
         task_id = f"swarm_{uuid.uuid4().hex[:8]}"
         
         task = SwarmTask(
@@ -155,53 +246,134 @@ class ScientificSwarmOrchestrator:
             priority=priority
         )
         
-        # Submit to swarm
-        await self.task_queue.put(task)
+        # Register before submitting so a fast pipeline cannot finish before we wait
+        result_future = asyncio.get_running_loop().create_future()
+        self._pending_results[task_id] = result_future
         
-        # Wait for result (with timeout)
-        timeout = 30.0  # 30 seconds
-        start_time = datetime.utcnow()
+        try:
+            # Submit to swarm and wait for the pipeline to resolve the future (with timeout)
+            await self.task_queue.put(task, task.priority)
+            return await asyncio.wait_for(result_future, timeout=self.result_timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"Swarm processing timeout for VIN {vin}")
+        finally:
+            self._pending_results.pop(task_id, None)
         
-        while (datetime.utcnow() - start_time).total_seconds() < timeout:
-            try:
-                # Check Redis for result
-                result_data = await self.redis_pool.get(f"swarm:result:{task_id}")
-                if result_data:
-                    result_dict = json.loads(result_data)
-                    return SwarmResult(**result_dict)
-                
-                await asyncio.sleep(0.1)
-                
-            except Exception as e:
-                self.logger.error(f"Error checking result for {task_id}: {str(e)}")
-                break
+    async def wait_for_remote_result(self, task_id: str, timeout: Optional[float] = None) -> SwarmResult:
+        """
+        Wait for a task submitted by another process
+        
+        Subscribes to the task's notification channel, then checks the
+        persisted copy in case the result was delivered before subscribing.
+        """
+        pubsub = self.redis_pool.pubsub()
+        await pubsub.subscribe(self._result_channel(task_id))
+        
+        try:
+            if self.persist_results:
+                stored = await self.redis_pool.get(f"swarm:result:{task_id}")
+                if stored:
+                    return SwarmResult(**json.loads(stored))
         
-        raise TimeoutError(f"Swarm processing timeout for VIN {vin}")
+            payload = await asyncio.wait_for(self._next_message(pubsub), timeout=timeout or self.result_timeout)
+            return SwarmResult(**json.loads(payload))
+        
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"Swarm processing timeout for task {task_id}")
+        finally:
+            await pubsub.unsubscribe(self._result_channel(task_id))
+            await pubsub.aclose()
     
-    async def process_batch(self, vins_data: List[Tuple[str, Dict[str, Any]]]) -> List[SwarmResult]:
-        """Process batch of VINs through swarm"""
-        self.logger.info(f"🔄 Processing batch of {len(vins_data)} VINs")
+    async def _next_message(self, pubsub) -> bytes:
+        """First published message on a subscribed channel"""
+        async for message in pubsub.listen():
+            if message["type"] == "message":
+                return message["data"]
+    
+    def _reject_displaced_task(self, task: SwarmTask, rejection: AdmissionRejected) -> None:
+        """A queued task was pushed out by higher-priority work; fail its waiter fast"""
+        task.status = "shed"
+        future = self._pending_results.get(task.task_id)
+        if future and not future.done():
+            future.set_exception(rejection)
+    
+    def _result_channel(self, task_id: str) -> str:
+        return f"swarm:result:notify:{task_id}"
+    
+    async def _deliver_result(self, result: SwarmResult, ttl: int) -> None:
+        """Resolve the local waiter, then stream, persist and notify remote waiters in one round trip"""
+        future = self._pending_results.get(result.task_id)
+        if future and not future.done():
+            future.set_result(result)
         
-        # Submit all tasks
-        tasks = []
-        for vin, input_data in vins_data:
-            task = asyncio.create_task(self.process_vin(vin, input_data))
-            tasks.append(task)
+        try:
+            payload = json.dumps(asdict(result), default=str)
+            pipe = self.redis_pool.pipeline(transaction=False)
+            pipe.xadd(self.result_stream, {"result": payload}, maxlen=self.result_stream_maxlen, approximate=True)
+            if self.persist_results:
+                pipe.setex(f"swarm:result:{result.task_id}", ttl, payload)
+            if self.notify_remote:
+                pipe.publish(self._result_channel(result.task_id), payload)
+            await pipe.execute()
+        except Exception as e:
+            self.logger.warning(f"Failed to persist result for {result.task_id}: {str(e)}")
+    
+    async def process_batch(
+        self,
+        vins_data: List[Tuple[str, Dict[str, Any]]],
+        priority: Optional[int] = None
+    ) -> List[SwarmResult]:
+        """Process batch of VINs through swarm (at batch_priority unless given)"""
+        self.logger.info(f"🔄 Processing batch of {len(vins_data)} VINs")
         
-        # Process all in parallel
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        # Submit in chunks of batch_size with at most max_concurrency VINs in flight
+        executor = BoundedBatchExecutor(
+            chunk_size=self.batch_size,
+            max_in_flight=self.max_concurrency,
+            name="swarm batch"
+        )
+        priority = priority or self.batch_priority
+        deadline = asyncio.get_running_loop().time() + self.batch_admission_timeout
+        results = await executor.run(
+            vins_data, lambda vin_data: self._process_vin_when_admitted(vin_data[0], vin_data[1], priority, deadline)
+        )
         
         # Filter out exceptions
         valid_results = []
+        rejections = []
         for i, result in enumerate(results):
-            if isinstance(result, Exception):
+            if isinstance(result, AdmissionRejected):
+                rejections.append(result)
+            elif isinstance(result, Exception):
                 self.logger.error(f"Failed to process VIN {vins_data[i][0]}: {str(result)}")
             else:
                 valid_results.append(result)
         
         self.logger.info(f"✅ Batch complete: {len(valid_results)}/{len(vins_data)} successful")
+        
+        # VINs still shed at the deadline: the swarm is saturated, so the caller gets the 429
+        if rejections:
+            raise AdmissionRejected(
+                f"{len(rejections)} of {len(vins_data)} VINs were shed for {self.batch_admission_timeout:.0f}s",
+                retry_after=max(rejection.retry_after for rejection in rejections),
+                priority=priority,
+                estimated_wait=max(rejection.estimated_wait for rejection in rejections)
+            )
         return valid_results
     
+    async def _process_vin_when_admitted(
+        self, vin: str, input_data: Dict[str, Any], priority: int, deadline: float
+    ) -> SwarmResult:
+        """Batch submission: back off for retry_after whenever the swarm sheds the task, until the deadline"""
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                return await self.process_vin(vin, input_data, priority)
+            except AdmissionRejected as e:
+                if loop.time() + e.retry_after > deadline:
+                    raise
+                await asyncio.sleep(e.retry_after)
+    
     async def _initialize_agents(self):
         """Initialize all swarm agents"""
         from .agents.data_ingest_agent import DataIngestAgent
@@ -230,21 +402,69 @@ class ScientificSwarmOrchestrator:
             "promotion_path": PromotionPathAgent(self.redis_pool)
         }
         
+        for agent in self.agents.values():
+            if self.audit_writer:
+                agent.attach_audit_writer(self.audit_writer)
+            if self.result_cache:
+                agent.attach_result_cache(self.result_cache)
+        
         self.logger.info(f"✅ Initialized {len(self.agents)} intelligent agents")
     
     async def _task_processor(self):
-        """Main task processing loop"""
-        while self.running:
-            try:
-                # Get next task
-                task = await self.task_queue.get()
+        """Main task processing loop: keeps up to max_concurrency tasks moving through the pipeline"""
+        if self.pipeline is None:
+            self.pipeline = AgentPipelineScheduler(
+                self.agents,
+                self.agent_dependencies,
+                stage_workers=self.stage_workers,
+                optional_agents=self.optional_agents,
+                max_batch_size=self.micro_batch_size,
+                max_batch_wait=self.micro_batch_wait_ms / 1000
+            )
+        await self.pipeline.start()
+        
+        in_flight = asyncio.Semaphore(self.max_concurrency)
+        try:
+            while self.running:
+                try:
+                    # Wait for room in the pipeline, then take the highest-priority task
+                    await in_flight.acquire()
+                    try:
+                        task = await self.task_queue.get()
+                    except BaseException:
+                        in_flight.release()
+                        raise
                 
-                # Process through agent pipeline
-                await self._process_task_through_pipeline(task)
+                    # Process through agent pipeline without waiting for it to finish
+                    run = asyncio.create_task(self._process_task_through_pipeline(task))
+                    self._pipeline_runs.add(run)
+                    run.add_done_callback(lambda done: self._pipeline_run_done(done, in_flight))
                 
-            except Exception as e:
-                self.logger.error(f"Task processor error: {str(e)}")
-                await asyncio.sleep(1)
+                except Exception as e:
+                    self.logger.error(f"Task processor error: {str(e)}")
+                    await asyncio.sleep(1)
+        finally:
+            await self._cancel_pipeline_runs()
+            await self.pipeline.stop()
+    
+    def _pipeline_run_done(self, run: asyncio.Task, in_flight: asyncio.Semaphore) -> None:
+        """Forget a finished pipeline run, free its slot and report an escaped exception"""
+        self._pipeline_runs.discard(run)
+        in_flight.release()
+        if not run.cancelled() and run.exception() is not None:
+            self.logger.error(f"Pipeline run failed: {str(run.exception())}")
+    
+    async def _cancel_pipeline_runs(self) -> None:
+        """Cancel pipeline runs still in flight, wait for them to unwind and fail their local waiters"""
+        runs = list(self._pipeline_runs)
+        for run in runs:
+            run.cancel()
+        if runs:
+            await asyncio.gather(*runs, return_exceptions=True)
+        
+        for future in self._pending_results.values():
+            if not future.done():
+                future.set_exception(RuntimeError("Swarm stopped before the task finished"))
     
     async def _process_task_through_pipeline(self, task: SwarmTask):
         """Process task through the agent pipeline"""
@@ -253,36 +473,8 @@ class ScientificSwarmOrchestrator:
         task.status = "processing"
         
         try:
-            # Stage 1: Parallel data ingestion and research
-            stage1_tasks = [
-                self.agents["data_ingest"].process(task),
-                self.agents["research_priors"].process(task)
-            ]
-            stage1_results = await asyncio.gather(*stage1_tasks, return_exceptions=True)
-            
-            # Merge results
-            for result in stage1_results:
-                if not isinstance(result, Exception):
-                    task.results.update(result)
-            
-            # Stage 2: Sequential validation chain
-            for agent_name in ["cohort_index", "stress_validation", "bayes_score", "lead_likelihood"]:
-                agent_result = await self.agents[agent_name].process(task)
-                task.results.update(agent_result)
-            
-            # Stage 3: Quality and messaging pipeline
-            for agent_name in ["veracity_inspector", "llm_message", "ux_guardrail"]:
-                agent_result = await self.agents[agent_name].process(task)
-                task.results.update(agent_result)
-            
-            # Stage 4: Final review and promotion tracking
-            final_agents = ["insight_reviewer", "promotion_path"]
-            final_tasks = [self.agents[agent].process(task) for agent in final_agents]
-            final_results = await asyncio.gather(*final_tasks, return_exceptions=True)
-            
-            for result in final_results:
-                if not isinstance(result, Exception):
-                    task.results.update(result)
+            # Every agent runs once its dependencies finished; optional agents may fail without failing the task
+            await self.pipeline.run(task)
             
             # Create final result
             processing_time = (datetime.utcnow() - start_time).total_seconds() * 1000
@@ -301,12 +493,8 @@ class ScientificSwarmOrchestrator:
                 agent_contributions=task.results.get("agent_debug", {})
             )
             
-            # Store result in Redis
-            await self.redis_pool.setex(
-                f"swarm:result:{task.task_id}",
-                300,  # 5 minute expiry
-                json.dumps(asdict(swarm_result), default=str)
-            )
+            # Deliver result (5 minute expiry for the Redis copy)
+            await self._deliver_result(swarm_result, 300)
             
             task.status = "completed"
             task.completed_at = datetime.utcnow()
@@ -332,34 +520,57 @@ class ScientificSwarmOrchestrator:
                 agent_contributions={"error": str(e)}
             )
             
-            await self.redis_pool.setex(
-                f"swarm:result:{task.task_id}",
-                60,  # 1 minute expiry for errors
-                json.dumps(asdict(error_result), default=str)
+            await self._deliver_result(error_result, 60)  # 1 minute expiry for errors
+    
+    async def _ensure_consumer_group(self, group: str) -> None:
+        """Create a consumer group on the result stream (new entries only); no-op if it exists"""
+        try:
+            await self.redis_pool.xgroup_create(self.result_stream, group, id="$", mkstream=True)
+        except redis.ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+    
+    async def _read_result_stream(self, group: str, count: int = 500) -> List[Dict[str, Any]]:
+        """Drain entries delivered to this consumer since the last read and acknowledge them"""
+        results = []
+        while True:
+            response = await self.redis_pool.xreadgroup(
+                group, self.consumer_name, {self.result_stream: ">"}, count=count
             )
+            entries = response[0][1] if response else []
+            if not entries:
+                break
+            
+            for _, fields in entries:
+                data = fields.get(b"result") or fields.get("result")
+                try:
+                    results.append(json.loads(data))
+                except (TypeError, json.JSONDecodeError):
+                    continue
+            
+            await self.redis_pool.xack(self.result_stream, group, *[entry_id for entry_id, _ in entries])
+            if len(entries) < count:
+                break
+        
+        return results
     
     async def _result_aggregator(self):
         """Aggregate and analyze swarm results"""
+        group_ready = False
+        
         while self.running:
             try:
-                # Process results from Redis
-                keys = await self.redis_pool.keys("swarm:result:*")
+                # Created on the first pass that reaches Redis, so a slow or down Redis is retried
+                if not group_ready:
+                    await self._ensure_consumer_group("swarm-metrics")
+                    group_ready = True
                 
-                if keys:
-                    results_data = await self.redis_pool.mget(keys)
-                    
-                    valid_results = []
-                    for data in results_data:
-                        if data:
-                            try:
-                                result = json.loads(data)
-                                valid_results.append(result)
-                            except json.JSONDecodeError:
-                                continue
-                    
-                    # Update metrics
-                    if valid_results:
-                        await self._update_metrics(valid_results)
+                # Only results published since the previous pass
+                valid_results = await self._read_result_stream("swarm-metrics")
+                
+                # Update metrics
+                if valid_results:
+                    await self._update_metrics(valid_results)
                 
                 await asyncio.sleep(10)  # Check every 10 seconds
                 
@@ -377,8 +588,13 @@ class ScientificSwarmOrchestrator:
                     "agents": {},
                     "queue_depths": {
                         "tasks": self.task_queue.qsize(),
+                        "tasks_by_priority": self.task_queue.depth_by_priority(),
                         "results": self.result_queue.qsize()
                     },
+                    "admission": self.task_queue.get_stats(),
+                    "pipeline_stages": self.pipeline.get_stage_stats() if self.pipeline else {},
+                    "audit_writer": self.audit_writer.get_stats() if self.audit_writer else {},
+                    "result_cache": self.result_cache.get_stats() if self.result_cache else {},
                     "metrics": self.metrics
                 }
                 
@@ -435,24 +651,25 @@ class ScientificSwarmOrchestrator:
     
     async def _quality_validator(self):
         """Validate swarm output quality"""
+        group_ready = False
+        
         while self.running:
             try:
-                # Get recent results for quality analysis
-                keys = await self.redis_pool.keys("swarm:result:*")
+                if not group_ready:
+                    await self._ensure_consumer_group("swarm-quality")
+                    group_ready = True
                 
-                if len(keys) > 10:  # Only validate if we have enough data
-                    sample_keys = keys[-10:]  # Last 10 results
-                    results_data = await self.redis_pool.mget(sample_keys)
-                    
+                # Keep the most recent results for quality analysis
+                self.quality_sample.extend(await self._read_result_stream("swarm-quality"))
+                
+                if len(self.quality_sample) == self.quality_sample.maxlen:  # Only validate if we have enough data
                     quality_scores = []
-                    for data in results_data:
-                        if data:
-                            try:
-                                result = json.loads(data)
-                                quality_score = self._calculate_quality_score(result)
-                                quality_scores.append(quality_score)
-                            except:
-                                continue
+                    for result in self.quality_sample:
+                        try:
+                            quality_score = self._calculate_quality_score(result)
+                            quality_scores.append(quality_score)
+                        except:
+                            continue
                     
                     # Update quality metrics
                     if quality_scores:
@@ -0,0 +1,409 @@
+"""
+Ford Bayesian Risk Score Engine - Redis Work Queue
+
+Pull-based task queue for swarm workers on Redis Streams:
+- One stream per (service, priority) lane and one consumer group per
+  service; XREADGROUP hands each entry to exactly one worker (atomic claim)
+- Idle workers pull: lanes are read in priority order, then a blocking
+  read waits on all lanes at once, so no dispatcher loop sits in between
+- A claim is a lease: entries not acked within visibility_timeout are
+  stolen by the next idle worker (XAUTOCLAIM); every claim counts an
+  attempt and tasks past max_attempts go to a dead-letter stream
+- ack/fail/extend only act while the caller still holds the lease: the
+  entry must be pending for its consumer (XPENDING) and the task hash,
+  WATCHed until the write, must still carry this claim's attempt, so a
+  late worker cannot re-queue or dead-letter a task someone else took over
+- Task state lives in one hash per task; finished and dead-lettered
+  tasks expire after result_ttl, acked stream entries are deleted
+- Queue waits (first claim minus submission) feed per-priority histograms
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import redis.asyncio as redis
+
+from .admission import WaitTimeHistogram
+
+logger = logging.getLogger(__name__)
+
+
+PRIORITIES = (1, 2, 3, 4, 5)  # 1 = highest, the ProcessingTask convention
+
+
+def task_key(task_id: str) -> str:
+    return f"swarm:task:{task_id}"
+
+
+def _text(value: Any) -> Any:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+async def get_task_state(redis_pool: redis.Redis, task_id: str) -> Optional[Dict[str, str]]:
+    """Stored state of a task (any service), or None once it expired or never existed"""
+    state = await redis_pool.hgetall(task_key(task_id))
+    return {_text(field): _text(value) for field, value in state.items()} if state else None
+
+
+@dataclass
+class ClaimedTask:
+    """A task leased to one worker until it is acked, failed or its lease expires"""
+    task_id: str
+    payload: str
+    service: str
+    priority: int
+    stream: str
+    entry_id: str
+    attempts: int
+    worker_id: str
+
+
+class RedisWorkQueue:
+    """
+    Work-stealing task queue for one service type
+    """
+    
+    def __init__(
+        self,
+        redis_pool: redis.Redis,
+        service: str,
+        group: str = "swarm-workers",
+        visibility_timeout: float = 300.0,
+        max_attempts: int = 3,
+        result_ttl: int = 86400,
+        dead_letter_maxlen: int = 10000,
+        key_prefix: str = "swarm:queue"
+    ):
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        
+        self.redis_pool = redis_pool
+        self.service = service
+        self.group = group
+        self.visibility_timeout = visibility_timeout  # Seconds before an unacked claim can be stolen
+        self.max_attempts = max_attempts
+        self.result_ttl = result_ttl  # Seconds finished task state is kept
+        self.dead_letter_maxlen = dead_letter_maxlen
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        
+        self.lanes = {priority: f"{key_prefix}:{service}:p{priority}" for priority in PRIORITIES}
+        self.dead_letter_key = f"{key_prefix}:{service}:dead"
+        self.acked_key = f"{key_prefix}:{service}:acked"  # Completed-task counter (drives throughput estimates)
+        self.steal_interval = max(1.0, visibility_timeout / 10)  # Seconds between scans for expired leases
+        self._groups_ready = False
+        self._next_steal_at = 0.0
+        self.wait_histograms: Dict[int, WaitTimeHistogram] = {}  # Claims made through this instance
+    
+    def lane_for(self, priority: int) -> str:
+        return self.lanes[min(max(priority, PRIORITIES[0]), PRIORITIES[-1])]
+    
+    async def ensure_groups(self) -> None:
+        """Create every lane's stream and consumer group (idempotent)"""
+        if self._groups_ready:
+            return
+        
+        for lane in self.lanes.values():
+            try:
+                await self.redis_pool.xgroup_create(lane, self.group, id="0", mkstream=True)
+            except redis.ResponseError as e:
+                if "BUSYGROUP" not in str(e):
+                    raise
+        self._groups_ready = True
+    
+    async def submit(self, task_id: str, payload: str, priority: int = 1) -> None:
+        """Record the task and append it to its priority lane"""
+        await self.ensure_groups()
+        
+        pipe = self.redis_pool.pipeline(transaction=True)
+        pipe.hset(task_key(task_id), mapping={
+            "service": self.service,
+            "status": "pending",
+            "priority": priority,
+            "payload": payload,
+            "attempts": 0,
+            "submitted_at": datetime.utcnow().isoformat()
+        })
+        pipe.xadd(self.lane_for(priority), {"task_id": task_id, "payload": payload})
+        await pipe.execute()
+    
+    async def claim(self, worker_id: str, count: int = 1, block_ms: int = 5000) -> List[ClaimedTask]:
+        """
+        Lease up to `count` tasks to a worker
+        
+        Expired leases are stolen first (scanned every steal_interval), then
+        lanes are read in priority order; with nothing ready the call blocks
+        on all lanes for block_ms and may then return up to `count` tasks
+        per lane.
+        """
+        await self.ensure_groups()
+        
+        entries = []
+        if time.monotonic() >= self._next_steal_at:
+            self._next_steal_at = time.monotonic() + self.steal_interval
+            entries = await self._steal_expired(worker_id, count)
+        
+        if not entries:
+            for lane in self.lanes.values():
+                response = await self.redis_pool.xreadgroup(self.group, worker_id, {lane: ">"}, count=count)
+                entries = self._entries_from(response)
+                if entries:
+                    break
+        
+        if not entries and block_ms:
+            response = await self.redis_pool.xreadgroup(
+                self.group, worker_id, {lane: ">" for lane in self.lanes.values()}, count=count, block=block_ms
+            )
+            entries = self._entries_from(response)
+        
+        return await self._start(worker_id, entries)
+    
+    async def ack(self, task: ClaimedTask, result: Optional[str] = None) -> bool:
+        """
+        Complete a task: release its entry and keep its state for result_ttl
+        
+        Returns False, writing nothing, when the lease was taken over.
+        """
+        fields = {"status": "completed", "completed_at": datetime.utcnow().isoformat()}
+        if result is not None:
+            fields["result"] = result
+        
+        def write(pipe):
+            pipe.xack(task.stream, self.group, task.entry_id)
+            pipe.xdel(task.stream, task.entry_id)
+            pipe.hset(task_key(task.task_id), mapping=fields)
+            pipe.expire(task_key(task.task_id), self.result_ttl)
+            pipe.incr(self.acked_key)
+    
+        return await self._while_leased(task, "ack", write)
+    
+    async def fail(self, task: ClaimedTask, error: str, retry: bool = True) -> bool:
+        """
+        Requeue a failed task, or dead-letter it once attempts run out
+        
+        Returns False, writing nothing, when the lease was taken over.
+        """
+        if not retry or task.attempts >= self.max_attempts:
+            dead_lettered = await self._while_leased(
+                task, "dead-letter", lambda pipe: self._queue_dead_letter(pipe, task, error)
+            )
+            if dead_lettered:
+                self._log_dead_letter(task, error)
+            return dead_lettered
+        
+        def write(pipe):
+            pipe.xack(task.stream, self.group, task.entry_id)
+            pipe.xdel(task.stream, task.entry_id)
+            pipe.xadd(task.stream, {"task_id": task.task_id, "payload": task.payload})
+            pipe.hset(task_key(task.task_id), mapping={"status": "retrying", "error": error})
+    
+        return await self._while_leased(task, "retry", write)
+    
+    async def extend(self, task: ClaimedTask) -> bool:
+        """Renew a lease for long-running work (resets the entry's idle time); False once it was taken over"""
+        return await self._while_leased(
+            task, "extend",
+            lambda pipe: pipe.xclaim(task.stream, self.group, task.worker_id, 0, [task.entry_id], justid=True)
+        )
+    
+    async def get_task(self, task_id: str) -> Optional[Dict[str, str]]:
+        """Stored state of a task, or None once it expired or never existed"""
+        return await get_task_state(self.redis_pool, task_id)
+    
+    async def depth(self, max_priority: int = PRIORITIES[-1]) -> int:
+        """Tasks waiting or in flight in lanes up to max_priority (acked entries are deleted)"""
+        depths, _ = await self.backlog()
+        return sum(depth for priority, depth in depths.items() if priority <= max_priority)
+    
+    async def backlog(self) -> Tuple[Dict[int, int], int]:
+        """(depth per priority, completed-task counter) in one round trip"""
+        pipe = self.redis_pool.pipeline(transaction=False)
+        for lane in self.lanes.values():
+            pipe.xlen(lane)
+        pipe.get(self.acked_key)
+        *lengths, acked = await pipe.execute()
+        return dict(zip(self.lanes, lengths)), int(acked or 0)
+    
+    async def get_stats(self) -> Dict[str, Any]:
+        """Per-lane length and in-flight count, dead letters, completions and queue-wait histograms"""
+        await self.ensure_groups()
+        
+        pipe = self.redis_pool.pipeline(transaction=False)
+        for lane in self.lanes.values():
+            pipe.xlen(lane)
+            pipe.xpending(lane, self.group)
+        pipe.xlen(self.dead_letter_key)
+        pipe.get(self.acked_key)
+        *lane_stats, dead_letters, acked = await pipe.execute()
+        
+        lanes = {}
+        for index, priority in enumerate(self.lanes):
+            length, pending = lane_stats[2 * index], lane_stats[2 * index + 1]
+            lanes[priority] = {"depth": length, "in_flight": pending["pending"]}
+        
+        return {
+            "lanes": lanes,
+            "depth": sum(lane["depth"] for lane in lanes.values()),
+            "dead_letters": dead_letters,
+            "completed": int(acked or 0),
+            "wait_histograms": self.get_wait_histograms()
+        }
+    
+    def get_wait_histograms(self) -> Dict[int, Dict[str, Any]]:
+        """Queue wait (submission to first claim) per priority"""
+        return {priority: histogram.snapshot() for priority, histogram in sorted(self.wait_histograms.items())}
+    
+    async def _steal_expired(self, worker_id: str, count: int) -> List[Tuple[int, str, str, Dict]]:
+        """Take over entries whose lease ran out, highest priority first"""
+        min_idle_ms = int(self.visibility_timeout * 1000)
+        entries = []
+        for priority, lane in self.lanes.items():
+            response = await self.redis_pool.xautoclaim(
+                lane, self.group, worker_id, min_idle_time=min_idle_ms, start_id="0-0", count=count - len(entries)
+            )
+            for entry_id, fields in response[1]:
+                if fields:  # Entries deleted while pending come back empty
+                    entries.append((priority, lane, _text(entry_id), fields))
+            if len(entries) >= count:
+                break
+        
+        if entries:
+            self.logger.info(f"Worker {worker_id} took over {len(entries)} expired {self.service} tasks")
+        return entries
+    
+    async def _while_leased(self, task: ClaimedTask, action: str, write: Callable[[Any], Any]) -> bool:
+        """Queue write() in a transaction that only commits while task's lease is still held"""
+        key = task_key(task.task_id)
+        async with self.redis_pool.pipeline(transaction=True) as pipe:
+            try:
+                await pipe.watch(key)  # Every (re)claim bumps the hash's attempts, aborting the EXEC
+                pending = await pipe.xpending_range(
+                    task.stream, self.group, min=task.entry_id, max=task.entry_id, count=1,
+                    consumername=task.worker_id
+                )
+                attempts = await pipe.hget(key, "attempts")
+                if pending and int(attempts or 0) == task.attempts:
+                    pipe.multi()
+                    write(pipe)
+                    await pipe.execute()
+                    return True
+            except redis.WatchError:
+                pass
+        
+        self.logger.warning(
+            f"Skipped {action} of {self.service} task {task.task_id}: "
+            f"worker {task.worker_id} no longer holds its lease (attempt {task.attempts})"
+        )
+        return False
+    
+    def _entries_from(self, response) -> List[Tuple[int, str, str, Dict]]:
+        priority_by_lane = {lane: priority for priority, lane in self.lanes.items()}
+        entries = []
+        for stream, messages in response or []:
+            lane = _text(stream)
+            for entry_id, fields in messages:
+                entries.append((priority_by_lane[lane], lane, _text(entry_id), fields))
+        return entries
+    
+    async def _start(self, worker_id: str, entries: List[Tuple[int, str, str, Dict]]) -> List[ClaimedTask]:
+        """Count an attempt per claimed entry; dead-letter tasks that ran out of attempts"""
+        if not entries:
+            return []
+        
+        now = datetime.utcnow()
+        claimed_at = now.isoformat()
+        pipe = self.redis_pool.pipeline(transaction=False)
+        tasks = []
+        for priority, lane, entry_id, fields in entries:
+            fields = {_text(field): _text(value) for field, value in fields.items()}
+            tasks.append(ClaimedTask(
+                task_id=fields["task_id"], payload=fields["payload"], service=self.service, priority=priority,
+                stream=lane, entry_id=entry_id, attempts=0, worker_id=worker_id
+            ))
+            pipe.hincrby(task_key(fields["task_id"]), "attempts", 1)
+            pipe.hget(task_key(fields["task_id"]), "submitted_at")
+            pipe.hset(task_key(fields["task_id"]), mapping={
+                "status": "processing", "worker_id": worker_id, "claimed_at": claimed_at
+            })
+        results = await pipe.execute()
+        
+        leased = []
+        for task, attempts, submitted_at in zip(tasks, results[0::3], results[1::3]):
+            task.attempts = int(attempts)
+            if task.attempts == 1 and submitted_at:  # Retries and steals are not queue wait
+                wait = (now - datetime.fromisoformat(_text(submitted_at))).total_seconds()
+                self.wait_histograms.setdefault(task.priority, WaitTimeHistogram()).observe(max(0.0, wait))
+            if task.attempts > self.max_attempts:
+                await self._dead_letter(task, f"Lease expired {self.max_attempts} times")
+            else:
+                leased.append(task)
+        return leased
+    
+    async def _dead_letter(self, task: ClaimedTask, error: str) -> None:
+        pipe = self.redis_pool.pipeline(transaction=True)
+        self._queue_dead_letter(pipe, task, error)
+        await pipe.execute()
+        self._log_dead_letter(task, error)
+    
+    def _queue_dead_letter(self, pipe, task: ClaimedTask, error: str) -> None:
+        pipe.xack(task.stream, self.group, task.entry_id)
+        pipe.xdel(task.stream, task.entry_id)
+        pipe.xadd(self.dead_letter_key, {
+            "task_id": task.task_id,
+            "payload": task.payload,
+            "error": error,
+            "attempts": task.attempts
+        }, maxlen=self.dead_letter_maxlen, approximate=True)
+        pipe.hset(task_key(task.task_id), mapping={
+            "status": "dead_letter", "error": error, "completed_at": datetime.utcnow().isoformat()
+        })
+        pipe.expire(task_key(task.task_id), self.result_ttl)
+    
+    def _log_dead_letter(self, task: ClaimedTask, error: str) -> None:
+        self.logger.warning(f"Dead-lettered {self.service} task {task.task_id} after {task.attempts} attempts: {error}")
+
+
+class WorkQueueWorker:
+    """
+    Pull loop for one worker process: claim, handle, then ack or fail
+    """
+    
+    def __init__(
+        self,
+        queue: RedisWorkQueue,
+        worker_id: str,
+        handler: Callable[[ClaimedTask], Awaitable[Optional[str]]],
+        batch_size: int = 1,
+        block_ms: int = 5000
+    ):
+        self.queue = queue
+        self.worker_id = worker_id
+        self.handler = handler  # Returns the serialized result (or None)
+        self.batch_size = batch_size
+        self.block_ms = block_ms
+        self.running = False
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+    
+    async def run(self) -> None:
+        self.running = True
+        while self.running:
+            try:
+                tasks = await self.queue.claim(self.worker_id, count=self.batch_size, block_ms=self.block_ms)
+            except Exception as e:
+                self.logger.error(f"Worker {self.worker_id} claim failed: {str(e)}")
+                await asyncio.sleep(1)
+                continue
+            
+            for task in tasks:
+                try:
+                    result = await self.handler(task)
+                except Exception as e:
+                    await self.queue.fail(task, str(e))
+                else:
+                    await self.queue.ack(task, result)
+    
+    def stop(self) -> None:
+        self.running = False
@@ -0,0 +1,58 @@
+"""
+Shared fixtures for the scoring, swarm and pipeline tests
+
+Tests run against the cohorts in data/cohorts.json and synthetic vehicles;
+Redis-backed components use fakeredis so no server is needed.
+"""
+
+import json
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+# Project root on the path so tests import the src package like the scripts do
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.models.schemas import VehicleInputData, CohortAssignment
+
+COHORTS_FILE = ROOT / "data" / "cohorts.json"
+
+# VIN prefixes covering every cohort pattern in data/cohorts.json plus one unmatched make
+VIN_PREFIXES = ["1FTFW1ET5", "1FTRE1234", "1FMSK1234", "1FMHK1234", "3FA6P1234", "1FADP1234", "1FTBF1234", "ZZZZZ1234"]
+VIN_YEAR_CODES = "ABCDEFGHJKLMNPR"
+
+
+def make_vehicle(seed: int, **overrides) -> VehicleInputData:
+    """Deterministic synthetic vehicle; the seed also makes the VIN unique"""
+    rng = random.Random(seed)
+    fields = dict(
+        vin=(rng.choice(VIN_PREFIXES) + rng.choice(VIN_YEAR_CODES) + "A" + "%06d" % seed)[:17],
+        soc_30day_trend=-rng.random() * 0.5,
+        trip_cycles_weekly=rng.randint(0, 100),
+        odometer_variance=rng.random(),
+        climate_stress_index=rng.random(),
+        maintenance_compliance=rng.random(),
+        cohort_assignment=CohortAssignment(model="F-150", powertrain="Gas", region="Midwest", mileage_band="40-80k")
+    )
+    fields.update(overrides)
+    return VehicleInputData(**fields)
+
+
+@pytest.fixture
+def vehicles():
+    return [make_vehicle(i) for i in range(400)]
+
+
+@pytest.fixture(scope="session")
+def cohorts_file(tmp_path_factory):
+    """data/cohorts.json with only the metadata entries CohortDatabase accepts (str/datetime values)"""
+    database = json.loads(COHORTS_FILE.read_text())
+    database["metadata"] = {
+        key: value for key, value in database["metadata"].items() if isinstance(value, str)
+    }
+    path = tmp_path_factory.mktemp("cohorts") / "cohorts.json"
+    path.write_text(json.dumps(database))
+    return str(path)
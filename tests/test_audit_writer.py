@@ -0,0 +1,72 @@
+"""AuditWriter shutdown must not hang on a full queue and must not lose queued records"""
+
+import asyncio
+
+import fakeredis.aioredis
+
+from src.swarm.agents.audit_writer import AuditWriter
+
+
+class SlowRedis(fakeredis.aioredis.FakeRedis):
+    """Pipelines that take a while to execute, as a Redis falling behind would"""
+    
+    def pipeline(self, *args, **kwargs):
+        pipe = super().pipeline(*args, **kwargs)
+        execute = pipe.execute
+        
+        async def slow_execute(*execute_args, **execute_kwargs):
+            await asyncio.sleep(0.05)
+            return await execute(*execute_args, **execute_kwargs)
+        
+        pipe.execute = slow_execute
+        return pipe
+
+
+def test_stop_with_full_queue_writes_everything():
+    async def run():
+        client = SlowRedis()
+        writer = AuditWriter(client, max_queue=4, max_batch=2, flush_interval=0.01, put_timeout=5.0)
+        writer.start()
+        for i in range(12):
+            await writer.lpush(f"swarm:audit:task_{i}", "entry", 60)
+        assert writer._queue.full()
+        
+        await asyncio.wait_for(writer.stop(), timeout=5.0)
+        return writer.get_stats(), sorted(key.decode() for key in await client.keys("swarm:audit:*"))
+    
+    stats, keys = asyncio.run(run())
+    
+    assert stats["written"] == 12
+    assert stats["dropped"] == 0
+    assert stats["queue_depth"] == 0
+    assert keys == sorted(f"swarm:audit:task_{i}" for i in range(12))
+
+
+def test_stop_after_flush_loop_died_with_full_queue():
+    async def run():
+        client = fakeredis.aioredis.FakeRedis()
+        writer = AuditWriter(client, max_queue=3, put_timeout=0.01)
+        writer.start()
+        writer._flusher.cancel()
+        await asyncio.sleep(0)
+        for i in range(3):
+            await writer.lpush(f"swarm:audit:task_{i}", "entry", 60)
+        
+        await asyncio.wait_for(writer.stop(), timeout=1.0)
+        return writer.get_stats()
+    
+    stats = asyncio.run(run())
+    
+    assert stats["written"] == 3
+    assert stats["queue_depth"] == 0
+
+
+def test_stop_on_idle_writer_returns():
+    async def run():
+        writer = AuditWriter(fakeredis.aioredis.FakeRedis())
+        writer.start()
+        await asyncio.sleep(0)
+        await asyncio.wait_for(writer.stop(), timeout=1.0)
+        return writer.running
+    
+    assert asyncio.run(run()) is False
@@ -0,0 +1,65 @@
+"""Micro-batched swarm agents: per-task failure isolation and opt-in audit writes"""
+
+import asyncio
+from types import SimpleNamespace
+
+import fakeredis.aioredis
+
+from src.swarm.agents.audit_writer import AuditWriter
+from src.swarm.agents.bayes_score_agent import BayesScoreAgent
+from src.swarm.agents.lead_likelihood_agent import LeadLikelihoodAgent
+from src.swarm.agents.veracity_inspector_agent import VeracityInspectorAgent
+
+AGENTS = [BayesScoreAgent, LeadLikelihoodAgent, VeracityInspectorAgent]
+
+
+def _tasks():
+    stressors = [["soc_decline"], ["soc_decline", "trip_cycling"], [], ["climate_stress", "unknown"]]
+    tasks = [
+        SimpleNamespace(task_id=f"task_{i}", results={
+            "validated_stressors": validated,
+            "risk_score": 0.1 * i,
+            "confidence": 0.8,
+            "lead_classification": {"level": "high"}
+        })
+        for i, validated in enumerate(stressors)
+    ]
+    tasks.insert(2, SimpleNamespace(task_id="task_bad", results=None))
+    return tasks
+
+
+def test_one_bad_task_fails_alone():
+    async def run(agent_class):
+        agent = agent_class(fakeredis.aioredis.FakeRedis())
+        tasks = _tasks()
+        batch = await agent.process_batch(tasks)
+        single = [await agent.process(task) for task in tasks]
+        return batch, single, agent.metrics
+    
+    for agent_class in AGENTS:
+        batch, single, metrics = asyncio.run(run(agent_class))
+        
+        assert batch == single
+        assert ["error" in result for result in batch] == [False, False, True, False, False]
+        assert metrics["error_count"] == 2
+
+
+def test_audit_records_only_go_through_the_writer():
+    async def run(agent_class):
+        client = fakeredis.aioredis.FakeRedis()
+        agent = agent_class(client)
+        await agent.process_batch(_tasks())
+        direct_keys = await client.keys("swarm:*")
+        
+        writer = AuditWriter(client)
+        agent.attach_audit_writer(writer)
+        await agent.process_batch(_tasks())
+        await writer.stop()
+        audit_keys = sorted(key.decode() for key in await client.keys("swarm:audit:*"))
+        return direct_keys, audit_keys
+    
+    for agent_class in AGENTS:
+        direct_keys, audit_keys = asyncio.run(run(agent_class))
+        
+        assert direct_keys == []
+        assert audit_keys == [f"swarm:audit:task_{i}" for i in range(4)]
@@ -0,0 +1,70 @@
+"""Bounded batch executor: concurrency cap, input-ordered results and per-item failures"""
+
+import asyncio
+import random
+
+import pytest
+
+from src.services.batch_executor import BoundedBatchExecutor
+
+
+def test_concurrency_never_exceeds_the_runner_pool():
+    active = 0
+    peak = 0
+    
+    async def worker(item):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        active -= 1
+        return item
+    
+    asyncio.run(BoundedBatchExecutor(chunk_size=50, max_in_flight=7).run(list(range(230)), worker))
+    
+    assert peak == 7
+
+
+def test_results_keep_input_order_across_chunks():
+    delays = random.Random(5).choices([0, 1, 2, 3], k=95)
+    progress = []
+    
+    async def worker(item):
+        for _ in range(delays[item]):
+            await asyncio.sleep(0)
+        return item * 10
+    
+    executor = BoundedBatchExecutor(chunk_size=20, max_in_flight=6, progress_callback=progress.append)
+    results = asyncio.run(executor.run(list(range(95)), worker))
+    
+    assert results == [item * 10 for item in range(95)]
+    assert [(p.chunk_index, p.total_chunks, p.completed_items) for p in progress] == [
+        (1, 5, 20), (2, 5, 40), (3, 5, 60), (4, 5, 80), (5, 5, 95)
+    ]
+
+
+def test_a_failing_item_does_not_cancel_its_chunk():
+    progress = []
+    
+    async def worker(item):
+        await asyncio.sleep(0)
+        if item % 4 == 1:
+            raise ValueError(f"bad item {item}")
+        return item
+    
+    executor = BoundedBatchExecutor(chunk_size=8, max_in_flight=3, progress_callback=progress.append)
+    results = asyncio.run(executor.run(list(range(16)), worker))
+    
+    assert [result for result in results if not isinstance(result, Exception)] == [
+        item for item in range(16) if item % 4 != 1
+    ]
+    assert [str(results[item]) for item in (1, 5, 9, 13)] == ["bad item 1", "bad item 5", "bad item 9", "bad item 13"]
+    assert [p.failed_items for p in progress] == [2, 4]
+
+
+def test_rejects_empty_pools():
+    with pytest.raises(ValueError):
+        BoundedBatchExecutor(chunk_size=0)
+    with pytest.raises(ValueError):
+        BoundedBatchExecutor(max_in_flight=0)
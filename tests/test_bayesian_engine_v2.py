@@ -0,0 +1,62 @@
+"""Columnar batch scoring must reproduce the single-VIN V2 path row for row"""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from src.engines.bayesian_engine_v2 import BayesianRiskEngineV2, SEVERITY_ORDER, SEVERITY_THRESHOLDS
+from src.services.cohort_service import CohortService
+
+
+def _comparable(output):
+    """Output fields that do not depend on when or how fast the VIN was scored"""
+    data = output.model_dump(exclude={"metadata"})
+    data["metadata"] = output.metadata.model_dump(exclude={"scored_at", "calculation_time_ms"})
+    return data
+
+
+@pytest.fixture
+def scored(cohorts_file, vehicles):
+    async def run():
+        engine = BayesianRiskEngineV2(CohortService(cohorts_file))
+        scalar = [await engine.calculate_risk_score(vehicle) for vehicle in vehicles]
+        columns = await engine.columns_from_vehicles(vehicles)
+        scores = await engine.calculate_risk_scores_columnar(columns)
+        outputs = [await engine.build_risk_score_output(scores, row, vehicle) for row, vehicle in enumerate(vehicles)]
+        records = engine.build_risk_score_records(scores, vehicles)
+        from_records = [await engine.to_risk_score_output(record) for record in records]
+        return scalar, scores, outputs, from_records
+    
+    return asyncio.run(run())
+
+
+def test_columnar_scores_match_scalar_path(scored, vehicles):
+    scalar, scores, _, _ = scored
+    
+    assert len(scores) == len(vehicles)
+    assert scores.posterior_probability.tolist() == [output.risk_score for output in scalar]
+    assert [scores.severity(row) for row in range(len(scores))] == [output.severity_bucket for output in scalar]
+    assert [scores.cohort_id(row) for row in range(len(scores))] == [output.cohort for output in scalar]
+    assert [scores.active_stressors(row) for row in range(len(scores))] == [output.dominant_stressors for output in scalar]
+    
+    # The fixture fleet exercises more than one severity and active stressors
+    assert len(np.unique(scores.severity_index)) > 1
+    assert scores.active_mask.any()
+
+
+def test_columnar_outputs_match_scalar_outputs(scored):
+    scalar, _, outputs, from_records = scored
+    
+    assert [_comparable(output) for output in outputs] == [_comparable(output) for output in scalar]
+    assert [_comparable(output) for output in from_records] == [_comparable(output) for output in scalar]
+
+
+def test_severity_thresholds_match_classifier(cohorts_file):
+    async def run():
+        return BayesianRiskEngineV2(CohortService(cohorts_file))
+    
+    engine = asyncio.run(run())
+    for risk_score in [0.0, 0.029, 0.03, 0.0699, 0.07, 0.12, 0.1999, 0.2, 0.9]:
+        index = int(np.searchsorted(SEVERITY_THRESHOLDS, risk_score, side="right"))
+        assert SEVERITY_ORDER[index] == engine._classify_severity(risk_score)
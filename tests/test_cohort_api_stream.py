@@ -0,0 +1,86 @@
+"""Streaming batch endpoint helpers: upload parsing and NDJSON framing"""
+
+import asyncio
+import io
+import json
+
+from fastapi import UploadFile
+
+from conftest import make_vehicle
+from src.api.cohort_api import _iter_upload_records, _ndjson_stream, _score_by_priority, _score_upload_in_chunks
+
+CSV_HEADER = "vin,soc_30day_trend,trip_cycles_weekly,odometer_variance,climate_stress_index,maintenance_compliance,model,powertrain,region,mileage_band\n"
+
+
+class RejectingOrchestrator:
+    """Scores nothing, like a batch where every VIN fails"""
+    
+    async def process_vehicle_batch(self, vehicles):
+        return []
+
+
+class LaneOrchestrator:
+    """Yields fixed lanes, the middle one empty"""
+    
+    async def process_by_priority(self, vehicles):
+        yield "critical", ["first"]
+        yield "high", []
+        yield "standard", ["second", "third"]
+
+
+def _upload(text: str, filename: str) -> UploadFile:
+    return UploadFile(file=io.BytesIO(text.encode("utf-8")), filename=filename)
+
+
+def test_csv_quoted_fields_may_span_lines():
+    vin = make_vehicle(1).vin
+    upload = _upload(
+        CSV_HEADER
+        + f'{vin},-0.2,40,0.3,0.5,0.9,"F-150\nSuperCrew",Gas,"Southwest, hot",40-80k\n'
+        + f"{vin},-0.1,20,0.2,0.4,0.8,Escape,Hybrid,Midwest,0-40k\n",
+        "fleet.csv"
+    )
+    
+    records = list(_iter_upload_records(upload, is_csv=True))
+    
+    assert [line for line, _ in records] == [1, 3, 4]
+    assert records[1][1][6] == "F-150\nSuperCrew"
+    assert records[1][1][8] == "Southwest, hot"
+    assert not upload.file.closed
+
+
+def test_ndjson_lines_are_numbered_and_blank_lines_skipped():
+    vehicle = make_vehicle(2)
+    upload = _upload(vehicle.json() + "\n\n" + "{broken\n" + vehicle.json(), "fleet.ndjson")
+    
+    records = list(_iter_upload_records(upload, is_csv=False))
+    
+    assert [line for line, _ in records] == [1, 3, 4]
+
+
+def test_chunks_with_no_results_are_not_streamed():
+    upload = _upload("".join(make_vehicle(i).json() + "\n" for i in range(5)), "fleet.ndjson")
+    
+    async def run():
+        chunks = _score_upload_in_chunks(upload, False, 2, RejectingOrchestrator())
+        return [block async for block in _ndjson_stream(chunks)]
+    
+    assert asyncio.run(run()) == []
+
+
+def test_parse_errors_are_reported_with_their_line():
+    upload = _upload(make_vehicle(3).json() + "\n{broken\n", "fleet.ndjson")
+    
+    async def run():
+        chunks = _score_upload_in_chunks(upload, False, 10, RejectingOrchestrator())
+        return b"".join([block async for block in _ndjson_stream(chunks)])
+    
+    lines = asyncio.run(run()).decode().splitlines()
+    assert [json.loads(line)["line"] for line in lines] == [2]
+
+
+def test_priority_lanes_stream_one_chunk_per_non_empty_lane():
+    async def run():
+        return [chunk async for chunk in _score_by_priority([], LaneOrchestrator())]
+    
+    assert asyncio.run(run()) == [["first"], ["second", "third"]]
@@ -0,0 +1,68 @@
+"""Searchsorted cohort ranking must classify every vehicle exactly as the per-vehicle scipy path"""
+
+import json
+
+import numpy as np
+import pytest
+from scipy import stats
+
+from scripts.cohort_relative_outlier_detector import CohortRelativeOutlierDetector, percentiles_of_scores
+
+STATES = ["FL", "MI", "AZ", "TX", "OH"]
+MODELS = ["F-150", "Explorer", "Escape", "Mustang"]
+CLIMATES = ["coastal_humid", "cold_winter", "hot_dry", "temperate"]
+STRESSORS = ["salt_corrosion_exposure", "humidity_cycling_stress", "deep_discharge_events", "towing_load_stress",
+             "parasitic_draw_stress", "alternator_cycling_stress", "voltage_regulation_stress"]
+
+
+def _fleet(size: int, seed: int):
+    rng = np.random.default_rng(seed)
+    vehicles = []
+    for i in range(size):
+        active = list(rng.choice(STRESSORS, size=rng.integers(0, 5), replace=False))
+        vehicles.append({
+            "vin": f"1FTFW1ET5{i:08d}",
+            "state": str(rng.choice(STATES)),
+            "model": str(rng.choice(MODELS)),
+            "climate_zone": str(rng.choice(CLIMATES)),
+            "vehicle_age": int(rng.integers(0, 8)),
+            "current_mileage": int(rng.integers(5000, 90000)),
+            "posterior_probability": round(float(rng.beta(2, 12)), 2),  # Rounded so ranks tie
+            "stressor_count": len(active),
+            "active_stressors": active,
+            "revenue_opportunity": float(rng.choice([0, 150, 300, 450, 1200]))
+        })
+    return vehicles
+
+
+def _analyze(vehicles, percentile_method):
+    detector = CohortRelativeOutlierDetector(percentile_method=percentile_method)
+    result = detector.analyze_all_vehicles({"vehicle_analyses": vehicles})
+    with open(result["results_file"]) as f:
+        saved = json.load(f)
+    saved["summary"].pop("processing_timestamp")
+    return saved
+
+
+def test_percentiles_match_scipy_rank_kind():
+    rng = np.random.default_rng(7)
+    values = np.round(rng.normal(size=200), 1)
+    scores = np.concatenate([values[:50], [-10.0, 10.0, 0.05, np.nan]])
+    
+    expected = [stats.percentileofscore(values, score) for score in scores]
+    
+    np.testing.assert_array_equal(percentiles_of_scores(np.sort(values), scores), expected)
+    assert np.isnan(percentiles_of_scores(np.sort(np.append(values, np.nan)), scores[:3])).all()
+
+
+@pytest.mark.parametrize("size", [300, 1500])
+def test_searchsorted_classifications_match_scipy(tmp_path, monkeypatch, size):
+    monkeypatch.chdir(tmp_path)
+    vehicles = _fleet(size, seed=size)
+    
+    scipy_analysis = _analyze(vehicles, "scipy")
+    sorted_analysis = _analyze(vehicles, "searchsorted")
+    
+    assert sorted_analysis == scipy_analysis
+    statuses = {v["cohort_analysis"]["outlier_status"] for v in sorted_analysis["vehicle_outlier_analyses"]}
+    assert {"severe_outlier", "moderate_outlier", "worth_attention", "normal_for_cohort"} <= statuses
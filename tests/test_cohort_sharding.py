@@ -0,0 +1,104 @@
+"""Cohort sharding: owner-node routing over LocalShardTransport and ring rebalancing"""
+
+import asyncio
+
+import fakeredis.aioredis
+
+from src.engines.bayesian_engine_v2 import BayesianRiskEngineV2
+from src.services.cohort_service import CohortService
+from src.swarm.cohort_orchestrator import CohortOrchestrator
+from src.swarm.cohort_sharding import ConsistentHashRing, LocalShardTransport, moved_keys
+
+NODE_IDS = ["node_a", "node_b", "node_c"]
+
+
+def _comparable(output):
+    data = output.model_dump(exclude={"metadata"})
+    data["metadata"] = output.metadata.model_dump(exclude={"scored_at", "calculation_time_ms"})
+    return data
+
+
+def _orchestrator(cohorts_file, **kwargs) -> CohortOrchestrator:
+    engine = BayesianRiskEngineV2(CohortService(cohorts_file))
+    return CohortOrchestrator(fakeredis.aioredis.FakeRedis(), engine.cohort_service, engine, **kwargs)
+
+
+def _record_groups(node: CohortOrchestrator, processed: list) -> None:
+    """Log (node, cohort) for every cohort group the node scores, before it joins the transport"""
+    process = node._process_cohort_group
+    
+    async def recording(cohort_id, vehicles):
+        processed.append((node.node_id, cohort_id))
+        return await process(cohort_id, vehicles)
+    
+    node._process_cohort_group = recording
+
+
+def test_cohort_groups_are_scored_on_their_owner_node(cohorts_file, vehicles):
+    async def run():
+        ring = ConsistentHashRing()
+        transport = LocalShardTransport(consumers_per_node=2)
+        processed = []
+        nodes = []
+        for node_id in NODE_IDS:
+            node = _orchestrator(cohorts_file, node_id=node_id, shard_ring=ring, shard_transport=transport)
+            _record_groups(node, processed)
+            await node.initialize()
+            nodes.append(node)
+        
+        single = _orchestrator(cohorts_file)
+        await single.initialize()
+        try:
+            sharded = await nodes[0].process_vehicle_batch(vehicles)
+        finally:
+            await transport.stop()
+        return ring, transport, processed, sharded, await single.process_vehicle_batch(vehicles)
+    
+    ring, transport, processed, sharded, local = asyncio.run(run())
+    
+    assert ring.nodes == NODE_IDS
+    assert processed and all(node_id == ring.node_for(cohort_id) for node_id, cohort_id in processed)
+    assert len({cohort_id for _, cohort_id in processed}) == len(processed)
+    assert len({node_id for node_id, _ in processed}) > 1
+    assert sum(transport.submitted.values()) == sum(node_id != "node_a" for node_id, _ in processed)
+    
+    assert len(sharded) == len(local) == len(vehicles)
+    by_vin = {result.vin: _comparable(result) for result in local}
+    assert sorted(by_vin) == sorted(result.vin for result in sharded)
+    assert all(_comparable(result) == by_vin[result.vin] for result in sharded)
+
+
+def test_adding_a_node_moves_about_one_nth_of_cohorts():
+    cohort_ids = [f"cohort_{i}" for i in range(4000)]
+    before = ConsistentHashRing(NODE_IDS)
+    after = ConsistentHashRing(NODE_IDS + ["node_d"])
+    
+    moves = moved_keys(before, after, cohort_ids)
+    
+    assert 0.18 < len(moves) / len(cohort_ids) < 0.32
+    assert {new_owner for _, _, new_owner in moves} == {"node_d"}
+    
+    # Removing it again restores the original owners
+    after.remove_node("node_d")
+    assert moved_keys(before, after, cohort_ids) == []
+
+
+def test_single_node_without_ring_scores_locally(cohorts_file, vehicles):
+    async def run():
+        node = _orchestrator(cohorts_file)
+        processed = []
+        _record_groups(node, processed)
+        await node.initialize()
+        results = await node.process_vehicle_batch(vehicles)
+        expected = [await node.bayesian_engine.calculate_risk_score(vehicle) for vehicle in vehicles]
+        return node, processed, results, expected
+    
+    node, processed, results, expected = asyncio.run(run())
+    
+    assert node.shard_ring is None and node.shard_transport is None
+    assert all(node_id == "local" for node_id, _ in processed)
+    assert all(node.owner_node(cohort_id) == "local" for _, cohort_id in processed)
+    assert set(node.cohort_owners()) == {"local"}
+    by_vin = {result.vin: _comparable(result) for result in expected}
+    assert sorted(by_vin) == sorted(result.vin for result in results)
+    assert all(_comparable(result) == by_vin[result.vin] for result in results)
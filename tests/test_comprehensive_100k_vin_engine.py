@@ -0,0 +1,50 @@
+"""Comprehensive VIN engine: streamed and in-memory runs must produce the same fleet and exports"""
+
+import asyncio
+import json
+
+from scripts.comprehensive_100k_vin_engine import Comprehensive100kVINEngine
+
+
+def _generate(**kwargs):
+    return asyncio.run(Comprehensive100kVINEngine().generate_100k_vins(2000, chunk_size=300, seed=11, **kwargs))
+
+
+def test_without_a_sink_vehicles_are_returned():
+    results = _generate()
+    
+    assert "main_file" not in results
+    assert len(results["vehicles"]) == results["total_count"] == 2000
+    assert sum(stats["vin_count"] for stats in results["regional_stats"].values()) == 2000
+
+
+def test_streamed_file_matches_in_memory_results(tmp_path):
+    main_file = str(tmp_path / "comprehensive.json")
+    
+    streamed = _generate(main_file=main_file)
+    in_memory = _generate()
+    with open(main_file) as f:
+        written = json.load(f)
+    
+    assert streamed["main_file"] == main_file and "vehicles" not in streamed
+    assert written["vehicles"] == in_memory["vehicles"]
+    assert {key: value for key, value in written.items() if key != "vehicles"} == json.loads(json.dumps(
+        {key: value for key, value in in_memory.items() if key != "vehicles"}
+    ))
+
+
+def test_export_without_a_sink_writes_the_vehicles(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    engine = Comprehensive100kVINEngine()
+    
+    async def run():
+        results = await engine.generate_100k_vins(500, chunk_size=200, seed=3)
+        return results, await engine.export_comprehensive_results(results, "fleet", "test")
+    
+    results, files = asyncio.run(run())
+    with open(files["main_file"]) as f:
+        exported = json.load(f)
+    
+    assert files["main_file"] == "fleet_test.json"
+    assert "main_file" not in exported
+    assert len(exported["vehicles"]) == exported["total_count"] == 500
@@ -0,0 +1,120 @@
+"""Swarm metrics history: capped raw and rollup streams, 1m/5m/1h rollup aggregates"""
+
+import asyncio
+
+import fakeredis.aioredis
+import pytest
+
+from src.swarm.metrics_history import MetricsHistory, flatten_metrics
+
+HOUR = 3600.0
+START = 1000 * HOUR  # Aligned to every rollup resolution
+
+
+class CapRecordingRedis(fakeredis.aioredis.FakeRedis):
+    """
+    Records XADD caps and applies them exactly: fakeredis ignores approximate
+    trimming, which real Redis applies a macro node at a time
+    """
+    
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.caps = []
+    
+    def pipeline(self, transaction=True, shard_hint=None):
+        return _ExactTrimPipeline(super().pipeline(transaction=transaction), self.caps)
+
+
+class _ExactTrimPipeline:
+    def __init__(self, pipe, caps):
+        self.pipe = pipe
+        self.caps = caps
+    
+    def xadd(self, name, fields, maxlen=None, approximate=True):
+        self.caps.append((name, maxlen, approximate))
+        return self.pipe.xadd(name, fields, maxlen=maxlen, approximate=False)
+    
+    async def execute(self):
+        return await self.pipe.execute()
+
+
+def _snapshot(i):
+    return {"total_workers": float(i), "queue_depths": {"bayes": 2.0 * i}, "uptime": 99, "timestamp": "now"}
+
+
+def _record(history, count, step=30.0):
+    async def run():
+        for i in range(count):
+            await history.record(_snapshot(i), START + i * step)
+    
+    asyncio.run(run())
+
+
+def test_raw_and_rollup_streams_are_capped():
+    client = CapRecordingRedis()
+    history = MetricsHistory(client, max_snapshots=25, rollup_retention={"1m": 4})
+    _record(history, 240)
+    
+    async def read():
+        return (
+            await client.xlen(history.key),
+            await client.xlen(history.rollup_key("1m")),
+            await client.xlen(history.rollup_key("5m")),
+            await history.latest_snapshots(3),
+            await history.load_rollups("1m")
+        )
+    
+    raw_length, minute_length, five_minute_length, latest, minutes = asyncio.run(read())
+    
+    assert {cap for cap in client.caps} == {
+        (history.key, 25, True), (history.rollup_key("1m"), 4, True),
+        (history.rollup_key("5m"), 288, True), (history.rollup_key("1h"), 168, True)
+    }
+    assert (raw_length, minute_length, five_minute_length) == (25, 4, 23)
+    assert [snapshot["total_workers"] for snapshot in latest] == [239.0, 238.0, 237.0]
+    assert [bucket["series"]["total_workers"]["last"] for bucket in minutes] == [231.0, 233.0, 235.0, 237.0]
+    assert len(history.get_rollups("1m", include_open=False)) == 4
+
+
+def test_rollups_aggregate_each_window():
+    history = MetricsHistory(fakeredis.aioredis.FakeRedis())
+    _record(history, 240)  # Two hours at one snapshot per 30 s
+    
+    minutes = history.get_rollups("1m", include_open=False)
+    five_minutes = history.get_rollups("5m", include_open=False)
+    hours = history.get_rollups("1h")
+    
+    assert len(minutes) == 119 and len(five_minutes) == 23 and len(hours) == 2
+    assert minutes[3]["samples"] == 2
+    assert minutes[3]["series"]["total_workers"] == {"avg": 6.5, "min": 6.0, "max": 7.0, "last": 7.0}
+    assert five_minutes[1]["series"]["queue_depths.bayes"] == {"avg": 29.0, "min": 20.0, "max": 38.0, "last": 38.0}
+    assert hours[0]["samples"] == 120 and hours[0]["series"]["total_workers"]["avg"] == 59.5
+    assert hours[1]["start"] == "1970-02-11T17:00:00"
+    assert set(hours[0]["series"]) == {"total_workers", "queue_depths.bayes"}
+    
+    persisted = asyncio.run(history.load_rollups("5m", count=1000))
+    assert persisted == five_minutes
+
+
+def test_late_samples_and_filters():
+    history = MetricsHistory(fakeredis.aioredis.FakeRedis())
+    _record(history, 6)
+    
+    async def late():
+        await history.record(_snapshot(1000), START - 30)
+    
+    asyncio.run(late())
+    
+    minutes = history.get_rollups("1m")
+    assert [bucket["series"]["total_workers"]["max"] for bucket in minutes] == [1.0, 3.0, 5.0]
+    assert len(history.get_rollups("1m", since=START + 60)) == 2
+    assert list(history.get_rollups("1m", series=["total_workers"])[0]["series"]) == ["total_workers"]
+    with pytest.raises(ValueError):
+        history.get_rollups("10m")
+
+
+def test_flatten_keeps_numeric_leaves_of_selected_sections():
+    metrics = {"work_queues": {"bayes": {"depth": 3, "ok": True}}, "other": {"depth": 1}, "total_workers": 2}
+    
+    assert flatten_metrics(metrics, ["work_queues", "total_workers"]) == {"work_queues.bayes.depth": 3.0, "total_workers": 2.0}
+    assert flatten_metrics(metrics, None)["other.depth"] == 1.0
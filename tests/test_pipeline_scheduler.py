@@ -0,0 +1,140 @@
+"""Agent pipeline DAG: dependency order, per-stage worker limits, micro-batches and failures"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from src.swarm.pipeline_scheduler import AgentPipelineScheduler
+
+# ingest -> (cohort, priors) -> score -> message; priors has no dependencies
+DEPENDENCIES = {
+    "ingest": [],
+    "priors": [],
+    "cohort": ["ingest"],
+    "score": ["cohort", "priors"],
+    "message": ["score"]
+}
+
+
+class RecordingAgent:
+    """Logs start/end per task and tracks how many tasks it holds at once"""
+    
+    def __init__(self, name, log, steps=2, fail_for=()):
+        self.name = name
+        self.log = log
+        self.steps = steps
+        self.fail_for = set(fail_for)
+        self.active = 0
+        self.peak = 0
+    
+    async def process(self, task):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        self.log.append(("start", task.task_id, self.name))
+        try:
+            for _ in range(self.steps):
+                await asyncio.sleep(0)
+            if task.task_id in self.fail_for:
+                raise RuntimeError(f"{self.name} failed")
+            return {self.name: True}
+        finally:
+            self.active -= 1
+            self.log.append(("end", task.task_id, self.name))
+
+
+class BatchAgent(RecordingAgent):
+    """Agent with a process_batch(); remembers the micro-batch sizes it was handed"""
+    
+    def __init__(self, name, log):
+        super().__init__(name, log)
+        self.batch_sizes = []
+    
+    async def process_batch(self, tasks):
+        self.batch_sizes.append(len(tasks))
+        return await asyncio.gather(*(self.process(task) for task in tasks))
+
+
+def _task(task_id):
+    return SimpleNamespace(task_id=task_id, results={})
+
+
+def _run_all(scheduler, tasks):
+    async def run():
+        try:
+            return await asyncio.gather(*(scheduler.run(task) for task in tasks), return_exceptions=True)
+        finally:
+            await scheduler.stop()
+    
+    return asyncio.run(run())
+
+
+def test_every_agent_starts_after_its_dependencies_finish():
+    log = []
+    agents = {name: RecordingAgent(name, log) for name in DEPENDENCIES}
+    scheduler = AgentPipelineScheduler(agents, DEPENDENCIES, default_workers=3)
+    tasks = [_task(f"t{i}") for i in range(12)]
+    
+    outcomes = _run_all(scheduler, tasks)
+    
+    assert scheduler.stage_order.index("score") > scheduler.stage_order.index("cohort")
+    assert outcomes == tasks
+    assert all(task.results == {name: True for name in DEPENDENCIES} for task in tasks)
+    position = {event: index for index, event in enumerate(log)}
+    for task in tasks:
+        for name, deps in DEPENDENCIES.items():
+            for dep in deps:
+                assert position[("end", task.task_id, dep)] < position[("start", task.task_id, name)]
+
+
+def test_stage_worker_pools_bound_concurrency_per_agent():
+    log = []
+    agents = {name: RecordingAgent(name, log, steps=5) for name in DEPENDENCIES}
+    agents["message"] = RecordingAgent("message", log, steps=1)
+    scheduler = AgentPipelineScheduler(
+        agents, DEPENDENCIES, stage_workers={"score": 2, "message": 1}, default_workers=6, max_batch_size=1
+    )
+    
+    _run_all(scheduler, [_task(f"t{i}") for i in range(20)])
+    
+    assert agents["score"].peak == 2
+    assert agents["message"].peak == 1
+    assert agents["priors"].peak == 6
+    assert scheduler.get_stage_stats()["score"]["processed"] == 20
+
+
+def test_micro_batches_are_capped_by_max_batch_size():
+    log = []
+    agents = {name: RecordingAgent(name, log) for name in DEPENDENCIES}
+    agents["score"] = BatchAgent("score", log)
+    scheduler = AgentPipelineScheduler(
+        agents, DEPENDENCIES, stage_workers={"score": 1}, max_batch_size=4, max_batch_wait=0.01
+    )
+    
+    _run_all(scheduler, [_task(f"t{i}") for i in range(16)])
+    
+    assert sum(agents["score"].batch_sizes) == 16
+    assert max(agents["score"].batch_sizes) == 4
+
+
+def test_required_failure_fails_the_task_and_optional_failure_does_not():
+    log = []
+    agents = {name: RecordingAgent(name, log) for name in DEPENDENCIES}
+    agents["cohort"].fail_for = {"t0"}
+    agents["priors"].fail_for = {"t1"}
+    scheduler = AgentPipelineScheduler(agents, DEPENDENCIES, optional_agents=["priors"])
+    
+    failed, degraded = _run_all(scheduler, [_task("t0"), _task("t1")])
+    
+    assert isinstance(failed, RuntimeError) and str(failed) == "cohort failed"
+    assert ("start", "t0", "score") not in log
+    assert "priors" not in degraded.results and degraded.results["message"] is True
+
+
+def test_cycles_and_unknown_dependencies_are_rejected():
+    agents = {"a": RecordingAgent("a", []), "b": RecordingAgent("b", [])}
+    
+    with pytest.raises(ValueError, match="cycle"):
+        AgentPipelineScheduler(agents, {"a": ["b"], "b": ["a"]})
+    with pytest.raises(ValueError, match="unknown"):
+        AgentPipelineScheduler(agents, {"a": ["missing"]})
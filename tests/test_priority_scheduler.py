@@ -0,0 +1,79 @@
+"""Priority lanes: lanes follow last known severity and each lane is yielded before later lanes are scored"""
+
+import asyncio
+
+import fakeredis.aioredis
+
+from src.engines.bayesian_engine_v2 import BayesianRiskEngineV2, BatchBayesianProcessorV2
+from src.services.cohort_service import CohortService
+from src.services.priority_scheduler import LANE_BY_SEVERITY, PRIORITY_LANES, PriorityLaneScheduler
+from src.services.score_fingerprint_store import ScoreFingerprintStore
+from src.swarm.cohort_orchestrator import CohortOrchestrator
+
+
+def _processor(cohorts_file, store):
+    engine = BayesianRiskEngineV2(CohortService(cohorts_file))
+    return BatchBayesianProcessorV2(engine, batch_size=50, fingerprint_store=store)
+
+
+def test_lanes_follow_last_known_severity(cohorts_file, vehicles):
+    async def run():
+        processor = _processor(cohorts_file, ScoreFingerprintStore())
+        first_run = await processor.process_batch(vehicles)
+        return first_run, [(lane, results) async for lane, results in processor.process_by_priority(vehicles)]
+    
+    first_run, lanes = asyncio.run(run())
+    
+    names = [lane for lane, _ in lanes]
+    assert names == [name for name in PRIORITY_LANES if name in names]
+    assert len(names) > 1
+    
+    # Unchanged inputs: every VIN stays in the lane of its previous severity
+    previous_lane = {result.vin: LANE_BY_SEVERITY[result.severity_bucket] for result in first_run}
+    for lane, results in lanes:
+        assert results and all(previous_lane[result.vin] == lane for result in results)
+    assert sorted(result.vin for _, results in lanes for result in results) == sorted(previous_lane)
+
+
+def test_input_deltas_promote_a_vin_one_lane(cohorts_file, vehicles):
+    async def run():
+        store = ScoreFingerprintStore()
+        results = await _processor(cohorts_file, store).process_batch(vehicles)
+        unchanged, moved = [v for v, r in zip(vehicles, results) if LANE_BY_SEVERITY[r.severity_bucket] == "high"][:2]
+        
+        # A 20-point deeper SOC decline is two delta units, past the default promotion threshold
+        worse = moved.copy(update={"soc_30day_trend": moved.soc_30day_trend - 0.2})
+        return unchanged, worse, await PriorityLaneScheduler(store).plan([unchanged, worse])
+    
+    unchanged, worse, lanes = asyncio.run(run())
+    
+    assert [(lane.name, lane.vehicles) for lane in lanes] == [("critical", [worse]), ("high", [unchanged])]
+
+
+def test_first_lane_is_yielded_before_later_lanes_are_scored(cohorts_file, vehicles):
+    async def run():
+        store = ScoreFingerprintStore()
+        engine = await BayesianRiskEngineV2(CohortService(cohorts_file)).ready()
+        orchestrator = CohortOrchestrator(fakeredis.aioredis.FakeRedis(), engine.cohort_service, engine, store)
+        await orchestrator.initialize()
+        await orchestrator.process_vehicle_batch(vehicles)
+        
+        scored = []
+        real_process = orchestrator.process_vehicle_batch
+        
+        async def counting_process(batch):
+            scored.append(len(batch))
+            return await real_process(batch)
+        
+        orchestrator.process_vehicle_batch = counting_process
+        lanes = orchestrator.process_by_priority(vehicles)
+        first_lane, first_results = await lanes.__anext__()
+        scored_before_first_yield = list(scored)
+        rest = [lane async for lane, _ in lanes]
+        return first_lane, first_results, scored_before_first_yield, scored, rest
+    
+    first_lane, first_results, scored_before_first_yield, scored, rest = asyncio.run(run())
+    
+    assert first_lane == "critical"
+    assert scored_before_first_yield == [len(first_results)]
+    assert rest and len(scored) == 1 + len(rest)
@@ -0,0 +1,89 @@
+"""Process-pool scoring must match in-process scoring, and the orchestrator must not switch engines"""
+
+import asyncio
+
+import fakeredis.aioredis
+import numpy as np
+import pytest
+
+from src.engines.bayesian_engine import BayesianRiskEngine
+from src.engines.bayesian_engine_v2 import BayesianRiskEngineV2
+from src.engines.process_pool_scorer import ProcessPoolScorer
+from src.services.cohort_service import CohortService
+from src.swarm.cohort_orchestrator import CohortOrchestrator
+
+
+def _comparable(output):
+    data = output.model_dump(exclude={"metadata"})
+    data["metadata"] = output.metadata.model_dump(exclude={"scored_at", "calculation_time_ms"})
+    return data
+
+
+def test_pool_scores_match_in_process_columnar(cohorts_file, vehicles):
+    async def run():
+        engine = await BayesianRiskEngineV2(CohortService(cohorts_file)).ready()
+        expected = await engine.calculate_risk_scores_columnar(await engine.columns_from_vehicles(vehicles))
+        scorer = ProcessPoolScorer(engine, max_workers=2, shard_size=64)
+        try:
+            return expected, await scorer.score_vehicles(vehicles)
+        finally:
+            scorer.shutdown()
+    
+    expected, pooled = asyncio.run(run())
+    
+    assert pooled.vins == expected.vins
+    np.testing.assert_array_equal(pooled.cohort_index, expected.cohort_index)
+    np.testing.assert_array_equal(pooled.cohort_match_confidence, expected.cohort_match_confidence)
+    np.testing.assert_array_equal(pooled.posterior_probability, expected.posterior_probability)
+    np.testing.assert_array_equal(pooled.severity_index, expected.severity_index)
+    np.testing.assert_array_equal(pooled.active_mask, expected.active_mask)
+    np.testing.assert_array_equal(pooled.stressor_contributions, expected.stressor_contributions)
+
+
+def test_shards_group_vins_by_match_key(cohorts_file, vehicles):
+    async def run():
+        return ProcessPoolScorer(await BayesianRiskEngineV2(CohortService(cohorts_file)).ready(), max_workers=4)
+    
+    scorer = asyncio.run(run())
+    vins = np.array([vehicle.vin for vehicle in vehicles])
+    shards = scorer._plan_shards(vins)
+    
+    assert len(shards) >= 4
+    assert sorted(np.concatenate(shards).tolist()) == list(range(len(vehicles)))
+    keys = [vin[3:8] + vin[9] for vin in vins[np.concatenate(shards)]]
+    assert keys == sorted(keys)
+
+
+def test_orchestrator_backends_give_identical_outputs(cohorts_file, vehicles):
+    async def run():
+        engine = await BayesianRiskEngineV2(CohortService(cohorts_file)).ready()
+        in_process = CohortOrchestrator(fakeredis.aioredis.FakeRedis(), engine.cohort_service, engine)
+        await in_process.initialize()
+        scorer = ProcessPoolScorer(engine, max_workers=2)
+        pooled = CohortOrchestrator(
+            fakeredis.aioredis.FakeRedis(), engine.cohort_service, engine, process_pool_scorer=scorer
+        )
+        await pooled.initialize()
+        try:
+            return await in_process.process_vehicle_batch(vehicles), await pooled.process_vehicle_batch(vehicles)
+        finally:
+            scorer.shutdown()
+    
+    in_process_results, pooled_results = asyncio.run(run())
+    
+    assert len(pooled_results) == len(in_process_results) == len(vehicles)
+    by_vin = {result.vin: _comparable(result) for result in in_process_results}
+    assert [_comparable(result) for result in pooled_results] == [by_vin[result.vin] for result in pooled_results]
+
+
+def test_orchestrator_rejects_pool_for_another_engine(cohorts_file):
+    async def run():
+        engine = await BayesianRiskEngineV2(CohortService(cohorts_file)).ready()
+        scorer = ProcessPoolScorer(engine, max_workers=1)
+        v1_engine = BayesianRiskEngine(cohorts_file)
+        with pytest.raises(ValueError, match="must wrap"):
+            CohortOrchestrator(
+                fakeredis.aioredis.FakeRedis(), v1_engine.cohort_service, v1_engine, process_pool_scorer=scorer
+            )
+    
+    asyncio.run(run())
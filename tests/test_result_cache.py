@@ -0,0 +1,129 @@
+"""Agent result cache: LRU in front of Redis, per-agent TTLs and single-flight loads"""
+
+import asyncio
+
+import fakeredis.aioredis
+import pytest
+
+from src.swarm.agents import result_cache as result_cache_module
+from src.swarm.agents.result_cache import AgentResultCache
+
+
+def test_local_misses_fall_through_to_redis_and_are_promoted():
+    async def run():
+        client = fakeredis.aioredis.FakeRedis()
+        writer = AgentResultCache(client, max_entries=2)
+        reader = AgentResultCache(client, max_entries=2)
+        await writer.set("cohort_index", "k1", {"cohort": "a"})
+        
+        first, second = await reader.get("cohort_index", "k1"), await reader.get("cohort_index", "k1")
+        
+        # Filling the writer's LRU evicts k1 locally; Redis still answers
+        await writer.set("cohort_index", "k2", 2)
+        await writer.set("cohort_index", "k3", 3)
+        evicted = await writer.get("cohort_index", "k1")
+        missing = await reader.get("cohort_index", "nope")
+        return first, second, evicted, missing, reader.get_stats("cohort_index"), writer.get_stats()
+    
+    first, second, evicted, missing, reader_stats, writer_stats = asyncio.run(run())
+    
+    assert first == second == evicted == {"cohort": "a"} and missing is None
+    counters = reader_stats["counters"]
+    assert (counters["redis_hits"], counters["local_hits"], counters["misses"]) == (1, 1, 1)
+    assert writer_stats["evictions"] == 2 and writer_stats["local_entries"] == 2
+    assert writer_stats["counters"]["cohort_index"]["redis_hits"] == 1
+
+
+def test_ttls_are_set_per_agent():
+    expected = {"data_ingest": 3600, "cohort_index": 60, "stress_validation": 86400, "llm_message": 600}
+    
+    async def run():
+        client = fakeredis.aioredis.FakeRedis()
+        cache = AgentResultCache(client, default_ttl=600, agent_ttls={"cohort_index": 60})
+        for agent in expected:
+            await cache.set(agent, f"key:{agent}", True)
+        return {agent: await client.ttl(f"key:{agent}") for agent in expected}
+    
+    ttls = asyncio.run(run())
+    
+    assert all(expected[agent] - 1 <= ttl <= expected[agent] for agent, ttl in ttls.items())
+
+
+def test_promoted_entries_expire_with_the_redis_ttl(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(result_cache_module.time, "monotonic", lambda: clock[0])
+    
+    async def run():
+        client = fakeredis.aioredis.FakeRedis()
+        await client.set("short", '"value"', ex=5)
+        cache = AgentResultCache(client, default_ttl=3600)
+        await cache.get("data_ingest", "short")
+        await cache.get("data_ingest", "short")
+        
+        clock[0] += 6  # Past Redis' remaining TTL, well inside the agent's own TTL
+        await cache.get("data_ingest", "short")
+        return cache.get_stats("data_ingest")
+    
+    stats = asyncio.run(run())
+    
+    assert stats["expirations"] == 1
+    assert (stats["counters"]["redis_hits"], stats["counters"]["local_hits"]) == (2, 1)
+
+
+def test_concurrent_misses_load_once():
+    loads = []
+    
+    async def run():
+        cache = AgentResultCache(fakeredis.aioredis.FakeRedis())
+        release = asyncio.Event()
+        
+        async def loader():
+            loads.append(1)
+            await release.wait()
+            return {"risk": 0.4}
+        
+        callers = [asyncio.create_task(cache.get_or_load("bayes_score", "vin", loader)) for _ in range(5)]
+        await asyncio.sleep(0.01)
+        release.set()
+        outcomes = await asyncio.gather(*callers)
+        again = await cache.get_or_load("bayes_score", "vin", loader)
+        return outcomes, again, cache.get_stats("bayes_score")
+    
+    outcomes, again, stats = asyncio.run(run())
+    
+    assert len(loads) == 1
+    assert sorted(hit for _, hit in outcomes) == [False, True, True, True, True]
+    assert all(value == {"risk": 0.4} for value, _ in outcomes) and again == ({"risk": 0.4}, True)
+    counters = stats["counters"]
+    assert (counters["misses"], counters["coalesced"], counters["local_hits"]) == (1, 4, 1)
+    assert stats["loads_in_flight"] == 0
+
+
+def test_failed_load_fails_its_waiters_and_is_not_cached():
+    async def run():
+        cache = AgentResultCache(None)
+        release = asyncio.Event()
+        
+        async def failing_loader():
+            await release.wait()
+            raise RuntimeError("upstream down")
+        
+        callers = [asyncio.create_task(cache.get_or_load("data_ingest", "vin", failing_loader)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        release.set()
+        outcomes = await asyncio.gather(*callers, return_exceptions=True)
+        
+        async def loader():
+            return "fresh"
+        
+        return outcomes, await cache.get_or_load("data_ingest", "vin", loader)
+    
+    outcomes, retried = asyncio.run(run())
+    
+    assert [str(outcome) for outcome in outcomes] == ["upstream down"] * 3
+    assert retried == ("fresh", False)
+
+
+def test_rejects_an_empty_local_tier():
+    with pytest.raises(ValueError):
+        AgentResultCache(None, max_entries=0)
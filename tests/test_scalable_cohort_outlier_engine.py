@@ -0,0 +1,84 @@
+"""Cohort outlier engine: a column store must export every field, like the JSON path"""
+
+import json
+
+import numpy as np
+
+from scripts.scalable_cohort_outlier_engine import ScalableCohortOutlierEngine
+from src.services.vin_column_store import convert_to_column_store
+
+STATES = ["FL", "MI", "AZ", "TX"]
+MODELS = ["F150", "Explorer", "Escape"]
+CLIMATES = ["coastal", "cold", "hot_dry"]
+STRESSORS = ["salt_corrosion_exposure", "humidity_cycling_stress", "deep_discharge_events", "towing_load_stress"]
+
+
+def _analysis_file(path, size: int = 600, seed: int = 3) -> str:
+    rng = np.random.default_rng(seed)
+    vehicles = []
+    for i in range(size):
+        active = [str(s) for s in rng.choice(STRESSORS, size=rng.integers(0, 4), replace=False)]
+        vehicles.append({
+            "vin": f"1FTFW1ET5{i:08d}",
+            "model": str(rng.choice(MODELS)),
+            "state": str(rng.choice(STATES)),
+            "climate_zone": str(rng.choice(CLIMATES)),
+            "vehicle_age": int(rng.integers(0, 8)),
+            "posterior_probability": float(rng.beta(2, 12)),
+            "stressor_count": len(active),
+            "revenue_opportunity": float(rng.choice([0, 150, 300, 1200])),
+            "active_stressors": active,
+            "severity": str(rng.choice(["LOW", "MODERATE", "HIGH"])),
+            # Fields the cohort stages never read, but the full export carries
+            "dealer_code": f"D{int(rng.integers(100, 999))}",
+            "current_mileage": int(rng.integers(5000, 90000))
+        })
+    with open(path, "w") as f:
+        json.dump({"vehicle_analyses": vehicles}, f)
+    return str(path)
+
+
+def _load(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def _alerts(result):
+    alerts = _load(result["actionable_alerts_file"])
+    alerts["summary"].pop("processing_timestamp")
+    return alerts
+
+
+def test_store_full_export_keeps_every_field(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    source = _analysis_file(tmp_path / "enhanced_13_stressor_analysis_test.json")
+    store = convert_to_column_store(source)
+    engine = ScalableCohortOutlierEngine()
+    
+    # Runs within one second share output names, so read each run's files before the next
+    from_json = engine.process_vehicles(source)
+    json_export, json_alerts = _load(from_json["full_results_file"]), _alerts(from_json)
+    from_store = engine.process_vehicles(store)
+    store_export, store_alerts = _load(from_store["full_results_file"]), _alerts(from_store)
+    
+    assert len(store_export) == len(json_export) == 600
+    assert set(store_export[0]) == set(json_export[0])
+    assert {"dealer_code", "current_mileage"} <= set(store_export[0])
+    assert store_export == json_export
+    assert store_alerts == json_alerts
+    assert store_alerts["actionable_alerts"]
+
+
+def test_alerts_only_skips_the_full_export(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    store = convert_to_column_store(_analysis_file(tmp_path / "enhanced_13_stressor_analysis_test.json"))
+    engine = ScalableCohortOutlierEngine()
+    
+    full_alerts = _alerts(engine.process_vehicles(store))
+    for export in tmp_path.glob("scalable_cohort_analysis_*.json"):
+        export.unlink()
+    alerts_only = engine.process_vehicles(store, full_export=False)
+    
+    assert alerts_only["full_results_file"] is None
+    assert list(tmp_path.glob("scalable_cohort_analysis_*.json")) == []
+    assert _alerts(alerts_only)["summary"] == full_alerts["summary"]
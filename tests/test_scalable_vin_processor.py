@@ -0,0 +1,58 @@
+"""Scalable VIN pipeline: lead generation through the command line and the lead-to-engine mapping"""
+
+import asyncio
+import json
+
+import pytest
+
+from scripts.generate_lead_database import LeadDatabaseGenerator
+from scripts.scalable_vin_processor import ScalableVINProcessor
+from src.models.schemas import CohortAssignment, VehicleInputData
+
+
+def test_generate_step_runs_the_lead_generator(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    
+    vin_db_file = asyncio.run(ScalableVINProcessor().generate_vin_database(200, "20000101_000000"))
+    with open(tmp_path / vin_db_file) as f:
+        leads = json.load(f)
+    
+    assert len(leads) == 200
+    assert len({lead["vin"] for lead in leads}) == 200
+
+
+@pytest.fixture(scope="module")
+def leads():
+    return LeadDatabaseGenerator().generate_database(300, seed=7)
+
+
+def test_leads_map_field_for_field_onto_engine_inputs(leads):
+    for lead in leads:
+        vehicle = ScalableVINProcessor.lead_to_vehicle_input(lead)
+        expected = VehicleInputData(
+            vin=lead["vin"],
+            soc_30day_trend=lead["soc_30day_trend"],
+            trip_cycles_weekly=lead["trip_cycles_weekly"],
+            odometer_variance=lead["odometer_variance"],
+            climate_stress_index=lead["climate_stress_index"],
+            maintenance_compliance=lead["maintenance_compliance"],
+            cohort_assignment=CohortAssignment(
+                model=lead["model"],
+                powertrain=lead["powertrain"],
+                region=lead["region"],
+                mileage_band=lead["mileage_band"]
+            )
+        )
+        assert vehicle.dict(exclude={"timestamp"}) == expected.dict(exclude={"timestamp"})
+    
+    # Service history comes from the lead, not a constant
+    assert len({lead["maintenance_compliance"] for lead in leads}) > 1
+
+
+@pytest.mark.parametrize("field", ["maintenance_compliance", "region"])
+def test_lead_missing_engine_fields_is_rejected(leads, field):
+    lead = dict(leads[0])
+    del lead[field]
+    
+    with pytest.raises(ValueError, match=field):
+        ScalableVINProcessor.lead_to_vehicle_input(lead)
@@ -0,0 +1,150 @@
+"""Scientific swarm: result-stream consumers survive a late Redis, pipeline runs are tracked, batch admission is bounded"""
+
+import asyncio
+import json
+
+import fakeredis.aioredis
+import pytest
+import redis.asyncio as redis
+
+from src.swarm import scientific_swarm_orchestrator as swarm_module
+from src.swarm.admission import AdmissionRejected
+from src.swarm.scientific_swarm_orchestrator import ScientificSwarmOrchestrator
+
+
+class FlakyRedis(fakeredis.aioredis.FakeRedis):
+    """Fails the first consumer-group creations, as a Redis that is still starting would"""
+    
+    def __init__(self, failures: int, **kwargs):
+        super().__init__(**kwargs)
+        self.failures = failures
+    
+    async def xgroup_create(self, *args, **kwargs):
+        if self.failures:
+            self.failures -= 1
+            raise redis.ConnectionError("Connection refused")
+        return await super().xgroup_create(*args, **kwargs)
+
+
+class BlockingPipeline:
+    """Stands in for the agent pipeline: every run waits until released"""
+    
+    def __init__(self):
+        self.release = asyncio.Event()
+        self.started = 0
+    
+    async def start(self):
+        pass
+    
+    async def stop(self):
+        pass
+    
+    async def run(self, task):
+        self.started += 1
+        await self.release.wait()
+
+
+async def _wait_until(condition):
+    while not condition():
+        await asyncio.sleep(0)
+
+
+def test_consumers_retry_group_creation(monkeypatch):
+    swarm = ScientificSwarmOrchestrator()
+    swarm.redis_pool = FlakyRedis(failures=2)
+    swarm.running = True
+    passes = []
+    real_sleep = asyncio.sleep
+    
+    async def fast_sleep(seconds):
+        passes.append(seconds)
+        if len(passes) == 3:
+            # Publish once the group exists, so the next pass has a result to aggregate
+            await swarm.redis_pool.xadd(swarm.result_stream, {"result": json.dumps({"risk_score": 0.5})})
+        if len(passes) >= 5:
+            swarm.running = False
+        await real_sleep(0)
+    
+    updates = []
+    
+    async def record_update(results):
+        updates.append(results)
+    
+    monkeypatch.setattr(swarm_module.asyncio, "sleep", fast_sleep)
+    monkeypatch.setattr(swarm, "_update_metrics", record_update)
+    
+    asyncio.run(swarm._result_aggregator())
+    
+    assert swarm.redis_pool.failures == 0
+    assert updates == [[{"risk_score": 0.5}]]
+
+
+def test_pipeline_runs_are_tracked_and_cancelled_on_stop():
+    async def run():
+        swarm = ScientificSwarmOrchestrator(max_concurrency=4)
+        swarm.pipeline = BlockingPipeline()
+        swarm.running = True
+        processor = asyncio.create_task(swarm._task_processor())
+        waiters = [asyncio.create_task(swarm.process_vin(f"VIN{i}", {})) for i in range(3)]
+        await _wait_until(lambda: swarm.pipeline.started == 3)
+        tracked = set(swarm._pipeline_runs)
+        
+        await swarm.stop()
+        processor.cancel()
+        outcomes = await asyncio.gather(*waiters, processor, return_exceptions=True)
+        return tracked, swarm._pipeline_runs, outcomes
+    
+    tracked, remaining, outcomes = asyncio.run(run())
+    
+    assert len(tracked) == 3 and all(run.cancelled() for run in tracked)
+    assert remaining == set()
+    assert all(isinstance(outcome, RuntimeError) for outcome in outcomes[:3])
+
+
+def test_failed_pipeline_run_is_logged_and_frees_its_slot(caplog):
+    async def run():
+        swarm = ScientificSwarmOrchestrator(max_concurrency=1)
+        swarm.pipeline = BlockingPipeline()
+        swarm.running = True
+        
+        async def escaping_run(task):
+            raise RuntimeError(f"lost {task.vin}")
+        
+        swarm._process_task_through_pipeline = escaping_run
+        processor = asyncio.create_task(swarm._task_processor())
+        for i in range(2):
+            await swarm.task_queue.put(swarm_module.SwarmTask(f"t{i}", f"VIN{i}", {}, [], priority=1), 1)
+        await _wait_until(lambda: swarm.task_queue.qsize() == 0 and not swarm._pipeline_runs)
+        
+        swarm.running = False
+        processor.cancel()
+        await asyncio.gather(processor, return_exceptions=True)
+    
+    asyncio.run(run())
+    
+    assert [record.message for record in caplog.records if "Pipeline run failed" in record.message] == [
+        "Pipeline run failed: lost VIN0", "Pipeline run failed: lost VIN1"
+    ]
+
+
+def test_batch_admission_retries_until_the_deadline_then_raises_429():
+    async def run():
+        swarm = ScientificSwarmOrchestrator(batch_admission_timeout=1.5)
+        attempts = []
+        
+        async def shedding_process_vin(vin, input_data, priority):
+            attempts.append(vin)
+            if vin == "VIN_OK" and len(attempts) > 2:
+                return vin
+            raise AdmissionRejected("shed", retry_after=1.0, priority=priority, estimated_wait=30.0)
+        
+        swarm.process_vin = shedding_process_vin
+        with pytest.raises(AdmissionRejected) as shed:
+            await swarm.process_batch([("VIN_SHED", {}), ("VIN_OK", {})])
+        return shed.value, attempts
+    
+    shed, attempts = asyncio.run(run())
+    
+    assert shed.status_code == 429 and shed.priority == 5
+    assert str(shed).startswith("1 of 2 VINs were shed")
+    assert sorted(attempts) == ["VIN_OK", "VIN_OK", "VIN_SHED", "VIN_SHED"]
@@ -0,0 +1,134 @@
+"""Delta rescoring: fingerprint partitions, carried-forward order, per-VIN TTLs and invalidation"""
+
+import asyncio
+
+import fakeredis.aioredis
+import pytest
+
+from conftest import make_vehicle
+from src.engines.bayesian_engine_v2 import BayesianRiskEngineV2, BatchBayesianProcessorV2
+from src.services.cohort_service import CohortService
+from src.services import score_fingerprint_store
+from src.services.score_fingerprint_store import ScoreFingerprintStore
+
+
+def _processor(cohorts_file, store):
+    engine = BayesianRiskEngineV2(CohortService(cohorts_file))
+    return BatchBayesianProcessorV2(engine, batch_size=50, fingerprint_store=store)
+
+
+def test_delta_run_keeps_input_order(cohorts_file):
+    async def run():
+        processor = _processor(cohorts_file, ScoreFingerprintStore())
+        vehicles = [make_vehicle(i) for i in range(60)]
+        first = await processor.process_batch(vehicles)
+        
+        # Change every third VIN so fresh and carried-forward results interleave
+        changed = [
+            make_vehicle(i, soc_30day_trend=-0.9) if i % 3 == 0 else vehicle
+            for i, vehicle in enumerate(vehicles)
+        ]
+        second = await processor.process_batch(changed)
+        return vehicles, first, second
+    
+    vehicles, first, second = asyncio.run(run())
+    
+    assert [result.vin for result in first] == [vehicle.vin for vehicle in vehicles]
+    assert [result.vin for result in second] == [vehicle.vin for vehicle in vehicles]
+    for i, (before, after) in enumerate(zip(first, second)):
+        if i % 3:
+            assert after == before  # Carried forward unchanged
+        else:
+            assert after.risk_score >= before.risk_score
+
+
+def test_results_are_per_vin_keys_with_ttl(cohorts_file):
+    async def run():
+        client = fakeredis.aioredis.FakeRedis()
+        store = ScoreFingerprintStore(client, result_ttl_seconds=3600)
+        processor = _processor(cohorts_file, store)
+        vehicles = [make_vehicle(i) for i in range(10)]
+        await processor.process_batch(vehicles)
+        
+        keys = sorted(key.decode() for key in await client.keys("scoring:result:*"))
+        ttls = [await client.ttl(key) for key in keys]
+        
+        # An expired result forces a rescore even though the fingerprint matches
+        await client.delete(f"scoring:result:{vehicles[0].vin}")
+        partition = await store.partition(
+            vehicles, processor.engine.cohort_service.database_version, processor.engine.model_version
+        )
+        return vehicles, keys, ttls, partition
+    
+    vehicles, keys, ttls, partition = asyncio.run(run())
+    
+    assert keys == sorted(f"scoring:result:{vehicle.vin}" for vehicle in vehicles)
+    assert all(0 < ttl <= 3600 for ttl in ttls)
+    assert [vehicle.vin for vehicle in partition.changed] == [vehicles[0].vin]
+    assert len(partition.carried_forward) == 9
+
+
+def test_fingerprints_and_states_expire_with_results(cohorts_file):
+    async def run():
+        client = fakeredis.aioredis.FakeRedis()
+        processor = _processor(cohorts_file, ScoreFingerprintStore(client, result_ttl_seconds=3600))
+        await processor.process_batch([make_vehicle(i) for i in range(10)])
+        
+        keys = sorted(key.decode() for key in await client.keys("scoring:*"))
+        return keys, [await client.ttl(key) for key in keys]
+    
+    keys, ttls = asyncio.run(run())
+    
+    assert len(keys) == 30
+    assert {key.split(":")[1] for key in keys} == {"fingerprint", "result", "state"}
+    assert all(0 < ttl <= 3600 for ttl in ttls)
+
+
+def test_in_process_entries_expire(cohorts_file, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(score_fingerprint_store.time, "monotonic", lambda: clock[0])
+    
+    async def run():
+        store = ScoreFingerprintStore(result_ttl_seconds=60)
+        processor = _processor(cohorts_file, store)
+        vehicles = [make_vehicle(i) for i in range(5)]
+        await processor.process_batch(vehicles)
+        vins = [vehicle.vin for vehicle in vehicles]
+        before = await store.last_known_states(vins)
+        
+        clock[0] += 61
+        after = await store.last_known_states(vins)
+        partition = await store.partition(
+            vehicles, processor.engine.cohort_service.database_version, processor.engine.model_version
+        )
+        return before, after, partition, store
+    
+    before, after, partition, store = asyncio.run(run())
+    
+    assert len(before) == 5 and after == {}
+    assert len(partition.changed) == 5
+    assert not store._states
+
+
+@pytest.mark.parametrize("use_redis", [False, True])
+def test_invalidate_forgets_fingerprint_and_state(cohorts_file, use_redis):
+    async def run():
+        store = ScoreFingerprintStore(fakeredis.aioredis.FakeRedis() if use_redis else None)
+        processor = _processor(cohorts_file, store)
+        vehicles = [make_vehicle(i) for i in range(6)]
+        vins = [vehicle.vin for vehicle in vehicles]
+        await processor.process_batch(vehicles)
+        versions = (processor.engine.cohort_service.database_version, processor.engine.model_version)
+        
+        await store.invalidate(vins[:2])
+        one = await store.last_known_states(vins), await store.partition(vehicles, *versions)
+        await store.invalidate()
+        everything = await store.last_known_states(vins), await store.partition(vehicles, *versions)
+        return vins, one, everything
+    
+    vins, (states, partition), (all_states, all_partition) = asyncio.run(run())
+    
+    assert sorted(states) == sorted(vins[2:])
+    assert [vehicle.vin for vehicle in partition.changed] == vins[:2]
+    assert all_states == {}
+    assert len(all_partition.changed) == 6
@@ -0,0 +1,69 @@
+"""SwarmOrchestrator admission: headroom for high priority and per-priority queue-wait histograms"""
+
+import asyncio
+
+import fakeredis.aioredis
+import pytest
+
+from conftest import make_vehicle
+from src.models.schemas import ProcessingTask, ServiceType
+from src.swarm.admission import AdmissionRejected
+from src.swarm.orchestrator import SwarmOrchestrator
+from src.swarm.work_queue import RedisWorkQueue
+
+
+def _orchestrator(**kwargs) -> SwarmOrchestrator:
+    orchestrator = SwarmOrchestrator(**kwargs)
+    orchestrator.redis_pool = fakeredis.aioredis.FakeRedis()
+    for service_type in ServiceType:
+        orchestrator.work_queues[service_type] = RedisWorkQueue(orchestrator.redis_pool, service_type.value)
+    return orchestrator
+
+
+def _task(task_id: str, priority: int) -> ProcessingTask:
+    vehicle = make_vehicle(1)
+    return ProcessingTask(
+        task_id=task_id, task_type="risk_calculation", vin=vehicle.vin, input_data=vehicle, priority=priority
+    )
+
+
+def test_full_queue_sheds_low_priority_and_keeps_headroom_for_priority_1():
+    async def run():
+        orchestrator = _orchestrator(max_queue_size=10, high_priority_reserve=0.2)
+        for i in range(8):
+            await orchestrator.submit_task(_task(f"nightly_{i}", priority=5))
+        
+        with pytest.raises(AdmissionRejected) as shed:
+            await orchestrator.submit_task(_task("nightly_8", priority=5))
+        for i in range(2):
+            await orchestrator.submit_task(_task(f"dealer_{i}", priority=1))
+        with pytest.raises(AdmissionRejected):
+            await orchestrator.submit_task(_task("dealer_2", priority=1))
+        return shed.value, [orchestrator._admission_limit(priority) for priority in range(1, 6)]
+    
+    shed, limits = asyncio.run(run())
+    
+    assert shed.priority == 5 and shed.status_code == 429
+    assert limits == [10, 9, 9, 8, 8]
+
+
+def test_claims_record_queue_wait_per_priority():
+    async def run():
+        orchestrator = _orchestrator()
+        await orchestrator.register_worker("worker_a", ServiceType.BAYESIAN_ENGINE)
+        await orchestrator.submit_task(_task("dealer", priority=1))
+        await orchestrator.submit_task(_task("nightly", priority=5))
+        claimed = await orchestrator.claim_task("worker_a", count=1, block_ms=0)
+        claimed += await orchestrator.claim_task("worker_a", count=1, block_ms=0)
+        
+        # A retry is claimed again but does not count as queue wait
+        await orchestrator.fail_task("worker_a", claimed[0][1], "boom")
+        claimed += await orchestrator.claim_task("worker_a", count=1, block_ms=0)
+        return claimed, await orchestrator.get_swarm_metrics()
+    
+    claimed, metrics = asyncio.run(run())
+    
+    assert [task.task_id for task, _ in claimed] == ["dealer", "nightly", "dealer"]
+    histograms = metrics["admission"][ServiceType.BAYESIAN_ENGINE.value]["wait_histograms"]
+    assert sorted(histograms) == [1, 5]
+    assert histograms[1]["count"] == 1 and histograms[5]["count"] == 1
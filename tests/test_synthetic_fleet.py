@@ -0,0 +1,56 @@
+"""Seeded fleet generation: the same seed must reproduce a fleet exactly, another seed must not"""
+
+import asyncio
+
+import numpy as np
+
+from scripts.comprehensive_100k_vin_engine import Comprehensive100kVINEngine
+from scripts.generate_lead_database import LeadDatabaseGenerator
+from src.services.synthetic_fleet import fleet_rng, sample_without_replacement, synthesize_vins
+
+
+def _vehicles(seed):
+    results = asyncio.run(Comprehensive100kVINEngine().generate_100k_vins(900, chunk_size=250, seed=seed))
+    return results["vehicles"]
+
+
+def test_vins_and_samples_repeat_for_a_seed():
+    first, second, other = fleet_rng(7), fleet_rng(7), fleet_rng(8)
+    
+    vins = synthesize_vins(first, 500)
+    assert vins.dtype == np.dtype("<U17")
+    assert all(len(vin) == 17 and vin.startswith("1FT") and vin[5:8] == "W1E" for vin in vins)
+    np.testing.assert_array_equal(vins, synthesize_vins(second, 500))
+    assert not np.array_equal(vins, synthesize_vins(other, 500))
+    
+    counts = np.array([0, 1, 3, 5])
+    sample = sample_without_replacement(first, counts, 8, 5)
+    np.testing.assert_array_equal(sample, sample_without_replacement(second, counts, 8, 5))
+    for row, count in zip(sample, counts):
+        assert len(set(row[:count])) == count and (row[count:] == -1).all()
+
+
+def test_existing_generator_is_passed_through():
+    rng = np.random.default_rng(1)
+    
+    assert fleet_rng(rng) is rng
+
+
+def test_vin_engine_fleet_repeats_for_a_seed():
+    first, second, other = _vehicles(5), _vehicles(5), _vehicles(6)
+    
+    assert first == second
+    assert [vehicle["vin"] for vehicle in first] != [vehicle["vin"] for vehicle in other]
+
+
+def test_lead_database_repeats_for_a_seed():
+    generator = LeadDatabaseGenerator()
+    
+    def leads(seed):
+        return [
+            {key: value for key, value in lead.items() if key != "generated_date"}
+            for lead in generator.generate_database(300, seed=seed)
+        ]
+    
+    assert leads(21) == leads(21)
+    assert leads(21) != leads(22)
@@ -0,0 +1,116 @@
+"""Redis Streams work queue: atomic claims, lease stealing, retries, dead letters and stale owners"""
+
+import asyncio
+
+import fakeredis.aioredis
+
+from src.swarm.work_queue import RedisWorkQueue
+
+
+def _queue(client, **kwargs):
+    return RedisWorkQueue(client, "risk_scoring", visibility_timeout=0.05, max_attempts=2, **kwargs)
+
+
+async def _steal(queue, worker_id):
+    """Claim after every lease has expired, without waiting for the steal interval"""
+    await asyncio.sleep(0.1)
+    queue._next_steal_at = 0.0
+    return await queue.claim(worker_id, block_ms=0)
+
+
+def test_each_task_is_claimed_once_in_priority_order():
+    async def run():
+        queue = _queue(fakeredis.aioredis.FakeRedis())
+        await queue.submit("low", "{}", priority=5)
+        await queue.submit("high", "{}", priority=1)
+        await queue.submit("mid", "{}", priority=3)
+        first = await queue.claim("worker_a", count=2, block_ms=0)
+        second = await queue.claim("worker_b", count=2, block_ms=0)
+        third = await queue.claim("worker_b", count=2, block_ms=0)
+        return first, second, third, await queue.get_task("high")
+    
+    first, second, third, state = asyncio.run(run())
+    
+    assert [task.task_id for task in first] == ["high"]
+    assert [task.task_id for task in second] == ["mid"]
+    assert [task.task_id for task in third] == ["low"]
+    assert first[0].worker_id == "worker_a" and first[0].attempts == 1
+    assert state["status"] == "processing" and state["worker_id"] == "worker_a"
+
+
+def test_expired_lease_is_stolen_and_the_late_owner_is_ignored():
+    async def run():
+        client = fakeredis.aioredis.FakeRedis()
+        queue = _queue(client)
+        await queue.submit("task_1", "{}")
+        [stale] = await queue.claim("worker_a", block_ms=0)
+        [stolen] = await _steal(queue, "worker_b")
+        
+        late_fail = await queue.fail(stale, "timed out")
+        late_ack = await queue.ack(stale, "late")
+        acked = await queue.ack(stolen, "done")
+        return queue, stale, stolen, late_fail, late_ack, acked, await queue.get_stats(), await queue.get_task("task_1")
+    
+    queue, stale, stolen, late_fail, late_ack, acked, stats, state = asyncio.run(run())
+    
+    assert (stolen.task_id, stolen.worker_id, stolen.attempts) == ("task_1", "worker_b", 2)
+    assert stolen.entry_id == stale.entry_id
+    assert (late_fail, late_ack, acked) == (False, False, True)
+    assert stats["depth"] == 0 and stats["dead_letters"] == 0 and stats["completed"] == 1
+    assert state["status"] == "completed" and state["result"] == "done"
+
+
+def test_failed_task_is_retried_then_dead_lettered():
+    async def run():
+        client = fakeredis.aioredis.FakeRedis()
+        queue = _queue(client)
+        await queue.submit("task_1", "{}")
+        [first] = await queue.claim("worker_a", block_ms=0)
+        retried = await queue.fail(first, "boom")
+        [second] = await queue.claim("worker_b", block_ms=0)
+        dead_lettered = await queue.fail(second, "boom again")
+        dead_letters = await client.xrange(queue.dead_letter_key)
+        return first, second, retried, dead_lettered, dead_letters, await queue.get_stats(), await queue.get_task("task_1")
+    
+    first, second, retried, dead_lettered, dead_letters, stats, state = asyncio.run(run())
+    
+    assert (retried, dead_lettered) == (True, True)
+    assert (first.attempts, second.attempts) == (1, 2)
+    assert second.entry_id != first.entry_id
+    assert [fields[b"task_id"] for _, fields in dead_letters] == [b"task_1"]
+    assert stats["depth"] == 0 and stats["dead_letters"] == 1
+    assert state["status"] == "dead_letter" and state["error"] == "boom again"
+
+
+def test_lease_that_keeps_expiring_is_dead_lettered_on_the_next_steal():
+    async def run():
+        queue = _queue(fakeredis.aioredis.FakeRedis())
+        await queue.submit("task_1", "{}")
+        await queue.claim("worker_a", block_ms=0)
+        await _steal(queue, "worker_b")
+        third = await _steal(queue, "worker_c")
+        return third, await queue.get_stats(), await queue.get_task("task_1")
+    
+    third, stats, state = asyncio.run(run())
+    
+    assert third == []
+    assert stats["depth"] == 0 and stats["dead_letters"] == 1
+    assert state["status"] == "dead_letter"
+
+
+def test_extend_keeps_the_lease_from_being_stolen():
+    async def run():
+        queue = _queue(fakeredis.aioredis.FakeRedis())
+        await queue.submit("task_1", "{}")
+        [task] = await queue.claim("worker_a", block_ms=0)
+        await asyncio.sleep(0.1)
+        extended = await queue.extend(task)
+        queue._next_steal_at = 0.0
+        stolen = await queue.claim("worker_b", block_ms=0)
+        return extended, stolen, await queue.ack(task)
+    
+    extended, stolen, acked = asyncio.run(run())
+    
+    assert extended is True
+    assert stolen == []
+    assert acked is True